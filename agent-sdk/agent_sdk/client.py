@@ -1,8 +1,9 @@
 import asyncio
 import json
 import logging
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from datetime import datetime
+import uuid
 import websockets
 import httpx
 from agent_sdk.models import AgentInfo, Message, Task, TaskAssignment, SharedMemory
@@ -42,6 +43,12 @@ class AgentClient:
         self._agent_joined_handlers: List[Callable[[str], None]] = []
         self._agent_left_handlers: List[Callable[[str], None]] = []
         
+        # Batches waiting for their batch:result, by batch id
+        self._pending_batches: Dict[str, asyncio.Future] = {}
+        
+        # Shared memory fetched last, by key: (etag, memory); revalidated with If-None-Match
+        self._memory_cache: Dict[str, Tuple[str, SharedMemory]] = {}
+        
         # HTTP client
         self._http = httpx.AsyncClient(base_url=server_url)
     
@@ -137,6 +144,14 @@ class AgentClient:
         elif event == "agent:left":
             for handler in self._agent_left_handlers:
                 await self._call_handler(handler, event_data["agent_id"])
+        
+        elif event == "batch:result":
+            waiter = self._pending_batches.pop(event_data.get("id"), None)
+            if waiter and not waiter.done():
+                if "error" in event_data:
+                    waiter.set_exception(RuntimeError(event_data["error"]))
+                else:
+                    waiter.set_result(event_data["results"])
     
     async def _call_handler(self, handler: Callable, *args) -> None:
         """Call an event handler safely"""
@@ -225,15 +240,22 @@ class AgentClient:
         description: Optional[str] = None,
         priority: int = 1,
         due_date: Optional[datetime] = None,
-        requirements: Optional[Dict[str, Any]] = None
+        requirements: Optional[Dict[str, Any]] = None,
+        depends_on: Optional[List[str]] = None,
+        run_at: Optional[datetime] = None
     ) -> Task:
-        """Create a new task"""
+        """Create a new task, blocked until the tasks in depends_on complete
+
+        With run_at (UTC) the task is held back by the server until then.
+        """
         await self._send_ws_event("task:create", {
             "title": title,
             "description": description,
             "priority": priority,
             "due_date": due_date.isoformat() if due_date else None,
-            "requirements": requirements or {}
+            "requirements": requirements or {},
+            "depends_on": depends_on,
+            "run_at": run_at.isoformat() if run_at else None
         })
         
         return Task(
@@ -241,7 +263,7 @@ class AgentClient:
             creator_id=self.agent_id,
             title=title,
             description=description,
-            status="pending",
+            status="scheduled" if run_at else "blocked" if depends_on else "pending",
             priority=priority,
             created_at=datetime.utcnow(),
             due_date=due_date,
@@ -314,7 +336,152 @@ class AgentClient:
         
         response = await self._http.get("/api/tasks", params=params)
         return [Task(**task) for task in response.json()]
-    
+
+    async def claim_next_task(
+        self,
+        capabilities: Optional[List[str]] = None,
+        lease_seconds: Optional[int] = None
+    ) -> Optional[Task]:
+        """Atomically claim the most urgent task this agent can run (None if idle)
+
+        The claim holds a lease that heartbeats extend; if the agent stops
+        heartbeating the task is requeued for someone else.
+        """
+        response = await self._http.post(
+            f"/api/agents/{self.agent_id}/claim-next",
+            json={"capabilities": capabilities, "lease_seconds": lease_seconds}
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") != "claimed":
+            return None
+        return Task(**data["task"])
+
+    async def ready_for_tasks(self, capabilities: Optional[List[str]] = None) -> None:
+        """Ask the server to push tasks to this agent (task:assigned) instead of polling
+
+        After each pushed task is completed or failed the agent is offered
+        the next one automatically.
+        """
+        await self._send_ws_event("agent:ready", {"capabilities": capabilities})
+
+    async def renew_task_lease(self, task_id: str, lease_seconds: Optional[int] = None) -> bool:
+        """Extend the lease on a task this agent is working on"""
+        params = {"agent_id": self.agent_id}
+        if lease_seconds:
+            params["lease_seconds"] = lease_seconds
+        response = await self._http.post(f"/api/tasks/{task_id}/lease", params=params)
+        return response.status_code == 200
+
+    async def create_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many tasks in one request and transaction; returns a result per task
+
+        Each task is a dict of create_task arguments. depends_on may refer to
+        earlier tasks of the same call as "#<index>".
+        """
+        response = await self._http.post(
+            "/api/tasks/bulk",
+            json={"tasks": [{"creator_id": self.agent_id, **task} for task in tasks]}
+        )
+        response.raise_for_status()
+        return response.json()["results"]
+
+    async def assign_tasks(self, assignments: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Create many (task_id, agent_id) assignments in one request; returns a result per assignment"""
+        response = await self._http.post(
+            "/api/tasks/assign/bulk",
+            json={"assignments": [
+                {"task_id": task_id, "agent_id": agent_id} for task_id, agent_id in assignments
+            ]}
+        )
+        response.raise_for_status()
+        return response.json()["results"]
+
+    async def update_tasks(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply many task updates (each a dict with task_id) in one request"""
+        response = await self._http.post("/api/tasks/update/bulk", json={"updates": updates})
+        response.raise_for_status()
+        return response.json()["results"]
+
+    async def send_batch(
+        self,
+        events: List[Tuple[str, Dict[str, Any]]],
+        timeout: float = 30.0
+    ) -> List[Dict[str, Any]]:
+        """Send task:create/assign/update events as one WebSocket frame
+
+        The server applies them in one transaction and answers with a result
+        per event, in order. Later events may refer to a task created earlier
+        in the batch as "#<index>".
+        """
+        batch_id = str(uuid.uuid4())
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending_batches[batch_id] = waiter
+        try:
+            await self._send_ws_event("batch", {
+                "id": batch_id,
+                "events": [{"event": event, "data": data} for event, data in events]
+            })
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            self._pending_batches.pop(batch_id, None)
+
+    async def add_task_dependencies(self, task_id: str, depends_on: List[str]) -> List[Task]:
+        """Make a task wait for other tasks; it is pushed to agents once they all complete"""
+        response = await self._http.post(
+            f"/api/tasks/{task_id}/dependencies",
+            json={"depends_on": depends_on}
+        )
+        response.raise_for_status()
+        return [Task(**task) for task in response.json()]
+
+    async def get_task_graph(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Everything a task waits for, with its critical path and remaining depth"""
+        response = await self._http.get(f"/api/tasks/{task_id}/graph")
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    async def schedule_task(
+        self,
+        name: str,
+        title: str,
+        cron: Optional[str] = None,
+        interval_seconds: Optional[int] = None,
+        description: Optional[str] = None,
+        priority: int = 1,
+        requirements: Optional[Dict[str, Any]] = None,
+        catch_up: str = "latest",
+        start_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Have the server create a task on a cron expression or interval (UTC)
+
+        Schedules are stored by the server, so they keep firing across agent
+        and server restarts; catch_up ("latest", "all" or "skip") decides
+        what happens to runs missed while the server was down.
+        """
+        response = await self._http.post("/api/schedules", json={
+            "name": name,
+            "creator_id": self.agent_id,
+            "cron": cron,
+            "interval_seconds": interval_seconds,
+            "catch_up": catch_up,
+            "start_at": start_at.isoformat() if start_at else None,
+            "template": {
+                "title": title,
+                "description": description,
+                "priority": priority,
+                "requirements": requirements or {}
+            }
+        })
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_schedule(self, schedule_id: str) -> bool:
+        """Stop a schedule created with schedule_task"""
+        response = await self._http.delete(f"/api/schedules/{schedule_id}")
+        return response.status_code == 204
+
     # Memory methods
     
     async def set_memory(
@@ -332,19 +499,21 @@ class AgentClient:
     
     async def get_memory(self, key: str) -> Optional[SharedMemory]:
         """Get shared memory"""
-        await self._send_ws_event("memory:get", {"key": key})
-        
-        # Wait for response (in production, use proper async waiting)
-        response = await self._http.get(f"/api/memory/key/{key}")
-        if response.status_code == 200:
-            return SharedMemory(**response.json())
-        return None
+        return await self.get_memory_by_key(key)
     
     async def get_memory_by_key(self, key: str) -> Optional[SharedMemory]:
-        """Get memory by key (HTTP)"""
-        response = await self._http.get(f"/api/memory/key/{key}")
+        """Get memory by key (HTTP); an unchanged entry fetched before is not downloaded again"""
+        cached = self._memory_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = await self._http.get(f"/api/memory/key/{key}", headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
         if response.status_code == 200:
-            return SharedMemory(**response.json())
+            memory = SharedMemory(**response.json())
+            if response.headers.get("ETag"):
+                self._memory_cache[key] = (response.headers["ETag"], memory)
+            return memory
+        self._memory_cache.pop(key, None)
         return None
     
     async def update_memory(
@@ -36,6 +36,7 @@ class Task(BaseModel):
     created_at: datetime
     due_date: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    run_at: Optional[datetime] = None
     requirements: Dict[str, Any] = {}
 
 
@@ -57,4 +58,5 @@ class SharedMemory(BaseModel):
     created_by: str
     created_at: datetime
     updated_at: datetime
-    access_control: Optional[Dict[str, List[str]]] = None
\ No newline at end of file
+    access_control: Optional[Dict[str, List[str]]] = None
+    version: int = 1
\ No newline at end of file
@@ -2,10 +2,12 @@ from app.api.agents import router as agents_router
 from app.api.messages import router as messages_router
 from app.api.tasks import router as tasks_router
 from app.api.memory import router as memory_router
+from app.api.schedules import router as schedules_router
 
 __all__ = [
     "agents_router",
     "messages_router",
     "tasks_router",
-    "memory_router"
+    "memory_router",
+    "schedules_router"
 ]
\ No newline at end of file
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.services.agent_service import AgentService
 from app.schemas.agent import AgentCreate, AgentUpdate, AgentResponse, AgentStatusUpdate
+from app.schemas.task import TaskClaim
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
@@ -15,9 +16,14 @@ async def health_check():
     
     expected_agents = ["memu-bot", "clawdbot-1", "clawdbot-2", "clawdbot-3"]
     agent_status = {}
+    agent_last_seen = {}
+    # Presence covers agents connected to any worker, not just this one
+    presence = await manager.get_presence()
     
     for agent_id in expected_agents:
-        agent_status[agent_id] = "connected" if agent_id in manager.active_connections else "disconnected"
+        agent_status[agent_id] = "connected" if agent_id in presence else "disconnected"
+        local = manager.presence.get(agent_id)
+        agent_last_seen[agent_id] = local["last_seen"].isoformat() if local else None
     
     connected_count = sum(1 for s in agent_status.values() if s == "connected")
     
@@ -25,11 +31,26 @@ async def health_check():
         "status": "healthy" if connected_count >= 3 else "degraded" if connected_count >= 1 else "unhealthy",
         "backend": "running",
         "agents": agent_status,
+        "last_seen": agent_last_seen,
         "connected_count": connected_count,
         "total_expected": len(expected_agents)
     }
 
 
+@router.get("/connections")
+async def connection_stats():
+    """Outbound queue depth and drop counters for each WebSocket connection"""
+    from app.websocket.connection_manager import manager
+
+    return {
+        "worker_id": manager.worker_id,
+        "overflow_policy": manager.overflow_policy,
+        "queue_size": manager.queue_size,
+        "evicted_count": manager.evicted_count,
+        "connections": manager.get_queue_stats(),
+    }
+
+
 
 @router.post("/register", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
 async def register_agent(
@@ -70,10 +91,23 @@ async def list_agents(
 
 @router.get("/online", response_model=List[AgentResponse])
 async def list_online_agents(db: AsyncSession = Depends(get_db)):
-    """List all online agents"""
+    """List all online agents, with live presence overriding not-yet-flushed rows"""
+    from app.websocket.connection_manager import manager
+
     service = AgentService(db)
-    agents = await service.get_online_agents()
-    return agents
+    agents = await service.get_online_agents(include_ids=manager.presence.snapshot().keys())
+    online = []
+    for agent in agents:
+        response = AgentResponse.model_validate(agent)
+        live = manager.presence.get(agent.id)
+        if live:
+            response = response.model_copy(update={
+                "status": live["status"],
+                "last_seen": live["last_seen"] or response.last_seen
+            })
+        if response.status == "online":
+            online.append(response)
+    return online
 
 
 @router.get("/{agent_id}", response_model=AgentResponse)
@@ -188,6 +222,24 @@ async def get_what_next(
     }
 
 
+@router.post("/{agent_id}/claim-next")
+async def claim_next_task(
+    agent_id: str,
+    claim: Optional[TaskClaim] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Atomically claim the most urgent task this agent can run, holding a lease on it"""
+    from app.services.task_service import TaskService
+    from app.schemas.task import TaskResponse
+    
+    claim = claim or TaskClaim()
+    task_service = TaskService(db)
+    task = await task_service.claim_next(agent_id, claim.capabilities, claim.lease_seconds)
+    if not task:
+        return {"status": "idle", "message": "No claimable tasks."}
+    return {"status": "claimed", "task": TaskResponse.model_validate(task)}
+
+
 @router.post("/{agent_id}/claim/{task_id}")
 async def claim_task(
     agent_id: str,
@@ -221,6 +273,9 @@ async def agent_heartbeat(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agent not found"
         )
-    # Update last_seen
+    # Extend the leases of tasks it is working on, then update last_seen (which commits)
+    from app.services.task_service import TaskService
+    
+    leases = await TaskService(db).extend_leases([agent_id])
     agent = await service.update_status(agent_id, agent.status)
-    return {"status": "ok", "agent_id": agent_id, "last_seen": agent.last_seen}
\ No newline at end of file
+    return {"status": "ok", "agent_id": agent_id, "last_seen": agent.last_seen, "leases_extended": leases}
\ No newline at end of file
@@ -1,12 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.core.database import get_db
+from app.models.memory import SharedMemory
+from app.services.memory_cache import memory_etag
 from app.services.memory_service import MemoryService
-from app.schemas.memory import MemoryCreate, MemoryUpdate, MemoryResponse
+from app.schemas.memory import MemoryCreate, MemoryUpdate, MemoryResponse, MemorySearchHit
 
 router = APIRouter(prefix="/api/memory", tags=["memory"])
 
+NOT_MODIFIED = {304: {"description": "Not modified: the If-None-Match ETag is still current"}}
+
+
+def etag_response(memory: SharedMemory, response: Response, if_none_match: Optional[str] = None):
+    """Tag the response with the entry's ETag; an empty 304 if the client already has this version"""
+    etag = memory_etag(memory)
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match compares weakly
+        if "*" in tags or etag in tags or f"W/{etag}" in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return memory
+
 
 @router.post("", response_model=MemoryResponse, status_code=status.HTTP_201_CREATED)
 async def set_memory(
@@ -45,28 +61,49 @@ async def list_memories(
     return memories
 
 
-@router.get("/key/{key}", response_model=MemoryResponse)
+@router.get("/search", response_model=List[MemorySearchHit])
+async def search_memories(
+    q: str = Query(..., min_length=1, description="Words to find; a trailing * matches prefixes"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    created_by: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over memory keys and values, best matches first"""
+    service = MemoryService(db)
+    hits = await service.search_memory(q, skip=skip, limit=limit, created_by=created_by)
+    return [
+        MemorySearchHit(**MemoryResponse.model_validate(memory).model_dump(), score=score, snippet=snippet)
+        for memory, score, snippet in hits
+    ]
+
+
+@router.get("/key/{key}", response_model=MemoryResponse, responses=NOT_MODIFIED)
 async def get_memory_by_key(
     key: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get memory by key"""
+    """Get memory by key (cached); send If-None-Match to get 304 while it is unchanged"""
     service = MemoryService(db)
-    memory = await service.get_memory_by_key(key)
+    memory = await service.read_memory_by_key(key)
     if not memory:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Memory not found"
         )
-    return memory
+    return etag_response(memory, response, if_none_match)
 
 
-@router.get("/{memory_id}", response_model=MemoryResponse)
+@router.get("/{memory_id}", response_model=MemoryResponse, responses=NOT_MODIFIED)
 async def get_memory(
     memory_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get memory by ID"""
+    """Get memory by ID; send If-None-Match to get 304 while it is unchanged"""
     service = MemoryService(db)
     memory = await service.get_memory(memory_id)
     if not memory:
@@ -74,13 +111,14 @@ async def get_memory(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Memory not found"
         )
-    return memory
+    return etag_response(memory, response, if_none_match)
 
 
 @router.put("/key/{key}", response_model=MemoryResponse)
 async def update_memory_by_key(
     key: str,
     memory_data: MemoryUpdate,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """Update memory by key"""
@@ -95,13 +133,14 @@ async def update_memory_by_key(
         )
     
     memory = await service.update_memory(existing.id, memory_data)
-    return memory
+    return etag_response(memory, response)
 
 
 @router.put("/{memory_id}", response_model=MemoryResponse)
 async def update_memory(
     memory_id: str,
     memory_data: MemoryUpdate,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """Update memory"""
@@ -112,7 +151,7 @@ async def update_memory(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Memory not found"
         )
-    return memory
+    return etag_response(memory, response)
 
 
 @router.delete("/key/{key}", status_code=status.HTTP_204_NO_CONTENT)
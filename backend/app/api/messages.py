@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
+import json
 from app.core.database import get_db
 from app.services.message_service import MessageService
-from app.schemas.message import MessageCreate, MessageResponse
+from app.schemas.message import MessageCreate, MessageResponse, MessagePage, MessageSearchHit
 
 router = APIRouter(prefix="/api/messages", tags=["messages"])
 
@@ -36,6 +38,8 @@ async def send_message(
         }
         await manager.send_to_agents(payload, message_data.recipients)
 
+    # With write-behind, delivery above did not wait for the database
+    await service.wait_persisted(message)
     return message
 
 
@@ -62,25 +66,114 @@ async def list_messages(
     return messages
 
 
+@router.get("/page", response_model=MessagePage)
+async def list_messages_page(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    sender_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+    message_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """List messages one page at a time, ordered by (created_at, id)"""
+    service = MessageService(db)
+    try:
+        messages, next_cursor = await service.list_messages_page(
+            limit=limit,
+            cursor=cursor,
+            order=order,
+            sender_id=sender_id,
+            task_id=task_id,
+            message_type=message_type,
+            since=since
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return MessagePage(items=messages, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=List[MessageSearchHit])
+async def search_messages(
+    q: str = Query(..., min_length=1, description="Words to find; a trailing * matches prefixes"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    sender_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+    message_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over message content, best matches first"""
+    service = MessageService(db)
+    hits = await service.search_messages(
+        q,
+        skip=skip,
+        limit=limit,
+        sender_id=sender_id,
+        task_id=task_id,
+        message_type=message_type
+    )
+    return [
+        MessageSearchHit(**MessageResponse.model_validate(message).model_dump(), score=score, snippet=snippet)
+        for message, score, snippet in hits
+    ]
+
+
+@router.get("/export")
+async def export_messages(
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    sender_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+    message_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream matching messages as NDJSON, one message per line"""
+    service = MessageService(db)
+
+    async def lines():
+        # The response outlives the dependency, so the session is closed here
+        try:
+            async for row in service.stream_messages(
+                order=order,
+                sender_id=sender_id,
+                task_id=task_id,
+                message_type=message_type,
+                since=since
+            ):
+                row["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+                yield json.dumps(row, separators=(",", ":"), ensure_ascii=False) + "\n"
+        finally:
+            await db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/recent", response_model=List[MessageResponse])
 async def get_recent_messages(
     hours: int = Query(24, ge=1, le=168),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: AsyncSession = Depends(get_db)
 ):
     """Get messages from the last N hours"""
     service = MessageService(db)
-    messages = await service.get_recent_messages(hours=hours)
+    messages = await service.get_recent_messages(hours=hours, limit=limit)
     return messages
 
 
 @router.get("/task/{task_id}", response_model=List[MessageResponse])
 async def get_task_messages(
     task_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all messages for a task"""
+    """Get messages for a task, oldest first"""
     service = MessageService(db)
-    messages = await service.get_messages_by_task(task_id)
+    messages = await service.get_messages_by_task(task_id, limit=limit)
     return messages
 
 
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.database import get_db
+from app.services.schedule_service import ScheduleService
+from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse
+from app.schemas.task import TaskResponse
+
+router = APIRouter(prefix="/api/schedules", tags=["schedules"])
+
+
+@router.post("", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
+async def create_schedule(
+    schedule_data: ScheduleCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a recurring task schedule (cron or interval)"""
+    service = ScheduleService(db)
+    try:
+        schedule = await service.create_schedule(schedule_data)
+        return schedule
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("", response_model=List[ScheduleResponse])
+async def list_schedules(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    enabled: Optional[bool] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """List schedules, soonest first"""
+    service = ScheduleService(db)
+    schedules = await service.list_schedules(skip=skip, limit=limit, enabled=enabled)
+    return schedules
+
+
+@router.get("/timers")
+async def get_timers():
+    """Delayed tasks and schedules due within the scheduler's current window"""
+    from app.services.scheduler import scheduler
+
+    return {
+        "timers": scheduler.pending_timers(),
+        "fired_count": scheduler.fired_count,
+    }
+
+
+@router.get("/{schedule_id}", response_model=ScheduleResponse)
+async def get_schedule(
+    schedule_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get schedule by ID"""
+    service = ScheduleService(db)
+    schedule = await service.get_schedule(schedule_id)
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found"
+        )
+    return schedule
+
+
+@router.put("/{schedule_id}", response_model=ScheduleResponse)
+async def update_schedule(
+    schedule_id: str,
+    schedule_data: ScheduleUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update schedule"""
+    service = ScheduleService(db)
+    try:
+        schedule = await service.update_schedule(schedule_id, schedule_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found"
+        )
+    return schedule
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(
+    schedule_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete schedule; tasks it already created are kept"""
+    service = ScheduleService(db)
+    success = await service.delete_schedule(schedule_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found"
+        )
+    return None
+
+
+@router.post("/{schedule_id}/fire", response_model=List[TaskResponse])
+async def fire_schedule(
+    schedule_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Fire a schedule now if it is due; returns the tasks created"""
+    service = ScheduleService(db)
+    if not await service.get_schedule(schedule_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found"
+        )
+    return await service.fire(schedule_id)
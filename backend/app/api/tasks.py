@@ -3,7 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.core.database import get_db
 from app.services.task_service import TaskService
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskAssignmentCreate, TaskAssignmentResponse, TaskComplete
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskAssignmentCreate, TaskAssignmentResponse, TaskComplete,
+    TaskDependencyCreate, TaskGraph, TaskBulkCreate, TaskBulkAssign, TaskBulkUpdate, TaskBulkResponse
+)
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
@@ -13,10 +16,52 @@ async def create_task(
     task_data: TaskCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new task"""
+    """Create a new task, blocked until the tasks in depends_on complete"""
     service = TaskService(db)
-    task = await service.create_task(task_data)
-    return task
+    try:
+        task = await service.create_task(task_data)
+        return task
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many tasks in one transaction, with a result per task
+
+    depends_on may refer to earlier tasks of the same request as "#<index>".
+    """
+    service = TaskService(db)
+    outcomes = await service.create_tasks(bulk_data.tasks)
+    return TaskBulkResponse.from_outcomes(outcomes)
+
+
+@router.post("/assign/bulk", response_model=TaskBulkResponse)
+async def assign_tasks_bulk(
+    bulk_data: TaskBulkAssign,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many assignments in one transaction, with a result per assignment"""
+    service = TaskService(db)
+    outcomes = await service.assign_tasks([(item.task_id, item.agent_id) for item in bulk_data.assignments])
+    return TaskBulkResponse.from_outcomes(outcomes)
+
+
+@router.post("/update/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update many tasks in one transaction, with a result per update"""
+    service = TaskService(db)
+    outcomes = await service.update_tasks([(item.task_id, item) for item in bulk_data.updates])
+    return TaskBulkResponse.from_outcomes(outcomes)
 
 
 @router.get("", response_model=List[TaskResponse])
@@ -48,6 +93,18 @@ async def get_pending_tasks(db: AsyncSession = Depends(get_db)):
     return tasks
 
 
+@router.get("/queue")
+async def get_dispatch_queue():
+    """Tasks waiting to be pushed, in dispatch order, and agents waiting for work"""
+    from app.websocket.dispatcher import dispatcher
+
+    return {
+        "queued_tasks": dispatcher.queued_task_ids(),
+        "ready_agents": dispatcher.ready_agent_ids(),
+        "dispatched_count": dispatcher.dispatched_count,
+    }
+
+
 @router.get("/overdue", response_model=List[TaskResponse])
 async def get_overdue_tasks(db: AsyncSession = Depends(get_db)):
     """Get all overdue tasks"""
@@ -141,6 +198,94 @@ async def complete_task(
     return task
 
 
+@router.post("/{task_id}/lease", response_model=TaskResponse)
+async def renew_task_lease(
+    task_id: str,
+    agent_id: str = Query(..., description="Agent holding the task"),
+    lease_seconds: Optional[int] = Query(None, ge=1, le=86400),
+    db: AsyncSession = Depends(get_db)
+):
+    """Extend the lease on an in-progress task"""
+    service = TaskService(db)
+    task = await service.renew_lease(task_id, agent_id, lease_seconds)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task is not in progress under this agent"
+        )
+    return task
+
+
+@router.get("/{task_id}/dependencies", response_model=List[TaskResponse])
+async def get_task_dependencies(
+    task_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the tasks this task waits for"""
+    service = TaskService(db)
+    return await service.dependencies.get_dependencies(task_id)
+
+
+@router.post("/{task_id}/dependencies", response_model=List[TaskResponse])
+async def add_task_dependencies(
+    task_id: str,
+    dependency_data: TaskDependencyCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Make a task wait for other tasks; rejects edges that would create a cycle"""
+    service = TaskService(db)
+    try:
+        return await service.add_dependencies(task_id, dependency_data.depends_on)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.delete("/{task_id}/dependencies/{depends_on_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_task_dependency(
+    task_id: str,
+    depends_on_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Stop a task waiting for another"""
+    service = TaskService(db)
+    success = await service.remove_dependency(task_id, depends_on_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dependency not found"
+        )
+    return None
+
+
+@router.get("/{task_id}/dependents", response_model=List[TaskResponse])
+async def get_task_dependents(
+    task_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the tasks waiting for this task"""
+    service = TaskService(db)
+    return await service.dependencies.get_dependents(task_id)
+
+
+@router.get("/{task_id}/graph", response_model=TaskGraph)
+async def get_task_graph(
+    task_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Everything a task transitively waits for, with its critical path and remaining depth"""
+    service = TaskService(db)
+    graph = await service.dependencies.graph(task_id)
+    if graph is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    return graph
+
+
 @router.get("/{task_id}/assignments", response_model=List[TaskAssignmentResponse])
 async def get_task_assignments(
     task_id: str,
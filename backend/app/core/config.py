@@ -15,12 +15,54 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./agent_communication.db"
+    SQL_ECHO: bool = False  # log every SQL statement (independent of DEBUG)
+    # SQLite storage profile: tuned (WAL, synchronous=NORMAL), durable (WAL, synchronous=FULL)
+    # or default (SQLite's own settings); SQLITE_PRAGMAS overrides single pragmas, e.g. {"mmap_size": 0}
+    SQLITE_PROFILE: str = "tuned"
+    SQLITE_PRAGMAS: dict = {}
+
+    # Message write-behind: group-commit messages every MESSAGE_FLUSH_INTERVAL_MS or
+    # MESSAGE_FLUSH_BATCH_SIZE messages. Durability "buffered" acknowledges before the
+    # commit (a crash can lose the last interval); "commit" waits for the group commit
+    MESSAGE_WRITE_BEHIND: bool = False
+    MESSAGE_FLUSH_INTERVAL_MS: int = 50
+    MESSAGE_FLUSH_BATCH_SIZE: int = 500
+    MESSAGE_DURABILITY: str = "buffered"  # buffered | commit
     
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
     
     # WebSocket
     WS_HEARTBEAT_INTERVAL: int = 30  # seconds
+    WS_SEND_QUEUE_SIZE: int = 256  # outbound messages buffered per connection
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest | coalesce | disconnect
+    PRESENCE_FLUSH_INTERVAL: float = 5.0  # seconds between batched last_seen/status writes
+
+    # Task leases: a claimed task is requeued if its lease is not extended in time.
+    # Heartbeats extend the leases of the agent's in_progress tasks
+    TASK_LEASE_SECONDS: int = 300
+    TASK_REAPER_INTERVAL: float = 15.0  # seconds between expired-lease sweeps
+    TASK_DISPATCH_RESYNC_INTERVAL: float = 60.0  # seconds between reloads of the push queue from the DB
+
+    # Scheduler: delayed tasks and recurring schedules due within the horizon are kept in
+    # memory and fired on time; the window is reloaded from the DB when it runs out
+    SCHEDULER_HORIZON_SECONDS: float = 300.0
+    SCHEDULE_MAX_CATCH_UP: int = 100  # most missed runs fired at once by catch_up="all"
+    SCHEDULE_MISFIRE_GRACE_SECONDS: float = 60.0  # catch_up="skip" drops runs later than this
+    # Failed tasks are retried after RETRY_BACKOFF * 2^(attempt-1) seconds, capped at the max
+    # (0 retries at once); requirements["retry_backoff_seconds"] overrides it per task
+    TASK_RETRY_BACKOFF_SECONDS: float = 0.0
+    TASK_RETRY_BACKOFF_MAX_SECONDS: float = 3600.0
+
+    # Shared memory: rows most recently read by key are cached per worker (0 disables);
+    # writes invalidate them on every worker through the event bus
+    MEMORY_CACHE_SIZE: int = 1024
+
+    # Workers: with WORKERS > 1, EVENT_BUS_URL must point to a shared broker
+    # (redis://host:6379/0, or unix:///path/to.sock for app.websocket.local_broker)
+    WORKERS: int = 1
+    EVENT_BUS_URL: Optional[str] = None
+    WORKER_ID: Optional[str] = None  # defaults to hostname-pid
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Tuple
+
+# (name, lowest, highest) of the five cron fields
+CRON_FIELDS: List[Tuple[str, int, int]] = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),  # 0 = Sunday; 7 is accepted as Sunday too
+]
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+WEEKDAY_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+# Give up looking for a match after this long (e.g. "0 0 30 2 *" never fires)
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+
+def _parse_value(value: str, name: str) -> int:
+    names = MONTH_NAMES if name == "month" else WEEKDAY_NAMES if name == "weekday" else None
+    if names and value.lower()[:3] in names:
+        return names.index(value.lower()[:3]) + (1 if name == "month" else 0)
+    if not value.isdigit():
+        raise ValueError(f"Invalid {name} value {value!r}")
+    return int(value)
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        part, _, step_text = part.partition("/")
+        step = int(step_text) if step_text.isdigit() else None
+        if step_text and not step:
+            raise ValueError(f"Invalid {name} step {step_text!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            first, _, last = part.partition("-")
+            start, end = _parse_value(first, name), _parse_value(last, name)
+        else:
+            start = _parse_value(part, name)
+            end = high if step else start
+        # Weekday 7 is Sunday again, folded to 0 below
+        if start < low or end > (7 if name == "weekday" else high) or start > end:
+            raise ValueError(f"{name} out of range in {text!r}")
+        values.update(value % 7 if name == "weekday" else value for value in range(start, end + 1, step or 1))
+    return frozenset(values)
+
+
+class CronExpression:
+    """Standard five-field cron expression (minute hour day month weekday)
+
+    Supports ``*``, lists, ranges, steps and month/weekday names. Times are
+    naive UTC datetimes like everywhere else in the backend. As in cron,
+    when both day of month and weekday are restricted a time matches if
+    either does.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression needs {len(CRON_FIELDS)} fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(part, name, low, high) for part, (name, low, high) in zip(parts, CRON_FIELDS)
+        )
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def __repr__(self):
+        return f"<CronExpression({self.expression!r})>"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # datetime.weekday() is 0 = Monday; cron counts from Sunday
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment``; raises ValueError if there is none"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + SEARCH_LIMIT
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
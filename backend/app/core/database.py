@@ -1,14 +1,65 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import Connection, MetaData, event
+from sqlalchemy.schema import CreateIndex
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
 
+# Pragmas applied to every new SQLite connection, per storage profile.
+# busy_timeout comes first so switching the journal mode waits for locks.
+SQLITE_PROFILES: Dict[str, Dict[str, object]] = {
+    "default": {},
+    "tuned": {
+        "busy_timeout": 5000,  # ms to wait for a lock before "database is locked"
+        "journal_mode": "WAL",  # readers no longer block the writer
+        "synchronous": "NORMAL",  # fsync at checkpoints only; safe with WAL
+        "mmap_size": 268435456,  # 256 MiB memory-mapped reads
+        "cache_size": -65536,  # 64 MiB page cache (negative = KiB)
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",  # fsync every commit
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile: Optional[str] = None, overrides: Optional[dict] = None) -> Dict[str, object]:
+    """Resolve the pragmas of a storage profile plus per-pragma overrides"""
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLite profile {profile!r}, expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    overrides = settings.SQLITE_PRAGMAS if overrides is None else overrides
+    return {**SQLITE_PROFILES[profile], **overrides}
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: Dict[str, object]):
+    """Run the given pragmas on every connection the engine opens"""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=settings.SQL_ECHO,
     future=True
 )
+apply_sqlite_pragmas(engine, sqlite_pragmas())
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -33,6 +84,45 @@ class Base(DeclarativeBase):
     )
 
 
+# Columns added to existing tables since their first release: (table, column, DDL type).
+# create_all never alters a table that already exists, so init_db adds them
+ADDED_COLUMNS: List[Tuple[str, str, str]] = [
+    ("tasks", "claimed_by", "VARCHAR"),
+    ("tasks", "lease_expires_at", "DATETIME"),
+    ("tasks", "run_at", "DATETIME"),
+    ("tasks", "schedule_id", "VARCHAR"),
+    ("shared_memory", "version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+def migrate_sqlite_schema(connection: Connection) -> List[str]:
+    """Add missing ADDED_COLUMNS to existing SQLite tables and create their tables' indexes
+
+    Columns are found with ``PRAGMA table_info`` and added with ``ALTER
+    TABLE ... ADD COLUMN``; indexes use ``CREATE INDEX IF NOT EXISTS``.
+
+    Safe to run on every startup. Returns the ``table.column`` names added.
+    """
+    added = []
+    tables: Dict[str, set] = {}
+    for table, column, ddl in ADDED_COLUMNS:
+        if table not in tables:
+            tables[table] = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')}
+        # A missing table is left to create_all, which creates it whole
+        if tables[table] and column not in tables[table]:
+            connection.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl}')
+            tables[table].add(column)
+            added.append(f"{table}.{column}")
+    for table, columns in tables.items():
+        if not columns:
+            continue
+        for index in Base.metadata.tables[table].indexes:
+            # Indexes on columns this step does not add yet are left to a later upgrade
+            if {column.name for column in index.columns} <= columns:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+    return added
+
+
 async def get_db() -> AsyncSession:
     """Dependency for getting database sessions"""
     async with AsyncSessionLocal() as session:
@@ -43,6 +133,13 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
-    """Initialize database tables"""
+    """Initialize database tables, upgrade older SQLite schemas and index rows the full-text index is missing"""
+    from app.services.search_service import SearchService
+
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            await conn.run_sync(migrate_sqlite_schema)
+    async with AsyncSessionLocal() as db:
+        await SearchService(db).backfill()
+        await db.commit()
@@ -3,8 +3,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.database import init_db
-from app.api import agents_router, messages_router, tasks_router, memory_router
+from app.api import agents_router, messages_router, tasks_router, memory_router, schedules_router
 from app.websocket.events import handle_agent_websocket
+from app.websocket.connection_manager import manager
+from app.services.message_writer import message_writer
+from app.services.lease_reaper import lease_reaper
+from app.services.scheduler import scheduler
+from app.services.memory_cache import memory_cache
+from app.websocket.dispatcher import dispatcher
+from typing import Optional
 import logging
 
 # Configure logging
@@ -15,6 +22,50 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def announce_requeued_tasks(tasks):
+    """Tell agents about tasks put back in the queue after their lease expired"""
+    for task in tasks:
+        await manager.broadcast({
+            "event": "task:updated",
+            "data": {
+                "id": task.id,
+                "status": task.status,
+                "reason": "lease_expired"
+            }
+        })
+
+
+async def announce_scheduled_tasks(created, released):
+    """Tell agents about tasks created by schedules and delayed tasks whose time came"""
+    for task in created:
+        await manager.broadcast({
+            "event": "task:created",
+            "data": {
+                "id": task.id,
+                "creator_id": task.creator_id,
+                "title": task.title,
+                "status": task.status,
+                "priority": task.priority,
+                "created_at": task.created_at.isoformat(),
+                "schedule_id": task.schedule_id
+            }
+        })
+    for task in released:
+        await manager.broadcast({
+            "event": "task:updated",
+            "data": {
+                "id": task.id,
+                "status": task.status,
+                "reason": "run_at"
+            }
+        })
+
+
+async def publish_memory_invalidation(key):
+    """Tell the other workers to drop a shared memory key from their caches"""
+    await manager.publish({"type": "memory:invalidate", "key": key})
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -22,11 +73,31 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Agent Communication Channel...")
     await init_db()
     logger.info("Database initialized successfully")
+    if settings.WORKERS > 1 and not settings.EVENT_BUS_URL:
+        logger.warning("WORKERS > 1 without EVENT_BUS_URL: agents on other workers will not receive events")
+    manager.bus_handlers["memory:invalidate"] = lambda envelope: memory_cache.discard(envelope["key"])
+    memory_cache.on_invalidated = publish_memory_invalidation
+    await manager.start()
+    manager.presence.start()
+    if settings.MESSAGE_WRITE_BEHIND:
+        message_writer.start()
+    lease_reaper.on_requeued = announce_requeued_tasks
+    lease_reaper.start()
+    await dispatcher.start()
+    scheduler.on_fired = announce_scheduled_tasks
+    await scheduler.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Agent Communication Channel...")
+    await scheduler.stop()
+    await dispatcher.stop()
+    await lease_reaper.stop()
+    await manager.close_all()
+    await manager.presence.stop()
+    # Commit messages still queued by the write-behind writer
+    await message_writer.stop()
 
 
 # Create FastAPI app
@@ -51,6 +122,7 @@ app.include_router(agents_router)
 app.include_router(messages_router)
 app.include_router(tasks_router)
 app.include_router(memory_router)
+app.include_router(schedules_router)
 
 
 @app.get("/")
@@ -78,18 +150,24 @@ async def health_check():
 @app.websocket("/ws/{agent_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
-    agent_id: str
+    agent_id: str,
+    encoding: Optional[str] = Query(None, description="Outbound frame encoding: json (default) or msgpack")
 ):
     """WebSocket endpoint for agent communication"""
-    await handle_agent_websocket(websocket, agent_id)
+    await handle_agent_websocket(websocket, agent_id, encoding)
 
 
 if __name__ == "__main__":
     import uvicorn
+    # uvicorn ignores workers when reloading, so several workers win over reload
+    reload = settings.DEBUG and settings.WORKERS == 1
+    if settings.DEBUG and not reload:
+        logger.warning("DEBUG with WORKERS > 1: auto-reload is disabled")
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG,
+        reload=reload,
+        workers=settings.WORKERS,
         log_level="info" if settings.DEBUG else "warning"
     )
\ No newline at end of file
@@ -2,12 +2,17 @@ from app.models.agent import Agent
 from app.models.message import Message
 from app.models.task import Task
 from app.models.task_assignment import TaskAssignment
+from app.models.task_dependency import TaskDependency
+from app.models.task_schedule import TaskSchedule
 from app.models.memory import SharedMemory
+from app.models import search  # noqa: F401  (full-text index DDL)
 
 __all__ = [
     "Agent",
     "Message",
     "Task",
     "TaskAssignment",
+    "TaskDependency",
+    "TaskSchedule",
     "SharedMemory"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -15,6 +15,7 @@ class SharedMemory(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     access_control = Column(JSON, default={})  # e.g., {"read": ["agent1"], "write": ["agent1"]}
+    version = Column(Integer, nullable=False, default=1)  # incremented on every update
     
     # Relationships
     creator = relationship("Agent", back_populates="memory_accesses")
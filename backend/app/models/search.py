@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, event
+from app.core.database import Base
+
+# Full-text indexes live next to the tables they cover. On SQLite they are
+# FTS5 tables kept in sync by SearchService; on PostgreSQL they are GIN
+# expression indexes, which the database maintains itself.
+MESSAGES_FTS = "messages_fts"
+MEMORY_FTS = "shared_memory_fts"
+TEXT_SEARCH_CONFIG = "english"
+
+_SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {MESSAGES_FTS} "
+    f"USING fts5(content, message_id UNINDEXED, tokenize='unicode61')",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {MEMORY_FTS} "
+    f"USING fts5(key, value, memory_id UNINDEXED, tokenize='unicode61')",
+]
+_SQLITE_DROP = [
+    f"DROP TABLE IF EXISTS {MESSAGES_FTS}",
+    f"DROP TABLE IF EXISTS {MEMORY_FTS}",
+]
+_POSTGRES_CREATE = [
+    f"CREATE INDEX IF NOT EXISTS ix_messages_content_fts ON messages "
+    f"USING GIN (to_tsvector('{TEXT_SEARCH_CONFIG}', content))",
+    f"CREATE INDEX IF NOT EXISTS ix_shared_memory_value_fts ON shared_memory "
+    f"USING GIN (to_tsvector('{TEXT_SEARCH_CONFIG}', key || ' ' || value::text))",
+]
+
+for statement in _SQLITE_CREATE:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _SQLITE_DROP:
+    event.listen(Base.metadata, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _POSTGRES_CREATE:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -7,17 +7,27 @@ from app.core.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Work-queue order: runnable tasks by priority, then age
+        Index("ix_tasks_status_priority_created_at", "status", "priority", "created_at"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     creator_id = Column(String, ForeignKey("agents.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    status = Column(String, default="pending")  # pending, assigned, in_progress, completed, failed
+    status = Column(String, default="pending")  # pending, scheduled, blocked, assigned, in_progress, completed, failed
     priority = Column(Integer, default=1)  # 1=low, 2=medium, 3=high, 4=urgent
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     due_date = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     requirements = Column(JSON, default={})
+    # Delayed tasks (and retries backing off) wait in "scheduled" until run_at
+    run_at = Column(DateTime, nullable=True, index=True)
+    schedule_id = Column(String, nullable=True, index=True)  # recurring schedule that created the task
+    # Lease held by the agent working on an in_progress task; expired leases are requeued
+    claimed_by = Column(String, nullable=True, index=True)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
     
     # Relationships
     creator = relationship("Agent", back_populates="created_tasks")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+
+class TaskDependency(Base):
+    """Edge of the task DAG: ``task_id`` cannot start before ``depends_on_id`` completes"""
+    __tablename__ = "task_dependencies"
+    
+    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TaskDependency(task_id={self.task_id}, depends_on_id={self.depends_on_id})>"
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Boolean
+from datetime import datetime
+import uuid
+from app.core.database import Base
+
+
+class TaskSchedule(Base):
+    """Recurring task template, fired by the backend scheduler"""
+    __tablename__ = "task_schedules"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, nullable=False, unique=True, index=True)
+    creator_id = Column(String, ForeignKey("agents.id"), nullable=False, index=True)
+    template = Column(JSON, nullable=False)  # title, description, priority, requirements of each task
+    cron = Column(String, nullable=True)  # five-field cron expression (UTC), or
+    interval_seconds = Column(Integer, nullable=True)  # fixed interval
+    catch_up = Column(String, default="latest")  # latest, all, skip: runs missed while the backend was down
+    enabled = Column(Boolean, default=True)
+    end_at = Column(DateTime, nullable=True)
+    next_run_at = Column(DateTime, nullable=True, index=True)
+    last_run_at = Column(DateTime, nullable=True)
+    run_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TaskSchedule(id={self.id}, name={self.name}, next_run_at={self.next_run_at})>"
@@ -1,7 +1,8 @@
 from app.schemas.agent import AgentCreate, AgentUpdate, AgentResponse, AgentStatusUpdate
-from app.schemas.message import MessageCreate, MessageResponse
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskAssignmentCreate, TaskAssignmentResponse, TaskComplete
-from app.schemas.memory import MemoryCreate, MemoryUpdate, MemoryResponse
+from app.schemas.message import MessageCreate, MessageResponse, MessagePage, MessageSearchHit
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskAssignmentCreate, TaskAssignmentResponse, TaskComplete, TaskClaim
+from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse
+from app.schemas.memory import MemoryCreate, MemoryUpdate, MemoryResponse, MemorySearchHit
 
 __all__ = [
     "AgentCreate",
@@ -10,13 +11,20 @@ __all__ = [
     "AgentStatusUpdate",
     "MessageCreate",
     "MessageResponse",
+    "MessagePage",
+    "MessageSearchHit",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
     "TaskAssignmentCreate",
     "TaskAssignmentResponse",
     "TaskComplete",
+    "TaskClaim",
+    "ScheduleCreate",
+    "ScheduleUpdate",
+    "ScheduleResponse",
     "MemoryCreate",
     "MemoryUpdate",
-    "MemoryResponse"
+    "MemoryResponse",
+    "MemorySearchHit"
 ]
\ No newline at end of file
@@ -23,6 +23,12 @@ class MemoryResponse(MemoryBase):
     created_by: str
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class MemorySearchHit(MemoryResponse):
+    score: float  # higher is a better match
+    snippet: Optional[str] = None  # matching text with <mark>…</mark> around the hits
@@ -21,4 +21,14 @@ class MessageResponse(MessageBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class MessagePage(BaseModel):
+    items: List[MessageResponse]
+    next_cursor: Optional[str] = None  # pass as ?cursor= to get the next page; None on the last page
+
+
+class MessageSearchHit(MessageResponse):
+    score: float  # higher is a better match
+    snippet: Optional[str] = None  # matching text with <mark>…</mark> around the hits
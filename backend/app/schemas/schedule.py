@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+
+class TaskTemplate(BaseModel):
+    """Task created each time a schedule fires"""
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    priority: int = Field(default=1, ge=1, le=4)
+    requirements: Optional[Dict[str, Any]] = {}
+    due_in_seconds: Optional[int] = Field(None, ge=1)  # due date relative to the run
+
+
+class ScheduleBase(BaseModel):
+    template: TaskTemplate
+    cron: Optional[str] = None  # "minute hour day month weekday", UTC
+    interval_seconds: Optional[int] = Field(None, ge=1)
+    catch_up: str = Field(default="latest", pattern="^(latest|all|skip)$")
+    end_at: Optional[datetime] = None
+
+
+class ScheduleCreate(ScheduleBase):
+    name: str = Field(..., min_length=1, max_length=200)
+    creator_id: str
+    start_at: Optional[datetime] = None  # first run; defaults to the first occurrence after now
+    enabled: bool = True
+
+
+class ScheduleUpdate(BaseModel):
+    template: Optional[TaskTemplate] = None
+    cron: Optional[str] = None
+    interval_seconds: Optional[int] = Field(None, ge=1)
+    catch_up: Optional[str] = Field(None, pattern="^(latest|all|skip)$")
+    end_at: Optional[datetime] = None
+    start_at: Optional[datetime] = None
+    enabled: Optional[bool] = None
+
+
+class ScheduleResponse(ScheduleBase):
+    id: str
+    name: str
+    creator_id: str
+    enabled: bool
+    next_run_at: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    run_count: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -13,14 +13,17 @@ class TaskBase(BaseModel):
 
 class TaskCreate(TaskBase):
     creator_id: str
+    depends_on: Optional[List[str]] = None  # task ids that must complete before this one can start
+    run_at: Optional[datetime] = None  # UTC; the task waits as "scheduled" until then
 
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
-    status: Optional[str] = Field(None, pattern="^(pending|assigned|in_progress|completed|failed)$")
+    status: Optional[str] = Field(None, pattern="^(pending|scheduled|blocked|assigned|in_progress|completed|failed)$")
     priority: Optional[int] = Field(None, ge=1, le=4)
     due_date: Optional[datetime] = None
+    run_at: Optional[datetime] = None
     requirements: Optional[Dict[str, Any]] = None
 
 
@@ -30,6 +33,10 @@ class TaskResponse(TaskBase):
     status: str
     created_at: datetime
     completed_at: Optional[datetime] = None
+    run_at: Optional[datetime] = None
+    schedule_id: Optional[str] = None
+    claimed_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -53,4 +60,86 @@ class TaskAssignmentResponse(BaseModel):
 
 class TaskComplete(BaseModel):
     result: Optional[Dict[str, Any]] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+
+class TaskClaim(BaseModel):
+    capabilities: Optional[List[str]] = None  # only claim tasks whose required skills are all listed
+    lease_seconds: Optional[int] = Field(None, ge=1, le=86400)
+
+
+
+class TaskDependencyCreate(BaseModel):
+    depends_on: List[str] = Field(..., min_length=1)
+
+
+class TaskGraphNode(BaseModel):
+    id: str
+    title: str
+    status: str
+    priority: int
+    depends_on: List[str]
+    remaining_depth: int  # unfinished tasks on the longest chain ending here
+
+
+class TaskGraph(BaseModel):
+    task_id: str
+    remaining_depth: int
+    critical_path: List[str]  # task ids, first step first
+    tasks: List[TaskGraphNode]  # topological order
+
+
+class TaskBulkCreate(BaseModel):
+    # depends_on may name earlier items of the same request as "#<index>"
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkAssignment(BaseModel):
+    task_id: str
+    agent_id: str
+
+
+class TaskBulkAssign(BaseModel):
+    assignments: List[TaskBulkAssignment] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    task_id: str
+
+
+class TaskBulkUpdate(BaseModel):
+    updates: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkResult(BaseModel):
+    index: int
+    ok: bool
+    task_id: Optional[str] = None
+    status: Optional[str] = None  # task status after the batch
+    assignment_id: Optional[str] = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_outcome(cls, outcome: Dict[str, Any]) -> "TaskBulkResult":
+        """Build from a ``TaskService.apply_batch`` result"""
+        task, assignment = outcome["task"], outcome["assignment"]
+        return cls(
+            index=outcome["index"],
+            ok=outcome["ok"],
+            task_id=task.id if task else None,
+            status=task.status if task else None,
+            assignment_id=assignment.id if assignment else None,
+            error=outcome["error"]
+        )
+
+
+class TaskBulkResponse(BaseModel):
+    results: List[TaskBulkResult]
+    succeeded: int
+    failed: int
+    
+    @classmethod
+    def from_outcomes(cls, outcomes: List[Dict[str, Any]]) -> "TaskBulkResponse":
+        results = [TaskBulkResult.from_outcome(outcome) for outcome in outcomes]
+        succeeded = sum(1 for result in results if result.ok)
+        return cls(results=results, succeeded=succeeded, failed=len(results) - succeeded)
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import List, Optional
+from sqlalchemy import or_, select, update
+from typing import Iterable, List, Optional
 from datetime import datetime
 from app.models.agent import Agent
 from app.schemas.agent import AgentCreate, AgentUpdate
@@ -87,11 +87,12 @@ class AgentService:
         await self.db.commit()
         return True
     
-    async def get_online_agents(self) -> List[Agent]:
-        """Get all online agents"""
-        result = await self.db.execute(
-            select(Agent).where(Agent.status == "online")
-        )
+    async def get_online_agents(self, include_ids: Optional[Iterable[str]] = None) -> List[Agent]:
+        """Get all online agents, plus the given agents whatever their stored status"""
+        condition = Agent.status == "online"
+        if include_ids:
+            condition = or_(condition, Agent.id.in_(list(include_ids)))
+        result = await self.db.execute(select(Agent).where(condition))
         return result.scalars().all()
     
     async def get_agents_by_type(self, agent_type: str) -> List[Agent]:
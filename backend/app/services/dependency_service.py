@@ -0,0 +1,291 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, exists, or_
+from typing import Dict, Iterable, List, Optional, Set
+from app.models.task import Task
+from app.models.task_assignment import TaskAssignment
+from app.models.task_dependency import TaskDependency
+import heapq
+
+# Statuses a task may be in when dependencies are added to it
+NOT_STARTED = ("pending", "scheduled", "assigned", "blocked")
+
+
+class DependencyService:
+    """Dependency DAG between tasks
+
+    An edge means a task cannot start before another one completes. Tasks
+    with unfinished dependencies are ``blocked``, which keeps them out of the
+    pending pool that agents claim from. Instead of re-checking every blocked
+    task, completing a task only looks at its direct dependents and releases
+    those whose last dependency it was; failing a task for good fails
+    everything downstream of it. Cycles are rejected when an edge is added,
+    so the graph stays acyclic.
+
+    Methods change tasks without committing; ``TaskService`` commits and then
+    tells the dispatcher about released tasks.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_dependencies(self, task_id: str) -> List[Task]:
+        """Tasks this task waits for"""
+        result = await self.db.execute(
+            select(Task)
+            .join(TaskDependency, TaskDependency.depends_on_id == Task.id)
+            .where(TaskDependency.task_id == task_id)
+            .order_by(Task.created_at.asc())
+        )
+        return result.scalars().all()
+
+    async def get_dependents(self, task_id: str) -> List[Task]:
+        """Tasks waiting for this task"""
+        result = await self.db.execute(
+            select(Task)
+            .join(TaskDependency, TaskDependency.task_id == Task.id)
+            .where(TaskDependency.depends_on_id == task_id)
+            .order_by(Task.created_at.asc())
+        )
+        return result.scalars().all()
+
+    async def add_dependencies(self, task: Task, depends_on: Iterable[str]) -> List[str]:
+        """Make ``task`` wait for other tasks; returns the dependency ids that were new
+
+        Raises ValueError if a task is missing, the task already started, or
+        an edge would close a cycle. The task becomes ``blocked`` if any of
+        its dependencies has not completed yet.
+        """
+        depends_on = list(dict.fromkeys(depends_on))
+        if not depends_on:
+            return []
+        if task.status not in NOT_STARTED:
+            raise ValueError(f"Task {task.id} is already {task.status}")
+        if task.id in depends_on:
+            raise ValueError(f"Task {task.id} cannot depend on itself")
+
+        # Tasks added earlier in this transaction count too
+        await self.db.flush()
+        found = await self.db.execute(select(Task.id).where(Task.id.in_(depends_on)))
+        missing = set(depends_on) - set(found.scalars().all())
+        if missing:
+            raise ValueError(f"Task {sorted(missing)[0]} not found")
+
+        existing = await self.db.execute(
+            select(TaskDependency.depends_on_id).where(TaskDependency.task_id == task.id)
+        )
+        existing_ids = set(existing.scalars().all())
+        new = [dep for dep in depends_on if dep not in existing_ids]
+        cycle = await self._find_path(new, task.id)
+        if cycle:
+            raise ValueError(f"Dependency would create a cycle: {' -> '.join([task.id] + cycle)}")
+
+        # A new task is inserted together with its edges
+        self.db.add(task)
+        self.db.add_all([TaskDependency(task_id=task.id, depends_on_id=dep) for dep in new])
+        await self.db.flush()
+        # A scheduled task checks its dependencies when its run_at comes
+        if task.status != "scheduled" and await self.has_unfinished_dependencies(task.id):
+            task.status = "blocked"
+        return new
+
+    async def remove_dependency(self, task_id: str, depends_on_id: str) -> Optional[List[Task]]:
+        """Drop an edge; returns the tasks released by it, or None if there was no such edge"""
+        result = await self.db.execute(
+            delete(TaskDependency)
+            .where(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == depends_on_id)
+        )
+        if not result.rowcount:
+            return None
+        return await self._release([task_id])
+
+    async def release_dependents(self, task_id: str) -> List[Task]:
+        """After ``task_id`` completed, unblock dependents with nothing else left to wait for"""
+        await self.db.flush()
+        dependents = await self.db.execute(
+            select(TaskDependency.task_id).where(TaskDependency.depends_on_id == task_id)
+        )
+        return await self._release(dependents.scalars().all())
+
+    async def fail_dependents(self, task_id: str) -> List[Task]:
+        """After ``task_id`` failed for good, fail every task downstream of it
+
+        Those tasks can never run, so they are failed with the root cause
+        recorded instead of staying blocked forever.
+        """
+        failed: List[Task] = []
+        frontier, seen = {task_id}, {task_id}
+        cause = task_id
+        while frontier:
+            result = await self.db.execute(
+                select(Task)
+                .join(TaskDependency, TaskDependency.task_id == Task.id)
+                .where(TaskDependency.depends_on_id.in_(frontier), Task.status.in_(NOT_STARTED))
+            )
+            frontier = set()
+            for task in result.scalars().unique().all():
+                if task.id in seen:
+                    continue
+                seen.add(task.id)
+                frontier.add(task.id)
+                task.status = "failed"
+                task.requirements = {**(task.requirements or {}), "last_error": f"Dependency {cause} failed"}
+                failed.append(task)
+        return failed
+
+    async def detach(self, task_id: str) -> List[Task]:
+        """Remove a task from the graph before it is deleted; returns dependents it released"""
+        dependents = await self.db.execute(
+            select(TaskDependency.task_id).where(TaskDependency.depends_on_id == task_id)
+        )
+        dependent_ids = dependents.scalars().all()
+        await self.db.execute(
+            delete(TaskDependency)
+            .where(or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == task_id))
+        )
+        return await self._release(dependent_ids)
+
+    async def graph(self, task_id: str) -> Optional[dict]:
+        """The tasks ``task_id`` transitively depends on, with its critical path
+
+        Each node's ``remaining_depth`` counts the unfinished tasks on the
+        longest dependency chain ending at (and including) it, so the root's
+        depth is the least number of sequential steps left before it is done.
+        The critical path is that chain, first step first. Nodes are listed in
+        topological order, most urgent first among tasks that are ready
+        together.
+        """
+        root = await self.db.get(Task, task_id)
+        if root is None:
+            return None
+
+        # Upstream closure, one query per level
+        edges: Dict[str, List[str]] = {task_id: []}
+        frontier = {task_id}
+        while frontier:
+            result = await self.db.execute(
+                select(TaskDependency.task_id, TaskDependency.depends_on_id)
+                .where(TaskDependency.task_id.in_(frontier))
+            )
+            frontier = set()
+            for dependent, dependency in result.all():
+                edges[dependent].append(dependency)
+                if dependency not in edges:
+                    edges[dependency] = []
+                    frontier.add(dependency)
+        tasks = await self.db.execute(select(Task).where(Task.id.in_(list(edges))))
+        nodes = {task.id: task for task in tasks.scalars().all()}
+
+        order = self._topological_order(nodes, edges)
+        depth: Dict[str, int] = {}
+        for node_id in order:
+            deepest = max((depth[dep] for dep in edges[node_id]), default=0)
+            depth[node_id] = deepest + (0 if nodes[node_id].status == "completed" else 1)
+
+        critical_path = []
+        node_id = task_id
+        while node_id is not None and depth[node_id] > 0:
+            critical_path.append(node_id)
+            node_id = max(edges[node_id], key=lambda dep: (depth[dep], -order.index(dep)), default=None)
+        critical_path.reverse()
+
+        return {
+            "task_id": task_id,
+            "remaining_depth": depth[task_id],
+            "critical_path": critical_path,
+            "tasks": [
+                {
+                    "id": node_id,
+                    "title": nodes[node_id].title,
+                    "status": nodes[node_id].status,
+                    "priority": nodes[node_id].priority,
+                    "depends_on": edges[node_id],
+                    "remaining_depth": depth[node_id],
+                }
+                for node_id in order
+            ],
+        }
+
+    @staticmethod
+    def _topological_order(nodes: Dict[str, Task], edges: Dict[str, List[str]]) -> List[str]:
+        """Kahn's algorithm over ``edges`` (task -> dependencies), urgent and old tasks first"""
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+        waiting = {node_id: len(edges[node_id]) for node_id in nodes}
+        for node_id, dependencies in edges.items():
+            for dep in dependencies:
+                dependents[dep].append(node_id)
+
+        def key(node_id: str):
+            task = nodes[node_id]
+            return (-(task.priority or 1), task.created_at, node_id)
+
+        ready = [key(node_id) for node_id, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            node_id = heapq.heappop(ready)[2]
+            order.append(node_id)
+            for dependent in dependents[node_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, key(dependent))
+        return order
+
+    async def _find_path(self, starts: List[str], target: str) -> Optional[List[str]]:
+        """Dependency chain from one of ``starts`` to ``target``, or None; one query per level"""
+        parents: Dict[str, Optional[str]] = {start: None for start in starts}
+        frontier: Set[str] = set(starts)
+        while frontier:
+            if target in frontier:
+                path, node = [], target
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            result = await self.db.execute(
+                select(TaskDependency.task_id, TaskDependency.depends_on_id)
+                .where(TaskDependency.task_id.in_(frontier))
+            )
+            frontier = set()
+            for node, dependency in result.all():
+                if dependency not in parents:
+                    parents[dependency] = node
+                    frontier.add(dependency)
+        return None
+
+    async def has_unfinished_dependencies(self, task_id: str) -> bool:
+        """Whether any task this one waits for has not completed"""
+        result = await self.db.execute(
+            select(
+                exists()
+                .where(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == Task.id)
+                .where(Task.status != "completed")
+            )
+        )
+        return bool(result.scalar())
+
+    async def _release(self, task_ids: Iterable[str]) -> List[Task]:
+        """Unblock the given blocked tasks whose dependencies have all completed
+
+        A released task returns to ``assigned`` if an agent was assigned to
+        it while it was blocked, otherwise to ``pending``.
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        await self.db.flush()
+        dependency = Task.__table__.alias("dependency")
+        waiting = exists().where(
+            TaskDependency.task_id == Task.id,
+            TaskDependency.depends_on_id == dependency.c.id,
+            dependency.c.status != "completed"
+        )
+        assigned = exists().where(TaskAssignment.task_id == Task.id, TaskAssignment.status == "assigned")
+        result = await self.db.execute(
+            select(Task, assigned)
+            .where(Task.id.in_(task_ids), Task.status == "blocked", ~waiting)
+        )
+        released = []
+        for task, is_assigned in result.all():
+            task.status = "assigned" if is_assigned else "pending"
+            released.append(task)
+        return released
@@ -0,0 +1,66 @@
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.task import Task
+from app.services.task_service import TaskService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseReaper:
+    """Background sweep that requeues tasks whose lease expired
+
+    A worker that crashes mid-task stops heartbeating, its lease runs out and
+    the task goes back to ``pending`` (or ``failed`` once its retries are
+    used up) for another agent to claim. ``on_requeued`` is called with the
+    tasks changed by each sweep.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        interval: Optional[float] = None,
+        on_requeued: Optional[Callable[[List[Task]], Awaitable[None]]] = None
+    ):
+        self.session_factory = session_factory
+        self.interval = interval or settings.TASK_REAPER_INTERVAL
+        self.on_requeued = on_requeued
+        self._reaper: Optional[asyncio.Task] = None
+        self.requeued_count = 0
+
+    async def reap(self) -> List[Task]:
+        """Requeue expired leases once; returns the tasks changed"""
+        async with self.session_factory() as db:
+            tasks = await TaskService(db).requeue_expired_leases()
+        if tasks:
+            self.requeued_count += len(tasks)
+            logger.warning(f"Requeued {len(tasks)} task(s) with expired leases")
+            if self.on_requeued is not None:
+                await self.on_requeued(tasks)
+        return tasks
+
+    def start(self):
+        """Start sweeping in the background"""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"Error requeueing expired task leases: {e}")
+
+
+# Global reaper, started by the application lifespan
+lease_reaper = LeaseReaper()
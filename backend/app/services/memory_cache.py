@@ -0,0 +1,98 @@
+from typing import Awaitable, Callable, Dict, Optional
+from collections import OrderedDict
+from app.core.config import settings
+from app.models.memory import SharedMemory
+
+
+def memory_etag(memory: SharedMemory) -> str:
+    """Strong ETag of a memory entry; the id changes if the key is deleted and set again"""
+    return f'"{memory.id}-{memory.version}"'
+
+
+def snapshot(memory: SharedMemory) -> SharedMemory:
+    """Copy of a row that belongs to no session, safe to share between requests"""
+    return SharedMemory(**{column.key: getattr(memory, column.key) for column in SharedMemory.__table__.columns})
+
+
+class MemoryCache:
+    """Read-through LRU cache of SharedMemory rows by key
+
+    Entries are snapshots owned by the cache, so callers must treat them as
+    read-only. Writers invalidate a key after they commit. A reader that
+    loaded a row before such a write cannot put the stale row back: readers
+    take a ``generation`` before going to the database, and ``put`` refuses
+    rows read before the key's latest invalidation. Invalidations are only
+    remembered for as many keys as the cache holds; rows read before a
+    forgotten one are refused too.
+
+    Each worker has its own cache; ``on_invalidated`` lets the application
+    tell the other workers about invalidations.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = settings.MEMORY_CACHE_SIZE if max_size is None else max_size
+        self._entries: "OrderedDict[str, SharedMemory]" = OrderedDict()
+        # Generation of the latest invalidation of each recently invalidated key
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._generation = 0
+        # Rows read before this generation are refused
+        self._floor = 0
+        self.on_invalidated: Optional[Callable[[str], Awaitable[None]]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[SharedMemory]:
+        memory = self._entries.get(key)
+        if memory is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return memory
+
+    def generation(self) -> int:
+        """Token to take before reading from the database and hand to ``put``"""
+        return self._generation
+
+    def put(self, memory: SharedMemory, generation: int) -> SharedMemory:
+        """Cache a row read under ``generation``; returns the cached snapshot, or the row if it is refused"""
+        if self.max_size <= 0 or generation < self._floor or self._invalidated.get(memory.key, 0) > generation:
+            return memory
+        cached = snapshot(memory)
+        self._entries[memory.key] = cached
+        self._entries.move_to_end(memory.key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return cached
+
+    def discard(self, key: str):
+        """Drop ``key`` from this worker's cache"""
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > max(self.max_size, 1):
+            _, self._floor = self._invalidated.popitem(last=False)
+
+    async def invalidate(self, key: str):
+        """Drop ``key`` after a write, here and (through ``on_invalidated``) on other workers"""
+        self.discard(key)
+        if self.on_invalidated is not None:
+            await self.on_invalidated(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._invalidated.clear()
+        self._generation += 1
+        self._floor = self._generation
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+# Global cache shared by REST and WebSocket reads
+memory_cache = MemoryCache()
@@ -1,18 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.memory import SharedMemory
 from app.schemas.memory import MemoryCreate, MemoryUpdate
+from app.services.memory_cache import memory_cache
+from app.services.search_service import SearchService
 
 
 class MemoryService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.search = SearchService(db)
     
     async def create_memory(self, memory_data: MemoryCreate) -> SharedMemory:
         """Create a new shared memory entry"""
         db_memory = SharedMemory(**memory_data.model_dump())
         self.db.add(db_memory)
+        await self.db.flush()
+        await self.search.index_memory(db_memory)
         await self.db.commit()
         await self.db.refresh(db_memory)
         return db_memory
@@ -27,6 +32,17 @@ class MemoryService:
         result = await self.db.execute(select(SharedMemory).where(SharedMemory.key == key))
         return result.scalar_one_or_none()
     
+    async def read_memory_by_key(self, key: str) -> Optional[SharedMemory]:
+        """Get memory by key through the read-through cache; the result is read-only"""
+        cached = memory_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = memory_cache.generation()
+        memory = await self.get_memory_by_key(key)
+        if memory is None:
+            return None
+        return memory_cache.put(memory, generation)
+    
     async def list_memories(
         self,
         skip: int = 0,
@@ -44,6 +60,16 @@ class MemoryService:
         result = await self.db.execute(query)
         return result.scalars().all()
     
+    async def search_memory(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        created_by: Optional[str] = None
+    ) -> List[Tuple[SharedMemory, float, Optional[str]]]:
+        """Full-text search over memory keys and values, as (memory, score, snippet) best first"""
+        return await self.search.search_memory(query, skip=skip, limit=limit, created_by=created_by)
+    
     async def update_memory(self, memory_id: str, memory_data: MemoryUpdate) -> Optional[SharedMemory]:
         """Update memory"""
         memory = await self.get_memory(memory_id)
@@ -53,9 +79,13 @@ class MemoryService:
         update_data = memory_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(memory, field, value)
+        # Incremented in SQL, so concurrent writers never produce the same version
+        memory.version = SharedMemory.version + 1
+        await self.search.index_memory(memory)
         
         await self.db.commit()
         await self.db.refresh(memory)
+        await memory_cache.invalidate(memory.key)
         return memory
     
     async def delete_memory(self, memory_id: str) -> bool:
@@ -64,8 +94,10 @@ class MemoryService:
         if not memory:
             return False
         
+        await self.search.remove_memory(memory.id)
         await self.db.delete(memory)
         await self.db.commit()
+        await memory_cache.invalidate(memory.key)
         return True
     
     async def check_access(self, memory: SharedMemory, agent_id: str, access_type: str = "read") -> bool:
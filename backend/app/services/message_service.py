@@ -1,40 +1,74 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from typing import List, Optional
+from sqlalchemy import select, and_, or_
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor, parse_cursor_datetime
 from app.models.message import Message
 from app.schemas.message import MessageCreate
+from app.services.message_writer import MessageWriter, message_writer
+from app.services.search_service import SearchService
+import uuid
 
 
 class MessageService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, writer: Optional[MessageWriter] = None):
         self.db = db
+        self.search = SearchService(db)
+        # With a writer, messages are stored by its group commits instead of here
+        if writer is None and settings.MESSAGE_WRITE_BEHIND:
+            writer = message_writer
+        self.writer = writer
     
     async def create_message(self, message_data: MessageCreate) -> Message:
-        """Create a new message"""
+        """Create a new message
+
+        With write-behind enabled the message gets its id and timestamp here
+        and is queued for the next group commit, so it can be delivered right
+        away; call ``wait_persisted`` where the caller needs it stored.
+        """
         db_message = Message(**message_data.model_dump(exclude={"recipients"}))
+        if self.writer is not None:
+            db_message.id = str(uuid.uuid4())
+            db_message.created_at = datetime.utcnow()
+            if db_message.meta_data is None:
+                db_message.meta_data = {}
+            self.writer.submit(db_message)
+            return db_message
+
         self.db.add(db_message)
+        await self.db.flush()
+        await self.search.index_message(db_message)
         await self.db.commit()
         await self.db.refresh(db_message)
         return db_message
     
+    async def wait_persisted(self, message: Message):
+        """Wait for a write-behind message's group commit, if durability requires it"""
+        if self.writer is not None:
+            await self.writer.wait_persisted(message.id)
+    
+    async def _sync_pending(self):
+        """Flush queued write-behind messages so reads see them"""
+        if self.writer is not None and self.writer.pending_count():
+            await self.writer.flush()
+    
     async def get_message(self, message_id: str) -> Optional[Message]:
         """Get message by ID"""
+        if self.writer is not None:
+            pending = self.writer.get_pending(message_id)
+            if pending is not None:
+                return pending
         result = await self.db.execute(select(Message).where(Message.id == message_id))
         return result.scalar_one_or_none()
     
-    async def list_messages(
-        self,
-        skip: int = 0,
-        limit: int = 100,
+    @staticmethod
+    def _conditions(
         sender_id: Optional[str] = None,
         task_id: Optional[str] = None,
         message_type: Optional[str] = None,
         since: Optional[datetime] = None
-    ) -> List[Message]:
-        """List messages with optional filters"""
-        query = select(Message)
-        
+    ) -> list:
         conditions = []
         if sender_id:
             conditions.append(Message.sender_id == sender_id)
@@ -44,7 +78,22 @@ class MessageService:
             conditions.append(Message.message_type == message_type)
         if since:
             conditions.append(Message.created_at >= since)
+        return conditions
+    
+    async def list_messages(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        sender_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> List[Message]:
+        """List messages with optional filters"""
+        await self._sync_pending()
+        query = select(Message)
         
+        conditions = self._conditions(sender_id, task_id, message_type, since)
         if conditions:
             query = query.where(and_(*conditions))
         
@@ -53,31 +102,139 @@ class MessageService:
         result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def get_messages_by_task(self, task_id: str) -> List[Message]:
-        """Get all messages for a task"""
-        result = await self.db.execute(
+    async def list_messages_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order: str = "desc",
+        sender_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> Tuple[List[Message], Optional[str]]:
+        """List one page of messages ordered by (created_at, id)
+
+        ``cursor`` is the ``next_cursor`` of the previous page. Each page seeks
+        straight to its first row through the (created_at, id) index, so deep
+        pages cost the same as the first. Raises ValueError for a bad cursor.
+        """
+        await self._sync_pending()
+        conditions = self._conditions(sender_id, task_id, message_type, since)
+        if cursor:
+            created_at, message_id = decode_cursor(cursor, 2)
+            created_at = parse_cursor_datetime(created_at)
+            if order == "asc":
+                conditions.append(or_(
+                    Message.created_at > created_at,
+                    and_(Message.created_at == created_at, Message.id > message_id)
+                ))
+            else:
+                conditions.append(or_(
+                    Message.created_at < created_at,
+                    and_(Message.created_at == created_at, Message.id < message_id)
+                ))
+        
+        query = select(Message)
+        if conditions:
+            query = query.where(and_(*conditions))
+        if order == "asc":
+            query = query.order_by(Message.created_at.asc(), Message.id.asc())
+        else:
+            query = query.order_by(Message.created_at.desc(), Message.id.desc())
+        
+        # One extra row tells whether there is a next page
+        result = await self.db.execute(query.limit(limit + 1))
+        messages = result.scalars().all()
+        if len(messages) <= limit:
+            return messages, None
+        messages = messages[:limit]
+        last = messages[-1]
+        return messages, encode_cursor(last.created_at, last.id)
+    
+    async def stream_messages(
+        self,
+        order: str = "desc",
+        batch_size: int = 500,
+        sender_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching messages as plain rows from a server-side cursor
+
+        Rows are fetched ``batch_size`` at a time, so an export never holds
+        more than one batch in memory.
+        """
+        await self._sync_pending()
+        messages = Message.__table__
+        query = select(messages)
+        conditions = self._conditions(sender_id, task_id, message_type, since)
+        if conditions:
+            query = query.where(and_(*conditions))
+        if order == "asc":
+            query = query.order_by(messages.c.created_at.asc(), messages.c.id.asc())
+        else:
+            query = query.order_by(messages.c.created_at.desc(), messages.c.id.desc())
+        
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        async for row in result.mappings():
+            yield dict(row)
+    
+    async def search_messages(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        sender_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        message_type: Optional[str] = None
+    ) -> List[Tuple[Message, float, Optional[str]]]:
+        """Full-text search over message content, as (message, score, snippet) best first"""
+        await self._sync_pending()
+        return await self.search.search_messages(
+            query,
+            skip=skip,
+            limit=limit,
+            sender_id=sender_id,
+            task_id=task_id,
+            message_type=message_type
+        )
+    
+    async def get_messages_by_task(self, task_id: str, limit: Optional[int] = None) -> List[Message]:
+        """Get messages for a task, oldest first (all of them unless ``limit`` is given)"""
+        await self._sync_pending()
+        query = (
             select(Message)
             .where(Message.task_id == task_id)
-            .order_by(Message.created_at.asc())
+            .order_by(Message.created_at.asc(), Message.id.asc())
         )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def get_recent_messages(self, hours: int = 24) -> List[Message]:
-        """Get messages from the last N hours"""
+    async def get_recent_messages(self, hours: int = 24, limit: Optional[int] = None) -> List[Message]:
+        """Get messages from the last N hours, newest first (all of them unless ``limit`` is given)"""
+        await self._sync_pending()
         since = datetime.utcnow() - timedelta(hours=hours)
-        result = await self.db.execute(
+        query = (
             select(Message)
             .where(Message.created_at >= since)
-            .order_by(Message.created_at.desc())
+            .order_by(Message.created_at.desc(), Message.id.desc())
         )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
         return result.scalars().all()
     
     async def delete_message(self, message_id: str) -> bool:
         """Delete a message"""
+        await self._sync_pending()
         message = await self.get_message(message_id)
         if not message:
             return False
         
+        await self.search.remove_message(message.id)
         await self.db.delete(message)
         await self.db.commit()
         return True
@@ -88,6 +245,7 @@ class MessageService:
         task_id: Optional[str] = None
     ) -> int:
         """Count messages with optional filters"""
+        await self._sync_pending()
         from sqlalchemy import func
         
         query = select(func.count(Message.id))
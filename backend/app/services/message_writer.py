@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.message import Message
+from app.services.search_service import SearchService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("buffered", "commit")
+
+# Columns written for each queued message
+MESSAGE_COLUMNS = ("id", "sender_id", "task_id", "content", "message_type", "created_at", "meta_data")
+
+
+class MessageWriter:
+    """Write-behind queue that persists messages in group commits
+
+    Messages arrive with their id and created_at already set, so they can be
+    delivered before they are stored. Queued messages are inserted with one
+    executemany in a single transaction every flush interval, or as soon as
+    a batch is full. With ``buffered`` durability callers never wait for the
+    database; with ``commit`` they can wait until their batch has committed
+    (see ``wait_persisted``), which still shares one commit per batch.
+
+    If a batch fails, its messages are retried one transaction each so a
+    single bad row does not lose the rest.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        flush_interval_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        durability: Optional[str] = None
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = (flush_interval_ms or settings.MESSAGE_FLUSH_INTERVAL_MS) / 1000
+        self.batch_size = batch_size or settings.MESSAGE_FLUSH_BATCH_SIZE
+        self.durability = durability or settings.MESSAGE_DURABILITY
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown message durability {self.durability!r}, expected one of {', '.join(DURABILITY_MODES)}"
+            )
+        self._pending: List[Message] = []
+        # Completed when the message is committed: {message_id: future}
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+        self._flush_now = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self.flush_count = 0
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, message: Message):
+        """Queue a message for the next group commit"""
+        self._pending.append(message)
+        if self.durability == "commit":
+            self._waiters[message.id] = asyncio.get_running_loop().create_future()
+        if len(self._pending) >= self.batch_size:
+            self._flush_now.set()
+        # Writers used outside the application lifespan start on first use
+        self.start()
+
+    async def wait_persisted(self, message_id: str):
+        """Wait until a message is committed (only tracked with ``commit`` durability)"""
+        waiter = self._waiters.get(message_id)
+        if waiter is not None:
+            await asyncio.shield(waiter)
+
+    def get_pending(self, message_id: str) -> Optional[Message]:
+        """Get a queued message that is not committed yet"""
+        for message in self._pending:
+            if message.id == message_id:
+                return message
+        return None
+
+    def pending_count(self) -> int:
+        """Number of messages waiting for a flush"""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Commit every queued message; returns the number written
+
+        Waits for a flush already in progress, so after it returns every
+        message submitted before the call is in the database (or failed).
+        """
+        async with self._lock:
+            written = 0
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                written += await self._write(batch)
+            return written
+
+    async def _write(self, batch: List[Message]) -> int:
+        rows = [{column: getattr(message, column) for column in MESSAGE_COLUMNS} for message in batch]
+        stmt = insert(Message.__table__)
+        try:
+            async with self.session_factory() as db:
+                await db.execute(stmt, rows)
+                await SearchService(db).index_messages(rows)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(rows)} messages, retrying one by one: {e}")
+            return await self._write_each(batch, rows)
+        self.flush_count += 1
+        self.written += len(rows)
+        for message in batch:
+            self._resolve(message.id)
+        return len(rows)
+
+    async def _write_each(self, batch: List[Message], rows: List[dict]) -> int:
+        written = 0
+        for message, row in zip(batch, rows):
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(insert(Message.__table__), row)
+                    await SearchService(db).index_messages([row])
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Dropping message {message.id} that could not be stored: {e}")
+                self.failed += 1
+                self._resolve(message.id, e)
+                continue
+            written += 1
+            self.written += 1
+            self._resolve(message.id)
+        return written
+
+    def _resolve(self, message_id: str, error: Optional[Exception] = None):
+        waiter = self._waiters.pop(message_id, None)
+        if waiter is None or waiter.done():
+            return
+        if error is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(error)
+
+    def start(self):
+        """Start flushing in the background"""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background flusher and write what is left"""
+        if self._flusher is not None:
+            # Never cancel in the middle of a batch: it is no longer queued
+            async with self._lock:
+                self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing messages: {e}")
+
+
+# Global writer, used by MessageService when MESSAGE_WRITE_BEHIND is enabled
+message_writer = MessageWriter()
@@ -0,0 +1,227 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.cron import CronExpression
+from app.models.task import Task
+from app.models.task_schedule import TaskSchedule
+from app.schemas.schedule import ScheduleCreate, ScheduleUpdate
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService, notify_schedule_changed, notify_task_changed
+from collections import deque
+
+
+def next_occurrence(schedule: TaskSchedule, after: datetime) -> Optional[datetime]:
+    """First run of a schedule strictly after ``after``; None once it has ended
+
+    Interval schedules stay on the grid set by their current ``next_run_at``,
+    so a late run does not shift the ones after it.
+    """
+    if schedule.cron:
+        try:
+            run = CronExpression(schedule.cron).next_after(after)
+        except ValueError:
+            return None
+    else:
+        interval = timedelta(seconds=schedule.interval_seconds)
+        run = schedule.next_run_at or after + interval
+        if run <= after:
+            run += interval * ((after - run) // interval + 1)
+    if schedule.end_at is not None and run > schedule.end_at:
+        return None
+    return run
+
+
+def missed_runs(schedule: TaskSchedule, now: datetime, limit: int) -> Tuple[List[datetime], int]:
+    """Runs due from ``next_run_at`` up to ``now``: the latest ``limit`` of them and how many there are"""
+    first = schedule.next_run_at
+    if schedule.cron:
+        cron = CronExpression(schedule.cron)
+        runs, count, run = deque(maxlen=limit), 0, first
+        while run <= now:
+            runs.append(run)
+            count += 1
+            run = cron.next_after(run)
+        return list(runs), count
+    interval = timedelta(seconds=schedule.interval_seconds)
+    count = (now - first) // interval + 1
+    return [first + interval * i for i in range(max(0, count - limit), count)], count
+
+
+class ScheduleService:
+    """Recurring task templates, stored so they survive restarts
+
+    A schedule fires on a cron expression or a fixed interval (UTC). Each
+    run inserts a task from its template and advances ``next_run_at`` in the
+    same transaction, guarded by a conditional UPDATE so schedulers on
+    several workers never fire the same run twice. Runs missed while the
+    backend was down are handled by the schedule's ``catch_up`` policy:
+    ``latest`` fires once for all of them, ``all`` fires each one (up to
+    SCHEDULE_MAX_CATCH_UP) and ``skip`` fires only a run that is no later
+    than SCHEDULE_MISFIRE_GRACE_SECONDS.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_schedule(self, schedule_data: ScheduleCreate) -> TaskSchedule:
+        """Create a schedule; raises ValueError if its timing is invalid or the name is taken"""
+        self._check_timing(schedule_data.cron, schedule_data.interval_seconds)
+        existing = await self.db.execute(select(TaskSchedule.id).where(TaskSchedule.name == schedule_data.name))
+        if existing.first() is not None:
+            raise ValueError(f"Schedule {schedule_data.name} already exists")
+
+        schedule = TaskSchedule(**schedule_data.model_dump(exclude={"start_at"}))
+        schedule.run_count = 0
+        schedule.next_run_at = schedule_data.start_at or next_occurrence(schedule, datetime.utcnow())
+        self.db.add(schedule)
+        await self.db.commit()
+        await self.db.refresh(schedule)
+        notify_schedule_changed(schedule)
+        return schedule
+
+    async def get_schedule(self, schedule_id: str) -> Optional[TaskSchedule]:
+        """Get schedule by ID"""
+        return await self.db.get(TaskSchedule, schedule_id)
+
+    async def list_schedules(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        enabled: Optional[bool] = None
+    ) -> List[TaskSchedule]:
+        """List schedules, soonest first"""
+        query = select(TaskSchedule)
+        if enabled is not None:
+            query = query.where(TaskSchedule.enabled == enabled)
+        query = query.order_by(TaskSchedule.next_run_at.asc(), TaskSchedule.name.asc()).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def update_schedule(self, schedule_id: str, schedule_data: ScheduleUpdate) -> Optional[TaskSchedule]:
+        """Update schedule; changing its timing or enabling it computes the next run again"""
+        schedule = await self.get_schedule(schedule_id)
+        if not schedule:
+            return None
+
+        update_data = schedule_data.model_dump(exclude_unset=True)
+        start_at = update_data.pop("start_at", None)
+        retime = start_at is not None or bool({"cron", "interval_seconds", "end_at"} & update_data.keys())
+        if update_data.get("cron"):
+            update_data["interval_seconds"] = None
+        elif update_data.get("interval_seconds"):
+            update_data["cron"] = None
+        self._check_timing(update_data.get("cron", schedule.cron), update_data.get("interval_seconds", schedule.interval_seconds))
+        if update_data.get("enabled") and not schedule.enabled:
+            retime = True
+        for field, value in update_data.items():
+            setattr(schedule, field, value)
+
+        if retime:
+            schedule.next_run_at = None
+            schedule.next_run_at = start_at or next_occurrence(schedule, datetime.utcnow())
+        if schedule.next_run_at is None:
+            schedule.enabled = False
+
+        await self.db.commit()
+        await self.db.refresh(schedule)
+        notify_schedule_changed(schedule)
+        return schedule
+
+    async def delete_schedule(self, schedule_id: str) -> bool:
+        """Delete schedule; tasks it already created are kept"""
+        schedule = await self.get_schedule(schedule_id)
+        if not schedule:
+            return False
+
+        await self.db.delete(schedule)
+        await self.db.commit()
+        # Detached now; tells listeners to drop its timer
+        schedule.enabled = False
+        notify_schedule_changed(schedule)
+        return True
+
+    async def fire(self, schedule_id: str, now: Optional[datetime] = None) -> List[Task]:
+        """Create the tasks of a due schedule and advance it; returns the tasks created
+
+        Returns nothing if the schedule is not due, for example because
+        another worker fired it first.
+        """
+        now = now or datetime.utcnow()
+        schedule = await self.db.get(TaskSchedule, schedule_id, populate_existing=True)
+        if schedule is None:
+            return []
+        due_at = schedule.next_run_at
+        if not schedule.enabled or due_at is None or due_at > now:
+            # Let the scheduler pick up whatever the schedule holds now
+            notify_schedule_changed(schedule)
+            return []
+
+        runs = self._runs_to_fire(schedule, now)
+        next_run_at = next_occurrence(schedule, now)
+        changed = await self.db.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id == schedule_id, TaskSchedule.next_run_at == due_at)
+            .values(
+                next_run_at=next_run_at,
+                enabled=next_run_at is not None,
+                last_run_at=now if runs else schedule.last_run_at,
+                run_count=TaskSchedule.run_count + len(runs)
+            )
+            .returning(TaskSchedule.id)
+            .execution_options(synchronize_session=False)
+        )
+        if changed.scalar_one_or_none() is None:
+            await self.db.rollback()
+            schedule = await self.db.get(TaskSchedule, schedule_id, populate_existing=True)
+            if schedule is not None:
+                notify_schedule_changed(schedule)
+            return []
+
+        tasks = []
+        task_service = TaskService(self.db)
+        for run in runs:
+            task = await task_service.add_task(self._task_data(schedule, run))
+            task.schedule_id = schedule.id
+            tasks.append(task)
+        await self.db.commit()
+
+        schedule = await self.db.get(TaskSchedule, schedule_id, populate_existing=True)
+        for task in tasks:
+            notify_task_changed(task)
+        notify_schedule_changed(schedule)
+        return tasks
+
+    @staticmethod
+    def _runs_to_fire(schedule: TaskSchedule, now: datetime) -> List[datetime]:
+        """The due runs to create tasks for, per the schedule's catch_up policy"""
+        limit = settings.SCHEDULE_MAX_CATCH_UP if schedule.catch_up == "all" else 1
+        runs, _ = missed_runs(schedule, now, limit)
+        if schedule.end_at is not None:
+            runs = [run for run in runs if run <= schedule.end_at]
+        if schedule.catch_up == "skip":
+            grace = timedelta(seconds=settings.SCHEDULE_MISFIRE_GRACE_SECONDS)
+            runs = [run for run in runs if now - run <= grace]
+        return runs
+
+    @staticmethod
+    def _task_data(schedule: TaskSchedule, run: datetime) -> TaskCreate:
+        template = schedule.template or {}
+        due_in = template.get("due_in_seconds")
+        return TaskCreate(
+            creator_id=schedule.creator_id,
+            title=template["title"],
+            description=template.get("description"),
+            priority=template.get("priority", 1),
+            requirements={**(template.get("requirements") or {}), "scheduled_for": run.isoformat()},
+            due_date=run + timedelta(seconds=due_in) if due_in else None
+        )
+
+    @staticmethod
+    def _check_timing(cron: Optional[str], interval_seconds: Optional[int]):
+        """Raise ValueError unless exactly one valid timing is given"""
+        if bool(cron) == bool(interval_seconds):
+            raise ValueError("A schedule needs exactly one of cron or interval_seconds")
+        if cron:
+            CronExpression(cron)
@@ -0,0 +1,201 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.task import Task
+from app.models.task_schedule import TaskSchedule
+from app.services.schedule_service import ScheduleService
+from app.services.task_service import TaskListener, TaskService, task_listeners
+import asyncio
+import heapq
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Heap item: (fire_at, sequence, kind, id); kind is "task" (delayed task) or "schedule"
+TimerItem = Tuple[datetime, int, str, str]
+
+# How long a timer that failed to fire waits before it is tried again
+RETRY_DELAY = timedelta(seconds=1)
+
+
+class TaskScheduler(TaskListener):
+    """Fires delayed tasks and recurring schedules on time, without polling
+
+    Timers due within the horizon sit in an in-memory heap and the loop
+    sleeps until the earliest one. The heap is loaded from the database at
+    startup and whenever the horizon runs out, and kept current in between by
+    ``TaskService`` and ``ScheduleService`` writes (see ``TaskListener``).
+    Loading picks up everything already overdue, so runs missed while the
+    backend was down fire right away, subject to each schedule's catch_up
+    policy.
+
+    The database stays the source of truth: releasing a delayed task and
+    firing a schedule are conditional updates, so several workers sharing a
+    database never fire the same timer twice. ``on_fired`` is called with
+    the tasks each pass created and released.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        horizon: Optional[float] = None,
+        on_fired: Optional[Callable[[List[Task], List[Task]], Awaitable[None]]] = None
+    ):
+        self.session_factory = session_factory
+        self.horizon = timedelta(seconds=horizon or settings.SCHEDULER_HORIZON_SECONDS)
+        self.on_fired = on_fired
+        self._heap: List[TimerItem] = []
+        # Live heap entries: {(kind, id): sequence}; other items are stale
+        self._timers: Dict[Tuple[str, str], int] = {}
+        self._sequence = itertools.count()
+        self._window_end = datetime.min
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._runner: Optional[asyncio.Task] = None
+        self.fired_count = 0
+
+    # TaskListener
+
+    def task_delayed(self, task: Task):
+        self.add("task", task.id, task.run_at)
+
+    def task_runnable(self, task: Task):
+        self.discard("task", task.id)
+
+    def task_taken(self, task_id: str):
+        self.discard("task", task_id)
+
+    def schedule_changed(self, schedule: TaskSchedule):
+        if schedule.enabled and schedule.next_run_at is not None:
+            self.add("schedule", schedule.id, schedule.next_run_at)
+        else:
+            self.discard("schedule", schedule.id)
+
+    # Timers
+
+    def add(self, kind: str, timer_id: str, fire_at: Optional[datetime]):
+        """Set (or move) a timer; timers past the horizon are loaded when the window moves on"""
+        self.discard(kind, timer_id)
+        if fire_at is None or fire_at > self._window_end:
+            return
+        sequence = next(self._sequence)
+        self._timers[(kind, timer_id)] = sequence
+        heapq.heappush(self._heap, (fire_at, sequence, kind, timer_id))
+        if self._heap[0][1] == sequence:
+            self._wake.set()
+
+    def discard(self, kind: str, timer_id: str):
+        self._timers.pop((kind, timer_id), None)
+
+    def pending_timers(self) -> List[dict]:
+        """Timers in the current window, soonest first"""
+        return [
+            {"kind": kind, "id": timer_id, "fire_at": fire_at}
+            for fire_at, sequence, kind, timer_id in sorted(self._heap)
+            if self._timers.get((kind, timer_id)) == sequence
+        ]
+
+    def _next_fire_at(self) -> Optional[datetime]:
+        while self._heap and self._timers.get((self._heap[0][2], self._heap[0][3])) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Firing
+
+    async def load(self, now: Optional[datetime] = None):
+        """Load every timer due before the end of the next window, overdue ones included"""
+        now = now or datetime.utcnow()
+        async with self._lock:
+            window_end = now + self.horizon
+            async with self.session_factory() as db:
+                tasks = await db.execute(
+                    select(Task.id, Task.run_at)
+                    .where(Task.status == "scheduled", Task.run_at <= window_end)
+                )
+                schedules = await db.execute(
+                    select(TaskSchedule.id, TaskSchedule.next_run_at)
+                    .where(TaskSchedule.enabled.is_(True), TaskSchedule.next_run_at <= window_end)
+                )
+                timers = [("task", row.id, row.run_at) for row in tasks.all()]
+                timers += [("schedule", row.id, row.next_run_at) for row in schedules.all()]
+            self._window_end = window_end
+            for kind, timer_id, fire_at in timers:
+                self.add(kind, timer_id, fire_at)
+
+    async def fire_due(self, now: Optional[datetime] = None) -> Tuple[List[Task], List[Task]]:
+        """Fire every timer that is due; returns the tasks created and the tasks released"""
+        now = now or datetime.utcnow()
+        async with self._lock:
+            due: Dict[str, List[str]] = {"task": [], "schedule": []}
+            while True:
+                fire_at = self._next_fire_at()
+                if fire_at is None or fire_at > now:
+                    break
+                _, _, kind, timer_id = heapq.heappop(self._heap)
+                self._timers.pop((kind, timer_id), None)
+                due[kind].append(timer_id)
+            if not due["task"] and not due["schedule"]:
+                return [], []
+
+            created, released = [], []
+            async with self.session_factory() as db:
+                if due["task"]:
+                    released = await TaskService(db).release_due_tasks(due["task"], now)
+                schedule_service = ScheduleService(db)
+                for schedule_id in due["schedule"]:
+                    try:
+                        created += await schedule_service.fire(schedule_id, now)
+                    except Exception as e:
+                        await db.rollback()
+                        logger.error(f"Error firing schedule {schedule_id}: {e}")
+                        # Its timer was popped above; the run is still due in the database
+                        self.add("schedule", schedule_id, max(now, datetime.utcnow()) + RETRY_DELAY)
+        self.fired_count += len(created) + len(released)
+        if (created or released) and self.on_fired is not None:
+            await self.on_fired(created, released)
+        return created, released
+
+    async def start(self):
+        """Load the timers and start firing them in the background"""
+        if self not in task_listeners:
+            task_listeners.append(self)
+        await self.load()
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self in task_listeners:
+            task_listeners.remove(self)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                if datetime.utcnow() >= self._window_end:
+                    await self.load()
+                await self.fire_due()
+            except Exception as e:
+                logger.error(f"Error firing scheduled tasks: {e}")
+                # Timers popped by a failed pass come back with the reload
+                self._window_end = datetime.min
+                delay = RETRY_DELAY.total_seconds()
+            else:
+                # Sleep until the earliest timer, or the end of the window
+                wake_at = min(filter(None, [self._next_fire_at(), self._window_end]))
+                delay = max((wake_at - datetime.utcnow()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Global scheduler, started by the application lifespan
+scheduler = TaskScheduler()
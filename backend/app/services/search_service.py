@@ -0,0 +1,225 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Text, cast, column, func, literal_column, select, table, text
+from typing import Any, Iterable, List, Optional, Tuple
+from app.models.memory import SharedMemory
+from app.models.message import Message
+from app.models.search import MEMORY_FTS, MESSAGES_FTS, TEXT_SEARCH_CONFIG
+import json
+import re
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_TOKENS = 16
+
+_messages_fts = table(MESSAGES_FTS, column("message_id"))
+_memory_fts = table(MEMORY_FTS, column("memory_id"))
+_TERM = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching all of its words
+
+    Every word is quoted so user input can never be FTS5 syntax; a trailing
+    ``*`` keeps prefix matching. Returns None if there are no words.
+    """
+    terms = []
+    for term in _TERM.findall(query):
+        prefix = term.endswith("*")
+        word = term.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms) or None
+
+
+def memory_text(value: Any) -> str:
+    """Text indexed for a shared memory value"""
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class SearchService:
+    """Ranked full-text search over message content and shared memory
+
+    On SQLite the text lives in FTS5 tables that the message and memory
+    services update in the same transaction as their own writes. On
+    PostgreSQL search runs against GIN ``tsvector`` expression indexes on the
+    tables themselves, so there is nothing to keep in sync. Other databases
+    fall back to an unranked substring match.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @property
+    def dialect(self) -> str:
+        bind = self.db.bind
+        return bind.dialect.name if bind is not None else ""
+
+    async def index_messages(self, messages: Iterable[dict]):
+        """Add messages ({"id", "content"}) to the index"""
+        if self.dialect != "sqlite":
+            return
+        rows = [{"message_id": message["id"], "content": message["content"]} for message in messages]
+        if rows:
+            await self.db.execute(
+                text(f"INSERT INTO {MESSAGES_FTS}(content, message_id) VALUES (:content, :message_id)"),
+                rows
+            )
+
+    async def index_message(self, message: Message):
+        await self.index_messages([{"id": message.id, "content": message.content}])
+
+    async def remove_message(self, message_id: str):
+        if self.dialect == "sqlite":
+            await self.db.execute(
+                text(f"DELETE FROM {MESSAGES_FTS} WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+
+    async def index_memory(self, memory: SharedMemory):
+        """Add or replace a shared memory entry in the index"""
+        if self.dialect != "sqlite":
+            return
+        await self.remove_memory(memory.id)
+        await self.db.execute(
+            text(f"INSERT INTO {MEMORY_FTS}(key, value, memory_id) VALUES (:key, :value, :memory_id)"),
+            {"key": memory.key, "value": memory_text(memory.value), "memory_id": memory.id}
+        )
+
+    async def remove_memory(self, memory_id: str):
+        if self.dialect == "sqlite":
+            await self.db.execute(
+                text(f"DELETE FROM {MEMORY_FTS} WHERE memory_id = :memory_id"),
+                {"memory_id": memory_id}
+            )
+
+    async def backfill(self) -> int:
+        """Index rows written before the index existed; returns how many were added"""
+        if self.dialect != "sqlite":
+            return 0
+        result = await self.db.execute(text(
+            f"INSERT INTO {MESSAGES_FTS}(content, message_id) "
+            f"SELECT content, id FROM messages WHERE id NOT IN (SELECT message_id FROM {MESSAGES_FTS})"
+        ))
+        added = result.rowcount or 0
+        memories = await self.db.execute(
+            select(SharedMemory).where(SharedMemory.id.not_in(select(_memory_fts.c.memory_id)))
+        )
+        for memory in memories.scalars():
+            await self.index_memory(memory)
+            added += 1
+        return added
+
+    async def search_messages(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        sender_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        message_type: Optional[str] = None
+    ) -> List[Tuple[Message, float, Optional[str]]]:
+        """Find messages matching ``query``, best first, as (message, score, snippet)"""
+        conditions = []
+        if sender_id:
+            conditions.append(Message.sender_id == sender_id)
+        if task_id:
+            conditions.append(Message.task_id == task_id)
+        if message_type:
+            conditions.append(Message.message_type == message_type)
+
+        if self.dialect == "sqlite":
+            match = fts5_query(query)
+            if match is None:
+                return []
+            fts = literal_column(MESSAGES_FTS)
+            rank = func.bm25(fts)
+            stmt = (
+                select(Message, rank, self._fts5_snippet(fts, 0))
+                .join(_messages_fts, _messages_fts.c.message_id == Message.id)
+                .where(fts.op("MATCH")(match), *conditions)
+                .order_by(rank)
+            )
+        elif self.dialect == "postgresql":
+            tsquery = func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), query)
+            vector = func.to_tsvector(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), Message.content)
+            rank = func.ts_rank(vector, tsquery)
+            stmt = (
+                select(Message, rank, self._ts_headline(Message.content, tsquery))
+                .where(vector.op("@@")(tsquery), *conditions)
+                .order_by(rank.desc())
+            )
+        else:
+            stmt = (
+                select(Message, literal_column("0"), literal_column("NULL"))
+                .where(Message.content.ilike(f"%{query}%"), *conditions)
+                .order_by(Message.created_at.desc())
+            )
+
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return [self._hit(row) for row in result.all()]
+
+    async def search_memory(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        created_by: Optional[str] = None
+    ) -> List[Tuple[SharedMemory, float, Optional[str]]]:
+        """Find shared memory whose key or value matches ``query``, as (memory, score, snippet)"""
+        conditions = []
+        if created_by:
+            conditions.append(SharedMemory.created_by == created_by)
+
+        if self.dialect == "sqlite":
+            match = fts5_query(query)
+            if match is None:
+                return []
+            fts = literal_column(MEMORY_FTS)
+            rank = func.bm25(fts)
+            stmt = (
+                select(SharedMemory, rank, self._fts5_snippet(fts, -1))
+                .join(_memory_fts, _memory_fts.c.memory_id == SharedMemory.id)
+                .where(fts.op("MATCH")(match), *conditions)
+                .order_by(rank)
+            )
+        elif self.dialect == "postgresql":
+            document = literal_column("shared_memory.key || ' ' || shared_memory.value::text")
+            tsquery = func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), query)
+            vector = func.to_tsvector(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), document)
+            rank = func.ts_rank(vector, tsquery)
+            stmt = (
+                select(SharedMemory, rank, self._ts_headline(document, tsquery))
+                .where(vector.op("@@")(tsquery), *conditions)
+                .order_by(rank.desc())
+            )
+        else:
+            document = SharedMemory.key + " " + cast(SharedMemory.value, Text)
+            stmt = (
+                select(SharedMemory, literal_column("0"), literal_column("NULL"))
+                .where(document.ilike(f"%{query}%"), *conditions)
+                .order_by(SharedMemory.updated_at.desc())
+            )
+
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return [self._hit(row) for row in result.all()]
+
+    @staticmethod
+    def _fts5_snippet(fts, column_index: int):
+        # -1 lets FTS5 pick the best matching column
+        return func.snippet(fts, column_index, HIGHLIGHT_START, HIGHLIGHT_END, "…", SNIPPET_TOKENS)
+
+    @staticmethod
+    def _ts_headline(document, tsquery):
+        return func.ts_headline(
+            literal_column(f"'{TEXT_SEARCH_CONFIG}'"),
+            document,
+            tsquery,
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_TOKENS * 2}, MinWords=5"
+        )
+
+    def _hit(self, row) -> tuple:
+        entity, rank, snippet = row
+        rank = float(rank or 0)
+        # bm25() is lower-is-better; report higher-is-better everywhere
+        score = -rank if self.dialect == "sqlite" else rank
+        return entity, score, snippet
@@ -1,23 +1,124 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy import select, and_, or_, exists, inspect, update
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from app.core.config import settings
 from app.models.task import Task
 from app.models.task_assignment import TaskAssignment
 from app.models.agent import Agent
+from app.services.dependency_service import DependencyService
 from app.schemas.task import TaskCreate, TaskUpdate, TaskAssignmentCreate
+import re
+import uuid
+
+# Retries granted to a failed (or abandoned) task before it is marked failed
+MAX_TASK_RETRIES = 3
+
+# Candidate tasks examined per query while looking for one an agent can claim
+CLAIM_SCAN_BATCH = 50
+
+# Most operations accepted in one batch
+MAX_BATCH_SIZE = 500
+
+# "#<index>" in a batch refers to the task created by that earlier item
+BATCH_REF = re.compile(r"^#(\d+)$")
+
+
+def retry_backoff(requirements: Optional[dict], attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based): doubling each time, capped"""
+    base = (requirements or {}).get("retry_backoff_seconds", settings.TASK_RETRY_BACKOFF_SECONDS)
+    if not isinstance(base, (int, float)) or base <= 0:
+        return 0.0
+    return min(base * 2 ** (attempt - 1), settings.TASK_RETRY_BACKOFF_MAX_SECONDS)
+
+
+def required_capabilities(requirements: Optional[dict]) -> set:
+    """Skills a task needs, from requirements["capabilities"] or requirements["skills"]"""
+    requirements = requirements or {}
+    required = requirements.get("capabilities") or requirements.get("skills") or []
+    return set(required) if isinstance(required, list) else set()
+
+
+class TaskListener:
+    """Observer of the open-task pool and its timers, told about changes after they commit"""
+
+    def task_runnable(self, task: Task):
+        """A task is pending and can be claimed"""
+
+    def task_taken(self, task_id: str):
+        """A task left the pending pool (claimed, assigned, finished or deleted)"""
+
+    def agent_finished(self, agent_id: str):
+        """An agent completed or failed the task it was working on"""
+
+    def task_delayed(self, task: Task):
+        """A task is scheduled to enter the pool at its run_at"""
+
+    def schedule_changed(self, schedule):
+        """A recurring schedule was created, fired, changed or deleted"""
+
+
+# Registered observers, e.g. the push dispatcher
+task_listeners: List[TaskListener] = []
+
+
+def notify_task_changed(task: Task):
+    for listener in task_listeners:
+        if task.status == "pending":
+            listener.task_runnable(task)
+        else:
+            listener.task_taken(task.id)
+            if task.status == "scheduled":
+                listener.task_delayed(task)
+
+
+def notify_task_taken(task_id: str):
+    for listener in task_listeners:
+        listener.task_taken(task_id)
+
+
+def notify_agent_finished(agent_id: str):
+    for listener in task_listeners:
+        listener.agent_finished(agent_id)
+
+
+def notify_schedule_changed(schedule):
+    for listener in task_listeners:
+        listener.schedule_changed(schedule)
 
 
 class TaskService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.dependencies = DependencyService(db)
     
     async def create_task(self, task_data: TaskCreate) -> Task:
-        """Create a new task"""
-        db_task = Task(**task_data.model_dump())
-        self.db.add(db_task)
+        """Create a new task, blocked until the tasks in ``depends_on`` complete"""
+        db_task = await self.add_task(task_data)
         await self.db.commit()
         await self.db.refresh(db_task)
+        notify_task_changed(db_task)
+        return db_task
+    
+    async def add_task(self, task_data: TaskCreate, depends_on: Optional[List[str]] = None) -> Task:
+        """Add a task and its dependency edges; the caller commits
+
+        A task with a future ``run_at`` is ``scheduled`` until then. Raises
+        ValueError before touching the session if a dependency is invalid.
+        """
+        # Id and status are needed before the insert to link dependencies
+        delayed = task_data.run_at is not None and task_data.run_at > datetime.utcnow()
+        db_task = Task(
+            id=str(uuid.uuid4()),
+            status="scheduled" if delayed else "pending",
+            **task_data.model_dump(exclude={"depends_on"})
+        )
+        depends_on = task_data.depends_on if depends_on is None else depends_on
+        if depends_on:
+            await self.dependencies.add_dependencies(db_task, depends_on)
+        else:
+            self.db.add(db_task)
         return db_task
     
     async def get_task(self, task_id: str) -> Optional[Task]:
@@ -58,17 +159,32 @@ class TaskService:
         if not task:
             return None
         
-        update_data = task_data.model_dump(exclude_unset=True)
+        changed = await self._update(task, task_data)
+        
+        await self.db.commit()
+        await self.db.refresh(task)
+        notify_task_changed(task)
+        for dependent in changed:
+            notify_task_changed(dependent)
+        return task
+    
+    async def _update(self, task: Task, task_data: TaskUpdate) -> List[Task]:
+        """Apply an update without committing; returns dependents it released or failed"""
+        previous_status = task.status
+        update_data = task_data.model_dump(exclude_unset=True, exclude={"task_id"})
         for field, value in update_data.items():
             setattr(task, field, value)
         
         # Set completed_at if status is completed
         if task.status == "completed" and not task.completed_at:
             task.completed_at = datetime.utcnow()
+        if task.status != "in_progress":
+            task.claimed_by = None
+            task.lease_expires_at = None
         
-        await self.db.commit()
-        await self.db.refresh(task)
-        return task
+        if task.status != previous_status:
+            return await self._settle_dependents(task)
+        return []
     
     async def delete_task(self, task_id: str) -> bool:
         """Delete task"""
@@ -76,47 +192,237 @@ class TaskService:
         if not task:
             return False
         
+        released = await self.dependencies.detach(task_id)
         await self.db.delete(task)
         await self.db.commit()
+        notify_task_taken(task_id)
+        for dependent in released:
+            notify_task_changed(dependent)
         return True
     
+    async def add_dependencies(self, task_id: str, depends_on: List[str]) -> List[Task]:
+        """Make a task wait for others; returns its dependencies
+
+        Raises ValueError if a task is missing, the task already started, or
+        the new edges would create a cycle.
+        """
+        task = await self.get_task(task_id)
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
+        try:
+            await self.dependencies.add_dependencies(task, depends_on)
+        except ValueError:
+            await self.db.rollback()
+            raise
+        await self.db.commit()
+        notify_task_changed(task)
+        return await self.dependencies.get_dependencies(task_id)
+    
+    async def remove_dependency(self, task_id: str, depends_on_id: str) -> bool:
+        """Stop a task waiting for another; it is released if that was its last blocker"""
+        released = await self.dependencies.remove_dependency(task_id, depends_on_id)
+        if released is None:
+            return False
+        await self.db.commit()
+        for task in released:
+            notify_task_changed(task)
+        return True
+    
+    async def _settle_dependents(self, task: Task) -> List[Task]:
+        """Release or fail the dependents of a task that just finished; the caller commits"""
+        if task.status == "completed":
+            return await self.dependencies.release_dependents(task.id)
+        if task.status == "failed":
+            return await self.dependencies.fail_dependents(task.id)
+        return []
+    
     async def assign_task(self, task_id: str, agent_id: str) -> TaskAssignment:
         """Assign task to an agent"""
+        assignment = await self._assign(task_id, agent_id)
+        await self.db.commit()
+        await self.db.refresh(assignment)
+        notify_task_taken(task_id)
+        return assignment
+    
+    async def _assign(
+        self,
+        task_id: str,
+        agent_id: str,
+        assigned: Optional[Set[Tuple[str, str]]] = None
+    ) -> TaskAssignment:
+        """Validate and add an assignment without committing
+
+        ``assigned`` holds the existing (task_id, agent_id) pairs when the
+        caller loaded them up front; tasks and agents already in the session
+        are not fetched again.
+        """
         # Check if task exists
-        task = await self.get_task(task_id)
+        task = await self.db.get(Task, task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
         
         # Check if agent exists
-        result = await self.db.execute(select(Agent).where(Agent.id == agent_id))
-        agent = result.scalar_one_or_none()
-        if not agent:
+        if await self.db.get(Agent, agent_id) is None:
             raise ValueError(f"Agent {agent_id} not found")
         
         # Check if assignment already exists
-        existing = await self.db.execute(
-            select(TaskAssignment).where(
-                and_(TaskAssignment.task_id == task_id, TaskAssignment.agent_id == agent_id)
+        if assigned is None:
+            existing = await self.db.execute(
+                select(TaskAssignment.id).where(
+                    and_(TaskAssignment.task_id == task_id, TaskAssignment.agent_id == agent_id)
+                )
             )
-        )
-        if existing.scalar_one_or_none():
+            already_assigned = existing.first() is not None
+        else:
+            already_assigned = (task_id, agent_id) in assigned
+        if already_assigned:
             raise ValueError(f"Task already assigned to agent {agent_id}")
         
         # Create assignment
         assignment = TaskAssignment(
+            id=str(uuid.uuid4()),
             task_id=task_id,
             agent_id=agent_id,
             status="assigned"
         )
         self.db.add(assignment)
+        if assigned is not None:
+            assigned.add((task_id, agent_id))
         
-        # Update task status
-        task.status = "assigned"
-        
-        await self.db.commit()
-        await self.db.refresh(assignment)
+        # Update task status; a waiting task becomes assigned once it is released
+        if task.status not in ("blocked", "scheduled"):
+            task.status = "assigned"
         return assignment
     
+    async def apply_batch(self, operations: List[Optional[Tuple[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Apply many task writes in one transaction, with a result per operation
+
+        Each operation is ``("create", TaskCreate)``, ``("assign",
+        (task_id, agent_id))`` or ``("update", (task_id, TaskUpdate))``; None
+        entries (rejected by the caller) are skipped and give a None result.
+        Task ids and dependencies written ``#<index>`` refer to the task
+        created by an earlier operation of the same batch.
+
+        Tasks, agents and existing assignments referenced by the batch are
+        loaded with one query each rather than per item. Each operation runs
+        in a savepoint: one that fails validation or hits a database error is
+        rolled back and skipped with its error, and the rest still apply;
+        all successful ones commit together. Results are dicts with
+        ``index``, ``ok``, ``error`` and the ``task`` and ``assignment`` written.
+        """
+        if len(operations) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch holds at most {MAX_BATCH_SIZE} operations")
+        # Holding the prefetched rows keeps them in the session's identity map
+        assigned, prefetched = await self._prefetch(operations)
+        created: Dict[int, str] = {}
+        touched: Dict[str, Task] = {}
+        results: List[Optional[Dict[str, Any]]] = []
+        
+        for index, operation in enumerate(operations):
+            if operation is None:
+                results.append(None)
+                continue
+            kind, item = operation
+            result = {"index": index, "ok": False, "error": None, "task": None, "assignment": None}
+            try:
+                # A savepoint per operation, so a failed one leaves none of its writes behind
+                async with self.db.begin_nested():
+                    if kind == "create":
+                        depends_on = [self._resolve_ref(dep, created) for dep in item.depends_on or []]
+                        task = await self.add_task(item, depends_on)
+                        created[index] = task.id
+                    elif kind == "assign":
+                        task_id, agent_id = item
+                        task_id = self._resolve_ref(task_id, created)
+                        result["assignment"] = await self._assign(task_id, agent_id, assigned)
+                        task = await self.db.get(Task, task_id)
+                    elif kind == "update":
+                        task_id, task_data = item
+                        task = await self.db.get(Task, self._resolve_ref(task_id, created))
+                        if not task:
+                            raise ValueError(f"Task {task_id} not found")
+                        dependents = await self._update(task, task_data)
+                    else:
+                        raise ValueError(f"Unknown batch operation {kind!r}")
+            except (ValueError, SQLAlchemyError) as e:
+                result["error"] = str(e)
+                created.pop(index, None)
+                if result["assignment"] is not None:
+                    assigned.discard((result["assignment"].task_id, result["assignment"].agent_id))
+                    result["assignment"] = None
+            else:
+                result["ok"] = True
+                result["task"] = task
+                touched[task.id] = task
+                if kind == "update":
+                    for dependent in dependents:
+                        touched[dependent.id] = dependent
+            results.append(result)
+        
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        for task in touched.values():
+            # Rolling back a savepoint expires the rows its operation changed
+            if inspect(task).expired_attributes:
+                await self.db.refresh(task)
+            notify_task_changed(task)
+        return results
+    
+    async def create_tasks(self, tasks: List[TaskCreate]) -> List[Dict[str, Any]]:
+        """Create many tasks in one transaction (see ``apply_batch``)"""
+        return await self.apply_batch([("create", task_data) for task_data in tasks])
+    
+    async def assign_tasks(self, assignments: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Create many (task_id, agent_id) assignments in one transaction"""
+        return await self.apply_batch([("assign", assignment) for assignment in assignments])
+    
+    async def update_tasks(self, updates: List[Tuple[str, TaskUpdate]]) -> List[Dict[str, Any]]:
+        """Apply many (task_id, update) pairs in one transaction"""
+        return await self.apply_batch([("update", update_item) for update_item in updates])
+    
+    async def _prefetch(self, operations: List[Optional[Tuple[str, Any]]]) -> Tuple[Set[Tuple[str, str]], list]:
+        """Load the tasks and agents a batch touches
+
+        Returns the existing (task_id, agent_id) assignment pairs and the
+        loaded rows.
+        """
+        task_ids, agent_ids = set(), set()
+        for operation in operations:
+            if operation is None or operation[0] not in ("assign", "update"):
+                continue
+            kind, item = operation
+            task_ids.add(item[0])
+            if kind == "assign":
+                agent_ids.add(item[1])
+        task_ids = {task_id for task_id in task_ids if not BATCH_REF.match(task_id)}
+        
+        loaded = []
+        if task_ids:
+            loaded += (await self.db.execute(select(Task).where(Task.id.in_(task_ids)))).scalars().all()
+        if agent_ids:
+            loaded += (await self.db.execute(select(Agent).where(Agent.id.in_(agent_ids)))).scalars().all()
+        if not task_ids:
+            return set(), loaded
+        existing = await self.db.execute(
+            select(TaskAssignment.task_id, TaskAssignment.agent_id)
+            .where(TaskAssignment.task_id.in_(task_ids))
+        )
+        return {(task_id, agent_id) for task_id, agent_id in existing.all()}, loaded
+    
+    @staticmethod
+    def _resolve_ref(task_id: str, created: Dict[int, str]) -> str:
+        """Map "#<index>" to the id of the task created by that batch item"""
+        match = BATCH_REF.match(task_id)
+        if not match:
+            return task_id
+        index = int(match.group(1))
+        if index not in created:
+            raise ValueError(f"Batch item #{index} did not create a task")
+        return created[index]
+    
     async def complete_task(self, task_id: str, agent_id: str, result: Optional[dict] = None) -> Optional[Task]:
         """Mark task as completed by an agent"""
         task = await self.get_task(task_id)
@@ -126,6 +432,8 @@ class TaskService:
         # Update task status
         task.status = "completed"
         task.completed_at = datetime.utcnow()
+        task.claimed_by = None
+        task.lease_expires_at = None
         if result:
             task.requirements = {**task.requirements, "result": result}
         
@@ -140,8 +448,15 @@ class TaskService:
             assignment.status = "completed"
             assignment.completed_at = datetime.utcnow()
         
+        released = await self.dependencies.release_dependents(task_id)
+        
         await self.db.commit()
         await self.db.refresh(task)
+        notify_task_taken(task_id)
+        # Dependents waiting only for this task go straight to the dispatcher
+        for dependent in released:
+            notify_task_changed(dependent)
+        notify_agent_finished(agent_id)
         return task
     
     async def get_task_assignments(self, task_id: str) -> List[TaskAssignment]:
@@ -203,32 +518,244 @@ class TaskService:
                     Task.status.in_(["assigned", "pending"])
                 )
             )
-            .order_by(Task.priority.asc(), Task.created_at.asc())
+            .order_by(Task.priority.desc(), Task.created_at.asc())
             .limit(1)
         )
         return result.scalar_one_or_none()
     
-    async def claim_task(self, task_id: str, agent_id: str) -> Optional[Task]:
-        """Worker claims and starts a task"""
-        task = await self.get_task(task_id)
-        if not task:
+    def _runnable_by(self, agent_id: str):
+        """Condition for tasks an agent may claim: open tasks, or tasks assigned to it"""
+        assigned_to_agent = exists().where(
+            TaskAssignment.task_id == Task.id,
+            TaskAssignment.agent_id == agent_id,
+            TaskAssignment.status == "assigned"
+        )
+        return or_(Task.status == "pending", and_(Task.status == "assigned", assigned_to_agent))
+    
+    def _lease_expiry(self, lease_seconds: Optional[int] = None) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=lease_seconds or settings.TASK_LEASE_SECONDS)
+    
+    async def _try_claim(self, task_id: str, agent_id: str, condition, lease_expires_at: datetime) -> Optional[Task]:
+        """Take a task with one conditional UPDATE; None if another agent got there first"""
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.id == task_id, condition)
+            .values(status="in_progress", claimed_by=agent_id, lease_expires_at=lease_expires_at)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
             return None
         
-        task.status = "in_progress"
-        
-        # Update assignment status if exists
-        result = await self.db.execute(
+        # Record the claim on the agent's assignment
+        assignment = (await self.db.execute(
             select(TaskAssignment).where(
                 and_(TaskAssignment.task_id == task_id, TaskAssignment.agent_id == agent_id)
             )
-        )
-        assignment = result.scalar_one_or_none()
+        )).scalar_one_or_none()
         if assignment:
             assignment.status = "in_progress"
+        else:
+            self.db.add(TaskAssignment(task_id=task_id, agent_id=agent_id, status="in_progress"))
         
         await self.db.commit()
-        await self.db.refresh(task)
-        return task
+        notify_task_taken(task_id)
+        return await self.db.get(Task, task_id, populate_existing=True)
+    
+    async def claim_next(
+        self,
+        agent_id: str,
+        capabilities: Optional[Iterable[str]] = None,
+        lease_seconds: Optional[int] = None
+    ) -> Optional[Task]:
+        """Atomically claim the most urgent task this agent can run
+
+        Candidates are open tasks and tasks assigned to the agent, highest
+        priority first, then oldest. With ``capabilities``, tasks needing a
+        skill outside that list are skipped. Each candidate is taken with a
+        conditional UPDATE, so two agents can never claim the same task; on
+        PostgreSQL rows locked by a concurrent claimer are skipped. The claim
+        holds a lease that heartbeats extend; if it runs out the task is
+        requeued. Returns None if there is nothing to claim.
+        """
+        capabilities = set(capabilities) if capabilities is not None else None
+        condition = self._runnable_by(agent_id)
+        lease_expires_at = self._lease_expiry(lease_seconds)
+        offset = 0
+        while True:
+            query = (
+                select(Task.id, Task.requirements)
+                .where(condition)
+                .order_by(Task.priority.desc(), Task.created_at.asc(), Task.id.asc())
+                .offset(offset)
+                .limit(CLAIM_SCAN_BATCH)
+            )
+            if self.db.bind is not None and self.db.bind.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True, of=Task)
+            candidates = (await self.db.execute(query)).all()
+            if not candidates:
+                await self.db.rollback()
+                return None
+            for task_id, requirements in candidates:
+                if capabilities is not None and not required_capabilities(requirements) <= capabilities:
+                    continue
+                task = await self._try_claim(task_id, agent_id, condition, lease_expires_at)
+                if task:
+                    return task
+            offset += len(candidates)
+    
+    async def claim_task(self, task_id: str, agent_id: str, lease_seconds: Optional[int] = None) -> Optional[Task]:
+        """Worker claims and starts a specific task
+
+        Returns None if the task does not exist or is not claimable by this
+        agent. Claiming a task the agent already holds renews its lease.
+        """
+        condition = or_(
+            self._runnable_by(agent_id),
+            and_(Task.status == "in_progress", Task.claimed_by == agent_id)
+        )
+        return await self._try_claim(task_id, agent_id, condition, self._lease_expiry(lease_seconds))
+    
+    async def renew_lease(self, task_id: str, agent_id: str, lease_seconds: Optional[int] = None) -> Optional[Task]:
+        """Extend the lease on a task the agent holds; None if it does not hold it"""
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.status == "in_progress", Task.claimed_by == agent_id)
+            .values(lease_expires_at=self._lease_expiry(lease_seconds))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+        return await self.db.get(Task, task_id, populate_existing=True)
+    
+    async def extend_leases(self, agent_ids: Iterable[str], lease_seconds: Optional[int] = None) -> int:
+        """Extend every lease held by these agents (heartbeats); the caller commits"""
+        agent_ids = list(agent_ids)
+        if not agent_ids:
+            return 0
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.claimed_by.in_(agent_ids), Task.status == "in_progress")
+            .values(lease_expires_at=self._lease_expiry(lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    async def requeue_expired_leases(self, now: Optional[datetime] = None) -> List[Task]:
+        """Requeue in_progress tasks whose lease ran out; returns the tasks changed
+
+        Each requeue counts as a failed attempt, so a task that keeps killing
+        its workers ends up failed instead of looping forever.
+        """
+        now = now or datetime.utcnow()
+        result = await self.db.execute(
+            select(Task).where(Task.status == "in_progress", Task.lease_expires_at < now)
+        )
+        requeued, dependents_failed = [], []
+        for task in result.scalars().all():
+            holder, expired_at = task.claimed_by, task.lease_expires_at
+            status, requirements, run_at = self._retry_state(task, f"Lease held by {holder} expired", now)
+            # Skip tasks whose lease was extended or released since the SELECT
+            changed = await self.db.execute(
+                update(Task)
+                .where(Task.id == task.id, Task.status == "in_progress", Task.lease_expires_at == expired_at)
+                .values(
+                    status=status,
+                    requirements=requirements,
+                    run_at=run_at,
+                    claimed_by=None,
+                    lease_expires_at=None
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if not changed.rowcount:
+                continue
+            if holder:
+                await self.db.execute(
+                    update(TaskAssignment)
+                    .where(TaskAssignment.task_id == task.id, TaskAssignment.agent_id == holder)
+                    .values(status="failed")
+                    .execution_options(synchronize_session=False)
+                )
+            requeued.append(task.id)
+            if status == "failed":
+                dependents_failed.extend(await self.dependencies.fail_dependents(task.id))
+        await self.db.commit()
+        if not requeued:
+            return []
+        refreshed = await self.db.execute(
+            select(Task).where(Task.id.in_(requeued)).execution_options(populate_existing=True)
+        )
+        tasks = refreshed.scalars().all()
+        for task in tasks + dependents_failed:
+            notify_task_changed(task)
+        return tasks
+    
+    @staticmethod
+    def _retry_state(task: Task, error: str, now: Optional[datetime] = None) -> tuple:
+        """Status, requirements and run_at after a failed attempt
+
+        The task goes back to pending until retries run out, or waits in
+        scheduled until run_at when it has a retry backoff.
+        """
+        current_retry = task.requirements.get("retry_count", 0) if task.requirements else 0
+        if current_retry < MAX_TASK_RETRIES:
+            requirements = {**(task.requirements or {}), "retry_count": current_retry + 1, "last_error": error}
+            delay = retry_backoff(task.requirements, current_retry + 1)
+            if delay:
+                return "scheduled", requirements, (now or datetime.utcnow()) + timedelta(seconds=delay)
+            return "pending", requirements, None
+        return "failed", {**(task.requirements or {}), "retry_count": current_retry, "last_error": error}, None
+    
+    async def release_due_tasks(
+        self,
+        task_ids: Optional[Iterable[str]] = None,
+        now: Optional[datetime] = None
+    ) -> List[Task]:
+        """Move scheduled tasks whose run_at has passed into the pool; returns the tasks released
+
+        A released task is blocked if it still waits on dependencies, assigned
+        if an agent was assigned to it meanwhile, and pending otherwise. Each
+        release is a conditional UPDATE, so schedulers on several workers
+        never release a task twice.
+        """
+        now = now or datetime.utcnow()
+        query = select(Task).where(Task.status == "scheduled", Task.run_at <= now)
+        if task_ids is not None:
+            query = query.where(Task.id.in_(list(task_ids)))
+        due = (await self.db.execute(query)).scalars().all()
+        released = []
+        for task in due:
+            if await self.dependencies.has_unfinished_dependencies(task.id):
+                status = "blocked"
+            else:
+                assigned = await self.db.execute(
+                    select(TaskAssignment.id)
+                    .where(TaskAssignment.task_id == task.id, TaskAssignment.status == "assigned")
+                )
+                status = "assigned" if assigned.first() is not None else "pending"
+            changed = await self.db.execute(
+                update(Task)
+                .where(Task.id == task.id, Task.status == "scheduled")
+                .values(status=status)
+                .returning(Task.id)
+                .execution_options(synchronize_session=False)
+            )
+            if changed.scalar_one_or_none() is not None:
+                released.append(task.id)
+        await self.db.commit()
+        if not released:
+            return []
+        refreshed = await self.db.execute(
+            select(Task).where(Task.id.in_(released)).execution_options(populate_existing=True)
+        )
+        tasks = refreshed.scalars().all()
+        for task in tasks:
+            notify_task_changed(task)
+        return tasks
     
     async def fail_task(self, task_id: str, agent_id: str, error: str, retry_count: int = 0) -> Optional[Task]:
         """Mark task as failed with error details"""
@@ -236,17 +763,20 @@ class TaskService:
         if not task:
             return None
         
-        # Check retry logic (max 3 retries)
-        current_retry = task.requirements.get("retry_count", 0) if task.requirements else 0
-        if current_retry < 3:
-            task.status = "pending"  # Allow retry
-            task.requirements = {**(task.requirements or {}), "retry_count": current_retry + 1, "last_error": error}
-        else:
-            task.status = "failed"
-            task.requirements = {**(task.requirements or {}), "retry_count": current_retry, "last_error": error}
+        # Back to pending (after its backoff, if any) for a retry, until MAX_TASK_RETRIES is reached
+        task.status, task.requirements, task.run_at = self._retry_state(task, error)
+        task.claimed_by = None
+        task.lease_expires_at = None
+        
+        # Out of retries: nothing downstream can run any more
+        failed = await self._settle_dependents(task)
         
         await self.db.commit()
         await self.db.refresh(task)
+        notify_task_changed(task)
+        for dependent in failed:
+            notify_task_changed(dependent)
+        notify_agent_finished(agent_id)
         return task
     
     async def get_agent_work_queue(self, agent_id: str) -> dict:
@@ -259,7 +789,7 @@ class TaskService:
         pending_result = await self.db.execute(
             select(Task)
             .where(Task.status == "pending")
-            .order_by(Task.priority.asc(), Task.created_at.asc())
+            .order_by(Task.priority.desc(), Task.created_at.asc())
             .limit(5)
         )
         pending_tasks = pending_result.scalars().all()
@@ -1,89 +1,401 @@
-from typing import Dict, Set, Optional
+from typing import Callable, Deque, Dict, Set, Optional
+from collections import deque
 from fastapi import WebSocket, WebSocketDisconnect
+import asyncio
 import json
 import logging
+import os
+import socket
 from datetime import datetime
+from app.core.config import settings
+from app.websocket.event_bus import EventBus, create_event_bus
+from app.websocket.presence import PresenceTracker
+
+try:
+    import msgpack
+except ImportError:  # optional: binary frames are only offered when msgpack is installed
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+ENCODINGS = ("json", "msgpack")
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Close code sent to consumers evicted under the "disconnect" policy (1013: try again later)
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+def coalesce_key(message: dict) -> Optional[str]:
+    """Key identifying messages that supersede each other (same event about the same entity)"""
+    event = message.get("event")
+    data = message.get("data")
+    if not event or not isinstance(data, dict):
+        return None
+    for field in ("id", "key", "task_id", "agent_id"):
+        if data.get(field) is not None:
+            return f"{event}:{data[field]}"
+    return None
+
+
+def negotiate_encoding(requested: Optional[str]) -> str:
+    """Pick the wire encoding for a connection, falling back to JSON text frames"""
+    if requested == "msgpack" and msgpack is not None:
+        return "msgpack"
+    if requested not in (None, "json"):
+        logger.warning(f"Unsupported WebSocket encoding {requested!r}, using json")
+    return "json"
+
+
+class EncodedMessage:
+    """A message serialized at most once per wire encoding, shared by all recipients"""
+
+    __slots__ = ("message", "key", "_text", "_binary")
+
+    def __init__(self, message: dict):
+        self.message = message
+        self.key = coalesce_key(message)
+        self._text: Optional[str] = None
+        self._binary: Optional[bytes] = None
+
+    @property
+    def text(self) -> str:
+        """JSON text frame, encoded the same way as ``WebSocket.send_json``"""
+        if self._text is None:
+            self._text = json.dumps(self.message, separators=(",", ":"), ensure_ascii=False)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        """msgpack binary frame"""
+        if self._binary is None:
+            self._binary = msgpack.packb(self.message, use_bin_type=True)
+        return self._binary
+
+
+class OutboundQueue:
+    """Bounded outbound buffer for one connection, drained by its writer task"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: Deque[EncodedMessage] = deque()
+        self._ready = asyncio.Event()
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def is_full(self) -> bool:
+        return len(self._items) >= self.max_size
+
+    def push(self, message: EncodedMessage):
+        """Append a message; the caller is responsible for making room first"""
+        self._items.append(message)
+        self.enqueued += 1
+        self._ready.set()
+
+    def drop_oldest(self):
+        """Discard the oldest queued message"""
+        if self._items:
+            self._items.popleft()
+            self.dropped += 1
+
+    def coalesce(self, message: EncodedMessage) -> bool:
+        """Replace the newest queued message with the same key; False if there is none"""
+        if message.key is None:
+            return False
+        for index in range(len(self._items) - 1, -1, -1):
+            if self._items[index].key == message.key:
+                self._items[index] = message
+                self.coalesced += 1
+                return True
+        return False
+
+    async def get(self) -> EncodedMessage:
+        """Wait for and pop the next message"""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "max_size": self.max_size,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time agent communication"""
-    
-    def __init__(self):
+    """Manages WebSocket connections for real-time agent communication
+
+    Every connection gets a bounded outbound queue drained by its own writer
+    task, so sending never waits on a slow socket. When a queue is full the
+    overflow policy decides what happens: ``drop_oldest`` discards the oldest
+    queued message, ``coalesce`` replaces a queued message about the same
+    entity (falling back to dropping the oldest) and ``disconnect`` evicts the
+    slow consumer.
+
+    Messages are serialized once per wire encoding and the same frame is
+    queued for every recipient. Connections receive JSON text frames unless
+    they negotiated msgpack binary frames at connect time.
+
+    Sends addressed to agents that are not connected to this worker, and
+    every broadcast, are also published on the event bus so the worker that
+    owns the socket delivers them; the bus also holds the presence registry
+    shared by all workers. Last-seen times and status of this worker's
+    agents live in ``presence`` and reach the database in batches.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        bus: Optional[EventBus] = None,
+        worker_id: Optional[str] = None,
+        presence: Optional[PresenceTracker] = None
+    ):
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.overflow_policy = overflow_policy or settings.WS_OVERFLOW_POLICY
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {self.overflow_policy!r}, expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
         # Store active connections: {agent_id: WebSocket}
         self.active_connections: Dict[str, WebSocket] = {}
         # Store connection metadata: {agent_id: metadata}
         self.connection_metadata: Dict[str, dict] = {}
-    
-    async def connect(self, websocket: WebSocket, agent_id: str, metadata: Optional[dict] = None):
-        """Accept a new WebSocket connection"""
+        # Outbound queues and their writer tasks: {agent_id: ...}
+        self.outbound_queues: Dict[str, OutboundQueue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.evicted_count = 0
+        self.bus = bus or create_event_bus(settings.EVENT_BUS_URL)
+        # Handlers for other envelope types published by other workers: {type: handler}
+        self.bus_handlers: Dict[str, Callable[[dict], None]] = {}
+        self.worker_id = worker_id or settings.WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+        self.presence = presence or PresenceTracker()
+
+    async def start(self):
+        """Start receiving events published by other workers"""
+        await self.bus.start(self.worker_id, self._deliver_from_bus)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        agent_id: str,
+        metadata: Optional[dict] = None,
+        encoding: Optional[str] = None
+    ) -> str:
+        """Accept a new WebSocket connection and return the negotiated encoding"""
+        encoding = negotiate_encoding(encoding)
         await websocket.accept()
+        # A reconnect replaces the previous socket for the same agent
+        self._remove(agent_id)
+        outbox = OutboundQueue(self.queue_size)
         self.active_connections[agent_id] = websocket
         self.connection_metadata[agent_id] = {
             "connected_at": datetime.utcnow().isoformat(),
+            "encoding": encoding,
             "metadata": metadata or {}
         }
-        logger.info(f"Agent {agent_id} connected")
-    
+        self.outbound_queues[agent_id] = outbox
+        self._writers[agent_id] = asyncio.create_task(self._writer(agent_id, websocket, outbox, encoding))
+        logger.info(f"Agent {agent_id} connected ({encoding})")
+        self.presence.mark_online(agent_id)
+        try:
+            await self.bus.set_presence(agent_id, self.worker_id)
+        except Exception as e:
+            logger.error(f"Error registering presence of agent {agent_id}: {e}")
+        return encoding
+
     def disconnect(self, agent_id: str):
-        """Remove a WebSocket connection"""
+        """Remove a WebSocket connection, stop its writer and clear its presence"""
+        if self._remove(agent_id):
+            self.presence.mark_offline(agent_id)
+            self._spawn(self._clear_presence(agent_id))
+            logger.info(f"Agent {agent_id} disconnected")
+
+    def _remove(self, agent_id: str) -> bool:
+        """Drop local state for a connection; False if there was none"""
         if agent_id in self.active_connections:
             del self.active_connections[agent_id]
             del self.connection_metadata[agent_id]
-            logger.info(f"Agent {agent_id} disconnected")
-    
-    async def send_personal_message(self, message: dict, agent_id: str):
-        """Send a message to a specific agent"""
-        if agent_id in self.active_connections:
-            try:
-                await self.active_connections[agent_id].send_json(message)
-                return True
-            except Exception as e:
-                logger.error(f"Error sending message to agent {agent_id}: {e}")
-                self.disconnect(agent_id)
-                return False
+            self.outbound_queues.pop(agent_id, None)
+            writer = self._writers.pop(agent_id, None)
+            if writer is not None and writer is not asyncio.current_task():
+                writer.cancel()
+            return True
         return False
-    
+
+    async def _clear_presence(self, agent_id: str):
+        try:
+            await self.bus.clear_presence(agent_id, self.worker_id)
+        except Exception as e:
+            logger.error(f"Error clearing presence of agent {agent_id}: {e}")
+
+    async def send_personal_message(self, message: dict, agent_id: str):
+        """Queue a message for a specific agent, wherever it is connected
+
+        Returns False if the agent is neither connected here nor reachable
+        through another worker.
+        """
+        if agent_id in self.outbound_queues:
+            return self._enqueue(agent_id, EncodedMessage(message))
+        return await self._publish({"type": "direct", "agent_ids": [agent_id], "message": message}) > 0
+
     async def broadcast(self, message: dict, exclude_agent_id: Optional[str] = None):
-        """Broadcast a message to all connected agents"""
-        disconnected_agents = []
-        # Copy items to avoid "dictionary changed size during iteration"
-        connections_snapshot = list(self.active_connections.items())
-        for agent_id, connection in connections_snapshot:
+        """Queue a message for all connected agents without waiting for delivery"""
+        self._deliver_local(message, exclude_agent_id=exclude_agent_id)
+        await self._publish({"type": "broadcast", "exclude": exclude_agent_id, "message": message})
+
+    async def send_to_agents(self, message: dict, agent_ids: list):
+        """Send a message to specific agents"""
+        encoded = EncodedMessage(message)
+        remote = []
+        for agent_id in agent_ids:
+            if agent_id in self.outbound_queues:
+                self._enqueue(agent_id, encoded)
+            else:
+                remote.append(agent_id)
+        if remote:
+            await self._publish({"type": "direct", "agent_ids": remote, "message": message})
+
+    def _deliver_local(
+        self,
+        message: dict,
+        agent_ids: Optional[list] = None,
+        exclude_agent_id: Optional[str] = None
+    ):
+        """Queue a message for local connections (all of them unless ``agent_ids`` is given)"""
+        encoded = EncodedMessage(message)
+        # Copy keys: the disconnect policy may evict agents while we iterate
+        for agent_id in list(self.active_connections) if agent_ids is None else agent_ids:
             if exclude_agent_id and agent_id == exclude_agent_id:
                 continue
+            self._enqueue(agent_id, encoded)
+
+    def _deliver_from_bus(self, envelope: dict):
+        """Deliver an envelope published by another worker to our connections"""
+        if envelope.get("type") == "broadcast":
+            self._deliver_local(envelope["message"], exclude_agent_id=envelope.get("exclude"))
+        elif envelope.get("type") == "direct":
+            self._deliver_local(envelope["message"], agent_ids=envelope.get("agent_ids", []))
+        elif envelope.get("type") in self.bus_handlers:
+            self.bus_handlers[envelope["type"]](envelope)
+
+    async def publish(self, envelope: dict) -> int:
+        """Send an envelope handled by ``bus_handlers`` to the other workers"""
+        return await self._publish(envelope)
+
+    async def _publish(self, envelope: dict) -> int:
+        """Hand an envelope to the other workers; returns how many received it"""
+        envelope["origin"] = self.worker_id
+        try:
+            return await self.bus.publish(envelope)
+        except Exception as e:
+            logger.error(f"Error publishing {envelope['type']} event on the event bus: {e}")
+            return 0
+
+    def _enqueue(self, agent_id: str, message: EncodedMessage) -> bool:
+        """Put a message on an agent's outbound queue, applying the overflow policy"""
+        outbox = self.outbound_queues.get(agent_id)
+        if outbox is None:
+            return False
+        if outbox.is_full():
+            if self.overflow_policy == "disconnect":
+                logger.warning(f"Outbound queue for agent {agent_id} is full, disconnecting slow consumer")
+                self._evict(agent_id)
+                return False
+            if self.overflow_policy == "coalesce" and outbox.coalesce(message):
+                return True
+            outbox.drop_oldest()
+        outbox.push(message)
+        return True
+
+    async def _writer(self, agent_id: str, websocket: WebSocket, outbox: OutboundQueue, encoding: str):
+        """Drain one connection's outbound queue onto its socket"""
+        while True:
+            message = await outbox.get()
             try:
-                await connection.send_json(message)
+                if encoding == "msgpack":
+                    await websocket.send_bytes(message.binary)
+                else:
+                    await websocket.send_text(message.text)
             except Exception as e:
-                logger.error(f"Error broadcasting to agent {agent_id}: {e}")
-                disconnected_agents.append(agent_id)
+                logger.error(f"Error sending message to agent {agent_id}: {e}")
+                # Only tear down if the agent has not reconnected on a new socket meanwhile
+                if self.active_connections.get(agent_id) is websocket:
+                    self.disconnect(agent_id)
+                return
+            outbox.sent += 1
+
+    def _evict(self, agent_id: str):
+        """Disconnect a slow consumer and close its socket in the background"""
+        websocket = self.active_connections.get(agent_id)
+        self.disconnect(agent_id)
+        self.evicted_count += 1
+        if websocket is not None:
+            self._spawn(self._close_quietly(websocket, WS_CLOSE_SLOW_CONSUMER))
+
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until it is done"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
 
-        # Clean up disconnected agents
-        for agent_id in disconnected_agents:
+    async def close_all(self):
+        """Stop all writer tasks and leave the event bus (used on application shutdown)"""
+        writers = list(self._writers.values())
+        for agent_id in list(self.active_connections):
             self.disconnect(agent_id)
-    
-    async def send_to_agents(self, message: dict, agent_ids: list):
-        """Send a message to specific agents"""
-        for agent_id in agent_ids:
-            await self.send_personal_message(message, agent_id)
-    
+        await asyncio.gather(*writers, *self._background_tasks, return_exceptions=True)
+        await self.bus.close()
+
     def get_connected_agents(self) -> Set[str]:
         """Get set of all connected agent IDs"""
         return set(self.active_connections.keys())
-    
+
     def is_connected(self, agent_id: str) -> bool:
         """Check if an agent is connected"""
         return agent_id in self.active_connections
-    
+
     def get_connection_count(self) -> int:
         """Get number of active connections"""
         return len(self.active_connections)
-    
+
+    async def get_presence(self) -> Dict[str, str]:
+        """Get {agent_id: worker_id} for agents connected to any worker"""
+        try:
+            return await self.bus.get_presence()
+        except Exception as e:
+            logger.error(f"Error reading presence from the event bus: {e}")
+            return {agent_id: self.worker_id for agent_id in self.active_connections}
+
     def get_agent_metadata(self, agent_id: str) -> Optional[dict]:
         """Get metadata for a connected agent"""
         return self.connection_metadata.get(agent_id)
 
+    def get_queue_stats(self, agent_id: Optional[str] = None) -> Dict[str, dict]:
+        """Get outbound queue depth and drop counters, per connection"""
+        if agent_id is not None:
+            outbox = self.outbound_queues.get(agent_id)
+            return {agent_id: outbox.stats()} if outbox is not None else {}
+        return {agent_id: outbox.stats() for agent_id, outbox in self.outbound_queues.items()}
+
 
 # Global connection manager instance
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
@@ -0,0 +1,210 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.task import Task
+from app.services.task_service import TaskListener, TaskService, required_capabilities, task_listeners
+from app.websocket.connection_manager import ConnectionManager, manager
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Heap item: (-priority, created_at, sequence, task_id); most urgent, then oldest, first
+HeapItem = Tuple[int, datetime, int, str]
+
+
+class TaskDispatcher(TaskListener):
+    """Pushes runnable tasks to idle, capable agents instead of waiting to be polled
+
+    Pending tasks sit in an in-memory priority heap, loaded from the database
+    at startup and kept current by ``TaskService`` writes (see
+    ``TaskListener``). Agents opt in with an ``agent:ready`` event listing
+    their capabilities. Whenever a task becomes runnable or an agent becomes
+    ready, the most urgent tasks are matched with the longest-idle agents that
+    can run them, claimed for that agent under a lease, and announced with a
+    ``task:assigned`` event. An agent is ready again once it completes or
+    fails its task.
+
+    The database stays the source of truth: every hand-out is an atomic
+    claim, so workers sharing a database never hand out the same task, and
+    the heap is rebuilt every resync interval to pick up tasks created by
+    other workers.
+    """
+
+    def __init__(
+        self,
+        connection_manager: ConnectionManager = manager,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        resync_interval: Optional[float] = None
+    ):
+        self.manager = connection_manager
+        self.session_factory = session_factory
+        self.resync_interval = resync_interval or settings.TASK_DISPATCH_RESYNC_INTERVAL
+        self._heap: List[HeapItem] = []
+        # Live heap entries: {task_id: sequence}; other items are stale
+        self._queued: Dict[str, int] = {}
+        self._required: Dict[str, Set[str]] = {}
+        self._sequence = itertools.count()
+        # Agents waiting for work, longest idle first: {agent_id: capabilities or None for any}
+        self._ready: Dict[str, Optional[Set[str]]] = {}
+        # Capabilities of every agent that opted in, so it can be made ready again
+        self._subscribed: Dict[str, Optional[Set[str]]] = {}
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self.dispatched_count = 0
+
+    # TaskListener
+
+    def task_runnable(self, task: Task):
+        sequence = next(self._sequence)
+        self._queued[task.id] = sequence
+        self._required[task.id] = required_capabilities(task.requirements)
+        heapq.heappush(self._heap, (-(task.priority or 1), task.created_at or datetime.utcnow(), sequence, task.id))
+        self._wake.set()
+
+    def task_taken(self, task_id: str):
+        self._queued.pop(task_id, None)
+        self._required.pop(task_id, None)
+
+    def agent_finished(self, agent_id: str):
+        if agent_id in self._subscribed:
+            self._ready[agent_id] = self._subscribed[agent_id]
+            self._wake.set()
+
+    # Agents
+
+    def mark_ready(self, agent_id: str, capabilities: Optional[Iterable[str]] = None):
+        """Agent is idle and wants tasks pushed to it (any task if no capabilities are given)"""
+        capabilities = set(capabilities) if capabilities is not None else None
+        self._subscribed[agent_id] = capabilities
+        self._ready.pop(agent_id, None)
+        self._ready[agent_id] = capabilities
+        self._wake.set()
+
+    def mark_busy(self, agent_id: str):
+        """Agent is working and should not get pushes until it finishes"""
+        self._ready.pop(agent_id, None)
+
+    def forget(self, agent_id: str):
+        """Agent disconnected"""
+        self._ready.pop(agent_id, None)
+        self._subscribed.pop(agent_id, None)
+
+    def queued_task_ids(self) -> List[str]:
+        """Pending tasks in dispatch order"""
+        return [item[3] for item in sorted(self._heap) if self._queued.get(item[3]) == item[2]]
+
+    def ready_agent_ids(self) -> List[str]:
+        return list(self._ready)
+
+    # Dispatch
+
+    async def rebuild(self):
+        """Reload the heap from the pending tasks in the database"""
+        async with self._lock:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(Task)
+                    .where(Task.status == "pending")
+                    .order_by(Task.priority.desc(), Task.created_at.asc())
+                )
+                tasks = result.scalars().all()
+            self._heap, self._queued, self._required = [], {}, {}
+            for task in tasks:
+                self.task_runnable(task)
+
+    async def dispatch(self) -> int:
+        """Hand queued tasks to ready agents; returns how many were handed out"""
+        async with self._lock:
+            for agent_id in [a for a in self._ready if not self.manager.is_connected(a)]:
+                self.forget(agent_id)
+            if not self._ready or not self._queued:
+                return 0
+
+            dispatched = 0
+            parked: List[HeapItem] = []
+            async with self.session_factory() as db:
+                service = TaskService(db)
+                while self._heap and self._ready:
+                    item = heapq.heappop(self._heap)
+                    task_id = item[3]
+                    if self._queued.get(task_id) != item[2]:
+                        continue
+                    required = self._required.get(task_id, set())
+                    agent_id = next(
+                        (a for a, caps in self._ready.items() if caps is None or required <= caps),
+                        None
+                    )
+                    if agent_id is None:
+                        parked.append(item)
+                        continue
+                    task = await service.claim_task(task_id, agent_id)
+                    if task is None:
+                        # Claimed or changed elsewhere meanwhile
+                        self.task_taken(task_id)
+                        continue
+                    self._ready.pop(agent_id, None)
+                    dispatched += 1
+                    await self.manager.send_personal_message({
+                        "event": "task:assigned",
+                        "data": {
+                            "task_id": task.id,
+                            "title": task.title,
+                            "priority": task.priority,
+                            "assigned_at": datetime.utcnow().isoformat(),
+                            "lease_expires_at": task.lease_expires_at.isoformat()
+                        }
+                    }, agent_id)
+            for item in parked:
+                heapq.heappush(self._heap, item)
+            self.dispatched_count += dispatched
+            return dispatched
+
+    async def start(self):
+        """Load the queue and start dispatching in the background"""
+        if self not in task_listeners:
+            task_listeners.append(self)
+        await self.rebuild()
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self in task_listeners:
+            task_listeners.remove(self)
+
+    async def _run(self):
+        # start() has just loaded the queue
+        last_rebuild = time.monotonic()
+        while True:
+            remaining = self.resync_interval - (time.monotonic() - last_rebuild)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(remaining, 0))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # Pick up tasks written by other workers, however often local events wake the loop
+            if time.monotonic() - last_rebuild >= self.resync_interval:
+                last_rebuild = time.monotonic()
+                try:
+                    await self.rebuild()
+                except Exception as e:
+                    logger.error(f"Error rebuilding the task queue: {e}")
+            try:
+                await self.dispatch()
+            except Exception as e:
+                logger.error(f"Error dispatching tasks: {e}")
+
+
+# Global dispatcher, started by the application lifespan
+dispatcher = TaskDispatcher()
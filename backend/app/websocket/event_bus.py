@@ -0,0 +1,259 @@
+"""Cross-worker delivery of WebSocket events.
+
+Each uvicorn worker owns the sockets of the agents connected to it. The event
+bus carries sends addressed to agents on other workers and keeps a shared
+presence registry ({agent_id: worker_id}) so any worker can tell who is online.
+
+``InProcessEventBus`` serves a single worker (and several managers in one
+process, e.g. in tests). ``RedisEventBus`` speaks the Redis protocol over TCP
+or a Unix socket, to a Redis server or to ``app.websocket.local_broker``.
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Called with each envelope published by another worker
+DeliverFn = Callable[[dict], None]
+
+RespReply = Union[None, int, str, bytes, list]
+
+
+class EventBusError(Exception):
+    """Raised when the event bus backend rejects a command"""
+
+
+class EventBus(ABC):
+    """Interface for routing events between workers and tracking presence"""
+
+    @abstractmethod
+    async def start(self, worker_id: str, deliver: DeliverFn):
+        """Start receiving envelopes published by other workers"""
+
+    @abstractmethod
+    async def publish(self, envelope: dict) -> int:
+        """Publish an envelope; returns how many other workers received it"""
+
+    @abstractmethod
+    async def set_presence(self, agent_id: str, worker_id: str):
+        """Record that an agent is connected to a worker"""
+
+    @abstractmethod
+    async def clear_presence(self, agent_id: str, worker_id: str):
+        """Forget an agent, unless it has reconnected to another worker"""
+
+    @abstractmethod
+    async def get_presence(self) -> Dict[str, str]:
+        """Get {agent_id: worker_id} for every connected agent"""
+
+    async def close(self):
+        """Stop receiving and release connections"""
+
+
+class InProcessEventBus(EventBus):
+    """Event bus for managers living in the same process"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, DeliverFn] = {}
+        self._presence: Dict[str, str] = {}
+
+    async def start(self, worker_id: str, deliver: DeliverFn):
+        self._subscribers[worker_id] = deliver
+
+    async def publish(self, envelope: dict) -> int:
+        receivers = 0
+        for worker_id, deliver in list(self._subscribers.items()):
+            if worker_id == envelope.get("origin"):
+                continue
+            deliver(envelope)
+            receivers += 1
+        return receivers
+
+    async def set_presence(self, agent_id: str, worker_id: str):
+        self._presence[agent_id] = worker_id
+
+    async def clear_presence(self, agent_id: str, worker_id: str):
+        if self._presence.get(agent_id) == worker_id:
+            del self._presence[agent_id]
+
+    async def get_presence(self) -> Dict[str, str]:
+        return dict(self._presence)
+
+    async def close(self):
+        self._subscribers.clear()
+
+
+def encode_command(*args: Union[str, bytes, int]) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> RespReply:
+    """Read one RESP reply; error replies are raised as EventBusError"""
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise EventBusError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise EventBusError(f"Unexpected reply from event bus: {line!r}")
+
+
+async def open_bus_connection(url: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to ``redis://[:password@]host[:port][/db]`` or ``unix:///path/to.sock``"""
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        reader, writer = await asyncio.open_unix_connection(parsed.path)
+    elif parsed.scheme == "redis":
+        reader, writer = await asyncio.open_connection(parsed.hostname or "localhost", parsed.port or 6379)
+    else:
+        raise ValueError(f"Unsupported event bus URL scheme {parsed.scheme!r}")
+
+    commands: List[tuple] = []
+    if parsed.password:
+        username = unquote(parsed.username) if parsed.username else None
+        commands.append(("AUTH", username, unquote(parsed.password)) if username else ("AUTH", unquote(parsed.password)))
+    db = parsed.path.lstrip("/") if parsed.scheme == "redis" else ""
+    if db and db != "0":
+        commands.append(("SELECT", db))
+    for command in commands:
+        writer.write(encode_command(*command))
+        await writer.drain()
+        await read_reply(reader)
+    return reader, writer
+
+
+class RedisEventBus(EventBus):
+    """Event bus over Redis pub/sub with the presence registry in a Redis hash
+
+    Uses one connection for commands and one for the subscription. The
+    subscriber reconnects with backoff if the connection drops; envelopes
+    published meanwhile are lost, as with any Redis pub/sub consumer.
+    """
+
+    def __init__(self, url: str, channel: str = "agent-hub:events", presence_key: str = "agent-hub:presence"):
+        self.url = url
+        self.channel = channel
+        self.presence_key = presence_key
+        self._worker_id: Optional[str] = None
+        self._deliver: Optional[DeliverFn] = None
+        self._command_conn: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._command_lock = asyncio.Lock()
+        self._subscriber: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def start(self, worker_id: str, deliver: DeliverFn):
+        self._worker_id = worker_id
+        self._deliver = deliver
+        self._subscriber = asyncio.create_task(self._listen())
+        await self._subscribed.wait()
+
+    async def execute(self, *args: Union[str, bytes, int]) -> RespReply:
+        """Run one command on the shared command connection"""
+        async with self._command_lock:
+            if self._command_conn is None:
+                self._command_conn = await open_bus_connection(self.url)
+            reader, writer = self._command_conn
+            try:
+                writer.write(encode_command(*args))
+                await writer.drain()
+                return await read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Reconnect on the next command
+                writer.close()
+                self._command_conn = None
+                raise
+
+    async def publish(self, envelope: dict) -> int:
+        receivers = await self.execute("PUBLISH", self.channel, json.dumps(envelope, separators=(",", ":")))
+        # Our own subscription counts as a receiver
+        return max(int(receivers) - 1, 0)
+
+    async def set_presence(self, agent_id: str, worker_id: str):
+        await self.execute("HSET", self.presence_key, agent_id, worker_id)
+
+    async def clear_presence(self, agent_id: str, worker_id: str):
+        owner = await self.execute("HGET", self.presence_key, agent_id)
+        if owner is not None and owner.decode() == worker_id:
+            await self.execute("HDEL", self.presence_key, agent_id)
+
+    async def get_presence(self) -> Dict[str, str]:
+        reply = await self.execute("HGETALL", self.presence_key) or []
+        return {reply[i].decode(): reply[i + 1].decode() for i in range(0, len(reply), 2)}
+
+    async def close(self):
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            await asyncio.gather(self._subscriber, return_exceptions=True)
+            self._subscriber = None
+        if self._command_conn is not None:
+            self._command_conn[1].close()
+            self._command_conn = None
+
+    async def _listen(self):
+        """Receive envelopes from other workers, reconnecting on failure"""
+        delay = 0.5
+        while True:
+            writer = None
+            try:
+                reader, writer = await open_bus_connection(self.url)
+                writer.write(encode_command("SUBSCRIBE", self.channel))
+                await writer.drain()
+                await read_reply(reader)
+                self._subscribed.set()
+                delay = 0.5
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        self._dispatch(reply[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event bus subscription failed: {e}, retrying in {delay:.1f}s")
+                # Let start() return even if the bus is down; sends to other workers fail until it is back
+                self._subscribed.set()
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10.0)
+
+    def _dispatch(self, data: bytes):
+        try:
+            envelope = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed event bus envelope")
+            return
+        if envelope.get("origin") != self._worker_id:
+            self._deliver(envelope)
+
+
+def create_event_bus(url: Optional[str]) -> EventBus:
+    """Build the event bus for ``EVENT_BUS_URL`` (in-process when unset)"""
+    if not url or url == "memory://":
+        return InProcessEventBus()
+    scheme = urlparse(url).scheme
+    if scheme not in ("redis", "unix"):
+        raise ValueError(f"Unsupported event bus URL scheme {scheme!r}, expected redis:// or unix://")
+    return RedisEventBus(url)
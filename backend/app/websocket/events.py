@@ -1,26 +1,73 @@
 from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from pydantic import ValidationError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.database import AsyncSessionLocal
+from app.schemas.memory import MemoryCreate, MemoryUpdate
+from app.schemas.message import MessageCreate
+from app.schemas.task import TaskBulkResult, TaskCreate, TaskUpdate
+from app.services.agent_service import AgentService
+from app.services.memory_service import MemoryService
+from app.services.message_service import MessageService
+from app.services.task_service import MAX_BATCH_SIZE, TaskService
 from app.websocket.connection_manager import manager
+from app.websocket.dispatcher import dispatcher
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def handle_agent_websocket(websocket: WebSocket, agent_id: str):
+class ConnectionContext:
+    """Per-connection unit of work shared by all events from one agent
+
+    Holds one database session and the services bound to it for the lifetime
+    of the WebSocket, instead of building both for every frame. After each
+    event the session's transaction is ended and its identity map cleared, so
+    no SQLite lock is held between frames and no stale rows are served.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        websocket: Optional[WebSocket] = None,
+        session_factory: async_sessionmaker = AsyncSessionLocal
+    ):
+        self.agent_id = agent_id
+        self.websocket = websocket
+        self.db: AsyncSession = session_factory()
+        self.agents = AgentService(self.db)
+        self.messages = MessageService(self.db)
+        self.tasks = TaskService(self.db)
+        self.memory = MemoryService(self.db)
+
+    async def end_event(self, failed: bool = False):
+        """Finish the unit of work for one event"""
+        if failed or self.db.in_transaction():
+            await self.db.rollback()
+        self.db.expunge_all()
+
+    async def close(self):
+        await self.db.close()
+
+
+async def handle_agent_websocket(websocket: WebSocket, agent_id: str, encoding: Optional[str] = None):
     """Handle WebSocket connection for an agent"""
+    ctx = ConnectionContext(agent_id, websocket)
     try:
         # Accept connection
-        await manager.connect(websocket, agent_id)
-        
+        encoding = await manager.connect(websocket, agent_id, encoding=encoding)
+
         # Send welcome message
-        await websocket.send_json({
+        await manager.send_personal_message({
             "event": "connected",
             "data": {
                 "agent_id": agent_id,
+                "encoding": encoding,
                 "message": "Successfully connected to Agent Communication Channel"
             }
-        })
-        
+        }, agent_id)
+
         # Notify other agents
         await manager.broadcast({
             "event": "agent:joined",
@@ -28,15 +75,16 @@ async def handle_agent_websocket(websocket: WebSocket, agent_id: str):
                 "agent_id": agent_id
             }
         }, exclude_agent_id=agent_id)
-        
+
         # Keep connection alive and handle incoming messages
         while True:
             data = await websocket.receive_json()
-            await process_agent_event(agent_id, data, websocket)
-            
+            await process_agent_event(ctx, data)
+
     except WebSocketDisconnect:
         logger.info(f"Agent {agent_id} disconnected")
         manager.disconnect(agent_id)
+        dispatcher.forget(agent_id)
         try:
             await manager.broadcast({
                 "event": "agent:left",
@@ -49,6 +97,7 @@ async def handle_agent_websocket(websocket: WebSocket, agent_id: str):
     except Exception as e:
         logger.error(f"Error in agent websocket connection: {e}")
         manager.disconnect(agent_id)
+        dispatcher.forget(agent_id)
         try:
             await manager.broadcast({
                 "event": "agent:left",
@@ -58,267 +107,327 @@ async def handle_agent_websocket(websocket: WebSocket, agent_id: str):
             })
         except Exception:
             pass
+    finally:
+        await ctx.close()
 
 
-async def process_agent_event(agent_id: str, data: dict, websocket: WebSocket):
+async def process_agent_event(ctx: ConnectionContext, data: dict):
     """Process incoming events from an agent"""
     event_type = data.get("event")
     event_data = data.get("data", {})
-    
-    logger.info(f"Received event from agent {agent_id}: {event_type}")
-    
+
+    logger.info(f"Received event from agent {ctx.agent_id}: {event_type}")
+
     # Route events to appropriate handlers
-    if event_type == "agent:register":
-        logger.info(f"Agent {agent_id} registered: {event_data}")
-    elif event_type == "agent:heartbeat":
-        await handle_heartbeat(agent_id, event_data)
-    elif event_type == "message:send":
-        await handle_message_send(agent_id, event_data)
-    elif event_type == "task:create":
-        await handle_task_create(agent_id, event_data)
-    elif event_type == "task:assign":
-        await handle_task_assign(agent_id, event_data)
-    elif event_type == "task:update":
-        await handle_task_update(agent_id, event_data)
-    elif event_type == "memory:set":
-        await handle_memory_set(agent_id, event_data)
-    elif event_type == "memory:get":
-        await handle_memory_get(agent_id, event_data, websocket)
-    else:
+    handler = EVENT_HANDLERS.get(event_type)
+    if handler is None:
         logger.warning(f"Unknown event type: {event_type}")
+        return
+
+    try:
+        await handler(ctx, event_data)
+    except Exception:
+        await ctx.end_event(failed=True)
+        raise
+    await ctx.end_event()
+
+
+async def handle_register(ctx: ConnectionContext, data: dict):
+    """Handle registration announcement from agent"""
+    logger.info(f"Agent {ctx.agent_id} registered: {data}")
+    # Announcing capabilities opts the agent in to pushed tasks
+    if "capabilities" in data:
+        dispatcher.mark_ready(ctx.agent_id, data.get("capabilities"))
+
+
+async def handle_ready(ctx: ConnectionContext, data: dict):
+    """Handle an agent asking for tasks to be pushed to it"""
+    dispatcher.mark_ready(ctx.agent_id, data.get("capabilities"))
 
 
-async def handle_heartbeat(agent_id: str, data: dict):
+async def handle_busy(ctx: ConnectionContext, data: dict):
+    """Handle an agent pausing pushed tasks"""
+    dispatcher.mark_busy(ctx.agent_id)
+
+
+async def handle_heartbeat(ctx: ConnectionContext, data: dict):
     """Handle heartbeat from agent"""
-    # Update agent last_seen timestamp in database
-    from app.services.agent_service import AgentService
-    from app.core.database import get_db
-    
-    async for db in get_db():
-        service = AgentService(db)
-        await service.update_last_seen(agent_id)
-        break
-    
+    # Recorded in memory; the presence tracker writes last_seen in batches
+    manager.presence.touch(ctx.agent_id)
+
     # Send heartbeat response
     await manager.send_personal_message({
         "event": "agent:heartbeat_ack",
         "data": {
             "timestamp": data.get("timestamp")
         }
-    }, agent_id)
+    }, ctx.agent_id)
 
 
-async def handle_message_send(agent_id: str, data: dict):
+async def handle_message_send(ctx: ConnectionContext, data: dict):
     """Handle message sending from agent"""
-    from app.services.message_service import MessageService
-    from app.core.database import get_db
-    from app.schemas.message import MessageCreate
-    
-    async for db in get_db():
-        service = MessageService(db)
-        
-        # Create message
-        message_data = MessageCreate(
-            sender_id=agent_id,
-            content=data.get("content"),
-            message_type=data.get("message_type", "text"),
-            task_id=data.get("task_id"),
-            recipients=data.get("recipients", []),
-            metadata=data.get("metadata", {})
-        )
-        
-        message = await service.create_message(message_data)
-        
-        # Send to recipients
-        recipients = data.get("recipients", [])
-        if recipients:
-            await manager.send_to_agents({
-                "event": "message:received",
-                "data": {
-                    "id": message.id,
-                    "sender_id": message.sender_id,
-                    "content": message.content,
-                    "message_type": message.message_type,
-                    "task_id": message.task_id,
-                    "created_at": message.created_at.isoformat()
-                }
-            }, recipients)
-        
-        # Send confirmation to sender
-        await manager.send_personal_message({
-            "event": "message:sent",
+    # Create message
+    message_data = MessageCreate(
+        sender_id=ctx.agent_id,
+        content=data.get("content"),
+        message_type=data.get("message_type", "text"),
+        task_id=data.get("task_id"),
+        recipients=data.get("recipients", []),
+        metadata=data.get("metadata", {})
+    )
+
+    message = await ctx.messages.create_message(message_data)
+
+    # Send to recipients
+    recipients = data.get("recipients", [])
+    if recipients:
+        await manager.send_to_agents({
+            "event": "message:received",
             "data": {
-                "id": message.id
+                "id": message.id,
+                "sender_id": message.sender_id,
+                "content": message.content,
+                "message_type": message.message_type,
+                "task_id": message.task_id,
+                "created_at": message.created_at.isoformat()
             }
-        }, agent_id)
-        
-        break
+        }, recipients)
+
+    # With write-behind, delivery above did not wait for the database
+    await ctx.messages.wait_persisted(message)
+
+    # Send confirmation to sender
+    await manager.send_personal_message({
+        "event": "message:sent",
+        "data": {
+            "id": message.id
+        }
+    }, ctx.agent_id)
+
 
+def task_create_data(ctx: ConnectionContext, data: dict) -> TaskCreate:
+    """Task to create from a task:create event"""
+    return TaskCreate(
+        creator_id=ctx.agent_id,
+        title=data.get("title"),
+        description=data.get("description"),
+        priority=data.get("priority", 1),
+        due_date=data.get("due_date"),
+        requirements=data.get("requirements", {}),
+        depends_on=data.get("depends_on"),
+        run_at=data.get("run_at")
+    )
 
-async def handle_task_create(agent_id: str, data: dict):
+
+async def handle_task_create(ctx: ConnectionContext, data: dict):
     """Handle task creation from agent"""
-    from app.services.task_service import TaskService
-    from app.core.database import get_db
-    from app.schemas.task import TaskCreate
-    
-    async for db in get_db():
-        service = TaskService(db)
-        
-        task_data = TaskCreate(
-            creator_id=agent_id,
-            title=data.get("title"),
-            description=data.get("description"),
-            priority=data.get("priority", 1),
-            due_date=data.get("due_date"),
-            requirements=data.get("requirements", {})
-        )
-        
-        task = await service.create_task(task_data)
-        
-        # Broadcast task creation
-        await manager.broadcast({
-            "event": "task:created",
-            "data": {
-                "id": task.id,
-                "creator_id": task.creator_id,
-                "title": task.title,
-                "status": task.status,
-                "priority": task.priority,
-                "created_at": task.created_at.isoformat()
-            }
-        })
-        
-        break
+    task = await ctx.tasks.create_task(task_create_data(ctx, data))
+    await announce_task_created(task)
 
 
-async def handle_task_assign(agent_id: str, data: dict):
+async def announce_task_created(task):
+    """Broadcast task creation"""
+    await manager.broadcast({
+        "event": "task:created",
+        "data": {
+            "id": task.id,
+            "creator_id": task.creator_id,
+            "title": task.title,
+            "status": task.status,
+            "priority": task.priority,
+            "created_at": task.created_at.isoformat()
+        }
+    })
+
+
+async def handle_task_assign(ctx: ConnectionContext, data: dict):
     """Handle task assignment from agent"""
-    from app.services.task_service import TaskService
-    from app.core.database import get_db
-    
-    async for db in get_db():
-        service = TaskService(db)
-        
-        assignment = await service.assign_task(
-            data.get("task_id"),
-            data.get("agent_id")
-        )
-        
-        # Notify assigned agent
-        await manager.send_personal_message({
-            "event": "task:assigned",
-            "data": {
-                "task_id": assignment.task_id,
-                "assignment_id": assignment.id,
-                "assigned_at": assignment.assigned_at.isoformat()
-            }
-        }, data.get("agent_id"))
-        
-        # Notify creator
-        await manager.send_personal_message({
-            "event": "task:assignment_created",
-            "data": {
-                "task_id": assignment.task_id,
-                "agent_id": assignment.agent_id
-            }
-        }, agent_id)
-        
-        break
+    assignment = await ctx.tasks.assign_task(
+        data.get("task_id"),
+        data.get("agent_id")
+    )
+    await announce_assignment(ctx, assignment)
+
+
+async def announce_assignment(ctx: ConnectionContext, assignment):
+    """Notify the assigned agent and the agent that assigned it"""
+    # Notify assigned agent
+    await manager.send_personal_message({
+        "event": "task:assigned",
+        "data": {
+            "task_id": assignment.task_id,
+            "assignment_id": assignment.id,
+            "assigned_at": assignment.assigned_at.isoformat()
+        }
+    }, assignment.agent_id)
+
+    # Notify creator
+    await manager.send_personal_message({
+        "event": "task:assignment_created",
+        "data": {
+            "task_id": assignment.task_id,
+            "agent_id": assignment.agent_id
+        }
+    }, ctx.agent_id)
 
 
-async def handle_task_update(agent_id: str, data: dict):
+async def handle_task_update(ctx: ConnectionContext, data: dict):
     """Handle task status update from agent"""
-    from app.services.task_service import TaskService
-    from app.core.database import get_db
-    from app.schemas.task import TaskUpdate
-    
-    async for db in get_db():
-        service = TaskService(db)
-        
-        update_data = TaskUpdate(**data)
-        task = await service.update_task(data.get("task_id"), update_data)
-        
-        # Broadcast task update
-        await manager.broadcast({
-            "event": "task:updated",
+    update_data = TaskUpdate(**data)
+    task = await ctx.tasks.update_task(data.get("task_id"), update_data)
+    await announce_task_updated(task)
+
+
+async def announce_task_updated(task):
+    """Broadcast task update"""
+    await manager.broadcast({
+        "event": "task:updated",
+        "data": {
+            "id": task.id,
+            "status": task.status,
+            "updated_at": task.updated_at.isoformat() if hasattr(task, 'updated_at') else None
+        }
+    })
+
+
+def batch_operation(ctx: ConnectionContext, event_type: Optional[str], data: dict) -> Tuple[str, Any]:
+    """Service operation for one event of a batch; raises ValueError if it cannot be batched"""
+    if event_type == "task:create":
+        return "create", task_create_data(ctx, data)
+    if event_type == "task:assign":
+        return "assign", (data["task_id"], data["agent_id"])
+    if event_type == "task:update":
+        return "update", (data["task_id"], TaskUpdate(**data))
+    raise ValueError(f"Event {event_type} cannot be batched")
+
+
+async def handle_batch(ctx: ConnectionContext, data: dict):
+    """Handle a batch of task events applied in one transaction
+
+    Replies with one ``batch:result`` frame holding a result per event, in
+    order, and then announces each successful event as if it had been sent
+    on its own. Later events may refer to a task created earlier in the
+    batch as "#<index>".
+    """
+    events: List[dict] = [event if isinstance(event, dict) else {} for event in data.get("events") or []]
+    if len(events) > MAX_BATCH_SIZE:
+        await manager.send_personal_message({
+            "event": "batch:result",
             "data": {
-                "id": task.id,
-                "status": task.status,
-                "updated_at": task.updated_at.isoformat() if hasattr(task, 'updated_at') else None
+                "id": data.get("id"),
+                "error": f"A batch holds at most {MAX_BATCH_SIZE} events"
             }
-        })
-        
-        break
+        }, ctx.agent_id)
+        return
 
+    operations, rejected = [], {}
+    for index, event in enumerate(events):
+        try:
+            operations.append(batch_operation(ctx, event.get("event"), event.get("data") or {}))
+        except (KeyError, ValueError, ValidationError) as e:
+            operations.append(None)
+            rejected[index] = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
 
-async def handle_memory_set(agent_id: str, data: dict):
-    """Handle memory setting from agent"""
-    from app.services.memory_service import MemoryService
-    from app.core.database import get_db
-    from app.schemas.memory import MemoryCreate, MemoryUpdate
-    
-    async for db in get_db():
-        service = MemoryService(db)
-        
-        # Check if memory exists
-        existing = await service.get_memory_by_key(data.get("key"))
-        
-        if existing:
-            # Update existing memory
-            update_data = MemoryUpdate(
-                value=data.get("value"),
-                access_control=data.get("access_control")
-            )
-            memory = await service.update_memory(existing.id, update_data)
+    outcomes = await ctx.tasks.apply_batch(operations)
+
+    results = []
+    for index, (event, outcome) in enumerate(zip(events, outcomes)):
+        if outcome is None:
+            result = TaskBulkResult(index=index, ok=False, error=rejected[index])
         else:
-            # Create new memory
-            memory_data = MemoryCreate(
-                key=data.get("key"),
-                value=data.get("value"),
-                created_by=agent_id,
-                access_control=data.get("access_control")
-            )
-            memory = await service.create_memory(memory_data)
-        
-        # Broadcast memory update
-        await manager.broadcast({
-            "event": "memory:updated",
+            result = TaskBulkResult.from_outcome(outcome)
+        results.append({"event": event.get("event"), **result.model_dump()})
+
+    await manager.send_personal_message({
+        "event": "batch:result",
+        "data": {
+            "id": data.get("id"),
+            "results": results
+        }
+    }, ctx.agent_id)
+
+    for outcome in outcomes:
+        if outcome is None or not outcome["ok"]:
+            continue
+        if outcome["assignment"] is not None:
+            await announce_assignment(ctx, outcome["assignment"])
+        elif operations[outcome["index"]][0] == "create":
+            await announce_task_created(outcome["task"])
+        else:
+            await announce_task_updated(outcome["task"])
+
+
+async def handle_memory_set(ctx: ConnectionContext, data: dict):
+    """Handle memory setting from agent"""
+    # Check if memory exists
+    existing = await ctx.memory.get_memory_by_key(data.get("key"))
+
+    if existing:
+        # Update existing memory
+        update_data = MemoryUpdate(
+            value=data.get("value"),
+            access_control=data.get("access_control")
+        )
+        memory = await ctx.memory.update_memory(existing.id, update_data)
+    else:
+        # Create new memory
+        memory_data = MemoryCreate(
+            key=data.get("key"),
+            value=data.get("value"),
+            created_by=ctx.agent_id,
+            access_control=data.get("access_control")
+        )
+        memory = await ctx.memory.create_memory(memory_data)
+
+    # Broadcast memory update
+    await manager.broadcast({
+        "event": "memory:updated",
+        "data": {
+            "key": memory.key,
+            "version": memory.version,
+            "updated_at": memory.updated_at.isoformat()
+        }
+    })
+
+
+async def handle_memory_get(ctx: ConnectionContext, data: dict):
+    """Handle memory retrieval from agent"""
+    memory = await ctx.memory.read_memory_by_key(data.get("key"))
+
+    if memory:
+        await manager.send_personal_message({
+            "event": "memory:response",
             "data": {
                 "key": memory.key,
+                "value": memory.value,
+                "created_by": memory.created_by,
+                "version": memory.version,
                 "updated_at": memory.updated_at.isoformat()
             }
-        })
-        
-        break
+        }, ctx.agent_id)
+    else:
+        await manager.send_personal_message({
+            "event": "memory:response",
+            "data": {
+                "key": data.get("key"),
+                "error": "Memory not found"
+            }
+        }, ctx.agent_id)
 
 
-async def handle_memory_get(agent_id: str, data: dict, websocket: WebSocket):
-    """Handle memory retrieval from agent"""
-    from app.services.memory_service import MemoryService
-    from app.core.database import get_db
-    
-    async for db in get_db():
-        service = MemoryService(db)
-        
-        memory = await service.get_memory_by_key(data.get("key"))
-        
-        if memory:
-            await websocket.send_json({
-                "event": "memory:response",
-                "data": {
-                    "key": memory.key,
-                    "value": memory.value,
-                    "created_by": memory.created_by,
-                    "updated_at": memory.updated_at.isoformat()
-                }
-            })
-        else:
-            await websocket.send_json({
-                "event": "memory:response",
-                "data": {
-                    "key": data.get("key"),
-                    "error": "Memory not found"
-                }
-            })
-        
-        break
\ No newline at end of file
+EventHandler = Callable[[ConnectionContext, dict], Awaitable[None]]
+
+# Dispatch table: event name -> handler
+EVENT_HANDLERS: Dict[str, EventHandler] = {
+    "agent:register": handle_register,
+    "agent:heartbeat": handle_heartbeat,
+    "agent:ready": handle_ready,
+    "agent:busy": handle_busy,
+    "message:send": handle_message_send,
+    "task:create": handle_task_create,
+    "task:assign": handle_task_assign,
+    "task:update": handle_task_update,
+    "batch": handle_batch,
+    "memory:set": handle_memory_set,
+    "memory:get": handle_memory_get,
+}
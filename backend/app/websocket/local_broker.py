@@ -0,0 +1,148 @@
+"""Minimal Redis-compatible broker for running several workers on one host.
+
+Implements only what ``RedisEventBus`` needs (pub/sub and a few hash
+commands) over a Unix socket or TCP, so a multi-worker deployment on a single
+machine does not need a Redis server:
+
+    python -m app.websocket.local_broker --unix /tmp/agent-hub.sock
+    EVENT_BUS_URL=unix:///tmp/agent-hub.sock uvicorn app.main:app --workers 4
+
+State lives in memory and is lost when the broker stops.
+"""
+from typing import Dict, List, Optional, Set
+import argparse
+import asyncio
+import logging
+
+from app.websocket.event_bus import encode_command
+
+logger = logging.getLogger(__name__)
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _integer(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+class LocalBroker:
+    """In-memory broker speaking a subset of the Redis protocol"""
+
+    def __init__(self):
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Listen on a Unix socket if ``path`` is given, otherwise on TCP"""
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for subscribers in self.channels.values():
+            for writer in subscribers:
+                writer.close()
+        self.channels.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                writer.write(self._execute(command, writer))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for subscribers in self.channels.values():
+                subscribers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> List[bytes]:
+        header = await reader.readuntil(b"\r\n")
+        if header[:1] != b"*":
+            # Inline command, e.g. "PING" typed into netcat
+            return header.strip().split()
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _execute(self, command: List[bytes], writer: asyncio.StreamWriter) -> bytes:
+        if not command:
+            return b"-ERR empty command\r\n"
+        name, args = command[0].upper(), command[1:]
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"PUBLISH" and len(args) == 2:
+            return _integer(self._publish(args[0], args[1]))
+        if name == b"SUBSCRIBE" and args:
+            replies = []
+            for channel in args:
+                self.channels.setdefault(channel, set()).add(writer)
+                subscribed = sum(writer in subscribers for subscribers in self.channels.values())
+                replies.append(b"*3\r\n" + _bulk(b"subscribe") + _bulk(channel) + _integer(subscribed))
+            return b"".join(replies)
+        if name == b"HSET" and len(args) >= 3 and len(args) % 2 == 1:
+            fields = self.hashes.setdefault(args[0], {})
+            added = 0
+            for i in range(1, len(args), 2):
+                added += args[i] not in fields
+                fields[args[i]] = args[i + 1]
+            return _integer(added)
+        if name == b"HGET" and len(args) == 2:
+            return _bulk(self.hashes.get(args[0], {}).get(args[1]))
+        if name == b"HDEL" and len(args) >= 2:
+            fields = self.hashes.get(args[0], {})
+            removed = sum(fields.pop(field, None) is not None for field in args[1:])
+            return _integer(removed)
+        if name == b"HGETALL" and len(args) == 1:
+            fields = self.hashes.get(args[0], {})
+            items = [_bulk(value) for pair in fields.items() for value in pair]
+            return b"*%d\r\n" % len(items) + b"".join(items)
+        if name == b"DEL" and args:
+            return _integer(sum(self.hashes.pop(key, None) is not None for key in args))
+        return b"-ERR unsupported command '%s'\r\n" % name
+
+    def _publish(self, channel: bytes, message: bytes) -> int:
+        subscribers = self.channels.get(channel, set())
+        frame = encode_command(b"message", channel, message)
+        for writer in list(subscribers):
+            writer.write(frame)
+        return len(subscribers)
+
+
+async def _serve(path: Optional[str], host: str, port: int):
+    broker = LocalBroker()
+    server = await broker.start(path=path, host=host, port=port)
+    logger.info(f"Local event bus broker listening on {path or server.sockets[0].getsockname()}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Redis-compatible broker for the WebSocket event bus")
+    parser.add_argument("--unix", help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(_serve(args.unix, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
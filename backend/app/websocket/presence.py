@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Set
+from datetime import datetime
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.agent import Agent
+from app.services.task_service import TaskService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceTracker:
+    """In-memory last_seen/status of agents, flushed to the agents table in batches
+
+    Connects, disconnects and heartbeats only touch this table. A background
+    task writes the changes with one batched UPDATE every flush interval, and
+    right away when an agent disconnects, so heartbeats never take the SQLite
+    write lock. Status is only written when it changed here, so a heartbeat
+    does not overwrite a status set through the REST API. The same flush
+    extends the task leases of agents that are still online.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        flush_interval: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval or settings.PRESENCE_FLUSH_INTERVAL
+        # {agent_id: {"status": ..., "last_seen": ...}}
+        self._entries: Dict[str, dict] = {}
+        self._dirty: Set[str] = set()
+        self._status_dirty: Set[str] = set()
+        self._flush_now = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self.flush_count = 0
+
+    def mark_online(self, agent_id: str):
+        """Record a new connection"""
+        self._set(agent_id, "online")
+
+    def mark_offline(self, agent_id: str):
+        """Record a disconnect and flush soon"""
+        self._set(agent_id, "offline")
+        self._flush_now.set()
+
+    def touch(self, agent_id: str):
+        """Record a heartbeat"""
+        entry = self._entries.setdefault(agent_id, {"status": "online", "last_seen": None})
+        entry["last_seen"] = datetime.utcnow()
+        self._dirty.add(agent_id)
+
+    def _set(self, agent_id: str, status: str):
+        self._entries[agent_id] = {"status": status, "last_seen": datetime.utcnow()}
+        self._dirty.add(agent_id)
+        self._status_dirty.add(agent_id)
+
+    def get(self, agent_id: str) -> Optional[dict]:
+        """Get the in-memory presence of an agent, if known"""
+        entry = self._entries.get(agent_id)
+        return dict(entry) if entry else None
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Get presence of every agent known to this worker"""
+        return {agent_id: dict(entry) for agent_id, entry in self._entries.items()}
+
+    def online_agent_ids(self) -> Set[str]:
+        return {agent_id for agent_id, entry in self._entries.items() if entry["status"] == "online"}
+
+    def pending_count(self) -> int:
+        """Number of agents with changes not yet written"""
+        return len(self._dirty)
+
+    async def flush(self) -> int:
+        """Write pending changes in one transaction; returns the number of agents written"""
+        if not self._dirty:
+            return 0
+        dirty, status_dirty = self._dirty, self._status_dirty
+        self._dirty, self._status_dirty = set(), set()
+        with_status: List[dict] = []
+        seen_only: List[dict] = []
+        for agent_id in dirty:
+            entry = self._entries[agent_id]
+            params = {"agent_id": agent_id, "last_seen": entry["last_seen"]}
+            if agent_id in status_dirty:
+                with_status.append({**params, "status": entry["status"]})
+            else:
+                seen_only.append(params)
+
+        agents = Agent.__table__
+        stmt = update(agents).where(agents.c.id == bindparam("agent_id"))
+        try:
+            async with self.session_factory() as db:
+                if with_status:
+                    await db.execute(
+                        stmt.values(last_seen=bindparam("last_seen"), status=bindparam("status")),
+                        with_status
+                    )
+                if seen_only:
+                    await db.execute(stmt.values(last_seen=bindparam("last_seen")), seen_only)
+                await TaskService(db).extend_leases(
+                    agent_id for agent_id in dirty if self._entries[agent_id]["status"] == "online"
+                )
+                await db.commit()
+        except Exception:
+            # Keep the changes for the next attempt
+            self._dirty |= dirty
+            self._status_dirty |= status_dirty
+            raise
+        self.flush_count += 1
+
+        # Forget agents that went offline once that is persisted
+        for agent_id in dirty:
+            if agent_id not in self._dirty and self._entries[agent_id]["status"] == "offline":
+                del self._entries[agent_id]
+        return len(dirty)
+
+    def start(self):
+        """Start flushing in the background"""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background flusher and write what is left"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing agent presence: {e}")
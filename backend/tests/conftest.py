@@ -8,6 +8,7 @@ from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.core.database import Base, get_db
 from app.models import Agent, Message, Task, TaskAssignment, SharedMemory
+from app.services.memory_cache import memory_cache
 
 
 # Test database URL (in-memory SQLite)
@@ -22,6 +23,14 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Every test gets a fresh database, so cached memory rows must not leak between tests."""
+    memory_cache.clear()
+    yield
+    memory_cache.clear()
+
+
 @pytest.fixture(scope="function")
 async def test_db() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session."""
@@ -0,0 +1,95 @@
+"""Microbenchmark: broadcast cost against connection count.
+
+Compares the previous fan-out (``send_json`` per recipient, awaited one after
+another, so the event is JSON-encoded once per connection) with the
+serialize-once path of ``ConnectionManager.broadcast``. Sockets are in-memory
+stand-ins, so the numbers are encoding and scheduling overhead only.
+
+    python -m pytest tests/test_broadcast_benchmark.py -m slow -s --no-cov
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.websocket.connection_manager import ConnectionManager
+
+CONNECTION_COUNTS = (10, 50, 200)
+BROADCASTS = 200
+
+
+class NullWebSocket:
+    """Accepts frames and discards them, counting deliveries."""
+
+    def __init__(self):
+        self.frames = 0
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        # What starlette's WebSocket.send_json does before writing the frame
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        self.frames += 1
+
+    async def send_text(self, data: str):
+        self.frames += 1
+
+    async def send_bytes(self, data: bytes):
+        self.frames += 1
+
+
+def task_updated(index: int) -> dict:
+    return {
+        "event": "task:updated",
+        "data": {
+            "id": f"task-{index}",
+            "status": "in_progress",
+            "title": "Summarize the weekly agent activity report",
+            "requirements": {"skills": ["python", "analysis"], "deadline": "2026-01-01T00:00:00"},
+            "updated_at": "2026-01-01T00:00:00",
+        },
+    }
+
+
+async def per_recipient_broadcast(sockets, broadcasts: int) -> float:
+    started = time.perf_counter()
+    for index in range(broadcasts):
+        message = task_updated(index)
+        for websocket in sockets:
+            await websocket.send_json(message)
+    return time.perf_counter() - started
+
+
+async def serialize_once_broadcast(sockets, broadcasts: int) -> float:
+    manager = ConnectionManager(queue_size=broadcasts)
+    for i, websocket in enumerate(sockets):
+        await manager.connect(websocket, f"agent-{i}")
+    expected = broadcasts * len(sockets)
+
+    started = time.perf_counter()
+    for index in range(broadcasts):
+        await manager.broadcast(task_updated(index))
+    while sum(websocket.frames for websocket in sockets) < expected:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    await manager.close_all()
+    return elapsed
+
+
+@pytest.mark.slow
+async def test_broadcast_cost_by_connection_count():
+    """Benchmark broadcast cost for growing numbers of connections"""
+    print(f"\n{'connections':>11} {'per-recipient':>15} {'serialize-once':>15} {'speedup':>8}")
+    for count in CONNECTION_COUNTS:
+        baseline_sockets = [NullWebSocket() for _ in range(count)]
+        shared_sockets = [NullWebSocket() for _ in range(count)]
+
+        baseline = await per_recipient_broadcast(baseline_sockets, BROADCASTS)
+        shared = await serialize_once_broadcast(shared_sockets, BROADCASTS)
+
+        per_event = 1e6 / BROADCASTS
+        print(f"{count:>11} {baseline * per_event:>12.1f} us {shared * per_event:>12.1f} us {baseline / shared:>7.2f}x")
+        assert sum(websocket.frames for websocket in shared_sockets) == BROADCASTS * count
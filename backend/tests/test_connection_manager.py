@@ -0,0 +1,180 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.websocket.connection_manager import ConnectionManager, msgpack
+
+
+class FakeWebSocket:
+    """Records sent messages; blocks sends while ``stalled`` is set."""
+
+    def __init__(self, stalled: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.release = asyncio.Event()
+        if not stalled:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        await self.release.wait()
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data: bytes):
+        await self.release.wait()
+        self.sent.append(msgpack.unpackb(data))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def wait_for(predicate, timeout: float = 1.0):
+    """Yield to the writer tasks until ``predicate`` holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0)
+
+
+def task_updated(task_id: str, status: str) -> dict:
+    return {"event": "task:updated", "data": {"id": task_id, "status": status}}
+
+
+@pytest.mark.unit
+async def test_broadcast_does_not_wait_for_slow_consumer():
+    """Test a stalled socket does not delay delivery to other agents"""
+    manager = ConnectionManager(queue_size=8)
+    fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+    await manager.connect(fast, "fast")
+    await manager.connect(slow, "slow")
+
+    await asyncio.wait_for(manager.broadcast(task_updated("t1", "pending")), timeout=0.1)
+    await wait_for(lambda: len(fast.sent) == 1)
+
+    assert slow.sent == []
+    assert manager.get_queue_stats("slow")["slow"]["sent"] == 0
+
+    slow.release.set()
+    await wait_for(lambda: len(slow.sent) == 1)
+    assert manager.get_queue_stats("slow")["slow"]["sent"] == 1
+    await manager.close_all()
+
+
+@pytest.mark.unit
+async def test_drop_oldest_policy():
+    """Test a full queue discards its oldest message"""
+    manager = ConnectionManager(queue_size=2, overflow_policy="drop_oldest")
+    slow = FakeWebSocket(stalled=True)
+    await manager.connect(slow, "slow")
+    # Let the writer take the first message off the queue and block on it
+    await manager.send_personal_message(task_updated("t0", "pending"), "slow")
+    await wait_for(lambda: manager.get_queue_stats("slow")["slow"]["depth"] == 0)
+
+    for i in range(1, 5):
+        await manager.send_personal_message(task_updated(f"t{i}", "pending"), "slow")
+
+    stats = manager.get_queue_stats("slow")["slow"]
+    assert stats["depth"] == 2
+    assert stats["dropped"] == 2
+
+    slow.release.set()
+    await wait_for(lambda: len(slow.sent) == 3)
+    assert [m["data"]["id"] for m in slow.sent] == ["t0", "t3", "t4"]
+    await manager.close_all()
+
+
+@pytest.mark.unit
+async def test_coalesce_policy():
+    """Test a full queue replaces a queued message about the same entity"""
+    manager = ConnectionManager(queue_size=2, overflow_policy="coalesce")
+    slow = FakeWebSocket(stalled=True)
+    await manager.connect(slow, "slow")
+    await manager.send_personal_message(task_updated("t0", "pending"), "slow")
+    await wait_for(lambda: manager.get_queue_stats("slow")["slow"]["depth"] == 0)
+
+    await manager.send_personal_message(task_updated("t1", "pending"), "slow")
+    await manager.send_personal_message(task_updated("t2", "pending"), "slow")
+    await manager.send_personal_message(task_updated("t1", "completed"), "slow")
+
+    stats = manager.get_queue_stats("slow")["slow"]
+    assert stats["coalesced"] == 1
+    assert stats["dropped"] == 0
+
+    slow.release.set()
+    await wait_for(lambda: len(slow.sent) == 3)
+    assert slow.sent[1] == task_updated("t1", "completed")
+    await manager.close_all()
+
+
+@pytest.mark.unit
+async def test_disconnect_policy_evicts_slow_consumer():
+    """Test a full queue disconnects the slow consumer"""
+    manager = ConnectionManager(queue_size=1, overflow_policy="disconnect")
+    slow = FakeWebSocket(stalled=True)
+    await manager.connect(slow, "slow")
+    await manager.send_personal_message(task_updated("t0", "pending"), "slow")
+    await wait_for(lambda: manager.get_queue_stats("slow")["slow"]["depth"] == 0)
+
+    await manager.broadcast(task_updated("t1", "pending"))
+    await manager.broadcast(task_updated("t2", "pending"))
+
+    assert not manager.is_connected("slow")
+    assert manager.evicted_count == 1
+    await wait_for(lambda: slow.closed_with is not None)
+    assert slow.closed_with == 1013
+    await manager.close_all()
+
+
+@pytest.mark.unit
+async def test_broadcast_encodes_once_per_encoding(monkeypatch):
+    """Test a broadcast is serialized once per wire encoding, not per recipient"""
+    if msgpack is None:
+        pytest.skip("msgpack is not installed")
+    calls = {"json": 0, "msgpack": 0}
+    dumps, packb = json.dumps, msgpack.packb
+
+    def counting_dumps(*args, **kwargs):
+        calls["json"] += 1
+        return dumps(*args, **kwargs)
+
+    def counting_packb(*args, **kwargs):
+        calls["msgpack"] += 1
+        return packb(*args, **kwargs)
+
+    monkeypatch.setattr("app.websocket.connection_manager.json.dumps", counting_dumps)
+    monkeypatch.setattr("app.websocket.connection_manager.msgpack.packb", counting_packb)
+
+    manager = ConnectionManager(queue_size=8)
+    sockets = [FakeWebSocket() for _ in range(6)]
+    for i, websocket in enumerate(sockets):
+        encoding = await manager.connect(websocket, f"agent-{i}", encoding="msgpack" if i % 2 else None)
+        assert encoding == ("msgpack" if i % 2 else "json")
+
+    message = task_updated("t1", "completed")
+    await manager.broadcast(message)
+    await wait_for(lambda: all(websocket.sent for websocket in sockets))
+
+    assert all(websocket.sent == [message] for websocket in sockets)
+    assert calls == {"json": 1, "msgpack": 1}
+    await manager.close_all()
+
+
+@pytest.mark.unit
+def test_unknown_overflow_policy():
+    """Test an invalid overflow policy is rejected"""
+    with pytest.raises(ValueError):
+        ConnectionManager(overflow_policy="block")
+
+
+@pytest.mark.unit
+async def test_connection_stats_endpoint(client: AsyncClient):
+    """Test the queue statistics endpoint"""
+    response = await client.get("/api/agents/connections")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["overflow_policy"] in ("drop_oldest", "coalesce", "disconnect")
+    assert data["connections"] == {}
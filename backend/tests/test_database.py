@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import apply_sqlite_pragmas, migrate_sqlite_schema, sqlite_pragmas
+from app import models  # noqa: F401  (registers the tables)
+
+
+async def read_pragmas(engine, *names):
+    async with engine.connect() as conn:
+        return {name: (await conn.execute(text(f"PRAGMA {name}"))).scalar() for name in names}
+
+
+@pytest.mark.unit
+async def test_tuned_profile_applied_on_connect(tmp_path):
+    """Every new connection gets the profile's pragmas"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas("tuned", {}))
+    try:
+        pragmas = await read_pragmas(engine, "journal_mode", "synchronous", "busy_timeout", "temp_store")
+    finally:
+        await engine.dispose()
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1  # NORMAL
+    assert pragmas["busy_timeout"] == 5000
+    assert pragmas["temp_store"] == 2  # MEMORY
+
+
+@pytest.mark.unit
+async def test_default_profile_leaves_sqlite_defaults(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'default.db'}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas("default", {}))
+    try:
+        pragmas = await read_pragmas(engine, "journal_mode", "synchronous")
+    finally:
+        await engine.dispose()
+    assert pragmas["journal_mode"] == "delete"
+    assert pragmas["synchronous"] == 2  # FULL
+
+
+@pytest.mark.unit
+def test_pragma_overrides():
+    pragmas = sqlite_pragmas("tuned", {"mmap_size": 0, "wal_autocheckpoint": 2000})
+    assert pragmas["mmap_size"] == 0
+    assert pragmas["wal_autocheckpoint"] == 2000
+    assert pragmas["journal_mode"] == "WAL"
+
+
+@pytest.mark.unit
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("fastest", {})
+
+
+@pytest.mark.unit
+async def test_migration_adds_missing_columns(tmp_path):
+    """Tables created before a column existed get it added, with its indexes, once"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE tasks (id VARCHAR PRIMARY KEY, creator_id VARCHAR NOT NULL, title VARCHAR NOT NULL, "
+                "description VARCHAR, status VARCHAR, priority INTEGER, created_at DATETIME, due_date DATETIME, "
+                "completed_at DATETIME, requirements JSON)"
+            ))
+            await conn.execute(text("INSERT INTO tasks (id, creator_id, title) VALUES ('t1', 'a1', 'old')"))
+            await conn.execute(text(
+                "CREATE TABLE shared_memory (id VARCHAR PRIMARY KEY, key VARCHAR NOT NULL UNIQUE, value JSON NOT NULL, "
+                "created_by VARCHAR NOT NULL, created_at DATETIME, updated_at DATETIME, access_control JSON)"
+            ))
+            await conn.execute(text("INSERT INTO shared_memory (id, key, value, created_by) VALUES ('m1', 'k', '{}', 'a1')"))
+        async with engine.begin() as conn:
+            added = await conn.run_sync(migrate_sqlite_schema)
+        async with engine.begin() as conn:
+            assert await conn.run_sync(migrate_sqlite_schema) == []
+            columns = {row[1] for row in (await conn.execute(text("PRAGMA table_info(tasks)"))).all()}
+            indexes = {row[1] for row in (await conn.execute(text("PRAGMA index_list(tasks)"))).all()}
+            row = (await conn.execute(text("SELECT title, claimed_by FROM tasks"))).one()
+            version = (await conn.execute(text("SELECT version FROM shared_memory"))).scalar()
+    finally:
+        await engine.dispose()
+    assert added == [
+        "tasks.claimed_by", "tasks.lease_expires_at", "tasks.run_at", "tasks.schedule_id", "shared_memory.version"
+    ]
+    assert {"claimed_by", "lease_expires_at", "run_at", "schedule_id"} <= columns
+    assert {
+        "ix_tasks_claimed_by", "ix_tasks_lease_expires_at", "ix_tasks_run_at", "ix_tasks_schedule_id"
+    } <= indexes
+    assert tuple(row) == ("old", None)
+    assert version == 1
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Agent, Task
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService, task_listeners
+from app.websocket.connection_manager import ConnectionManager
+from app.websocket.dispatcher import TaskDispatcher
+from tests.test_connection_manager import FakeWebSocket, wait_for
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dispatch.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add_all([Agent(id=agent_id, name=agent_id, type="llm") for agent_id in ("boss", "py", "any")])
+        await db.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def dispatch(session_factory):
+    """A dispatcher with two connected agents, "py" and "any"."""
+    manager = ConnectionManager()
+    sockets = {"py": FakeWebSocket(), "any": FakeWebSocket()}
+    for agent_id, websocket in sockets.items():
+        await manager.connect(websocket, agent_id)
+    dispatcher = TaskDispatcher(manager, session_factory, resync_interval=60)
+    await dispatcher.start()
+    yield dispatcher, sockets
+    await dispatcher.stop()
+    await manager.close_all()
+    assert dispatcher not in task_listeners
+
+
+async def create_task(factory, title: str, priority: int = 1, skills=None) -> Task:
+    async with factory() as db:
+        return await TaskService(db).create_task(TaskCreate(
+            creator_id="boss", title=title, priority=priority, requirements={"skills": skills or []}
+        ))
+
+
+def assigned(websocket) -> list:
+    return [frame["data"]["task_id"] for frame in websocket.sent if frame["event"] == "task:assigned"]
+
+
+@pytest.mark.unit
+async def test_runnable_task_pushed_to_capable_agent(dispatch, session_factory):
+    """Test new tasks go straight to idle agents that can run them"""
+    dispatcher, sockets = dispatch
+    dispatcher.mark_ready("py", ["python"])
+    dispatcher.mark_ready("any")
+
+    python = await create_task(session_factory, "python", priority=4, skills=["python"])
+    await wait_for(lambda: assigned(sockets["py"]))
+    generic = await create_task(session_factory, "generic", priority=1)
+    await wait_for(lambda: assigned(sockets["any"]))
+
+    assert assigned(sockets["py"]) == [python.id]
+    assert assigned(sockets["any"]) == [generic.id]
+    async with session_factory() as db:
+        task = await db.get(Task, python.id)
+        assert task.status == "in_progress"
+        assert task.claimed_by == "py"
+
+
+@pytest.mark.unit
+async def test_highest_priority_first(dispatch, session_factory):
+    """Test queued tasks are pushed most urgent first once an agent is ready"""
+    dispatcher, sockets = dispatch
+    low = await create_task(session_factory, "low", priority=1)
+    urgent = await create_task(session_factory, "urgent", priority=4)
+    assert dispatcher.queued_task_ids() == [urgent.id, low.id]
+
+    dispatcher.mark_ready("any")
+    await wait_for(lambda: assigned(sockets["any"]))
+    assert assigned(sockets["any"]) == [urgent.id]
+    assert dispatcher.queued_task_ids() == [low.id]
+
+    # Finishing makes the agent ready again, without polling
+    async with session_factory() as db:
+        await TaskService(db).complete_task(urgent.id, "any")
+    await wait_for(lambda: len(assigned(sockets["any"])) == 2)
+    assert assigned(sockets["any"]) == [urgent.id, low.id]
+
+
+@pytest.mark.unit
+async def test_incapable_agent_skipped(dispatch, session_factory):
+    """Test tasks needing a skill nobody ready has stay queued"""
+    dispatcher, sockets = dispatch
+    rust = await create_task(session_factory, "rust", priority=4, skills=["rust"])
+    dispatcher.mark_ready("py", ["python"])
+    assert await dispatcher.dispatch() == 0
+    assert dispatcher.queued_task_ids() == [rust.id]
+    assert assigned(sockets["py"]) == []
+
+
+@pytest.mark.unit
+async def test_rebuild_loads_pending_tasks(session_factory):
+    """Test the queue is rebuilt from the database at startup"""
+    task = await create_task(session_factory, "existing", priority=2)
+    dispatcher = TaskDispatcher(ConnectionManager(), session_factory, resync_interval=60)
+    await dispatcher.rebuild()
+    assert dispatcher.queued_task_ids() == [task.id]
+
+
+@pytest.mark.unit
+async def test_busy_dispatcher_still_resyncs(session_factory):
+    """Test a dispatcher woken all the time still picks up tasks other workers wrote"""
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "any")
+    dispatcher = TaskDispatcher(manager, session_factory, resync_interval=0.05)
+    await dispatcher.start()
+    dispatcher.mark_ready("any")
+
+    async def keep_waking():
+        while True:
+            dispatcher._wake.set()
+            await asyncio.sleep(0.01)
+
+    waker = asyncio.create_task(keep_waking())
+    try:
+        # Written straight to the database, so no listener hears about it
+        async with session_factory() as db:
+            task = Task(creator_id="boss", title="elsewhere", status="pending", requirements={})
+            db.add(task)
+            await db.commit()
+        await wait_for(lambda: assigned(websocket), timeout=2.0)
+        assert assigned(websocket) == [task.id]
+    finally:
+        waker.cancel()
+        await dispatcher.stop()
+        await manager.close_all()
@@ -0,0 +1,109 @@
+import pytest
+
+from app.websocket.connection_manager import ConnectionManager
+from app.websocket.event_bus import EventBus, InProcessEventBus, RedisEventBus, create_event_bus
+from app.websocket.local_broker import LocalBroker
+from tests.test_connection_manager import FakeWebSocket, wait_for
+
+
+@pytest.fixture
+async def local_broker(tmp_path):
+    """Redis stand-in listening on a Unix socket."""
+    broker = LocalBroker()
+    path = str(tmp_path / "bus.sock")
+    await broker.start(path=path)
+    yield f"unix://{path}"
+    await broker.close()
+
+
+@pytest.fixture(params=["in_process", "local_broker"])
+async def workers(request, local_broker):
+    """Two connection managers standing in for two uvicorn workers."""
+    if request.param == "in_process":
+        bus = InProcessEventBus()
+        buses = [bus, bus]
+    else:
+        buses = [RedisEventBus(local_broker), RedisEventBus(local_broker)]
+    managers = [ConnectionManager(bus=bus, worker_id=f"worker-{i}") for i, bus in enumerate(buses)]
+    for manager in managers:
+        await manager.start()
+    yield managers
+    for manager in managers:
+        await manager.close_all()
+
+
+@pytest.mark.unit
+async def test_send_personal_message_reaches_other_worker(workers):
+    """Test a direct message is delivered by the worker owning the socket"""
+    worker_a, worker_b = workers
+    websocket = FakeWebSocket()
+    await worker_b.connect(websocket, "agent-b")
+
+    message = {"event": "task:assigned", "data": {"task_id": "t1"}}
+    assert await worker_a.send_personal_message(message, "agent-b")
+    await wait_for(lambda: websocket.sent == [message])
+
+
+@pytest.mark.unit
+async def test_send_to_agents_and_broadcast_span_workers(workers):
+    """Test fan-out reaches agents on every worker exactly once"""
+    worker_a, worker_b = workers
+    sockets = {"a1": FakeWebSocket(), "a2": FakeWebSocket(), "b1": FakeWebSocket()}
+    await worker_a.connect(sockets["a1"], "a1")
+    await worker_a.connect(sockets["a2"], "a2")
+    await worker_b.connect(sockets["b1"], "b1")
+
+    message = {"event": "message:received", "data": {"id": "m1"}}
+    await worker_a.send_to_agents(message, ["a2", "b1"])
+    await wait_for(lambda: sockets["a2"].sent == [message] and sockets["b1"].sent == [message])
+
+    update = {"event": "task:updated", "data": {"id": "t1", "status": "completed"}}
+    await worker_b.broadcast(update, exclude_agent_id="b1")
+    await wait_for(lambda: sockets["a1"].sent == [update] and sockets["a2"].sent == [message, update])
+    assert sockets["b1"].sent == [message]
+
+
+@pytest.mark.unit
+async def test_presence_is_shared(workers):
+    """Test presence lists agents on all workers and follows reconnects"""
+    worker_a, worker_b = workers
+    await worker_a.connect(FakeWebSocket(), "agent-1")
+    await worker_b.connect(FakeWebSocket(), "agent-2")
+    assert await worker_a.get_presence() == {"agent-1": "worker-0", "agent-2": "worker-1"}
+
+    # agent-1 reconnects to worker B before worker A notices the old socket is gone
+    await worker_b.connect(FakeWebSocket(), "agent-1")
+    worker_a.disconnect("agent-1")
+    worker_b.disconnect("agent-2")
+    await wait_for(lambda: not worker_a._background_tasks and not worker_b._background_tasks)
+    assert await worker_b.get_presence() == {"agent-1": "worker-1"}
+
+
+@pytest.mark.unit
+async def test_unreachable_agent(local_broker):
+    """Test sending to an agent connected nowhere reports failure"""
+    manager = ConnectionManager(bus=create_event_bus(local_broker), worker_id="solo")
+    await manager.start()
+    assert not await manager.send_personal_message({"event": "ping", "data": {}}, "ghost")
+    await manager.close_all()
+
+
+@pytest.mark.unit
+def test_unsupported_event_bus_url():
+    """Test an unknown bus URL scheme is rejected"""
+    with pytest.raises(ValueError):
+        create_event_bus("amqp://localhost")
+
+
+@pytest.mark.unit
+def test_event_bus_interface_is_abstract():
+    """Test a backend missing part of the interface fails when it is constructed"""
+    with pytest.raises(TypeError):
+        EventBus()
+
+    class PublishOnly(EventBus):
+        async def publish(self, envelope: dict) -> int:
+            return 0
+
+    with pytest.raises(TypeError):
+        PublishOnly()
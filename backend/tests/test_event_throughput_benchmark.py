@@ -0,0 +1,94 @@
+"""Benchmark: WebSocket event throughput through ``process_agent_event``.
+
+Drives a mix of heartbeat, memory and message events against a SQLite file
+database, paced at a target rate (0 = as fast as possible), once with a fresh
+``ConnectionContext`` per event (the previous session-per-frame behaviour) and
+once with one context for the whole connection. Tune with environment
+variables:
+
+    BENCH_EVENTS=2000 BENCH_EVENTS_PER_SEC=500 \\
+        python -m pytest tests/test_event_throughput_benchmark.py -m slow -s --no-cov
+"""
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Agent
+from app.websocket.events import ConnectionContext, process_agent_event
+
+EVENTS = int(os.getenv("BENCH_EVENTS", "200"))
+EVENTS_PER_SEC = float(os.getenv("BENCH_EVENTS_PER_SEC", "0"))
+AGENT_ID = "bench-agent"
+
+
+def event_mix(index: int) -> dict:
+    kind = index % 4
+    if kind == 0:
+        return {"event": "agent:heartbeat", "data": {"timestamp": index}}
+    if kind == 1:
+        return {"event": "memory:set", "data": {"key": f"key-{index % 16}", "value": {"n": index}}}
+    if kind == 2:
+        return {"event": "memory:get", "data": {"key": f"key-{index % 16}"}}
+    return {"event": "message:send", "data": {"content": f"message {index}"}}
+
+
+async def drive(make_context, events: int, rate: float):
+    """Send ``events`` events at ``rate`` per second; returns (elapsed, latencies)"""
+    interval = 1 / rate if rate else 0
+    latencies = []
+    ctx = None
+    started = time.perf_counter()
+    for index in range(events):
+        if interval:
+            delay = started + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        ctx = await make_context(ctx)
+        await process_agent_event(ctx, event_mix(index))
+        latencies.append(time.perf_counter() - t0)
+    await ctx.close()
+    return time.perf_counter() - started, latencies
+
+
+@pytest.mark.slow
+async def test_event_throughput(tmp_path):
+    """Benchmark events/sec with per-event versus per-connection sessions"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bench.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add(Agent(id=AGENT_ID, name=AGENT_ID, type="llm"))
+        await db.commit()
+
+    async def per_event(previous):
+        if previous is not None:
+            await previous.close()
+        return ConnectionContext(AGENT_ID, session_factory=session_factory)
+
+    async def per_connection(previous):
+        return previous or ConnectionContext(AGENT_ID, session_factory=session_factory)
+
+    # Per-event INFO logging would dominate the measurement
+    logging.getLogger("app.websocket").setLevel(logging.WARNING)
+    try:
+        print(f"\n{EVENTS} events, target rate {EVENTS_PER_SEC or 'unpaced'} events/sec")
+        for label, make_context in (("per-event session", per_event), ("per-connection session", per_connection)):
+            elapsed, latencies = await drive(make_context, EVENTS, EVENTS_PER_SEC)
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"{label:<24} {EVENTS / elapsed:8.0f} events/s  "
+                f"p50={statistics.median(latencies) * 1e3:6.2f}ms  p99={p99 * 1e3:6.2f}ms"
+            )
+            assert len(latencies) == EVENTS
+    finally:
+        logging.getLogger("app.websocket").setLevel(logging.NOTSET)
+        await engine.dispose()
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import Agent
+from app.websocket.connection_manager import manager
+from app.websocket.events import ConnectionContext, process_agent_event
+from tests.conftest import TEST_DATABASE_URL
+from tests.test_connection_manager import FakeWebSocket, wait_for
+
+
+@pytest.fixture
+async def session_factory():
+    """Session factory over a fresh in-memory database."""
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def connected_agent(session_factory):
+    """An agent connected to the global manager with its connection context."""
+    async with session_factory() as db:
+        db.add(Agent(id="agent-1", name="agent-1", type="llm"))
+        await db.commit()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "agent-1")
+    ctx = ConnectionContext("agent-1", websocket, session_factory=session_factory)
+    yield ctx, websocket
+    await ctx.close()
+    manager.disconnect("agent-1")
+
+
+@pytest.mark.unit
+async def test_memory_set_then_get(connected_agent):
+    """Test events share the connection's session and see each other's writes"""
+    ctx, websocket = connected_agent
+    await process_agent_event(ctx, {"event": "memory:set", "data": {"key": "k", "value": {"v": 1}}})
+    await process_agent_event(ctx, {"event": "memory:set", "data": {"key": "k", "value": {"v": 2}}})
+    await process_agent_event(ctx, {"event": "memory:get", "data": {"key": "k"}})
+
+    await wait_for(lambda: any(m["event"] == "memory:response" for m in websocket.sent))
+    response = next(m for m in websocket.sent if m["event"] == "memory:response")
+    assert response["data"]["value"] == {"v": 2}
+    assert not ctx.db.in_transaction()
+
+
+@pytest.mark.unit
+async def test_heartbeat_acknowledged(connected_agent):
+    """Test heartbeat updates the agent and is acknowledged"""
+    ctx, websocket = connected_agent
+    await process_agent_event(ctx, {"event": "agent:heartbeat", "data": {"timestamp": 123}})
+    await wait_for(lambda: {"event": "agent:heartbeat_ack", "data": {"timestamp": 123}} in websocket.sent)
+
+
+@pytest.mark.unit
+async def test_failed_event_rolls_back(connected_agent):
+    """Test a failing handler leaves the session usable for the next event"""
+    ctx, websocket = connected_agent
+    with pytest.raises(Exception):
+        await process_agent_event(ctx, {"event": "task:update", "data": {"task_id": "missing"}})
+    assert not ctx.db.in_transaction()
+
+    await process_agent_event(ctx, {"event": "unknown:event", "data": {}})
+    await process_agent_event(ctx, {"event": "memory:get", "data": {"key": "nope"}})
+    await wait_for(lambda: any(m["event"] == "memory:response" for m in websocket.sent))
+
+
+@pytest.mark.unit
+async def test_batch_applies_task_events_together(connected_agent):
+    """Test a batch frame runs its task events in one go and reports each result"""
+    ctx, websocket = connected_agent
+    await process_agent_event(ctx, {"event": "batch", "data": {"id": "b1", "events": [
+        {"event": "task:create", "data": {"title": "Plan"}},
+        {"event": "task:create", "data": {"title": "Build", "depends_on": ["#0"]}},
+        {"event": "task:assign", "data": {"task_id": "#1", "agent_id": "agent-1"}},
+        {"event": "task:update", "data": {"task_id": "#0", "status": "completed"}},
+        {"event": "task:assign", "data": {"task_id": "#0"}},
+        {"event": "memory:set", "data": {"key": "k", "value": 1}},
+    ]}})
+    assert not ctx.db.in_transaction()
+
+    await wait_for(lambda: any(m["event"] == "batch:result" for m in websocket.sent))
+    reply = next(m for m in websocket.sent if m["event"] == "batch:result")["data"]
+    assert reply["id"] == "b1"
+    results = reply["results"]
+    assert [result["ok"] for result in results] == [True, True, True, True, False, False]
+    assert results[2]["task_id"] == results[1]["task_id"]
+    assert "agent_id" in results[4]["error"]
+    assert "cannot be batched" in results[5]["error"]
+
+    # Completing the plan released the assigned build task
+    build = await ctx.tasks.get_task(results[1]["task_id"])
+    assert build.status == "assigned"
+    await wait_for(lambda: any(
+        m["event"] == "task:assigned" and m["data"]["task_id"] == build.id for m in websocket.sent
+    ))
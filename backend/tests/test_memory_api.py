@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
 
+from app.models import SharedMemory
+from app.services.memory_cache import MemoryCache, memory_cache
+
 
 @pytest.mark.unit
 async def test_set_memory(client: AsyncClient, sample_agent_data, sample_memory_data):
@@ -216,4 +219,100 @@ async def test_delete_memory(client: AsyncClient, sample_agent_data, sample_memo
 async def test_delete_nonexistent_memory(client: AsyncClient):
     """Test deleting a non-existent memory"""
     response = await client.delete("/api/memory/nonexistent_key")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+@pytest.mark.unit
+async def test_search_memory(client: AsyncClient, sample_agent_data, sample_memory_data):
+    """Test full-text search follows memory writes"""
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    agent_id = agent_response.json()["id"]
+    
+    memory_data = {**sample_memory_data, "key": "project_plan", "created_by": agent_id,
+                   "value": {"step": "draft the roadmap"}}
+    await client.post("/api/memory", json=memory_data)
+    
+    data = (await client.get("/api/memory/search?q=roadmap")).json()
+    assert [hit["key"] for hit in data] == ["project_plan"]
+    assert "<mark>roadmap</mark>" in data[0]["snippet"]
+    
+    # Updates replace the indexed value
+    await client.put("/api/memory/key/project_plan", json={"value": {"step": "ship the release"}})
+    assert (await client.get("/api/memory/search?q=roadmap")).json() == []
+    assert len((await client.get("/api/memory/search?q=release")).json()) == 1
+    
+    # Deletes remove it
+    await client.delete("/api/memory/key/project_plan")
+    assert (await client.get("/api/memory/search?q=release")).json() == []
+
+
+@pytest.mark.unit
+async def test_memory_etag(client: AsyncClient, sample_agent_data, sample_memory_data):
+    """Test unchanged memory answers If-None-Match with an empty 304 until it is updated"""
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    memory_data = {**sample_memory_data, "created_by": agent_response.json()["id"]}
+    created = (await client.post("/api/memory", json=memory_data)).json()
+    assert created["version"] == 1
+    
+    response = await client.get(f"/api/memory/key/{memory_data['key']}")
+    etag = response.headers["etag"]
+    response = await client.get(f"/api/memory/key/{memory_data['key']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    response = await client.get(f"/api/memory/{created['id']}", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    
+    update = await client.put(f"/api/memory/key/{memory_data['key']}", json={"value": {"data": "new"}})
+    assert update.json()["version"] == 2
+    assert update.headers["etag"] != etag
+    response = await client.get(f"/api/memory/key/{memory_data['key']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["value"] == {"data": "new"}
+    assert response.headers["etag"] == update.headers["etag"]
+
+
+@pytest.mark.unit
+async def test_memory_reads_are_cached(client: AsyncClient, sample_agent_data, sample_memory_data):
+    """Test reads by key are served from the cache and writes invalidate it"""
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    memory_data = {**sample_memory_data, "created_by": agent_response.json()["id"]}
+    await client.post("/api/memory", json=memory_data)
+    
+    for _ in range(3):
+        await client.get(f"/api/memory/key/{memory_data['key']}")
+    assert (memory_cache.misses, memory_cache.hits) == (1, 2)
+    
+    await client.put(f"/api/memory/key/{memory_data['key']}", json={"value": {"data": "new"}})
+    assert len(memory_cache) == 0
+    assert (await client.get(f"/api/memory/key/{memory_data['key']}")).json()["value"] == {"data": "new"}
+    
+    await client.delete(f"/api/memory/key/{memory_data['key']}")
+    assert (await client.get(f"/api/memory/key/{memory_data['key']}")).status_code == 404
+
+
+@pytest.mark.unit
+def test_memory_cache_refuses_rows_read_before_invalidation():
+    """Test a read racing a write cannot put the old row back, and the LRU bound holds"""
+    cache = MemoryCache(max_size=2)
+    
+    def row(key: str, version: int = 1) -> SharedMemory:
+        return SharedMemory(id=key, key=key, value={}, created_by="agent", version=version)
+    
+    generation = cache.generation()
+    cache.discard("a")  # a write committed while the row was being read
+    cache.put(row("a"), generation)
+    assert cache.get("a") is None
+    cache.put(row("a", 2), cache.generation())
+    assert cache.get("a").version == 2
+    
+    cache.put(row("b"), cache.generation())
+    cache.get("a")
+    cache.put(row("c"), cache.generation())
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    
+    # Invalidations beyond max_size are forgotten; reads older than them are refused
+    generation = cache.generation()
+    for key in ("x", "y", "z"):
+        cache.discard(key)
+    cache.put(row("d"), generation)
+    assert cache.get("d") is None
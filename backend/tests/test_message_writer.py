@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import Agent, Message
+from app.schemas.message import MessageCreate
+from app.services.message_service import MessageService
+from app.services.message_writer import MessageWriter
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def engine():
+    """In-memory database with one agent."""
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        db.add(Agent(id="a1", name="a1", type="llm"))
+        await db.commit()
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def commits(engine):
+    """COMMITs sent to the database."""
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def record(conn):
+        statements.append(conn)
+
+    return statements
+
+
+async def count_messages(engine) -> int:
+    async with AsyncSession(engine) as db:
+        return (await db.execute(select(func.count(Message.id)))).scalar()
+
+
+def make_writer(engine, **kwargs) -> MessageWriter:
+    kwargs.setdefault("flush_interval_ms", 60000)
+    return MessageWriter(async_sessionmaker(engine, expire_on_commit=False), **kwargs)
+
+
+@pytest.mark.unit
+async def test_messages_group_committed(engine, commits):
+    """Test queued messages are written in one transaction"""
+    writer = make_writer(engine)
+    async with AsyncSession(engine) as db:
+        service = MessageService(db, writer=writer)
+        messages = [
+            await service.create_message(MessageCreate(sender_id="a1", content=f"m{i}"))
+            for i in range(20)
+        ]
+    assert all(message.id and message.created_at for message in messages)
+    assert len({message.id for message in messages}) == 20
+    assert await count_messages(engine) == 0
+
+    assert await writer.flush() == 20
+    assert len(commits) == 1
+    assert await count_messages(engine) == 20
+    await writer.stop()
+
+
+@pytest.mark.unit
+async def test_full_batch_flushes_early(engine):
+    """Test a full batch is written without waiting for the interval"""
+    writer = make_writer(engine, batch_size=5)
+    async with AsyncSession(engine) as db:
+        service = MessageService(db, writer=writer)
+        for i in range(5):
+            await service.create_message(MessageCreate(sender_id="a1", content=f"m{i}"))
+    for _ in range(100):
+        if writer.flush_count:
+            break
+        await asyncio.sleep(0.01)
+    assert writer.flush_count == 1
+    await writer.stop()
+    assert await count_messages(engine) == 5
+
+
+@pytest.mark.unit
+async def test_commit_durability_waits(engine):
+    """Test wait_persisted returns once the message is committed"""
+    writer = make_writer(engine, flush_interval_ms=10, durability="commit")
+    async with AsyncSession(engine) as db:
+        service = MessageService(db, writer=writer)
+        message = await service.create_message(MessageCreate(sender_id="a1", content="durable"))
+        await asyncio.wait_for(service.wait_persisted(message), timeout=2)
+    assert await count_messages(engine) == 1
+    await writer.stop()
+
+
+@pytest.mark.unit
+async def test_reads_see_queued_messages(engine):
+    """Test reads through MessageService see messages not flushed yet"""
+    writer = make_writer(engine)
+    async with AsyncSession(engine) as db:
+        service = MessageService(db, writer=writer)
+        message = await service.create_message(MessageCreate(sender_id="a1", content="queued"))
+        assert (await service.get_message(message.id)) is message
+        assert [m.id for m in await service.list_messages()] == [message.id]
+    assert writer.pending_count() == 0
+    await writer.stop()
+
+
+@pytest.mark.unit
+async def test_stop_flushes_remaining(engine):
+    """Test shutdown commits whatever is still queued"""
+    writer = make_writer(engine)
+    async with AsyncSession(engine) as db:
+        service = MessageService(db, writer=writer)
+        for i in range(3):
+            await service.create_message(MessageCreate(sender_id="a1", content=f"m{i}"))
+    await writer.stop()
+    assert await count_messages(engine) == 3
+
+
+@pytest.mark.unit
+def test_unknown_durability():
+    with pytest.raises(ValueError):
+        MessageWriter(durability="eventually")
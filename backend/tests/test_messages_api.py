@@ -162,4 +162,91 @@ async def test_delete_message(client: AsyncClient, sample_agent_data, sample_mes
 async def test_delete_nonexistent_message(client: AsyncClient):
     """Test deleting a non-existent message"""
     response = await client.delete("/api/messages/nonexistent_id")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+@pytest.mark.unit
+async def test_list_messages_by_cursor(client: AsyncClient, sample_agent_data, sample_message_data):
+    """Test walking all messages page by page with cursors"""
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    agent_id = agent_response.json()["id"]
+    
+    sent = []
+    for i in range(5):
+        message_data = {**sample_message_data, "sender_id": agent_id, "content": f"Message {i}"}
+        sent.append((await client.post("/api/messages", json=message_data)).json()["id"])
+    
+    seen = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2, "sender_id": agent_id}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/messages/page", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(msg["id"] for msg in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert cursor is None
+    assert sorted(seen) == sorted(sent)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.unit
+async def test_list_messages_invalid_cursor(client: AsyncClient):
+    """Test a malformed cursor is rejected"""
+    response = await client.get("/api/messages/page?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+async def test_export_messages(client: AsyncClient, sample_agent_data, sample_message_data):
+    """Test streaming messages as NDJSON"""
+    import json
+    
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    agent_id = agent_response.json()["id"]
+    
+    for i in range(3):
+        message_data = {**sample_message_data, "sender_id": agent_id, "content": f"Message {i}"}
+        await client.post("/api/messages", json=message_data)
+    
+    response = await client.get(f"/api/messages/export?sender_id={agent_id}")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["content"] for row in rows] == ["Message 0", "Message 1", "Message 2"]
+
+
+@pytest.mark.unit
+async def test_search_messages(client: AsyncClient, sample_agent_data, sample_message_data):
+    """Test full-text search over message content"""
+    agent_response = await client.post("/api/agents/register", json=sample_agent_data)
+    agent_id = agent_response.json()["id"]
+    
+    contents = ["Deploy the backend to staging", "Review the frontend", "Deployment finished"]
+    ids = []
+    for content in contents:
+        message_data = {**sample_message_data, "sender_id": agent_id, "content": content}
+        ids.append((await client.post("/api/messages", json=message_data)).json()["id"])
+    
+    response = await client.get("/api/messages/search?q=deploy*")
+    assert response.status_code == 200
+    data = response.json()
+    assert {hit["id"] for hit in data} == {ids[0], ids[2]}
+    assert all("<mark>" in hit["snippet"] for hit in data)
+    
+    # Deleted messages leave the index
+    await client.delete(f"/api/messages/{ids[0]}")
+    data = (await client.get("/api/messages/search?q=deploy*")).json()
+    assert [hit["id"] for hit in data] == [ids[2]]
+
+
+@pytest.mark.unit
+async def test_search_messages_punctuation(client: AsyncClient):
+    """Test search input is never parsed as FTS syntax"""
+    response = await client.get('/api/messages/search', params={"q": 'foo" OR (bar'})
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import Agent
+from app.websocket.connection_manager import manager
+from app.websocket.presence import PresenceTracker
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def engine():
+    """In-memory database with two agents, counting UPDATE statements."""
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add_all([
+            Agent(id="a1", name="a1", type="llm", status="offline"),
+            Agent(id="a2", name="a2", type="llm", status="busy"),
+        ])
+        await db.commit()
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def updates(engine):
+    """UPDATE statements sent to the database."""
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            statements.append(statement)
+
+    return statements
+
+
+async def load(engine, agent_id: str) -> Agent:
+    async with AsyncSession(engine) as db:
+        return (await db.execute(select(Agent).where(Agent.id == agent_id))).scalar_one()
+
+
+@pytest.mark.unit
+async def test_heartbeats_flush_in_one_batch(engine, updates):
+    """Test heartbeats stay in memory until one batched flush"""
+    tracker = PresenceTracker(async_sessionmaker(engine, expire_on_commit=False), flush_interval=60)
+    tracker.mark_online("a1")
+    for _ in range(50):
+        tracker.touch("a1")
+        tracker.touch("a2")
+    assert updates == []
+
+    assert await tracker.flush() == 2
+    # One executemany for the agent whose status changed, one for last_seen only,
+    # and one extending the task leases held by the online agent
+    assert len(updates) == 3
+    assert updates[2].startswith("UPDATE tasks SET lease_expires_at")
+    a1, a2 = await load(engine, "a1"), await load(engine, "a2")
+    assert a1.status == "online"
+    assert a1.last_seen == tracker.get("a1")["last_seen"]
+    # A heartbeat does not overwrite a status set elsewhere
+    assert a2.status == "busy"
+    assert await tracker.flush() == 0
+
+
+@pytest.mark.unit
+async def test_disconnect_flushes_promptly(engine):
+    """Test a disconnect is written without waiting for the flush interval"""
+    tracker = PresenceTracker(async_sessionmaker(engine, expire_on_commit=False), flush_interval=60)
+    tracker.mark_online("a1")
+    await tracker.flush()
+    tracker.start()
+    tracker.mark_offline("a1")
+    for _ in range(100):
+        if tracker.flush_count == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert tracker.flush_count == 2
+    await tracker.stop()
+
+    assert (await load(engine, "a1")).status == "offline"
+    assert tracker.get("a1") is None
+
+
+@pytest.mark.unit
+async def test_online_endpoint_uses_live_presence(client: AsyncClient, sample_agent_data):
+    """Test /online reflects connections not yet flushed to the database"""
+    response = await client.post("/api/agents/register", json={**sample_agent_data, "name": "live"})
+    agent_id = response.json()["id"]
+    await client.put(f"/api/agents/{agent_id}/status", json={"status": "offline"})
+
+    manager.presence.mark_online(agent_id)
+    try:
+        data = (await client.get("/api/agents/online")).json()
+        assert agent_id in [agent["id"] for agent in data]
+
+        manager.presence.mark_offline(agent_id)
+        data = (await client.get("/api/agents/online")).json()
+        assert agent_id not in [agent["id"] for agent in data]
+    finally:
+        manager.presence._entries.pop(agent_id, None)
+        manager.presence._dirty.discard(agent_id)
+        manager.presence._status_dirty.discard(agent_id)
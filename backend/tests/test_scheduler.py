@@ -0,0 +1,235 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cron import CronExpression
+from app.core.database import Base
+from app.models import Agent, Task, TaskSchedule
+from app.schemas.schedule import ScheduleCreate, TaskTemplate
+from app.schemas.task import TaskCreate
+from app.services.schedule_service import ScheduleService
+from app.services.scheduler import TaskScheduler
+from app.services.task_service import TaskService, task_listeners
+from tests.test_connection_manager import wait_for
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """File database (so sessions use separate connections) with one agent."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'scheduler.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(Agent(id="boss", name="boss", type="llm"))
+        await db.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+async def create_schedule(factory, name: str, **timing) -> TaskSchedule:
+    async with factory() as db:
+        return await ScheduleService(db).create_schedule(ScheduleCreate(
+            name=name, creator_id="boss", template=TaskTemplate(title=name, priority=2), **timing
+        ))
+
+
+async def schedule_tasks(factory, schedule_id: str) -> list:
+    async with factory() as db:
+        result = await db.execute(select(Task).where(Task.schedule_id == schedule_id).order_by(Task.created_at))
+        return result.scalars().all()
+
+
+@pytest.mark.unit
+def test_cron_expression_next_after():
+    """Test cron matching for steps, ranges, names and impossible dates"""
+    friday = datetime(2026, 10, 16, 9, 30, 12)
+    assert CronExpression("*/15 * * * *").next_after(friday) == datetime(2026, 10, 16, 9, 45)
+    assert CronExpression("0 9 * * *").next_after(friday) == datetime(2026, 10, 17, 9, 0)
+    assert CronExpression("0 12 * * mon-fri").next_after(friday) == datetime(2026, 10, 16, 12, 0)
+    assert CronExpression("0 0 * * 7").next_after(friday) == datetime(2026, 10, 18, 0, 0)
+    assert CronExpression("0 0 29 feb *").next_after(friday) == datetime(2028, 2, 29, 0, 0)
+    # Day of month and weekday both restricted: either matches
+    assert CronExpression("0 0 13 * 5").next_after(friday) == datetime(2026, 10, 23, 0, 0)
+    for invalid in ("* * *", "60 * * * *", "* * * * 8", "*/0 * * * *"):
+        with pytest.raises(ValueError):
+            CronExpression(invalid)
+    with pytest.raises(ValueError):
+        CronExpression("0 0 30 2 *").next_after(friday)
+
+
+@pytest.mark.unit
+async def test_delayed_task_waits_for_run_at(session_factory):
+    """Test a task with a future run_at stays out of the pool until released"""
+    run_at = datetime.utcnow() + timedelta(hours=1)
+    async with session_factory() as db:
+        task = await TaskService(db).create_task(TaskCreate(creator_id="boss", title="later", run_at=run_at))
+    assert task.status == "scheduled"
+
+    async with session_factory() as db:
+        service = TaskService(db)
+        assert await service.get_pending_tasks() == []
+        assert await service.claim_next("boss") is None
+        assert await service.release_due_tasks() == []
+        released = await service.release_due_tasks(now=run_at + timedelta(seconds=1))
+    assert [t.id for t in released] == [task.id]
+    assert released[0].status == "pending"
+
+
+@pytest.mark.unit
+async def test_failed_task_retries_after_backoff(session_factory):
+    """Test a retry with a backoff is scheduled, doubling per attempt"""
+    async with session_factory() as db:
+        service = TaskService(db)
+        task = await service.create_task(TaskCreate(
+            creator_id="boss", title="flaky", requirements={"retry_backoff_seconds": 30}
+        ))
+        before = datetime.utcnow()
+        first = await service.fail_task(task.id, "boss", "boom")
+        assert first.status == "scheduled"
+        assert timedelta(seconds=29) < first.run_at - before < timedelta(seconds=31)
+
+        await service.release_due_tasks(now=first.run_at)
+        second = await service.fail_task(task.id, "boss", "boom again")
+        assert second.requirements["retry_count"] == 2
+        assert timedelta(seconds=59) < second.run_at - before < timedelta(seconds=61)
+
+
+@pytest.mark.unit
+async def test_catch_up_policies(session_factory):
+    """Test runs missed during downtime fire per catch_up policy and the grid is kept"""
+    now = datetime.utcnow().replace(microsecond=0)
+    start = now - timedelta(seconds=390)
+    schedules = {
+        policy: await create_schedule(
+            session_factory, policy, interval_seconds=100, start_at=start, catch_up=policy
+        )
+        for policy in ("all", "latest", "skip")
+    }
+
+    for policy, schedule in schedules.items():
+        async with session_factory() as db:
+            await ScheduleService(db).fire(schedule.id, now)
+
+    runs = {policy: await schedule_tasks(session_factory, s.id) for policy, s in schedules.items()}
+    assert len(runs["all"]) == 4
+    assert sorted(task.requirements["scheduled_for"] for task in runs["all"]) == [
+        (start + timedelta(seconds=100 * i)).isoformat() for i in range(4)
+    ]
+    assert len(runs["latest"]) == 1
+    assert runs["latest"][0].requirements["scheduled_for"] == (start + timedelta(seconds=300)).isoformat()
+    assert runs["skip"] == []
+
+    async with session_factory() as db:
+        schedule = await db.get(TaskSchedule, schedules["all"].id)
+    assert schedule.next_run_at == start + timedelta(seconds=400)
+    assert schedule.run_count == 4
+
+
+@pytest.mark.unit
+async def test_schedule_fires_once_across_workers(session_factory):
+    """Test concurrent schedulers firing the same run create one task"""
+    now = datetime.utcnow()
+    schedule = await create_schedule(
+        session_factory, "standup", cron="0 9 * * *", start_at=now - timedelta(minutes=1)
+    )
+
+    async def fire():
+        async with session_factory() as db:
+            return await ScheduleService(db).fire(schedule.id, now)
+
+    results = await asyncio.gather(*(fire() for _ in range(4)))
+    assert sorted(len(tasks) for tasks in results) == [0, 0, 0, 1]
+    assert len(await schedule_tasks(session_factory, schedule.id)) == 1
+
+
+@pytest.mark.unit
+async def test_failed_schedule_is_retried(session_factory, monkeypatch):
+    """Test a schedule whose firing fails keeps a timer and fires on the retry"""
+    now = datetime.utcnow()
+    schedule = await create_schedule(
+        session_factory, "flaky", interval_seconds=3600, start_at=now - timedelta(minutes=1)
+    )
+    fire = ScheduleService.fire
+    failures = []
+
+    async def flaky_fire(self, schedule_id, fire_now):
+        if not failures:
+            failures.append(schedule_id)
+            raise RuntimeError("database is locked")
+        return await fire(self, schedule_id, fire_now)
+
+    monkeypatch.setattr(ScheduleService, "fire", flaky_fire)
+    scheduler = TaskScheduler(session_factory, horizon=60)
+    await scheduler.load(now)
+    assert await scheduler.fire_due(now) == ([], [])
+    [timer] = scheduler.pending_timers()
+    assert timer["id"] == schedule.id
+    assert timer["fire_at"] > now
+
+    created, _ = await scheduler.fire_due(timer["fire_at"])
+    assert failures == [schedule.id]
+    assert [task.schedule_id for task in created] == [schedule.id]
+
+
+@pytest.mark.unit
+async def test_scheduler_fires_without_polling(session_factory):
+    """Test the scheduler catches up on start and wakes for new timers"""
+    overdue = await create_schedule(
+        session_factory, "overdue", interval_seconds=3600, start_at=datetime.utcnow() - timedelta(hours=5)
+    )
+    fired = []
+
+    async def on_fired(created, released):
+        fired.extend(task.id for task in created + released)
+
+    scheduler = TaskScheduler(session_factory, horizon=60, on_fired=on_fired)
+    await scheduler.start()
+    try:
+        await wait_for(lambda: len(fired) == 1)
+        assert len(await schedule_tasks(session_factory, overdue.id)) == 1
+
+        async with session_factory() as db:
+            task = await TaskService(db).create_task(TaskCreate(
+                creator_id="boss", title="soon", run_at=datetime.utcnow() + timedelta(seconds=0.2)
+            ))
+        assert [timer["id"] for timer in scheduler.pending_timers()] == [task.id]
+        await wait_for(lambda: task.id in fired)
+        async with session_factory() as db:
+            assert (await db.get(Task, task.id)).status == "pending"
+    finally:
+        await scheduler.stop()
+    assert scheduler not in task_listeners
+
+
+@pytest.mark.unit
+async def test_schedule_api(client: AsyncClient, sample_agent_data):
+    """Test creating, disabling and deleting a schedule through the API"""
+    agent_id = (await client.post("/api/agents/register", json=sample_agent_data)).json()["id"]
+    body = {"name": "digest", "creator_id": agent_id, "template": {"title": "Daily digest"}}
+
+    response = await client.post("/api/schedules", json={**body, "cron": "0 9 * * *", "interval_seconds": 60})
+    assert response.status_code == 400
+    response = await client.post("/api/schedules", json={**body, "cron": "0 25 * * *"})
+    assert response.status_code == 400
+
+    response = await client.post("/api/schedules", json={**body, "cron": "0 9 * * *"})
+    assert response.status_code == 201
+    schedule = response.json()
+    assert schedule["enabled"] is True
+    assert datetime.fromisoformat(schedule["next_run_at"]).time().hour == 9
+    assert (await client.post("/api/schedules", json={**body, "interval_seconds": 60})).status_code == 400
+
+    response = await client.put(f"/api/schedules/{schedule['id']}", json={"interval_seconds": 60})
+    assert response.status_code == 200
+    assert response.json()["cron"] is None
+    assert response.json()["interval_seconds"] == 60
+
+    response = await client.delete(f"/api/schedules/{schedule['id']}")
+    assert response.status_code == 204
+    assert (await client.get(f"/api/schedules/{schedule['id']}")).status_code == 404
@@ -0,0 +1,53 @@
+"""Benchmark: message insert throughput per SQLite storage profile.
+
+Inserts messages one commit at a time through ``MessageService.create_message``
+against a SQLite file, once with SQLite's defaults (rollback journal,
+synchronous=FULL) and once per tuned profile. Each commit is a durable write,
+so the numbers are dominated by fsync cost and vary a lot between disks.
+
+    BENCH_MESSAGES=2000 python -m pytest tests/test_sqlite_profile_benchmark.py -m slow -s --no-cov
+"""
+import os
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, apply_sqlite_pragmas, sqlite_pragmas
+from app.models import Agent
+from app.schemas.message import MessageCreate
+from app.services.message_service import MessageService
+
+MESSAGES = int(os.getenv("BENCH_MESSAGES", "300"))
+AGENT_ID = "bench-agent"
+
+
+async def insert_messages(path, profile: str) -> float:
+    """Insert ``MESSAGES`` messages with one commit each; returns messages/sec"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas(profile, {}))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add(Agent(id=AGENT_ID, name=AGENT_ID, type="llm"))
+            await db.commit()
+            service = MessageService(db)
+            started = time.perf_counter()
+            for index in range(MESSAGES):
+                await service.create_message(MessageCreate(sender_id=AGENT_ID, content=f"message {index}"))
+            return MESSAGES / (time.perf_counter() - started)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.slow
+async def test_message_insert_throughput(tmp_path):
+    """Benchmark committed message inserts per storage profile"""
+    print(f"\n{MESSAGES} messages, one commit each")
+    results = {}
+    for profile in ("default", "durable", "tuned"):
+        results[profile] = await insert_messages(tmp_path / f"{profile}.db", profile)
+        print(f"{profile:<8} {results[profile]:8.0f} messages/s")
+    assert all(rate > 0 for rate in results.values())
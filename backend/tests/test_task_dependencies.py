@@ -0,0 +1,189 @@
+import pytest
+from httpx import AsyncClient
+
+from app.services import task_service
+from app.services.task_service import TaskListener
+
+
+class RecordingListener(TaskListener):
+    def __init__(self):
+        self.runnable = []
+
+    def task_runnable(self, task):
+        self.runnable.append(task.id)
+
+
+@pytest.fixture
+def listener():
+    listener = RecordingListener()
+    task_service.task_listeners.append(listener)
+    yield listener
+    task_service.task_listeners.remove(listener)
+
+
+@pytest.fixture
+async def creator_id(client: AsyncClient, sample_agent_data) -> str:
+    response = await client.post("/api/agents/register", json=sample_agent_data)
+    return response.json()["id"]
+
+
+async def create(client: AsyncClient, creator_id: str, title: str, depends_on=None, priority: int = 1) -> dict:
+    response = await client.post("/api/tasks", json={
+        "creator_id": creator_id,
+        "title": title,
+        "priority": priority,
+        "depends_on": depends_on,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def complete(client: AsyncClient, task_id: str, agent_id: str) -> dict:
+    response = await client.post(f"/api/tasks/{task_id}/complete", params={"agent_id": agent_id}, json={})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.unit
+async def test_task_with_dependencies_is_blocked(client: AsyncClient, creator_id):
+    """Test a task waiting for unfinished tasks is blocked and not claimable"""
+    plan = await create(client, creator_id, "Plan")
+    build = await create(client, creator_id, "Build", depends_on=[plan["id"]])
+    assert build["status"] == "blocked"
+
+    pending = await client.get("/api/tasks/pending")
+    assert [task["id"] for task in pending.json()] == [plan["id"]]
+
+    dependencies = await client.get(f"/api/tasks/{build['id']}/dependencies")
+    assert [task["id"] for task in dependencies.json()] == [plan["id"]]
+    dependents = await client.get(f"/api/tasks/{plan['id']}/dependents")
+    assert [task["id"] for task in dependents.json()] == [build["id"]]
+
+
+@pytest.mark.unit
+async def test_completing_last_dependency_releases_task(client: AsyncClient, creator_id, listener):
+    """Test a blocked task becomes pending, and is announced, once all its dependencies complete"""
+    design = await create(client, creator_id, "Design")
+    backend = await create(client, creator_id, "Backend")
+    deploy = await create(client, creator_id, "Deploy", depends_on=[design["id"], backend["id"]])
+
+    await complete(client, design["id"], creator_id)
+    assert (await client.get(f"/api/tasks/{deploy['id']}")).json()["status"] == "blocked"
+    assert deploy["id"] not in listener.runnable
+
+    await complete(client, backend["id"], creator_id)
+    assert (await client.get(f"/api/tasks/{deploy['id']}")).json()["status"] == "pending"
+    assert listener.runnable[-1] == deploy["id"]
+
+
+@pytest.mark.unit
+async def test_dependency_on_completed_task_does_not_block(client: AsyncClient, creator_id):
+    """Test depending only on finished work leaves the task pending"""
+    done = await create(client, creator_id, "Done")
+    await complete(client, done["id"], creator_id)
+    task = await create(client, creator_id, "Next", depends_on=[done["id"]])
+    assert task["status"] == "pending"
+
+
+@pytest.mark.unit
+async def test_cycle_is_rejected(client: AsyncClient, creator_id):
+    """Test an edge closing a cycle is rejected and nothing is stored"""
+    a = await create(client, creator_id, "A")
+    b = await create(client, creator_id, "B", depends_on=[a["id"]])
+    c = await create(client, creator_id, "C", depends_on=[b["id"]])
+
+    response = await client.post(f"/api/tasks/{a['id']}/dependencies", json={"depends_on": [c["id"]]})
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"]
+    assert (await client.get(f"/api/tasks/{a['id']}")).json()["status"] == "pending"
+    assert (await client.get(f"/api/tasks/{a['id']}/dependencies")).json() == []
+
+    response = await client.post(f"/api/tasks/{a['id']}/dependencies", json={"depends_on": [a["id"]]})
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+async def test_adding_existing_dependency_adds_only_new_ones(client: AsyncClient, creator_id):
+    """Test re-adding an existing edge after a new one stores just the new edge"""
+    a = await create(client, creator_id, "A")
+    b = await create(client, creator_id, "B")
+    c = await create(client, creator_id, "C", depends_on=[a["id"]])
+
+    response = await client.post(f"/api/tasks/{c['id']}/dependencies", json={"depends_on": [b["id"], a["id"]]})
+    assert response.status_code == 200, response.text
+    assert sorted(task["id"] for task in response.json()) == sorted([a["id"], b["id"]])
+
+
+@pytest.mark.unit
+async def test_unknown_dependency_is_rejected(client: AsyncClient, creator_id):
+    """Test depending on a missing task fails without creating the task"""
+    response = await client.post("/api/tasks", json={
+        "creator_id": creator_id,
+        "title": "Orphan",
+        "depends_on": ["missing"],
+    })
+    assert response.status_code == 400
+    assert (await client.get("/api/tasks")).json() == []
+
+
+@pytest.mark.unit
+async def test_failure_fails_downstream_tasks(client: AsyncClient, creator_id):
+    """Test a task failing for good fails everything that transitively depends on it"""
+    a = await create(client, creator_id, "A")
+    b = await create(client, creator_id, "B", depends_on=[a["id"]])
+    c = await create(client, creator_id, "C", depends_on=[b["id"]])
+    other = await create(client, creator_id, "Other")
+
+    response = await client.put(f"/api/tasks/{a['id']}", json={"status": "failed"})
+    assert response.status_code == 200
+
+    for task in (b, c):
+        data = (await client.get(f"/api/tasks/{task['id']}")).json()
+        assert data["status"] == "failed"
+        assert a["id"] in data["requirements"]["last_error"]
+    assert (await client.get(f"/api/tasks/{other['id']}")).json()["status"] == "pending"
+
+
+@pytest.mark.unit
+async def test_removing_or_deleting_blocker_releases_task(client: AsyncClient, creator_id):
+    """Test dropping the last unfinished dependency releases the task"""
+    a = await create(client, creator_id, "A")
+    b = await create(client, creator_id, "B")
+    c = await create(client, creator_id, "C", depends_on=[a["id"], b["id"]])
+
+    response = await client.delete(f"/api/tasks/{c['id']}/dependencies/{a['id']}")
+    assert response.status_code == 204
+    assert (await client.get(f"/api/tasks/{c['id']}")).json()["status"] == "blocked"
+
+    response = await client.delete(f"/api/tasks/{b['id']}")
+    assert response.status_code == 204
+    assert (await client.get(f"/api/tasks/{c['id']}")).json()["status"] == "pending"
+
+    response = await client.delete(f"/api/tasks/{c['id']}/dependencies/{a['id']}")
+    assert response.status_code == 404
+
+
+@pytest.mark.unit
+async def test_task_graph_critical_path(client: AsyncClient, creator_id):
+    """Test the graph reports the longest unfinished chain and nodes in topological order"""
+    spec = await create(client, creator_id, "Spec")
+    schema = await create(client, creator_id, "Schema", depends_on=[spec["id"]])
+    api = await create(client, creator_id, "API", depends_on=[schema["id"]])
+    docs = await create(client, creator_id, "Docs", depends_on=[spec["id"]], priority=3)
+    release = await create(client, creator_id, "Release", depends_on=[api["id"], docs["id"]])
+
+    response = await client.get(f"/api/tasks/{release['id']}/graph")
+    assert response.status_code == 200
+    graph = response.json()
+    assert graph["remaining_depth"] == 4
+    assert graph["critical_path"] == [spec["id"], schema["id"], api["id"], release["id"]]
+    order = [node["id"] for node in graph["tasks"]]
+    assert order == [spec["id"], docs["id"], schema["id"], api["id"], release["id"]]
+
+    await complete(client, spec["id"], creator_id)
+    graph = (await client.get(f"/api/tasks/{release['id']}/graph")).json()
+    assert graph["remaining_depth"] == 3
+    assert graph["critical_path"] == [schema["id"], api["id"], release["id"]]
+
+    response = await client.get("/api/tasks/missing/graph")
+    assert response.status_code == 404
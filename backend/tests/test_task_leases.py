@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Agent, Task
+from app.services.lease_reaper import LeaseReaper
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """File database (so sessions use separate connections) with agents and four tasks."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'leases.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add_all([Agent(id=f"w{i}", name=f"w{i}", type="llm") for i in range(8)])
+        db.add_all([
+            Task(id="low", creator_id="w0", title="low", priority=1),
+            Task(id="urgent", creator_id="w0", title="urgent", priority=4),
+            Task(id="medium", creator_id="w0", title="medium", priority=2),
+            Task(id="python", creator_id="w0", title="python", priority=3,
+                 requirements={"skills": ["python"]}),
+        ])
+        await db.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+async def claim(factory, agent_id, capabilities=None):
+    async with factory() as db:
+        return await TaskService(db).claim_next(agent_id, capabilities)
+
+
+async def load(factory, task_id) -> Task:
+    async with factory() as db:
+        return await db.get(Task, task_id)
+
+
+@pytest.mark.unit
+async def test_claim_next_in_priority_order(session_factory):
+    """Test tasks are claimed most urgent first, each with a lease"""
+    claimed = [await claim(session_factory, "w1") for _ in range(5)]
+    assert [task.id if task else None for task in claimed] == ["urgent", "python", "medium", "low", None]
+    task = claimed[0]
+    assert task.status == "in_progress"
+    assert task.claimed_by == "w1"
+    assert task.lease_expires_at > datetime.utcnow()
+
+
+@pytest.mark.unit
+async def test_concurrent_claims_never_collide(session_factory):
+    """Test concurrent claimers each get a different task"""
+    claimed = await asyncio.gather(*(claim(session_factory, f"w{i}") for i in range(8)))
+    ids = [task.id for task in claimed if task]
+    assert sorted(ids) == ["low", "medium", "python", "urgent"]
+    holders = {task.id: task.claimed_by for task in claimed if task}
+    for task_id, holder in holders.items():
+        assert (await load(session_factory, task_id)).claimed_by == holder
+
+
+@pytest.mark.unit
+async def test_claim_next_respects_capabilities(session_factory):
+    """Test tasks needing skills an agent lacks are skipped"""
+    assert (await claim(session_factory, "w1", capabilities=["sql"])).id == "urgent"
+    assert (await claim(session_factory, "w1", capabilities=["sql"])).id == "medium"
+    assert (await claim(session_factory, "w2", capabilities=["python"])).id == "python"
+
+
+@pytest.mark.unit
+async def test_expired_lease_is_requeued(session_factory):
+    """Test the reaper hands tasks of silent workers back to the queue"""
+    task = await claim(session_factory, "w1")
+    reaper = LeaseReaper(session_factory, interval=60)
+    assert await reaper.reap() == []
+
+    async with session_factory() as db:
+        requeued = await TaskService(db).requeue_expired_leases(now=task.lease_expires_at + timedelta(seconds=1))
+    assert [t.id for t in requeued] == [task.id]
+    reloaded = await load(session_factory, task.id)
+    assert reloaded.status == "pending"
+    assert reloaded.claimed_by is None
+    assert reloaded.requirements["retry_count"] == 1
+
+    assert (await claim(session_factory, "w2")).id == task.id
+
+
+@pytest.mark.unit
+async def test_heartbeat_extends_leases(session_factory):
+    """Test extending leases keeps a task away from the reaper"""
+    task = await claim(session_factory, "w1")
+    async with session_factory() as db:
+        assert await TaskService(db).extend_leases(["w1"], lease_seconds=3600) == 1
+        await db.commit()
+    extended = await load(session_factory, task.id)
+    assert extended.lease_expires_at > task.lease_expires_at
+
+    async with session_factory() as db:
+        requeued = await TaskService(db).requeue_expired_leases(now=task.lease_expires_at + timedelta(seconds=1))
+    assert requeued == []
+
+
+@pytest.mark.unit
+async def test_claim_next_endpoint(client: AsyncClient, sample_agent_data, sample_task_data):
+    """Test claiming through the API, then renewing the lease"""
+    agent_id = (await client.post("/api/agents/register", json=sample_agent_data)).json()["id"]
+    task_id = (await client.post("/api/tasks", json={**sample_task_data, "creator_id": agent_id})).json()["id"]
+
+    response = await client.post(f"/api/agents/{agent_id}/claim-next", json={"capabilities": ["python", "analysis"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "claimed"
+    assert data["task"]["id"] == task_id
+    assert data["task"]["claimed_by"] == agent_id
+
+    assert (await client.post(f"/api/agents/{agent_id}/claim-next")).json()["status"] == "idle"
+    response = await client.post(f"/api/tasks/{task_id}/lease", params={"agent_id": agent_id})
+    assert response.status_code == 200
+    response = await client.post(f"/api/tasks/{task_id}/lease", params={"agent_id": "someone-else"})
+    assert response.status_code == 409
@@ -0,0 +1,124 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+async def agent_ids(client: AsyncClient) -> list:
+    ids = []
+    for name in ("planner", "worker"):
+        response = await client.post("/api/agents/register", json={"name": name, "type": "llm"})
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.unit
+async def test_bulk_create_tasks(client: AsyncClient, agent_ids):
+    """Test creating many tasks in one request, with references between them"""
+    planner, _ = agent_ids
+    response = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"creator_id": planner, "title": "Design"},
+        {"creator_id": planner, "title": "Build", "depends_on": ["#0"]},
+        {"creator_id": planner, "title": "Ship", "depends_on": ["#1", "missing"]},
+        {"creator_id": planner, "title": "Announce", "depends_on": ["#2"]},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["succeeded"], data["failed"]) == (2, 2)
+    results = data["results"]
+    assert [result["ok"] for result in results] == [True, True, False, False]
+    assert [result["status"] for result in results[:2]] == ["pending", "blocked"]
+    assert "missing" in results[2]["error"]
+    assert "#2" in results[3]["error"]
+
+    dependencies = await client.get(f"/api/tasks/{results[1]['task_id']}/dependencies")
+    assert [task["id"] for task in dependencies.json()] == [results[0]["task_id"]]
+    assert len((await client.get("/api/tasks")).json()) == 2
+
+
+@pytest.mark.unit
+async def test_bulk_assign_tasks(client: AsyncClient, agent_ids):
+    """Test assigning many tasks in one request with per-item errors"""
+    planner, worker = agent_ids
+    created = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"creator_id": planner, "title": f"Task {i}"} for i in range(3)
+    ]})
+    task_ids = [result["task_id"] for result in created.json()["results"]]
+
+    response = await client.post("/api/tasks/assign/bulk", json={"assignments": [
+        {"task_id": task_ids[0], "agent_id": worker},
+        {"task_id": task_ids[1], "agent_id": worker},
+        {"task_id": task_ids[1], "agent_id": worker},
+        {"task_id": task_ids[2], "agent_id": "nobody"},
+        {"task_id": "missing", "agent_id": worker},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [True, True, False, False, False]
+    assert results[0]["assignment_id"]
+    assert results[0]["status"] == "assigned"
+    assert "already assigned" in results[2]["error"]
+    assert "nobody" in results[3]["error"]
+    assert "missing" in results[4]["error"]
+
+    assigned = await client.get(f"/api/tasks/agent/{worker}")
+    assert {task["id"] for task in assigned.json()} == set(task_ids[:2])
+    assert (await client.get(f"/api/tasks/{task_ids[2]}")).json()["status"] == "pending"
+
+
+@pytest.mark.unit
+async def test_bulk_update_tasks(client: AsyncClient, agent_ids):
+    """Test updating many tasks in one request releases their dependents"""
+    planner, _ = agent_ids
+    created = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"creator_id": planner, "title": "A"},
+        {"creator_id": planner, "title": "B"},
+        {"creator_id": planner, "title": "C", "depends_on": ["#0", "#1"]},
+    ]})
+    a, b, c = [result["task_id"] for result in created.json()["results"]]
+
+    response = await client.post("/api/tasks/update/bulk", json={"updates": [
+        {"task_id": a, "status": "completed"},
+        {"task_id": b, "status": "completed", "priority": 4},
+        {"task_id": "missing", "status": "completed"},
+    ]})
+    assert response.status_code == 200
+    assert [result["ok"] for result in response.json()["results"]] == [True, True, False]
+    assert (await client.get(f"/api/tasks/{b}")).json()["priority"] == 4
+    assert (await client.get(f"/api/tasks/{c}")).json()["status"] == "pending"
+
+
+@pytest.mark.unit
+async def test_bulk_database_error_fails_only_its_item(client: AsyncClient, agent_ids, monkeypatch):
+    """Test an item hitting a database error is rolled back and reported while the rest commit"""
+    planner, _ = agent_ids
+    add_task = TaskService.add_task
+
+    async def flaky_add_task(self, task_data, depends_on=None):
+        task = await add_task(self, task_data, depends_on)
+        if task_data.title == "Boom":
+            await self.db.flush()
+            raise IntegrityError("INSERT INTO tasks", {}, Exception("constraint failed"))
+        return task
+
+    monkeypatch.setattr(TaskService, "add_task", flaky_add_task)
+    response = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"creator_id": planner, "title": "Before"},
+        {"creator_id": planner, "title": "Boom"},
+        {"creator_id": planner, "title": "After"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert "constraint failed" in results[1]["error"]
+    assert sorted(task["title"] for task in (await client.get("/api/tasks")).json()) == ["After", "Before"]
+
+
+@pytest.mark.unit
+async def test_bulk_request_is_validated(client: AsyncClient):
+    """Test empty and malformed bulk requests are rejected"""
+    assert (await client.post("/api/tasks/bulk", json={"tasks": []})).status_code == 422
+    response = await client.post("/api/tasks/update/bulk", json={"updates": [{"task_id": "x", "status": "bogus"}]})
+    assert response.status_code == 422
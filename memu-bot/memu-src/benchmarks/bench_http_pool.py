@@ -0,0 +1,104 @@
+"""
+Compare per-call ``httpx.AsyncClient`` against the pooled ``HTTPLLMClient``.
+
+Starts a local HTTP/1.1 keep-alive stub that answers every request with a canned
+chat completion, then times N sequential ``summarize`` calls twice: once opening a
+fresh client (and connection) per call like the previous implementation, once
+through the shared ``HTTPClientPool``. The stub speaks plain HTTP on localhost, so
+the numbers show connection setup only; real endpoints add a TLS handshake per
+fresh connection on top.
+
+    python benchmarks/bench_http_pool.py --calls 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from memu.llm.http_client import HTTPLLMClient
+
+_BODY = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode()
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: "
+    + str(len(_BODY)).encode()
+    + b"\r\n\r\n"
+    + _BODY
+)
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _time(label: str, calls: int, fn: Callable[[], Awaitable[object]]) -> None:
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<18s} total={total:7.2f}s  p50={statistics.median(latencies) * 1e3:6.2f}ms  p99={p99 * 1e3:6.2f}ms")
+
+
+async def _run(calls: int) -> None:
+    server = await asyncio.start_server(_serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    client = HTTPLLMClient(base_url=base_url, api_key="bench", chat_model="bench-model")
+    payload = client.backend.build_summary_payload(
+        text="hello", system_prompt=None, chat_model=client.chat_model, max_tokens=None
+    )
+
+    async def per_call() -> object:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as fresh:
+            resp = await fresh.post(client.summary_endpoint, json=payload, headers=client._headers())
+            resp.raise_for_status()
+            return resp.json()
+
+    async with server:
+        print(f"{calls} sequential summarize calls against {base_url}")
+        await _time("per-call client", calls, per_call)
+        await _time("pooled client", calls, lambda: client.summarize("hello"))
+        stats = client.pool_stats()
+        print(f"pool: {stats['requests']} requests over {stats['connections_opened']} connection(s)")
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare salience ranking paths against plain similarity search.
+
+Times the per-item ``salience_score`` loop (the previous implementation), the
+vectorized ``cosine_topk_salience`` over a list corpus, and ``search_salience`` /
+``search`` on the repo-owned ``EmbeddingStore``.
+
+    python benchmarks/bench_salience.py --n 50000 --dim 384 --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from memu.app.settings import VectorIndexConfig
+from memu.database.inmemory.ivf import build_vector_index
+from memu.database.inmemory.vector import _cosine, cosine_topk_salience, salience_score
+
+
+def _time(label: str, queries: list[list[float]], fn: Callable[[list[float]], object]) -> None:
+    latencies: list[float] = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        latencies.append(time.perf_counter() - started)
+    print(f"{label:<22s} p50={statistics.median(latencies) * 1e3:9.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = rng.standard_normal((args.n, args.dim)).astype(np.float32)
+    counts = rng.integers(1, 20, size=args.n).tolist()
+    now = datetime.now(UTC)
+    stamps = [now - timedelta(days=float(days)) for days in rng.uniform(0, 120, size=args.n)]
+    corpus = [
+        (f"item-{i}", vec, count, stamp)
+        for i, (vec, count, stamp) in enumerate(zip(data.tolist(), counts, stamps, strict=True))
+    ]
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32).tolist()
+
+    store = build_vector_index(VectorIndexConfig(provider="bruteforce"))
+    for item_id, vec, count, stamp in corpus:
+        store.upsert(item_id, vec, reinforcement_count=count, last_reinforced_at=stamp)
+
+    def legacy(q: list[float]) -> list[tuple[str, float]]:
+        qa = np.array(q, dtype=np.float32)
+        scored = [
+            (item_id, salience_score(_cosine(qa, np.array(vec, dtype=np.float32)), count, stamp))
+            for item_id, vec, count, stamp in corpus
+        ]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[: args.k]
+
+    print(f"corpus: {args.n} x {args.dim}, k={args.k}")
+    _time("per-item loop", queries[: max(1, args.queries // 10)], legacy)
+    _time("cosine_topk_salience", queries, lambda q: cosine_topk_salience(q, corpus, k=args.k))
+    _time("store.search_salience", queries, lambda q: store.search_salience(q, args.k))
+    _time("store.search", queries, lambda q: store.search(q, args.k))
+
+
+if __name__ == "__main__":
+    main()
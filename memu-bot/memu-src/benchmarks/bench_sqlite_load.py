@@ -0,0 +1,101 @@
+"""
+Measure SQLite embedding load cost: legacy JSON text vs. binary blobs.
+
+Builds a database in the legacy layout (``embedding_json`` only), times the old
+``json.loads`` + ``float()`` decode, migrates it to float32/float16 blobs through
+``SQLiteStore`` and times loading the item embedding matrix from the blobs.
+
+    python benchmarks/bench_sqlite_load.py --n 100000 --dim 768 [--dtype float16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from memu.app.settings import DatabaseConfig
+from memu.database.factory import build_database
+from memu.database.interfaces import Database
+
+
+class BenchScope(BaseModel):
+    user_id: str | None = None
+
+
+def _open_store(path: Path, dtype: str) -> Database:
+    config = DatabaseConfig(metadata_store={"provider": "sqlite", "dsn": f"sqlite:///{path}", "embedding_dtype": dtype})
+    return build_database(config=config, user_model=BenchScope)
+
+
+def _write_legacy_items(path: Path, n: int, dim: int, rng: np.random.Generator) -> None:
+    _open_store(path, "float32").close()
+    con = sqlite3.connect(path)
+    # Recreate the pre-blob layout: embeddings only as JSON text
+    con.execute("ALTER TABLE memory_items DROP COLUMN embedding")
+    now = "2025-01-01 00:00:00"
+    batch = 5000
+    for start in range(0, n, batch):
+        vecs = rng.standard_normal((min(batch, n - start), dim)).astype(np.float32)
+        con.executemany(
+            "INSERT INTO memory_items (id, created_at, updated_at, resource_id, memory_type, summary, "
+            "embedding_json, extra, user_id) VALUES (?, ?, ?, NULL, 'profile', ?, ?, '{}', ?)",
+            [
+                (str(uuid.uuid4()), now, now, f"item {start + i}", json.dumps(vec.tolist()), f"user-{i % 10}")
+                for i, vec in enumerate(vecs)
+            ],
+        )
+    con.commit()
+    con.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        _write_legacy_items(path, args.n, args.dim, np.random.default_rng(args.seed))
+        print(f"legacy db size: {path.stat().st_size / 2**20:8.1f} MiB ({args.n} x {args.dim})")
+
+        con = sqlite3.connect(path)
+        started = time.perf_counter()
+        for (raw,) in con.execute("SELECT embedding_json FROM memory_items"):
+            [float(x) for x in json.loads(raw)]
+        print(f"json decode:    {time.perf_counter() - started:8.2f}s")
+        con.close()
+
+        started = time.perf_counter()
+        store = _open_store(path, args.dtype)
+        print(f"migration:      {time.perf_counter() - started:8.2f}s")
+        store.close()
+
+        con = sqlite3.connect(path)
+        con.execute("VACUUM")
+        con.close()
+        print(f"{args.dtype} db size: {path.stat().st_size / 2**20:8.1f} MiB")
+
+        store = _open_store(path, args.dtype)
+        query = np.random.default_rng(args.seed + 1).standard_normal(args.dim).tolist()
+        started = time.perf_counter()
+        store.memory_item_repo.vector_search_items(query, 10)
+        print(f"blob load+search: {time.perf_counter() - started:6.2f}s")
+        started = time.perf_counter()
+        store.memory_item_repo.vector_search_items(query, 10, where={"user_id": "user-3"})
+        print(f"warm search:    {(time.perf_counter() - started) * 1e3:8.2f}ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
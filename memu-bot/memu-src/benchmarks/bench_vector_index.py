@@ -0,0 +1,99 @@
+"""
+Compare vector search paths: list-based ``cosine_topk``, the exact repo-owned
+``EmbeddingStore`` and the IVF index.
+
+Reports recall@k (against the exact result) and per-query latency, for a range of
+``nprobe`` values on the IVF index, on a synthetic clustered corpus.
+
+    python benchmarks/bench_vector_index.py --n 100000 --dim 768 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from memu.app.settings import VectorIndexConfig
+from memu.database.inmemory.ivf import build_vector_index
+from memu.database.inmemory.vector import cosine_topk
+
+
+def _clustered_corpus(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    return centers[labels] + 0.35 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = _clustered_corpus(args.n, args.dim, max(8, args.n // 500), rng)
+    ids = [f"item-{i}" for i in range(args.n)]
+    corpus = list(zip(ids, data.tolist(), strict=True))
+    queries = data[rng.integers(0, args.n, size=args.queries)] + 0.2 * rng.standard_normal((args.queries, args.dim))
+    query_lists = queries.astype(np.float32).tolist()
+
+    store = build_vector_index(VectorIndexConfig(provider="bruteforce"))
+    index = build_vector_index(VectorIndexConfig(provider="ivf", min_train_size=args.n))
+    for item_id, vec in corpus:
+        store.upsert(item_id, vec)
+    started = time.perf_counter()
+    for item_id, vec in corpus:
+        index.upsert(item_id, vec)
+    print(f"index build: {time.perf_counter() - started:.2f}s for {args.n} x {args.dim}")
+
+    exact: list[set[str]] = []
+    latencies: list[float] = []
+    for q in query_lists:
+        started = time.perf_counter()
+        hits = cosine_topk(q, corpus, k=args.k)
+        latencies.append(time.perf_counter() - started)
+        exact.append({item_id for item_id, _ in hits})
+    print(
+        f"cosine_topk p50={statistics.median(latencies) * 1e3:8.2f}ms "
+        f"p99={_percentile(latencies, 0.99) * 1e3:8.2f}ms recall@{args.k}=1.000"
+    )
+
+    latencies = []
+    for q in query_lists:
+        started = time.perf_counter()
+        store.search(q, args.k)
+        latencies.append(time.perf_counter() - started)
+    print(
+        f"store       p50={statistics.median(latencies) * 1e3:8.2f}ms "
+        f"p99={_percentile(latencies, 0.99) * 1e3:8.2f}ms recall@{args.k}=1.000"
+    )
+
+    for nprobe in args.nprobe:
+        latencies = []
+        recalled = 0
+        for q, truth in zip(query_lists, exact, strict=True):
+            started = time.perf_counter()
+            hits = index.search(q, args.k, nprobe=nprobe)
+            latencies.append(time.perf_counter() - started)
+            recalled += len(truth & {item_id for item_id, _ in hits})
+        print(
+            f"ivf nprobe={nprobe:<3d} p50={statistics.median(latencies) * 1e3:8.2f}ms "
+            f"p99={_percentile(latencies, 0.99) * 1e3:8.2f}ms "
+            f"recall@{args.k}={recalled / (len(exact) * args.k):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
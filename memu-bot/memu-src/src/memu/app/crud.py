@@ -34,6 +34,7 @@ class CRUDMixin:
         user_model: type[BaseModel]
         patch_config: PatchConfig
         _ensure_categories_ready: Callable[[Context, Database, Mapping[str, Any] | None], Awaitable[None]]
+        _write_category_summaries: Callable[..., Awaitable[dict[str, list[float]]]]
 
     async def list_memory_items(
         self,
@@ -659,15 +660,12 @@ class CRUDMixin:
         if not tasks:
             return
         patches = await asyncio.gather(*tasks)
+        patched: dict[str, str] = {}
         for cid, patch in zip(target_ids, patches, strict=True):
             need_update, summary = self._parse_category_patch_response(patch)
-            if not need_update:
-                continue
-            cat = store.memory_category_repo.categories.get(cid)
-            store.memory_category_repo.update_category(
-                category_id=cid,
-                summary=summary.strip(),
-            )
+            if need_update:
+                patched[cid] = summary.strip()
+        await self._write_category_summaries(patched, store)
 
     def _build_category_patch_prompt(
         self, *, category: MemoryCategory, content_before: str | None, content_after: str | None
@@ -6,14 +6,21 @@ import logging
 import pathlib
 import re
 from collections.abc import Awaitable, Callable, Mapping, Sequence
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 from xml.etree.ElementTree import Element
 
 import defusedxml.ElementTree as ET
 from pydantic import BaseModel
 
 from memu.app.settings import CategoryConfig, CustomPrompt
-from memu.database.models import CategoryItem, MemoryCategory, MemoryItem, MemoryType, Resource
+from memu.database.models import (
+    CategoryItem,
+    MemoryCategory,
+    MemoryItem,
+    MemoryType,
+    Resource,
+    compute_summary_hash,
+)
 from memu.prompts.category_summary import (
     CUSTOM_PROMPT as CATEGORY_SUMMARY_CUSTOM_PROMPT,
 )
@@ -37,6 +44,8 @@ from memu.workflow.step import WorkflowState, WorkflowStep
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 if TYPE_CHECKING:
     from memu.app.service import Context
     from memu.app.settings import MemorizeConfig
@@ -124,7 +133,7 @@ class MemorizeMixin:
                     "modality",
                     "resource_url",
                 },
-                produces={"resource_plans"},
+                produces={"resource_plans", "extraction_errors"},
                 capabilities={"llm"},
                 config={"chat_llm_profile": self.memorize_config.memory_extract_llm_profile},
             ),
@@ -199,31 +208,46 @@ class MemorizeMixin:
     async def _memorize_extract_items(self, state: WorkflowState, step_context: Any) -> WorkflowState:
         llm_client = self._get_step_llm_client(step_context)
         preprocessed_resources = state.get("preprocessed_resources", [])
-        resource_plans: list[dict[str, Any]] = []
         total_segments = len(preprocessed_resources) or 1
+        # One budget for every extraction LLM call of this memorize call (segments x memory types)
+        limiter = asyncio.Semaphore(self.memorize_config.extraction_concurrency)
+        res_urls = [
+            self._segment_resource_url(state["resource_url"], idx, total_segments)
+            for idx in range(len(preprocessed_resources))
+        ]
 
-        for idx, prep in enumerate(preprocessed_resources):
-            res_url = self._segment_resource_url(state["resource_url"], idx, total_segments)
-            text = prep.get("text")
-            caption = prep.get("caption")
-
-            structured_entries = await self._generate_structured_entries(
-                resource_url=res_url,
-                modality=state["modality"],
-                memory_types=state["memory_types"],
-                text=text,
-                categories_prompt_str=state["categories_prompt_str"],
-                llm_client=llm_client,
-            )
+        results = await self._gather_partial(
+            "resource extraction",
+            [
+                self._generate_structured_entries(
+                    resource_url=res_url,
+                    modality=state["modality"],
+                    memory_types=state["memory_types"],
+                    text=prep.get("text"),
+                    categories_prompt_str=state["categories_prompt_str"],
+                    llm_client=llm_client,
+                    limiter=limiter,
+                )
+                for res_url, prep in zip(res_urls, preprocessed_resources, strict=True)
+            ],
+        )
 
+        resource_plans: list[dict[str, Any]] = []
+        extraction_errors: list[dict[str, str]] = []
+        for res_url, prep, result in zip(res_urls, preprocessed_resources, results, strict=True):
+            if isinstance(result, BaseException):
+                # The resource is still stored, just without extracted memories
+                extraction_errors.append({"resource_url": res_url, "error": repr(result)})
+                result = []
             resource_plans.append({
                 "resource_url": res_url,
-                "text": text,
-                "caption": caption,
-                "entries": structured_entries,
+                "text": prep.get("text"),
+                "caption": prep.get("caption"),
+                "entries": result,
             })
 
         state["resource_plans"] = resource_plans
+        state["extraction_errors"] = extraction_errors
         return state
 
     def _memorize_dedupe_merge(self, state: WorkflowState, step_context: Any) -> WorkflowState:
@@ -321,6 +345,8 @@ class MemorizeMixin:
                 "categories": categories,
                 "relations": relations,
             }
+        if state.get("extraction_errors"):
+            response["extraction_errors"] = state["extraction_errors"]
         state["response"] = response
         return state
 
@@ -431,6 +457,7 @@ class MemorizeMixin:
         categories_prompt_str: str,
         segments: list[dict[str, int | str]] | None = None,
         llm_client: Any | None = None,
+        limiter: asyncio.Semaphore | None = None,
     ) -> list[tuple[MemoryType, str, list[str]]]:
         if not memory_types:
             return []
@@ -444,6 +471,7 @@ class MemorizeMixin:
                 categories_prompt_str=categories_prompt_str,
                 segments=segments,
                 llm_client=client,
+                limiter=limiter,
             )
             return entries
             # if entries:
@@ -463,6 +491,7 @@ class MemorizeMixin:
         categories_prompt_str: str,
         segments: list[dict[str, int | str]] | None,
         llm_client: Any | None = None,
+        limiter: asyncio.Semaphore | None = None,
     ) -> list[tuple[MemoryType, str, list[str]]]:
         if modality == "conversation" and segments:
             segment_entries = await self._generate_entries_for_segments(
@@ -471,6 +500,7 @@ class MemorizeMixin:
                 memory_types=memory_types,
                 categories_prompt_str=categories_prompt_str,
                 llm_client=llm_client,
+                limiter=limiter,
             )
             if segment_entries:
                 return segment_entries
@@ -479,6 +509,7 @@ class MemorizeMixin:
             memory_types=memory_types,
             categories_prompt_str=categories_prompt_str,
             llm_client=llm_client,
+            limiter=limiter,
         )
 
     async def _generate_entries_for_segments(
@@ -489,23 +520,33 @@ class MemorizeMixin:
         memory_types: list[MemoryType],
         categories_prompt_str: str,
         llm_client: Any | None = None,
+        limiter: asyncio.Semaphore | None = None,
     ) -> list[tuple[MemoryType, str, list[str]]]:
-        entries: list[tuple[MemoryType, str, list[str]]] = []
         lines = resource_text.split("\n")
         max_idx = len(lines) - 1
-        for segment in segments:
-            start_idx = int(segment.get("start", 0))
-            end_idx = int(segment.get("end", max_idx))
-            segment_text = self._extract_segment_text(lines, start_idx, end_idx)
-            if not segment_text:
-                continue
-            segment_entries = await self._generate_entries_from_text(
-                resource_text=segment_text,
-                memory_types=memory_types,
-                categories_prompt_str=categories_prompt_str,
-                llm_client=llm_client,
-            )
-            entries.extend(segment_entries)
+        segment_texts = [
+            self._extract_segment_text(lines, int(segment.get("start", 0)), int(segment.get("end", max_idx)))
+            for segment in segments
+        ]
+        limiter = limiter or asyncio.Semaphore(self.memorize_config.extraction_concurrency)
+        results = await self._gather_partial(
+            "segment extraction",
+            [
+                self._generate_entries_from_text(
+                    resource_text=segment_text,
+                    memory_types=memory_types,
+                    categories_prompt_str=categories_prompt_str,
+                    llm_client=llm_client,
+                    limiter=limiter,
+                )
+                for segment_text in segment_texts
+                if segment_text
+            ],
+        )
+        entries: list[tuple[MemoryType, str, list[str]]] = []
+        for segment_entries in results:
+            if not isinstance(segment_entries, BaseException):
+                entries.extend(segment_entries)
         return entries
 
     async def _generate_entries_from_text(
@@ -515,22 +556,57 @@ class MemorizeMixin:
         memory_types: list[MemoryType],
         categories_prompt_str: str,
         llm_client: Any | None = None,
+        limiter: asyncio.Semaphore | None = None,
     ) -> list[tuple[MemoryType, str, list[str]]]:
         if not memory_types:
             return []
         client = llm_client or self._get_llm_client()
-        prompts = [
-            self._build_memory_type_prompt(
-                memory_type=mtype,
-                resource_text=resource_text,
-                categories_str=categories_prompt_str,
+        limiter = limiter or asyncio.Semaphore(self.memorize_config.extraction_concurrency)
+        typed_prompts = [
+            (
+                mtype,
+                self._build_memory_type_prompt(
+                    memory_type=mtype,
+                    resource_text=resource_text,
+                    categories_str=categories_prompt_str,
+                ),
             )
             for mtype in memory_types
         ]
-        valid_prompts = [prompt for prompt in prompts if prompt.strip()]
-        tasks = [client.summarize(prompt_text) for prompt_text in valid_prompts]
-        responses = await asyncio.gather(*tasks)
-        return self._parse_structured_entries(memory_types, responses)
+        typed_prompts = [(mtype, prompt) for mtype, prompt in typed_prompts if prompt.strip()]
+
+        async def extract(prompt_text: str) -> str:
+            async with limiter:
+                return cast(str, await client.summarize(prompt_text))
+
+        responses = await self._gather_partial(
+            "memory type extraction", [extract(prompt_text) for _, prompt_text in typed_prompts]
+        )
+        succeeded = [
+            (mtype, response)
+            for (mtype, _), response in zip(typed_prompts, responses, strict=True)
+            if not isinstance(response, BaseException)
+        ]
+        return self._parse_structured_entries([m for m, _ in succeeded], [r for _, r in succeeded])
+
+    @staticmethod
+    async def _gather_partial(label: str, aws: Sequence[Awaitable[T]]) -> list[T | BaseException]:
+        """
+        Run ``aws`` concurrently, keeping results in order.
+
+        Failures are logged and returned in place of their result so sibling work is
+        kept; only when every awaitable fails is the first error raised.
+        """
+        results = await asyncio.gather(*aws, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        for failure in failures:
+            if not isinstance(failure, Exception):
+                raise failure
+        if failures and len(failures) == len(results):
+            raise failures[0]
+        for failure in failures:
+            logger.warning("%s failed for %d of %d tasks: %r", label, len(failures), len(results), failure)
+        return results
 
     def _parse_structured_entries(
         self, memory_types: list[MemoryType], responses: Sequence[str]
@@ -599,25 +675,28 @@ class MemorizeMixin:
         # Changed: now stores (item_id, summary) tuples for reference support
         category_memory_updates: dict[str, list[tuple[str, str]]] = {}
 
-        reinforce = self.memorize_config.enable_item_reinforcement
-        for (memory_type, summary_text, cat_names), emb in zip(structured_entries, item_embeddings, strict=True):
-            item = store.memory_item_repo.create_item(
-                resource_id=resource_id,
-                memory_type=memory_type,
-                summary=summary_text,
-                embedding=emb,
-                user_data=dict(user or {}),
-                reinforce=reinforce,
-            )
+        # One write for all items of the resource, one for all their category links
+        created_items = store.memory_item_repo.create_items_bulk(
+            resource_id=resource_id,
+            entries=[
+                (memory_type, summary_text, emb)
+                for (memory_type, summary_text, _), emb in zip(structured_entries, item_embeddings, strict=True)
+            ],
+            user_data=dict(user or {}),
+            reinforce=self.memorize_config.enable_item_reinforcement,
+        )
+        links: list[tuple[str, str]] = []
+        for (_, summary_text, cat_names), (item, created) in zip(structured_entries, created_items, strict=True):
             items.append(item)
-            if reinforce and item.extra.get("reinforcement_count", 1) > 1:
-                # existing item
+            if not created:
+                # existing item was reinforced
                 continue
-            mapped_cat_ids = self._map_category_names_to_ids(cat_names, ctx)
-            for cid in mapped_cat_ids:
-                rels.append(store.category_item_repo.link_item_category(item.id, cid, user_data=dict(user or {})))
+            for cid in self._map_category_names_to_ids(cat_names, ctx):
+                links.append((item.id, cid))
                 # Store (item_id, summary) tuple for reference support
                 category_memory_updates.setdefault(cid, []).append((item.id, summary_text))
+        if links:
+            rels = store.category_item_repo.link_items_bulk(links, user_data=dict(user or {}))
 
         return items, rels, category_memory_updates
 
@@ -823,8 +902,18 @@ class MemorizeMixin:
             segment_text = "\n".join(lines[start : end + 1])
 
             if segment_text.strip():
-                caption = await self._summarize_segment(segment_text, llm_client=client)
-                resources.append({"text": segment_text, "caption": caption})
+                resources.append({"text": segment_text, "caption": None})
+
+        # Captions are independent; _summarize_segment already degrades to None on failure
+        limiter = asyncio.Semaphore(self.memorize_config.extraction_concurrency)
+
+        async def caption(segment_text: str | None) -> str | None:
+            async with limiter:
+                return await self._summarize_segment(segment_text or "", llm_client=client)
+
+        captions = await asyncio.gather(*(caption(res["text"]) for res in resources))
+        for res, segment_caption in zip(resources, captions, strict=True):
+            res["caption"] = segment_caption
         return resources if resources else [{"text": conversation_text, "caption": None}]
 
     async def _summarize_segment(self, segment_text: str, llm_client: Any | None = None) -> str | None:
@@ -1132,13 +1221,41 @@ Summary:"""
             cat = store.memory_category_repo.categories.get(cid)
             if not cat:
                 continue
-            cleaned_summary = summary.replace("```markdown", "").replace("```", "").strip()
+            updated_summaries[cid] = summary.replace("```markdown", "").replace("```", "").strip()
+        await self._write_category_summaries(updated_summaries, store)
+        return updated_summaries
+
+    async def _write_category_summaries(
+        self,
+        summaries: Mapping[str, str],
+        store: Database,
+        embed_client: Any | None = None,
+    ) -> dict[str, list[float]]:
+        """
+        Persist category summaries together with their embeddings.
+
+        The embedding is stored with a ``compute_summary_hash`` fingerprint so retrieval
+        can rank categories without re-embedding every summary.
+
+        Returns:
+            dict mapping category_id -> summary embedding
+        """
+        if not summaries:
+            return {}
+        client = embed_client or self._get_llm_client("embedding")
+        embed_model = getattr(client, "embed_model", None)
+        to_embed = [cid for cid, summary in summaries.items() if summary]
+        vectors = await client.embed([summaries[cid] for cid in to_embed]) if to_embed else []
+        summary_vectors = dict(zip(to_embed, vectors, strict=True))
+        for cid, summary in summaries.items():
+            vector = summary_vectors.get(cid)
             store.memory_category_repo.update_category(
                 category_id=cid,
-                summary=cleaned_summary,
+                summary=summary,
+                summary_embedding=vector,
+                summary_hash=compute_summary_hash(summary, embed_model) if vector is not None else None,
             )
-            updated_summaries[cid] = cleaned_summary
-        return updated_summaries
+        return summary_vectors
 
     def _parse_conversation_preprocess(self, raw: str) -> tuple[str | None, str | None]:
         conversation = self._extract_tag_content(raw, "conversation")
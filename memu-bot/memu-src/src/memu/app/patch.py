@@ -33,6 +33,7 @@ class PatchMixin:
         _escape_prompt_value: Callable[[str], str]
         user_model: type[BaseModel]
         _ensure_categories_ready: Callable[[Context, Database, Mapping[str, Any] | None], Awaitable[None]]
+        _write_category_summaries: Callable[..., Awaitable[dict[str, list[float]]]]
 
     async def create_memory_item(
         self,
@@ -412,15 +413,12 @@ class PatchMixin:
         if not tasks:
             return
         patches = await asyncio.gather(*tasks)
+        patched: dict[str, str] = {}
         for cid, patch in zip(target_ids, patches, strict=True):
             need_update, summary = self._parse_category_patch_response(patch)
-            if not need_update:
-                continue
-            cat = store.memory_category_repo.categories.get(cid)
-            store.memory_category_repo.update_category(
-                category_id=cid,
-                summary=summary.strip(),
-            )
+            if need_update:
+                patched[cid] = summary.strip()
+        await self._write_category_summaries(patched, store)
 
     def _build_category_patch_prompt(
         self, *, category: MemoryCategory, content_before: str | None, content_after: str | None
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, cast
 from pydantic import BaseModel
 
 from memu.database.inmemory.vector import cosine_topk
+from memu.database.models import compute_summary_hash
 from memu.prompts.retrieve.llm_category_ranker import PROMPT as LLM_CATEGORY_RANKER_PROMPT
 from memu.prompts.retrieve.llm_item_ranker import PROMPT as LLM_ITEM_RANKER_PROMPT
 from memu.prompts.retrieve.llm_resource_ranker import PROMPT as LLM_RESOURCE_RANKER_PROMPT
@@ -31,6 +32,7 @@ class RetrieveMixin:
         _get_context: Callable[[], Context]
         _get_database: Callable[[], Database]
         _ensure_categories_ready: Callable[[Context, Database], Awaitable[None]]
+        _write_category_summaries: Callable[..., Awaitable[dict[str, list[float]]]]
         _get_step_llm_client: Callable[[Mapping[str, Any] | None], Any]
         _get_step_embedding_client: Callable[[Mapping[str, Any] | None], Any]
         _get_llm_client: Callable[..., Any]
@@ -735,10 +737,20 @@ class RetrieveMixin:
         entries = [(cid, cat.summary) for cid, cat in category_pool.items() if cat.summary]
         if not entries:
             return [], {}
-        summary_texts = [summary for _, summary in entries]
         client = embed_client or self._get_llm_client()
-        summary_embeddings = await client.embed(summary_texts)
-        corpus = [(cid, emb) for (cid, _), emb in zip(entries, summary_embeddings, strict=True)]
+        embed_model = getattr(client, "embed_model", None)
+        summary_vectors: dict[str, list[float] | None] = {}
+        stale: dict[str, str] = {}
+        for cid, summary in entries:
+            cat = category_pool[cid]
+            if cat.summary_embedding is not None and cat.summary_hash == compute_summary_hash(summary, embed_model):
+                summary_vectors[cid] = cat.summary_embedding
+            else:
+                stale[cid] = summary
+        if stale:
+            # Summaries written before embeddings were stored, or embedded with another model
+            summary_vectors.update(await self._write_category_summaries(stale, store, embed_client=client))
+        corpus = [(cid, summary_vectors.get(cid)) for cid, _ in entries]
         hits = cosine_topk(query_vec, corpus, k=top_k)
         summary_lookup = dict(entries)
         return hits, summary_lookup
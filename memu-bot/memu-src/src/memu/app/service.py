@@ -5,6 +5,7 @@ from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar
 
+import httpx
 from pydantic import BaseModel
 
 from memu.app.crud import CRUDMixin
@@ -14,6 +15,9 @@ from memu.app.settings import (
     BlobConfig,
     CategoryConfig,
     DatabaseConfig,
+    EmbeddingCacheConfig,
+    EmbeddingDispatchConfig,
+    HTTPPoolConfig,
     LLMConfig,
     LLMProfilesConfig,
     MemorizeConfig,
@@ -23,7 +27,10 @@ from memu.app.settings import (
 from memu.blob.local_fs import LocalFS
 from memu.database.factory import build_database
 from memu.database.interfaces import Database
+from memu.embedding.cache import CachedEmbeddingClient, EmbeddingCache
+from memu.embedding.dispatcher import EmbeddingDispatcher
 from memu.llm.http_client import HTTPLLMClient
+from memu.llm.http_pool import HTTPClientPool
 from memu.llm.wrapper import (
     LLMCallMetadata,
     LLMClientWrapper,
@@ -83,6 +90,8 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
 
         # Initialize client caches (lazy creation on first use)
         self._llm_clients: dict[str, Any] = {}
+        self._embedding_caches: dict[tuple[int, str | None], EmbeddingCache] = {}
+        self._http_pools: dict[tuple[Any, ...], HTTPClientPool] = {}
         self._llm_interceptors = LLMInterceptorRegistry()
         self._workflow_interceptors = WorkflowInterceptorRegistry()
 
@@ -107,6 +116,13 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
                 chat_model=cfg.chat_model,
                 embed_model=cfg.embed_model,
                 embed_batch_size=cfg.embed_batch_size,
+                http_limits=httpx.Limits(
+                    max_connections=cfg.http_pool.max_connections,
+                    max_keepalive_connections=cfg.http_pool.max_keepalive_connections,
+                    keepalive_expiry=cfg.http_pool.keepalive_expiry,
+                ),
+                http2=cfg.http_pool.http2,
+                embed_dispatcher=self._build_embed_dispatcher(cfg.embed_dispatch, cfg.embed_batch_size),
             )
         elif backend == "httpx":
             return HTTPLLMClient(
@@ -116,6 +132,8 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
                 provider=cfg.provider,
                 endpoint_overrides=cfg.endpoint_overrides,
                 embed_model=cfg.embed_model,
+                http_pool=self._get_http_pool(cfg.base_url, cfg.http_pool),
+                embed_dispatcher=self._build_embed_dispatcher(cfg.embed_dispatch, 2048),
             )
         elif backend == "lazyllm_backend":
             from memu.llm.lazyllm_client import LazyLLMClient
@@ -129,11 +147,24 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
                 embed_model=cfg.embed_model,
                 vlm_model=cfg.lazyllm_source.vlm_model,
                 stt_model=cfg.lazyllm_source.stt_model,
+                embed_dispatcher=self._build_embed_dispatcher(cfg.embed_dispatch, cfg.embed_batch_size),
             )
         else:
             msg = f"Unknown llm_client_backend '{cfg.client_backend}'"
             raise ValueError(msg)
 
+    @staticmethod
+    def _build_embed_dispatcher(config: EmbeddingDispatchConfig, default_batch_items: int) -> EmbeddingDispatcher:
+        return EmbeddingDispatcher(
+            max_batch_items=config.max_batch_items or default_batch_items,
+            max_batch_chars=config.max_batch_chars,
+            max_batch_tokens=config.max_batch_tokens,
+            max_concurrency=config.max_concurrency,
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+        )
+
     def _get_llm_base_client(self, profile: str | None = None) -> Any:
         """
         Lazily initialize and cache LLM clients per profile to avoid eager network setup.
@@ -147,9 +178,80 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
             msg = f"Unknown llm profile '{name}'"
             raise KeyError(msg)
         client = self._init_llm_client(cfg)
+        if cfg.embedding_cache.enabled:
+            client = CachedEmbeddingClient(
+                client,
+                cache=self._get_embedding_cache(cfg.embedding_cache),
+                provider=cfg.provider,
+                embed_model=cfg.embed_model,
+            )
         self._llm_clients[name] = client
         return client
 
+    def _get_embedding_cache(self, config: EmbeddingCacheConfig) -> EmbeddingCache:
+        """Profiles with the same cache settings share one cache (keys already carry provider and model)."""
+        key = (config.max_bytes, config.disk_path)
+        cache = self._embedding_caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(max_bytes=config.max_bytes, disk_path=config.disk_path)
+            self._embedding_caches[key] = cache
+        return cache
+
+    def _get_http_pool(self, base_url: str, config: HTTPPoolConfig) -> HTTPClientPool:
+        """Profiles pointing at the same host with the same limits share one connection pool."""
+        key = (
+            base_url.rstrip("/"),
+            config.max_connections,
+            config.max_keepalive_connections,
+            config.keepalive_expiry,
+            config.http2,
+        )
+        pool = self._http_pools.get(key)
+        if pool is None:
+            pool = HTTPClientPool(
+                base_url=base_url,
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+                http2=config.http2,
+            )
+            self._http_pools[key] = pool
+        return pool
+
+    def llm_pool_stats(self) -> dict[str, dict[str, Any]]:
+        """Connection pool statistics per initialized LLM profile (profiles sharing a pool report the same one)."""
+        return {
+            name: client.pool_stats() for name, client in self._llm_clients.items() if hasattr(client, "pool_stats")
+        }
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections, embedding caches and the database; the service is unusable afterwards."""
+        clients, self._llm_clients = list(self._llm_clients.values()), {}
+        for client in clients:
+            if hasattr(client, "aclose"):
+                await client.aclose()
+        for pool in self._http_pools.values():
+            await pool.aclose()
+        self._http_pools.clear()
+        for cache in self._embedding_caches.values():
+            cache.close()
+        self._embedding_caches.clear()
+        self.database.close()
+
+    async def __aenter__(self) -> MemoryService:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def embedding_cache_stats(self) -> dict[str, dict[str, Any]]:
+        """Cumulative embedding cache statistics per LLM profile (profiles without a cache are omitted)."""
+        return {
+            name: client.cache.stats()
+            for name, client in self._llm_clients.items()
+            if isinstance(client, CachedEmbeddingClient)
+        }
+
     @staticmethod
     def _llm_call_metadata(profile: str, step_context: Mapping[str, Any] | None) -> LLMCallMetadata:
         if not isinstance(step_context, Mapping):
@@ -373,7 +475,7 @@ class MemoryService(MemorizeMixin, RetrieveMixin, CRUDMixin):
         return value.replace("{", "{{").replace("}", "}}")
 
     def _model_dump_without_embeddings(self, obj: BaseModel) -> dict[str, Any]:
-        data = obj.model_dump(exclude={"embedding"})
+        data = obj.model_dump(exclude={"embedding", "summary_embedding"})
         return data
 
     @staticmethod
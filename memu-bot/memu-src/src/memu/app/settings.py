@@ -99,6 +99,48 @@ class LazyLLMSource(BaseModel):
     stt_model: str = Field(default="qwen-audio-turbo", description="Speech-to-text model for lazyllm client backend")
 
 
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = Field(default=False, description="Cache embeddings by (provider, model, sha256(text)).")
+    max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Byte budget of the in-process LRU tier (vectors are held as float32).",
+    )
+    disk_path: str | None = Field(
+        default=None,
+        description="Optional SQLite file backing the LRU so cached embeddings survive restarts.",
+    )
+
+
+class HTTPPoolConfig(BaseModel):
+    max_connections: int | None = Field(default=100, ge=1, description="Upper bound on open connections per pool.")
+    max_keepalive_connections: int | None = Field(
+        default=20,
+        ge=0,
+        description="Idle connections kept open for reuse between calls.",
+    )
+    keepalive_expiry: float | None = Field(default=30.0, ge=0, description="Seconds an idle connection is kept.")
+    http2: bool = Field(default=False, description="Negotiate HTTP/2 (requires the 'h2' package).")
+
+
+class EmbeddingDispatchConfig(BaseModel):
+    max_batch_items: int | None = Field(
+        default=None,
+        ge=1,
+        description="Inputs per embedding request; defaults to embed_batch_size for 'sdk' and 2048 for 'httpx'.",
+    )
+    max_batch_chars: int | None = Field(default=None, ge=1, description="Character budget per embedding request.")
+    max_batch_tokens: int | None = Field(
+        default=250_000,
+        ge=1,
+        description="Estimated token budget (~4 chars/token) per embedding request.",
+    )
+    max_concurrency: int = Field(default=4, ge=1, description="Embedding requests in flight at once.")
+    max_retries: int = Field(default=3, ge=0, description="Retries for a batch failing with a transient error.")
+    backoff_base: float = Field(default=0.5, ge=0, description="First retry delay in seconds (doubles per retry).")
+    backoff_max: float = Field(default=8.0, ge=0, description="Upper bound on a single retry delay in seconds.")
+
+
 class LLMConfig(BaseModel):
     provider: str = Field(
         default="openai",
@@ -124,6 +166,18 @@ class LLMConfig(BaseModel):
         default=1,
         description="Maximum batch size for embedding API calls (used by SDK client backends).",
     )
+    embedding_cache: EmbeddingCacheConfig = Field(
+        default_factory=EmbeddingCacheConfig,
+        description="Content-addressed cache in front of this profile's embedding calls.",
+    )
+    embed_dispatch: EmbeddingDispatchConfig = Field(
+        default_factory=EmbeddingDispatchConfig,
+        description="Batching, concurrency and retries for large embedding requests.",
+    )
+    http_pool: HTTPPoolConfig = Field(
+        default_factory=HTTPPoolConfig,
+        description="Connection pool limits for the 'httpx' and 'sdk' client backends.",
+    )
 
     @model_validator(mode="after")
     def set_provider_defaults(self) -> "LLMConfig":
@@ -217,6 +271,11 @@ class MemorizeConfig(BaseModel):
         description="User prompt overrides for each memory type extraction.",
     )
     memory_extract_llm_profile: str = Field(default="default", description="LLM profile for memory extract.")
+    extraction_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Max concurrent LLM calls while extracting memories (segments x memory types) per memorize call.",
+    )
     memory_categories: list[CategoryConfig] = Field(
         default_factory=_default_memory_categories,
         description="Global memory category definitions embedded at service startup.",
@@ -300,11 +359,30 @@ class MetadataStoreConfig(BaseModel):
     provider: Annotated[Literal["inmemory", "postgres", "sqlite"], Normalize] = "inmemory"
     ddl_mode: Annotated[Literal["create", "validate"], Normalize] = "create"
     dsn: str | None = Field(default=None, description="Database connection string (required for postgres/sqlite).")
+    embedding_dtype: Annotated[Literal["float32", "float16"], Normalize] = Field(
+        default="float32",
+        description="Element type of binary embedding columns (sqlite only); float16 halves size at some precision.",
+    )
 
 
 class VectorIndexConfig(BaseModel):
-    provider: Annotated[Literal["bruteforce", "pgvector", "none"], Normalize] = "bruteforce"
+    provider: Annotated[Literal["bruteforce", "ivf", "pgvector", "none"], Normalize] = "bruteforce"
     dsn: str | None = Field(default=None, description="Postgres connection string when provider=pgvector.")
+    nlist: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of IVF cells when provider=ivf; defaults to sqrt(n) at training time.",
+    )
+    nprobe: int = Field(
+        default=8,
+        ge=1,
+        description="IVF cells scanned per query; higher values improve recall at the cost of latency.",
+    )
+    min_train_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Vectors required before the IVF index clusters; smaller indexes are searched exactly.",
+    )
 
 
 class DatabaseConfig(BaseModel):
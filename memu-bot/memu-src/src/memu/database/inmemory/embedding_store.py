@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping
+from datetime import datetime
+from typing import Any, cast
+
+import numpy as np
+
+from memu.database.inmemory.vector import posix_timestamp, salience_weights
+
+
+def normalize_vector(vector: list[float] | np.ndarray) -> np.ndarray:
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        return vec
+    return vec / norm
+
+
+def topk_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` largest ``scores``, best first (argpartition, then sort only the winners)."""
+    n = scores.shape[0]
+    actual_k = min(k, n)
+    if actual_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if actual_k == n:
+        return np.argsort(scores)[::-1]
+    top = np.argpartition(scores, -actual_k)[-actual_k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+class EmbeddingStore:
+    """
+    Repository-owned embedding matrix used for vector search.
+
+    Embeddings live in one preallocated, geometrically grown float32 matrix whose
+    rows are normalised on write, so a cosine search is a single matmul over the
+    live rows. Rows are addressed through an id<->row map; deletes set a tombstone
+    bit and the matrix is compacted once tombstones outnumber live rows.
+
+    Scope fields (``user_id``, ...) are kept as integer-coded columns so ``where``
+    filters from ``matches_where`` can be evaluated as a vectorized mask without
+    touching the item models. Reinforcement counts and last-reinforced timestamps
+    are kept as parallel arrays so salience ranking is vectorized as well.
+    """
+
+    def __init__(self, *, scope_fields: Iterable[str] = (), initial_capacity: int = 1024) -> None:
+        self.scope_fields = list(scope_fields)
+        self._initial_capacity = max(1, initial_capacity)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._dim: int | None = None
+        self._capacity = 0
+        self._size = 0
+        self._vecs = np.empty((0, 0), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._reinforcement = np.empty(0, dtype=np.float64)
+        self._last_reinforced = np.empty(0, dtype=np.float64)
+        self._scope_cols: dict[str, np.ndarray] = {f: np.empty(0, dtype=np.int32) for f in self.scope_fields}
+        self._scope_codes: dict[str, dict[Hashable, int]] = {f: {} for f in self.scope_fields}
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    @property
+    def dim(self) -> int | None:
+        return self._dim
+
+    def clear(self) -> None:
+        self._reset()
+
+    def upsert(
+        self,
+        item_id: str,
+        vector: list[float] | np.ndarray | None,
+        scope: Mapping[str, Any] | None = None,
+        *,
+        reinforcement_count: int = 1,
+        last_reinforced_at: datetime | None = None,
+    ) -> None:
+        """Insert or replace the row for ``item_id``; a ``None`` vector removes it."""
+        if vector is None:
+            self.remove(item_id)
+            return
+        vec = normalize_vector(vector)
+        if self._dim is None:
+            self._dim = int(vec.shape[0])
+            self._resize(self._initial_capacity)
+        elif vec.shape[0] != self._dim:
+            msg = f"Embedding dimension mismatch: store has {self._dim}, got {vec.shape[0]}"
+            raise ValueError(msg)
+
+        row = self._rows.get(item_id)
+        if row is None:
+            if self._size == self._capacity:
+                self._resize(self._capacity * 2)
+            row = self._size
+            self._size += 1
+            self._alive[row] = True
+            for col in self._scope_cols.values():
+                col[row] = -1
+            self._ids.append(item_id)
+            self._rows[item_id] = row
+        self._vecs[row] = vec
+        self._reinforcement[row] = reinforcement_count
+        self._last_reinforced[row] = posix_timestamp(last_reinforced_at)
+        if scope is not None:
+            for field, col in self._scope_cols.items():
+                col[row] = self._code(field, scope.get(field))
+        self._on_upsert(row)
+
+    def set_salience(self, item_id: str, reinforcement_count: int, last_reinforced_at: datetime | None) -> None:
+        """Update the salience inputs of an indexed row (no-op for unknown ids)."""
+        row = self._rows.get(item_id)
+        if row is None:
+            return
+        self._reinforcement[row] = reinforcement_count
+        self._last_reinforced[row] = posix_timestamp(last_reinforced_at)
+
+    def remove(self, item_id: str) -> None:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._ids[row] = None
+        dead = self._size - len(self._rows)
+        if dead > len(self._rows) and dead >= self._initial_capacity:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop tombstoned rows, preserving the relative order of live rows."""
+        if len(self._rows) == self._size:
+            return
+        keep = np.flatnonzero(self._alive[: self._size])
+        self._compact_rows(keep)
+        self._ids = [self._ids[i] for i in keep]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids) if item_id is not None}
+        self._size = int(keep.size)
+
+    def where_mask(self, where: Mapping[str, Any] | None) -> np.ndarray | None:
+        """
+        Boolean mask of live rows matching ``where`` (same semantics as ``matches_where``).
+
+        Returns ``None`` when ``where`` references a field that is not a tracked scope
+        field; callers then resolve the filter themselves and use ``ids_mask``.
+        """
+        mask = self._alive[: self._size].copy()
+        if not where:
+            return mask
+        for raw_key, expected in where.items():
+            if expected is None:
+                continue
+            field, op = [*raw_key.split("__", 1), None][:2]
+            col = self._scope_cols.get(str(field))
+            if col is None:
+                return None
+            codes = self._scope_codes[str(field)]
+            if op == "in" and not isinstance(expected, str):
+                wanted = [codes[v] for v in expected if isinstance(v, Hashable) and v in codes]
+                mask &= np.isin(col[: self._size], wanted)
+            else:
+                code = codes.get(expected) if isinstance(expected, Hashable) else None
+                if code is None:
+                    mask[:] = False
+                    return mask
+                mask &= col[: self._size] == code
+        return mask
+
+    def ids_mask(self, item_ids: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(self._size, dtype=bool)
+        rows = [row for item_id in item_ids if (row := self._rows.get(item_id)) is not None]
+        mask[rows] = True
+        return mask
+
+    def search(self, query_vec: list[float], k: int, *, mask: np.ndarray | None = None) -> list[tuple[str, float]]:
+        """Exact top-``k`` cosine search over live rows (optionally restricted to ``mask``)."""
+        if k <= 0 or not self._rows:
+            return []
+        rows = np.flatnonzero(self._alive[: self._size] if mask is None else mask)
+        return self._rank(self._query(query_vec), rows, k)
+
+    def search_salience(
+        self,
+        query_vec: list[float],
+        k: int,
+        *,
+        mask: np.ndarray | None = None,
+        recency_decay_days: float = 30.0,
+    ) -> list[tuple[str, float]]:
+        """
+        Exact top-``k`` salience search: cosine * log(reinforcement + 1) * recency decay.
+
+        Always scans every candidate row (an approximate index would prune by cosine
+        alone, which is not the ranking being asked for).
+        """
+        if k <= 0 or not self._rows:
+            return []
+        rows = np.flatnonzero(self._alive[: self._size] if mask is None else mask)
+        if rows.size == 0:
+            return []
+        weights = salience_weights(self._reinforcement[rows], self._last_reinforced[rows], recency_decay_days)
+        scores = self._similarities(self._query(query_vec), rows) * weights
+        return [(self._ids[rows[i]], float(scores[i])) for i in topk_rows(scores, k)]
+
+    def _query(self, query_vec: list[float]) -> np.ndarray:
+        q = normalize_vector(query_vec)
+        if q.shape[0] != self._dim:
+            msg = f"Query dimension mismatch: store has {self._dim}, got {q.shape[0]}"
+            raise ValueError(msg)
+        return q
+
+    def _rank(self, q: np.ndarray, rows: np.ndarray, k: int) -> list[tuple[str, float]]:
+        if rows.size == 0:
+            return []
+        scores = self._similarities(q, rows)
+        return [(self._ids[rows[i]], float(scores[i])) for i in topk_rows(scores, k)]
+
+    def _similarities(self, q: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        # Mostly-full candidate set: one matmul over the contiguous block beats a gather copy
+        if rows.size * 2 >= self._size:
+            return cast(np.ndarray, (self._vecs[: self._size] @ q)[rows])
+        return cast(np.ndarray, self._vecs[rows] @ q)
+
+    def _code(self, field: str, value: Any) -> int:
+        codes = self._scope_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+        return code
+
+    # Hooks for subclasses keeping arrays aligned with the matrix rows.
+
+    def _resize(self, capacity: int) -> None:
+        vecs = np.empty((capacity, self._dim or 0), dtype=np.float32)
+        if self._size:
+            vecs[: self._size] = self._vecs[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        reinforcement = np.ones(capacity, dtype=np.float64)
+        reinforcement[: self._size] = self._reinforcement[: self._size]
+        last_reinforced = np.full(capacity, np.nan, dtype=np.float64)
+        last_reinforced[: self._size] = self._last_reinforced[: self._size]
+        self._reinforcement, self._last_reinforced = reinforcement, last_reinforced
+        for field, col in self._scope_cols.items():
+            grown = np.full(capacity, -1, dtype=np.int32)
+            grown[: self._size] = col[: self._size]
+            self._scope_cols[field] = grown
+        self._vecs, self._alive = vecs, alive
+        self._capacity = capacity
+
+    def _compact_rows(self, keep: np.ndarray) -> None:
+        n = keep.size
+        self._vecs[:n] = self._vecs[keep]
+        self._alive[:n] = True
+        self._alive[n:] = False
+        self._reinforcement[:n] = self._reinforcement[keep]
+        self._last_reinforced[:n] = self._last_reinforced[keep]
+        for col in self._scope_cols.values():
+            col[:n] = col[keep]
+
+    def _on_upsert(self, row: int) -> None:
+        return None
+
+
+__all__ = ["EmbeddingStore", "normalize_vector", "topk_rows"]
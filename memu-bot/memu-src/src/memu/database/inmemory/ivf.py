@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from memu.database.inmemory.embedding_store import EmbeddingStore
+
+if TYPE_CHECKING:
+    from memu.app.settings import VectorIndexConfig
+
+# Rows scored per chunk when (re)assigning vectors to centroids; bounds the
+# temporary (rows x nlist) score matrix.
+_ASSIGN_CHUNK = 8192
+
+
+class IVFIndex(EmbeddingStore):
+    """
+    Inverted-file approximate nearest-neighbour index over the embedding store.
+
+    Vectors are clustered with spherical k-means into ``nlist`` cells. A query
+    scores the centroids first and only scans the ``nprobe`` closest cells, so
+    raising ``nprobe`` trades latency for recall (``nprobe >= nlist`` is exact).
+
+    The index is maintained incrementally: ``upsert`` assigns new vectors to their
+    nearest existing centroid, ``remove`` tombstones the row. Until the index holds
+    ``min_train_size`` vectors it behaves as the exact store; it is retrained
+    (and tombstones compacted) once the live population grows by ``retrain_growth``.
+
+    Scores are cosine similarities, matching ``cosine_topk``.
+    """
+
+    def __init__(
+        self,
+        *,
+        scope_fields: Iterable[str] = (),
+        nlist: int | None = None,
+        nprobe: int = 8,
+        min_train_size: int = 1024,
+        retrain_growth: float = 4.0,
+        kmeans_iters: int = 10,
+        seed: int = 0,
+    ) -> None:
+        if nprobe < 1:
+            msg = "nprobe must be >= 1"
+            raise ValueError(msg)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.kmeans_iters = kmeans_iters
+        self._rng = np.random.default_rng(seed)
+        super().__init__(scope_fields=scope_fields)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._assign = np.empty(0, dtype=np.int32)
+        self._centroids: np.ndarray | None = None
+        self._trained_on = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def train(self) -> None:
+        """(Re)cluster the live vectors and compact tombstoned rows."""
+        self.compact()
+        n = self._size
+        if n == 0:
+            self._centroids = None
+            self._trained_on = 0
+            return
+
+        nlist = min(self.nlist or max(1, round(math.sqrt(n))), n)
+        data = self._vecs[:n]
+        sample_size = min(n, nlist * 64)
+        sample = data[self._rng.choice(n, size=sample_size, replace=False)] if sample_size < n else data
+
+        centroids = sample[self._rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            if empty.any():
+                # Re-seed empty cells with random sample points
+                sums[empty] = sample[self._rng.choice(sample.shape[0], size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.maximum(norms, 1e-9)).astype(np.float32, copy=False)
+
+        self._centroids = centroids.astype(np.float32, copy=False)
+        for start in range(0, n, _ASSIGN_CHUNK):
+            chunk = data[start : start + _ASSIGN_CHUNK]
+            self._assign[start : start + chunk.shape[0]] = np.argmax(chunk @ self._centroids.T, axis=1)
+        self._trained_on = n
+
+    def search(
+        self,
+        query_vec: list[float],
+        k: int,
+        *,
+        mask: np.ndarray | None = None,
+        nprobe: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Return up to ``k`` ``(id, cosine)`` pairs, best first.
+
+        ``mask`` restricts results to matching rows (e.g. the caller's ``where``
+        scope). If a probe yields fewer than ``k`` matches, the probe is widened
+        until it does or every cell has been scanned.
+        """
+        if k <= 0 or not self._rows:
+            return []
+        q = self._query(query_vec)
+        allowed = self._alive[: self._size] if mask is None else mask
+        probe = nprobe or self.nprobe
+        while True:
+            if self._centroids is None or probe >= self._centroids.shape[0]:
+                return self._rank(q, np.flatnonzero(allowed), k)
+            cells = np.argpartition(self._centroids @ q, -probe)[-probe:]
+            rows = np.flatnonzero(allowed & np.isin(self._assign[: self._size], cells))
+            hits = self._rank(q, rows, k)
+            if len(hits) >= k:
+                return hits
+            probe *= 2
+
+    def _resize(self, capacity: int) -> None:
+        assign = np.full(capacity, -1, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._assign = assign
+        super()._resize(capacity)
+
+    def _compact_rows(self, keep: np.ndarray) -> None:
+        super()._compact_rows(keep)
+        self._assign[: keep.size] = self._assign[keep]
+
+    def _on_upsert(self, row: int) -> None:
+        if self._centroids is not None:
+            self._assign[row] = int(np.argmax(self._centroids @ self._vecs[row]))
+        live = len(self._rows)
+        if (self._centroids is None and live >= self.min_train_size) or (
+            self._centroids is not None and live >= self._trained_on * self.retrain_growth
+        ):
+            self.train()
+
+
+def build_vector_index(config: VectorIndexConfig | None, *, scope_fields: Iterable[str] = ()) -> EmbeddingStore:
+    """Return the embedding store for the configured provider (exact unless provider="ivf")."""
+    if config is not None and config.provider == "ivf":
+        return IVFIndex(
+            scope_fields=scope_fields,
+            nlist=config.nlist,
+            nprobe=config.nprobe,
+            min_train_size=config.min_train_size,
+        )
+    return EmbeddingStore(scope_fields=scope_fields)
+
+
+__all__ = ["IVFIndex", "build_vector_index"]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
+from memu.database.inmemory.ivf import build_vector_index
 from memu.database.inmemory.models import build_inmemory_models
 from memu.database.inmemory.repositories import (
     InMemoryCategoryItemRepository,
@@ -16,6 +17,9 @@ from memu.database.interfaces import Database
 from memu.database.models import CategoryItem, MemoryCategory, MemoryItem, Resource
 from memu.database.repositories import MemoryCategoryRepo, ResourceRepo
 
+if TYPE_CHECKING:
+    from memu.app.settings import VectorIndexConfig
+
 
 class InMemoryStore(Database):
     def __init__(
@@ -27,6 +31,7 @@ class InMemoryStore(Database):
         memory_category_model: type[Any] | None = None,
         category_item_model: type[Any] | None = None,
         state: InMemoryState | None = None,
+        vector_index: VectorIndexConfig | None = None,
     ) -> None:
         self.scope_model = scope_model or BaseModel
         (
@@ -51,7 +56,11 @@ class InMemoryStore(Database):
         self.memory_category_repo: MemoryCategoryRepo = InMemoryMemoryCategoryRepository(
             state=self.state, memory_category_model=memory_category_model
         )
-        self.memory_item_repo = InMemoryMemoryItemRepository(state=self.state, memory_item_model=memory_item_model)
+        self.memory_item_repo = InMemoryMemoryItemRepository(
+            state=self.state,
+            memory_item_model=memory_item_model,
+            vectors=build_vector_index(vector_index, scope_fields=list(self.scope_model.model_fields)),
+        )
         self.category_item_repo = InMemoryCategoryItemRepository(
             state=self.state, category_item_model=category_item_model
         )
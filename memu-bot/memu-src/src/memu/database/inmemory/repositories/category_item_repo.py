@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any, override
 
 from memu.database.inmemory.repositories.filter import matches_where
@@ -30,6 +30,18 @@ class InMemoryCategoryItemRepository(CategoryItemRepo):
         self.relations.append(rel)
         return rel
 
+    def link_items_bulk(self, links: Sequence[tuple[str, str]], user_data: dict[str, Any]) -> list[CategoryItem]:
+        existing = {(rel.item_id, rel.category_id): rel for rel in self.relations}
+        result: list[CategoryItem] = []
+        for item_id, cat_id in links:
+            rel = existing.get((item_id, cat_id))
+            if rel is None:
+                rel = self.category_item_model(id=str(uuid.uuid4()), item_id=item_id, category_id=cat_id, **user_data)
+                self.relations.append(rel)
+                existing[(item_id, cat_id)] = rel
+            result.append(rel)
+        return result
+
     def load_existing(self) -> None:
         return None
 
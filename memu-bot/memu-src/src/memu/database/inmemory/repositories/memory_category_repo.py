@@ -58,6 +58,8 @@ class InMemoryMemoryCategoryRepository(MemoryCategoryRepoProtocol):
         description: str | None = None,
         embedding: list[float] | None = None,
         summary: str | None = None,
+        summary_embedding: list[float] | None = None,
+        summary_hash: str | None = None,
     ) -> MemoryCategory:
         cat = self.categories.get(category_id)
         if cat is None:
@@ -70,8 +72,14 @@ class InMemoryMemoryCategoryRepository(MemoryCategoryRepoProtocol):
             cat.description = description
         if embedding is not None:
             cat.embedding = embedding
-        if summary is not None:
+        if summary is not None and summary != cat.summary:
             cat.summary = summary
+            # A new summary invalidates the stored summary embedding
+            cat.summary_embedding = None
+            cat.summary_hash = None
+        if summary_embedding is not None:
+            cat.summary_embedding = summary_embedding
+            cat.summary_hash = summary_hash
 
         cat.updated_at = pendulum.now("UTC")
         return cat
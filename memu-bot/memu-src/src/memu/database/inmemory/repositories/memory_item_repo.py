@@ -1,23 +1,33 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any, override
 
 import pendulum
 
+from memu.database.inmemory.embedding_store import EmbeddingStore
 from memu.database.inmemory.repositories.filter import matches_where
 from memu.database.inmemory.state import InMemoryState
-from memu.database.inmemory.vector import cosine_topk, cosine_topk_salience
 from memu.database.models import MemoryItem, MemoryType, compute_content_hash
 from memu.database.repositories.memory_item import MemoryItemRepo
 
 
 class InMemoryMemoryItemRepository(MemoryItemRepo):
-    def __init__(self, *, state: InMemoryState, memory_item_model: type[MemoryItem]) -> None:
+    def __init__(
+        self,
+        *,
+        state: InMemoryState,
+        memory_item_model: type[MemoryItem],
+        vectors: EmbeddingStore | None = None,
+    ) -> None:
         self._state = state
         self.memory_item_model = memory_item_model
         self.items: dict[str, MemoryItem] = self._state.items
+        scope_fields = [f for f in memory_item_model.model_fields if f not in MemoryItem.model_fields]
+        self._vectors = vectors if vectors is not None else EmbeddingStore(scope_fields=scope_fields)
+        for item in self.items.values():
+            self._index_item(item)
 
     def list_items(self, where: Mapping[str, Any] | None = None) -> dict[str, MemoryItem]:
         if not where:
@@ -54,9 +64,12 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
         if not where:
             matches = self.items.copy()
             self.items.clear()
+            self._vectors.clear()
             return matches
         matches = {mid: item for mid, item in self.items.items() if matches_where(item, where)}
         self.items = {mid: item for mid, item in self.items.items() if mid not in matches}
+        for mid in matches:
+            self._vectors.remove(mid)
         return matches
 
     def _find_by_hash(self, content_hash: str, user_data: dict[str, Any]) -> MemoryItem | None:
@@ -117,6 +130,7 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
             **user_data,
         )
         self.items[mid] = it
+        self._index_item(it)
         return it
 
     def create_item_reinforce(
@@ -143,6 +157,7 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
                 "last_reinforced_at": pendulum.now("UTC").isoformat(),
             }
             existing.updated_at = pendulum.now("UTC")
+            self._vectors.set_salience(existing.id, *self._salience_inputs(existing))
             return existing
 
         # Create new item with salience tracking in extra
@@ -164,8 +179,71 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
             **user_data,
         )
         self.items[mid] = it
+        self._index_item(it)
         return it
 
+    def create_items_bulk(
+        self,
+        *,
+        resource_id: str,
+        entries: Sequence[tuple[MemoryType, str, list[float]]],
+        user_data: dict[str, Any],
+        reinforce: bool = False,
+    ) -> list[tuple[MemoryItem, bool]]:
+        user_data = dict(user_data)
+        base_extra = user_data.pop("extra", None) or {}
+        now = pendulum.now("UTC")
+        hashes = [
+            compute_content_hash(summary, memory_type) if reinforce and memory_type != "tool" else None
+            for memory_type, summary, _ in entries
+        ]
+        # One pass over the scope for every hash in the batch
+        wanted = {h for h in hashes if h}
+        by_hash: dict[str, MemoryItem] = {}
+        if wanted:
+            for item in self.items.values():
+                item_hash = (item.extra or {}).get("content_hash")
+                if item_hash in wanted and item_hash not in by_hash and matches_where(item, user_data):
+                    by_hash[item_hash] = item
+
+        results: list[tuple[MemoryItem, bool]] = []
+        for (memory_type, summary, embedding), content_hash in zip(entries, hashes, strict=True):
+            existing = by_hash.get(content_hash) if content_hash else None
+            if existing is not None:
+                current_extra = existing.extra or {}
+                existing.extra = {
+                    **current_extra,
+                    "reinforcement_count": current_extra.get("reinforcement_count", 1) + 1,
+                    "last_reinforced_at": now.isoformat(),
+                }
+                existing.updated_at = now
+                self._vectors.set_salience(existing.id, *self._salience_inputs(existing))
+                results.append((existing, False))
+                continue
+            extra: dict[str, Any] = dict(base_extra)
+            if content_hash:
+                extra.update({
+                    "content_hash": content_hash,
+                    "reinforcement_count": 1,
+                    "last_reinforced_at": now.isoformat(),
+                })
+            mid = str(uuid.uuid4())
+            it = self.memory_item_model(
+                id=mid,
+                resource_id=resource_id,
+                memory_type=memory_type,
+                summary=summary,
+                embedding=embedding,
+                extra=extra,
+                **user_data,
+            )
+            self.items[mid] = it
+            self._index_item(it)
+            if content_hash:
+                by_hash[content_hash] = it
+            results.append((it, True))
+        return results
+
     def vector_search_items(
         self,
         query_vec: list[float],
@@ -175,29 +253,35 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
         ranking: str = "similarity",
         recency_decay_days: float = 30.0,
     ) -> list[tuple[str, float]]:
-        pool = self.list_items(where)
-
+        mask = self._vectors.where_mask(where)
+        if mask is None:
+            mask = self._vectors.ids_mask(self.list_items(where))
         if ranking == "salience":
             # Salience-aware ranking: similarity x reinforcement x recency
-            # Read values from extra dict
-            corpus = [
-                (
-                    i.id,
-                    i.embedding,
-                    (i.extra or {}).get("reinforcement_count", 1),
-                    self._parse_datetime((i.extra or {}).get("last_reinforced_at")),
-                )
-                for i in pool.values()
-            ]
-            return cosine_topk_salience(query_vec, corpus, k=top_k, recency_decay_days=recency_decay_days)
-
-        # Default: pure cosine similarity (backward compatible)
-        hits = cosine_topk(query_vec, [(i.id, i.embedding) for i in pool.values()], k=top_k)
-        return hits
+            return self._vectors.search_salience(query_vec, top_k, mask=mask, recency_decay_days=recency_decay_days)
+        # Default: pure cosine similarity over the repo-owned embedding matrix
+        return self._vectors.search(query_vec, top_k, mask=mask)
 
     def load_existing(self) -> None:
         return None
 
+    def _index_item(self, item: MemoryItem) -> None:
+        """Mirror a new or changed item embedding into the embedding matrix."""
+        scope = {field: getattr(item, field, None) for field in self._vectors.scope_fields}
+        reinforcement_count, last_reinforced_at = self._salience_inputs(item)
+        self._vectors.upsert(
+            item.id,
+            item.embedding,
+            scope,
+            reinforcement_count=reinforcement_count,
+            last_reinforced_at=last_reinforced_at,
+        )
+
+    def _salience_inputs(self, item: MemoryItem) -> tuple[int, pendulum.DateTime | None]:
+        """Reinforcement count and last-reinforced time, read from the extra dict."""
+        extra = item.extra or {}
+        return extra.get("reinforcement_count", 1), self._parse_datetime(extra.get("last_reinforced_at"))
+
     def get_item(self, item_id: str) -> MemoryItem | None:
         return self.items.get(item_id)
 
@@ -219,6 +303,7 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
     def delete_item(self, item_id: str) -> None:
         if item_id in self.items:
             del self.items[item_id]
+        self._vectors.remove(item_id)
 
     @override
     def update_item(
@@ -242,6 +327,7 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
             item.summary = summary
         if embedding is not None:
             item.embedding = embedding
+            self._index_item(item)
 
         # Merge extra and tool_record into existing extra dict
         current_extra = item.extra or {}
@@ -254,6 +340,7 @@ class InMemoryMemoryItemRepository(MemoryItemRepo):
                     current_extra[key] = tool_record[key]
         if extra is not None or tool_record is not None:
             item.extra = current_extra
+            self._vectors.set_salience(item.id, *self._salience_inputs(item))
 
         self.items[item_id] = item
         return item
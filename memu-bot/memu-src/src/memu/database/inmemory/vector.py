@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import math
+import time
 from collections.abc import Iterable
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import cast
 
 import numpy as np
@@ -91,6 +92,41 @@ def cosine_topk(
     return [(ids[i], float(scores[i])) for i in topk_indices]
 
 
+def posix_timestamp(dt: datetime | None) -> float:
+    """POSIX seconds for ``dt`` (naive values are taken as UTC); ``NaN`` when unknown."""
+    if dt is None:
+        return math.nan
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.timestamp()
+
+
+def salience_weights(
+    reinforcement_counts: np.ndarray,
+    last_reinforced_ts: np.ndarray,
+    recency_decay_days: float = 30.0,
+    now: float | None = None,
+) -> np.ndarray:
+    """
+    Vectorized ``salience_score`` multiplier: log(count + 1) * recency decay.
+
+    Args:
+        reinforcement_counts: Reinforcement count per row
+        last_reinforced_ts: Last reinforcement as POSIX seconds per row (``NaN`` = unknown)
+        recency_decay_days: Half-life for recency decay in days
+        now: Reference time in POSIX seconds (defaults to the current time)
+
+    Returns:
+        Weights to multiply the cosine similarities with
+    """
+    now = time.time() if now is None else now
+    days_ago = (now - last_reinforced_ts) / 86400.0
+    recency = np.exp(-0.693 * days_ago / recency_decay_days)
+    # Unknown recency gets neutral score
+    recency = np.where(np.isnan(recency), 0.5, recency)
+    return np.log(reinforcement_counts + 1.0) * recency
+
+
 def cosine_topk_salience(
     query_vec: list[float],
     corpus: Iterable[tuple[str, list[float] | None, int, datetime | None]],
@@ -111,20 +147,37 @@ def cosine_topk_salience(
     Returns:
         List of (id, salience_score) tuples, sorted by score descending
     """
-    q = np.array(query_vec, dtype=np.float32)
-    scored: list[tuple[str, float]] = []
-
+    ids: list[str] = []
+    vecs: list[list[float]] = []
+    counts: list[int] = []
+    stamps: list[float] = []
     for _id, vec, reinforcement_count, last_reinforced_at in corpus:
         if vec is None:
             continue
-        vec_list = cast(list[float], vec)
-        v = np.array(vec_list, dtype=np.float32)
-        similarity = _cosine(q, v)
-        score = salience_score(similarity, reinforcement_count, last_reinforced_at, recency_decay_days)
-        scored.append((_id, score))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return scored[:k]
+        ids.append(_id)
+        vecs.append(cast(list[float], vec))
+        counts.append(reinforcement_count)
+        stamps.append(posix_timestamp(last_reinforced_at))
+
+    if not vecs:
+        return []
+
+    q = np.array(query_vec, dtype=np.float32)
+    matrix = np.array(vecs, dtype=np.float32)
+    similarities = matrix @ q / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(q) + 1e-9)
+    scores = similarities * salience_weights(
+        np.array(counts, dtype=np.float64), np.array(stamps, dtype=np.float64), recency_decay_days
+    )
+
+    n = len(scores)
+    actual_k = min(k, n)
+    if actual_k == n:
+        topk_indices = np.argsort(scores)[::-1]
+    else:
+        topk_indices = np.argpartition(scores, -actual_k)[-actual_k:]
+        topk_indices = topk_indices[np.argsort(scores[topk_indices])[::-1]]
+
+    return [(ids[i], float(scores[i])) for i in topk_indices]
 
 
 def query_cosine(query_vec: list[float], vecs: list[list[float]]) -> list[tuple[int, float]]:
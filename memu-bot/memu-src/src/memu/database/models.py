@@ -32,6 +32,24 @@ def compute_content_hash(summary: str, memory_type: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+def compute_summary_hash(summary: str, embed_model: str | None = None) -> str:
+    """
+    Fingerprint a category summary together with the model that embedded it.
+
+    A stored ``summary_embedding`` is only reused while this hash still matches,
+    so editing the summary or switching embedding models invalidates it.
+
+    Args:
+        summary: The category summary text
+        embed_model: Name of the embedding model
+
+    Returns:
+        A 16-character hex hash string
+    """
+    content = f"{embed_model or ''}:{summary}"
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
 class BaseRecord(BaseModel):
     """Backend-agnostic record interface."""
 
@@ -98,6 +116,10 @@ class MemoryCategory(BaseRecord):
     description: str
     embedding: list[float] | None = None
     summary: str | None = None
+    # Embedding of ``summary`` used to rank categories at retrieve time;
+    # valid while ``summary_hash`` matches ``compute_summary_hash(summary, embed_model)``
+    summary_embedding: list[float] | None = None
+    summary_hash: str | None = None
 
 
 class CategoryItem(BaseRecord):
@@ -144,5 +166,6 @@ __all__ = [
     "ToolCallResult",
     "build_scoped_models",
     "compute_content_hash",
+    "compute_summary_hash",
     "merge_scope_model",
 ]
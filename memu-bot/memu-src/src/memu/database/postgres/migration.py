@@ -28,6 +28,22 @@ def make_alembic_config(*, dsn: str, scope_model: type[Any]) -> AlembicConfig:
     return cfg
 
 
+def _add_missing_columns(engine: Any, metadata: Any) -> None:
+    """Add nullable columns introduced after the tables were created (``create_all`` skips existing tables)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{column.name}" {col_type}'))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+
 def run_migrations(*, dsn: str, scope_model: type[Any], ddl_mode: DDLMode = "create") -> None:
     """
     Run database migrations based on the ddl_mode setting.
@@ -61,6 +77,7 @@ def run_migrations(*, dsn: str, scope_model: type[Any], ddl_mode: DDLMode = "cre
 
         # Create all tables that don't exist
         metadata.create_all(engine)
+        _add_missing_columns(engine, metadata)
         logger.info("Database tables created/verified")
     elif ddl_mode == "validate":
         # Validate that all expected tables exist
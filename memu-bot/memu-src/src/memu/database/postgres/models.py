@@ -65,6 +65,8 @@ class MemoryCategoryModel(BaseModelMixin, MemoryCategory):
     description: str = Field(sa_column=Column(Text, nullable=False))
     embedding: list[float] | None = Field(default=None, sa_column=Column(Vector(), nullable=True))
     summary: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+    summary_embedding: list[float] | None = Field(default=None, sa_column=Column(Vector(), nullable=True))
+    summary_hash: str | None = Field(default=None, sa_column=Column(String, nullable=True))
 
 
 class CategoryItemModel(BaseModelMixin, CategoryItem):
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from memu.database.models import CategoryItem
@@ -65,6 +65,42 @@ class PostgresCategoryItemRepo(PostgresRepoBase, CategoryItemRepo):
 
         return self._cache_relation(new_rel)
 
+    def link_items_bulk(self, links: Sequence[tuple[str, str]], user_data: dict[str, Any]) -> list[CategoryItem]:
+        from sqlmodel import select
+
+        # Avoid duplicate inserts using the local cache, then one query for the rest
+        wanted = set(links)
+        by_pair: dict[tuple[str, str], CategoryItem] = {
+            (rel.item_id, rel.category_id): rel for rel in self.relations if (rel.item_id, rel.category_id) in wanted
+        }
+        missing = [pair for pair in dict.fromkeys(links) if pair not in by_pair]
+        if missing:
+            model = self._sqla_models.CategoryItem
+            with self._sessions.session() as session:
+                rows = session.scalars(
+                    select(model).where(
+                        model.item_id.in_(sorted({item_id for item_id, _ in missing})),
+                        model.category_id.in_(sorted({cat_id for _, cat_id in missing})),
+                    )
+                ).all()
+                for row in rows:
+                    if (row.item_id, row.category_id) in wanted and (row.item_id, row.category_id) not in by_pair:
+                        by_pair[(row.item_id, row.category_id)] = self._cache_relation(row)
+
+                now = self._now()
+                new_rels = [
+                    self._category_item_model(
+                        item_id=item_id, category_id=cat_id, **user_data, created_at=now, updated_at=now
+                    )
+                    for item_id, cat_id in missing
+                    if (item_id, cat_id) not in by_pair
+                ]
+                session.add_all(new_rels)
+                session.commit()
+            for rel in new_rels:
+                by_pair[(rel.item_id, rel.category_id)] = self._cache_relation(rel)
+        return [by_pair[pair] for pair in links]
+
     def unlink_item_category(self, item_id: str, cat_id: str) -> None:
         from sqlmodel import delete
 
@@ -33,6 +33,7 @@ class PostgresMemoryCategoryRepo(PostgresRepoBase, MemoryCategoryRepo):
             result: dict[str, MemoryCategory] = {}
             for row in rows:
                 row.embedding = self._normalize_embedding(row.embedding)
+                row.summary_embedding = self._normalize_embedding(row.summary_embedding)
                 cat = self._cache_category(row)
                 result[cat.id] = cat
         return result
@@ -47,6 +48,7 @@ class PostgresMemoryCategoryRepo(PostgresRepoBase, MemoryCategoryRepo):
             deleted: dict[str, MemoryCategory] = {}
             for row in rows:
                 row.embedding = self._normalize_embedding(row.embedding)
+                row.summary_embedding = self._normalize_embedding(row.summary_embedding)
                 deleted[row.id] = row
 
             if not deleted:
@@ -116,6 +118,8 @@ class PostgresMemoryCategoryRepo(PostgresRepoBase, MemoryCategoryRepo):
         description: str | None = None,
         embedding: list[float] | None = None,
         summary: str | None = None,
+        summary_embedding: list[float] | None = None,
+        summary_hash: str | None = None,
     ) -> MemoryCategory:
         from sqlmodel import select
 
@@ -134,14 +138,21 @@ class PostgresMemoryCategoryRepo(PostgresRepoBase, MemoryCategoryRepo):
                 cat.description = description
             if embedding is not None:
                 cat.embedding = self._prepare_embedding(embedding)
-            if summary is not None:
+            if summary is not None and summary != cat.summary:
                 cat.summary = summary
+                # A new summary invalidates the stored summary embedding
+                cat.summary_embedding = None
+                cat.summary_hash = None
+            if summary_embedding is not None:
+                cat.summary_embedding = self._prepare_embedding(summary_embedding)
+                cat.summary_hash = summary_hash
 
             cat.updated_at = now
             session.add(cat)
             session.commit()
             session.refresh(cat)
             cat.embedding = self._normalize_embedding(cat.embedding)
+            cat.summary_embedding = self._normalize_embedding(cat.summary_embedding)
 
         return self._cache_category(cat)
 
@@ -152,6 +163,7 @@ class PostgresMemoryCategoryRepo(PostgresRepoBase, MemoryCategoryRepo):
             rows = session.scalars(select(self._sqla_models.MemoryCategory)).all()
             for row in rows:
                 row.embedding = self._normalize_embedding(row.embedding)
+                row.summary_embedding = self._normalize_embedding(row.summary_embedding)
                 self._cache_category(row)
 
     def _cache_category(self, cat: MemoryCategory) -> MemoryCategory:
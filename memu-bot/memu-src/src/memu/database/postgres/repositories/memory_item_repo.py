@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import math
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from typing import Any
 
+from memu.database.inmemory.embedding_store import EmbeddingStore
 from memu.database.models import MemoryItem, MemoryType, compute_content_hash
 from memu.database.postgres.repositories.base import PostgresRepoBase
 from memu.database.postgres.session import SessionManager
@@ -21,12 +21,15 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
         sessions: SessionManager,
         scope_fields: list[str],
         use_vector: bool,
+        vectors: EmbeddingStore | None = None,
     ) -> None:
         super().__init__(
             state=state, sqla_models=sqla_models, sessions=sessions, scope_fields=scope_fields, use_vector=use_vector
         )
         self._memory_item_model = memory_item_model
         self.items: dict[str, MemoryItem] = self._state.items
+        # Local mirror of cached embeddings for salience ranking and the non-pgvector fallback
+        self._vectors = vectors if vectors is not None else EmbeddingStore(scope_fields=scope_fields)
 
     def get_item(self, memory_id: str) -> MemoryItem | None:
         from sqlmodel import select
@@ -107,6 +110,7 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
             # Clean up cache
             for item_id in deleted:
                 self.items.pop(item_id, None)
+                self._vectors.remove(item_id)
 
         return deleted
 
@@ -156,8 +160,7 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
             session.commit()
             session.refresh(item)
 
-        self.items[item.id] = item
-        return item
+        return self._cache_item(item)
 
     def create_item_reinforce(
         self,
@@ -219,8 +222,87 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
             session.commit()
             session.refresh(item)
 
-        self.items[item.id] = item
-        return item
+        return self._cache_item(item)
+
+    def create_items_bulk(
+        self,
+        *,
+        resource_id: str | None = None,
+        entries: Sequence[tuple[MemoryType, str, list[float]]],
+        user_data: dict[str, Any],
+        reinforce: bool = False,
+    ) -> list[tuple[MemoryItem, bool]]:
+        if not entries:
+            return []
+        from sqlmodel import select
+
+        user_data = dict(user_data)
+        base_extra = user_data.pop("extra", None) or {}
+        now = self._now()
+        hashes = [
+            compute_content_hash(summary, memory_type) if reinforce and memory_type != "tool" else None
+            for memory_type, summary, _ in entries
+        ]
+        wanted = sorted({h for h in hashes if h})
+
+        with self._sessions.session() as session:
+            # One dedupe query for the whole batch (extra->>'content_hash' IN (...))
+            by_hash: dict[str, Any] = {}
+            if wanted:
+                content_hash_col = self._sqla_models.MemoryItem.extra["content_hash"].astext
+                filters = [content_hash_col.in_(wanted)]
+                filters.extend(self._build_filters(self._sqla_models.MemoryItem, user_data))
+                for row in session.scalars(select(self._sqla_models.MemoryItem).where(*filters)).all():
+                    by_hash.setdefault(row.extra["content_hash"], row)
+
+            planned: list[tuple[Any, bool]] = []
+            new_rows: list[Any] = []
+            for (memory_type, summary, embedding), content_hash in zip(entries, hashes, strict=True):
+                existing = by_hash.get(content_hash) if content_hash else None
+                if existing is not None:
+                    current_extra = existing.extra or {}
+                    existing.extra = {
+                        **current_extra,
+                        "reinforcement_count": current_extra.get("reinforcement_count", 1) + 1,
+                        "last_reinforced_at": now.isoformat(),
+                    }
+                    existing.updated_at = now
+                    session.add(existing)
+                    planned.append((existing, False))
+                    continue
+                extra: dict[str, Any] = dict(base_extra)
+                if content_hash:
+                    extra.update({
+                        "content_hash": content_hash,
+                        "reinforcement_count": 1,
+                        "last_reinforced_at": now.isoformat(),
+                    })
+                item = self._memory_item_model(
+                    resource_id=resource_id,
+                    memory_type=memory_type,
+                    summary=summary,
+                    embedding=self._prepare_embedding(embedding),
+                    extra=extra,
+                    **user_data,
+                    created_at=now,
+                    updated_at=now,
+                )
+                new_rows.append(item)
+                if content_hash:
+                    by_hash[content_hash] = item
+                planned.append((item, True))
+            # Client-generated ids let SQLAlchemy send the inserts as one batched statement
+            session.add_all(new_rows)
+            session.commit()
+
+        cached: dict[str, MemoryItem] = {}
+        results: list[tuple[MemoryItem, bool]] = []
+        for row, created in planned:
+            if row.id not in cached:
+                row.embedding = self._normalize_embedding(row.embedding)
+                cached[row.id] = self._cache_item(row)
+            results.append((cached[row.id], created))
+        return results
 
     def update_item(
         self,
@@ -276,6 +358,8 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
         with self._sessions.session() as session:
             session.exec(delete(self._sqla_models.MemoryItem).where(self._sqla_models.MemoryItem.id == item_id))
             session.commit()
+        self.items.pop(item_id, None)
+        self._vectors.remove(item_id)
 
     def vector_search_items(
         self,
@@ -325,55 +409,27 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
         ranking: str = "similarity",
         recency_decay_days: float = 30.0,
     ) -> list[tuple[str, float]]:
-        scored: list[tuple[str, float]] = []
-        for item in self.items.values():
-            if item.embedding is None:
-                continue
-            if not self._matches_where(item, where):
-                continue
-
-            similarity = self._cosine(query_vec, item.embedding)
-
-            if ranking == "salience":
-                # Salience-aware scoring - read from extra dict
-                extra = item.extra or {}
-                reinforcement_count = extra.get("reinforcement_count", 1)
-                last_reinforced_at = self._parse_datetime(extra.get("last_reinforced_at"))
-                score = self._salience_score(
-                    similarity,
-                    reinforcement_count,
-                    last_reinforced_at,
-                    recency_decay_days,
-                )
-            else:
-                score = similarity
-
-            scored.append((item.id, score))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:top_k]
-
-    @staticmethod
-    def _salience_score(
-        similarity: float,
-        reinforcement_count: int,
-        last_reinforced_at: datetime | None,
-        recency_decay_days: float,
-    ) -> float:
-        """Compute salience score: similarity * reinforcement * recency."""
-        reinforcement_factor = math.log(reinforcement_count + 1)
-
-        if last_reinforced_at is None:
-            recency_factor = 0.5
-        else:
-            now = datetime.now(last_reinforced_at.tzinfo) if last_reinforced_at.tzinfo else datetime.utcnow()
-            days_ago = (now - last_reinforced_at).total_seconds() / 86400
-            recency_factor = math.exp(-0.693 * days_ago / recency_decay_days)
-
-        return similarity * reinforcement_factor * recency_factor
+        mask = self._vectors.where_mask(where)
+        if mask is None:
+            mask = self._vectors.ids_mask(
+                item_id for item_id, item in self.items.items() if self._matches_where(item, where)
+            )
+        if ranking == "salience":
+            # Salience-aware scoring: similarity x reinforcement x recency
+            return self._vectors.search_salience(query_vec, top_k, mask=mask, recency_decay_days=recency_decay_days)
+        return self._vectors.search(query_vec, top_k, mask=mask)
 
     def _cache_item(self, item: MemoryItem) -> MemoryItem:
         self.items[item.id] = item
+        embedding = item.embedding if isinstance(item.embedding, list) else self._normalize_embedding(item.embedding)
+        extra = item.extra or {}
+        self._vectors.upsert(
+            item.id,
+            embedding or None,
+            self._scope_kwargs_from(item),
+            reinforcement_count=extra.get("reinforcement_count", 1),
+            last_reinforced_at=self._parse_datetime(extra.get("last_reinforced_at")),
+        )
         return item
 
     @staticmethod
@@ -392,10 +448,5 @@ class PostgresMemoryItemRepo(PostgresRepoBase):
                 return parsed
             return None
 
-    @staticmethod
-    def _cosine(a: list[float], b: list[float]) -> float:
-        denom = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5) + 1e-9
-        return float(sum(x * y for x, y in zip(a, b, strict=True)) / denom)
-
 
 __all__ = ["PostgresMemoryItemRepo"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any, Protocol, runtime_checkable
 
 from memu.database.models import CategoryItem
@@ -16,6 +16,10 @@ class CategoryItemRepo(Protocol):
 
     def link_item_category(self, item_id: str, cat_id: str, user_data: dict[str, Any]) -> CategoryItem: ...
 
+    def link_items_bulk(self, links: Sequence[tuple[str, str]], user_data: dict[str, Any]) -> list[CategoryItem]:
+        """Link ``(item_id, category_id)`` pairs in a single write; returns one relation per pair, in order."""
+        ...
+
     def unlink_item_category(self, item_id: str, cat_id: str) -> None: ...
 
     def get_item_categories(self, item_id: str) -> list[CategoryItem]: ...
@@ -28,6 +28,8 @@ class MemoryCategoryRepo(Protocol):
         description: str | None = None,
         embedding: list[float] | None = None,
         summary: str | None = None,
+        summary_embedding: list[float] | None = None,
+        summary_hash: str | None = None,
     ) -> MemoryCategory: ...
 
     def load_existing(self) -> None: ...
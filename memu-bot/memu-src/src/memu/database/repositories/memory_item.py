@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any, Protocol, runtime_checkable
 
 from memu.database.models import MemoryItem, MemoryType
@@ -30,6 +30,23 @@ class MemoryItemRepo(Protocol):
         tool_record: dict[str, Any] | None = None,
     ) -> MemoryItem: ...
 
+    def create_items_bulk(
+        self,
+        *,
+        resource_id: str,
+        entries: Sequence[tuple[MemoryType, str, list[float]]],
+        user_data: dict[str, Any],
+        reinforce: bool = False,
+    ) -> list[tuple[MemoryItem, bool]]:
+        """
+        Create one item per ``(memory_type, summary, embedding)`` entry in a single write.
+
+        Returns ``(item, created)`` pairs in entry order. With ``reinforce``, an entry whose
+        content hash already exists in the scope (stored, or earlier in the batch) reinforces
+        that item and reports ``created=False``; tool memories are never deduplicated.
+        """
+        ...
+
     def update_item(
         self,
         *,
@@ -30,6 +30,8 @@ def build_sqlite_database(
     return SQLiteStore(
         dsn=dsn,
         scope_model=user_model,
+        vector_index=config.vector_index,
+        embedding_dtype=config.metadata_store.embedding_dtype,
     )
 
 
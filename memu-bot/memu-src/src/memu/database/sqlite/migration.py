@@ -0,0 +1,117 @@
+"""Schema upgrades for existing SQLite databases."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Table, bindparam, inspect, select, text
+
+from memu.database.sqlite.models import EmbeddingDType, encode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(engine: Any, tables: Iterable[Table]) -> list[str]:
+    """Add nullable model columns that are missing from existing tables.
+
+    ``create_all`` only creates whole tables, so columns introduced after a database
+    was created (e.g. ``memory_categories.summary_embedding``) are added here with
+    ``ALTER TABLE ... ADD COLUMN``. Non-nullable columns cannot be added without a
+    default and are reported instead.
+
+    Args:
+        engine: SQLAlchemy engine for the SQLite database.
+        tables: Tables to reconcile with the database.
+
+    Returns:
+        Qualified ``table.column`` names that were added.
+    """
+    added: list[str] = []
+    inspector = inspect(engine)
+    for table in tables:
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                logger.warning("Cannot add non-nullable column %s.%s to an existing table", table.name, column.name)
+                continue
+            col_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'))
+            logger.info("Added column %s.%s", table.name, column.name)
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def migrate_embedding_blobs(
+    engine: Any,
+    tables: Iterable[Table],
+    *,
+    dtype: EmbeddingDType = "float32",
+    batch_size: int = 1000,
+) -> int:
+    """Convert legacy ``embedding_json`` values into the binary ``embedding`` column.
+
+    Adds the ``embedding`` column to tables created before it existed, then rewrites
+    rows in batches (one transaction per batch) and clears the JSON copy so the space
+    can be reclaimed with ``VACUUM``. Safe to run on every startup: converted rows are
+    skipped.
+
+    Args:
+        engine: SQLAlchemy engine for the SQLite database.
+        tables: Tables carrying ``embedding`` and ``embedding_json`` columns.
+        dtype: Element type for the written blobs.
+        batch_size: Rows converted per transaction.
+
+    Returns:
+        Number of rows converted.
+    """
+    converted = 0
+    inspector = inspect(engine)
+    for table in tables:
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        if "embedding_json" not in existing:
+            continue
+        if "embedding" not in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN embedding BLOB'))
+            logger.info("Added binary embedding column to %s", table.name)
+
+        pending = (
+            select(table.c.id, table.c.embedding_json)
+            .where(table.c.embedding.is_(None), table.c.embedding_json.isnot(None))
+            .limit(batch_size)
+        )
+        rewrite = (
+            table
+            .update()
+            .where(table.c.id == bindparam("row_id"))
+            .values(embedding=bindparam("blob"), embedding_json=None)
+        )
+        table_converted = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(pending).all()
+                if not rows:
+                    break
+                params: list[dict[str, Any]] = []
+                for row_id, raw in rows:
+                    try:
+                        blob = encode_embedding(json.loads(raw), dtype)
+                    except (json.JSONDecodeError, TypeError, ValueError):
+                        logger.warning("Dropping unparseable embedding JSON for %s row %s", table.name, row_id)
+                        blob = None
+                    params.append({"row_id": row_id, "blob": blob})
+                conn.execute(rewrite, params)
+            table_converted += len(rows)
+        if table_converted:
+            logger.info("Migrated %d embeddings in %s to binary format", table_converted, table.name)
+        converted += table_converted
+    return converted
+
+
+__all__ = ["add_missing_columns", "migrate_embedding_blobs"]
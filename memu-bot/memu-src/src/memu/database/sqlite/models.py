@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
 import pendulum
 from pydantic import BaseModel
-from sqlalchemy import JSON, MetaData, String, Text
+from sqlalchemy import JSON, LargeBinary, MetaData, String, Text
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import Column, DateTime, Field, Index, SQLModel, func
 
 from memu.database.models import CategoryItem, MemoryCategory, MemoryItem, MemoryType, Resource
@@ -25,6 +26,50 @@ class TZDateTime(DateTime):
         super().__init__(timezone=timezone, **kw)
 
 
+EmbeddingDType = Literal["float32", "float16"]
+
+# Every embedding blob starts with a 4-byte tag naming its element type, so rows
+# written with different precisions can share a table. Four bytes keeps the float32
+# payload aligned for ``np.frombuffer``.
+_BLOB_TAGS: dict[str, bytes] = {"float32": b"ef32", "float16": b"ef16"}
+_BLOB_DTYPES: dict[bytes, np.dtype[Any]] = {
+    b"ef32": np.dtype("<f4"),
+    b"ef16": np.dtype("<f2"),
+}
+
+
+def encode_embedding(embedding: list[float] | np.ndarray, dtype: EmbeddingDType = "float32") -> bytes:
+    """Pack an embedding as a tagged little-endian float32/float16 blob."""
+    tag = _BLOB_TAGS[dtype]
+    return tag + np.asarray(embedding, dtype=_BLOB_DTYPES[tag]).tobytes()
+
+
+def decode_embedding(blob: bytes | memoryview) -> np.ndarray:
+    """View an embedding blob as a read-only NumPy array without copying the payload."""
+    dtype = _BLOB_DTYPES.get(bytes(blob[:4]))
+    if dtype is None:
+        msg = "Unrecognised embedding blob header"
+        raise ValueError(msg)
+    return np.frombuffer(blob, dtype=dtype, offset=4)
+
+
+class EmbeddingBlob(TypeDecorator[Any]):
+    """Binary embedding column: writes tagged float blobs, reads NumPy arrays."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> bytes | None:
+        if value is None or isinstance(value, bytes):
+            return value
+        return encode_embedding(value)
+
+    def process_result_value(self, value: Any, dialect: Any) -> np.ndarray | None:
+        if value is None:
+            return None
+        return decode_embedding(value)
+
+
 class SQLiteBaseModelMixin(SQLModel):
     """Base mixin for SQLite models with common fields."""
 
@@ -52,28 +97,11 @@ class SQLiteResourceModel(SQLiteBaseModelMixin, Resource):
     modality: str = Field(sa_column=Column(String, nullable=False))
     local_path: str = Field(sa_column=Column(String, nullable=False))
     caption: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
-    # Store embedding as JSON string since SQLite doesn't have native vector type
+    # Tagged float32/float16 bytes (see EmbeddingBlob); SQLite has no native vector type
+    embedding: list[float] | None = Field(default=None, sa_column=Column(EmbeddingBlob, nullable=True))
+    # Legacy JSON encoding, converted to ``embedding`` by ``migrate_embedding_blobs``
     embedding_json: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
 
-    @property
-    def embedding(self) -> list[float] | None:
-        """Parse embedding from JSON string."""
-        if self.embedding_json is None:
-            return None
-        try:
-            return list(json.loads(self.embedding_json))
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning("Failed to parse resource embedding JSON: %s", e)
-            return None
-
-    @embedding.setter
-    def embedding(self, value: list[float] | None) -> None:
-        """Serialize embedding to JSON string."""
-        if value is None:
-            self.embedding_json = None
-        else:
-            self.embedding_json = json.dumps(value)
-
 
 class SQLiteMemoryItemModel(SQLiteBaseModelMixin, MemoryItem):
     """SQLite memory item model."""
@@ -81,58 +109,26 @@ class SQLiteMemoryItemModel(SQLiteBaseModelMixin, MemoryItem):
     resource_id: str | None = Field(sa_column=Column(String, nullable=True))
     memory_type: MemoryType = Field(sa_column=Column(String, nullable=False))
     summary: str = Field(sa_column=Column(Text, nullable=False))
-    # Store embedding as JSON string since SQLite doesn't have native vector type
+    # Tagged float32/float16 bytes (see EmbeddingBlob); SQLite has no native vector type
+    embedding: list[float] | None = Field(default=None, sa_column=Column(EmbeddingBlob, nullable=True))
+    # Legacy JSON encoding, converted to ``embedding`` by ``migrate_embedding_blobs``
     embedding_json: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
     happened_at: datetime | None = Field(default=None, sa_column=Column(DateTime, nullable=True))
     extra: dict[str, Any] = Field(default={}, sa_column=Column(JSON, nullable=True))
 
-    @property
-    def embedding(self) -> list[float] | None:
-        """Parse embedding from JSON string."""
-        if self.embedding_json is None:
-            return None
-        try:
-            return list(json.loads(self.embedding_json))
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning("Failed to parse memory item embedding JSON: %s", e)
-            return None
-
-    @embedding.setter
-    def embedding(self, value: list[float] | None) -> None:
-        """Serialize embedding to JSON string."""
-        if value is None:
-            self.embedding_json = None
-        else:
-            self.embedding_json = json.dumps(value)
-
 
 class SQLiteMemoryCategoryModel(SQLiteBaseModelMixin, MemoryCategory):
     """SQLite memory category model."""
 
     name: str = Field(sa_column=Column(String, nullable=False, index=True))
     description: str = Field(sa_column=Column(Text, nullable=False))
-    # Store embedding as JSON string since SQLite doesn't have native vector type
+    # Tagged float32/float16 bytes (see EmbeddingBlob); SQLite has no native vector type
+    embedding: list[float] | None = Field(default=None, sa_column=Column(EmbeddingBlob, nullable=True))
+    # Legacy JSON encoding, converted to ``embedding`` by ``migrate_embedding_blobs``
     embedding_json: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
     summary: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
-
-    @property
-    def embedding(self) -> list[float] | None:
-        """Parse embedding from JSON string."""
-        if self.embedding_json is None:
-            return None
-        try:
-            return list(json.loads(self.embedding_json))
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning("Failed to parse category embedding JSON: %s", e)
-            return None
-
-    @embedding.setter
-    def embedding(self, value: list[float] | None) -> None:
-        """Serialize embedding to JSON string."""
-        if value is None:
-            self.embedding_json = None
-        else:
-            self.embedding_json = json.dumps(value)
+    summary_embedding: list[float] | None = Field(default=None, sa_column=Column(EmbeddingBlob, nullable=True))
+    summary_hash: str | None = Field(default=None, sa_column=Column(String, nullable=True))
 
 
 class SQLiteCategoryItemModel(SQLiteBaseModelMixin, CategoryItem):
@@ -228,10 +224,14 @@ def build_sqlite_table_model(
 
 
 __all__ = [
+    "EmbeddingBlob",
+    "EmbeddingDType",
     "SQLiteBaseModelMixin",
     "SQLiteCategoryItemModel",
     "SQLiteMemoryCategoryModel",
     "SQLiteMemoryItemModel",
     "SQLiteResourceModel",
     "build_sqlite_table_model",
+    "decode_embedding",
+    "encode_embedding",
 ]
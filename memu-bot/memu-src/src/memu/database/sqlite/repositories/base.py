@@ -5,10 +5,12 @@ from __future__ import annotations
 import json
 import logging
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, cast
 
+import numpy as np
 import pendulum
 
+from memu.database.sqlite.models import EmbeddingDType, decode_embedding, encode_embedding
 from memu.database.sqlite.session import SQLiteSessionManager
 from memu.database.state import DatabaseState
 
@@ -25,6 +27,7 @@ class SQLiteRepoBase:
         sqla_models: Any,
         sessions: SQLiteSessionManager,
         scope_fields: list[str],
+        embedding_dtype: EmbeddingDType = "float32",
     ) -> None:
         """Initialize base repository.
 
@@ -33,11 +36,13 @@ class SQLiteRepoBase:
             sqla_models: SQLAlchemy model definitions.
             sessions: Session manager for database connections.
             scope_fields: List of user scope field names.
+            embedding_dtype: Element type used when writing embedding blobs.
         """
         self._state = state
         self._sqla_models = sqla_models
         self._sessions = sessions
         self._scope_fields = scope_fields
+        self._embedding_dtype: EmbeddingDType = embedding_dtype
 
     def _scope_kwargs_from(self, obj: Any) -> dict[str, Any]:
         """Extract scope fields from an object."""
@@ -47,7 +52,16 @@ class SQLiteRepoBase:
         """Normalize embedding from various formats to list[float]."""
         if embedding is None:
             return None
-        # Handle JSON string format (SQLite stores embeddings as JSON)
+        # Binary column values arrive as NumPy views over the blob
+        if isinstance(embedding, np.ndarray):
+            return cast(list[float], embedding.tolist())
+        if isinstance(embedding, bytes | memoryview):
+            try:
+                return cast(list[float], decode_embedding(embedding).tolist())
+            except ValueError:
+                logger.debug("Could not decode embedding blob")
+                return None
+        # Handle legacy JSON string format
         if isinstance(embedding, str):
             try:
                 return [float(x) for x in json.loads(embedding)]
@@ -61,11 +75,11 @@ class SQLiteRepoBase:
             logger.debug("Could not normalize embedding %s", embedding)
             return None
 
-    def _prepare_embedding(self, embedding: list[float] | None) -> str | None:
-        """Serialize embedding to JSON string for SQLite storage."""
+    def _prepare_embedding(self, embedding: list[float] | None) -> bytes | None:
+        """Serialize embedding to a float32/float16 blob for SQLite storage."""
         if embedding is None:
             return None
-        return json.dumps(embedding)
+        return encode_embedding(embedding, self._embedding_dtype)
 
     def _merge_and_commit(self, obj: Any) -> None:
         """Merge object into session and commit."""
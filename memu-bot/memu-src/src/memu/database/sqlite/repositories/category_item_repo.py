@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from sqlmodel import select
@@ -140,6 +140,62 @@ class SQLiteCategoryItemRepo(SQLiteRepoBase, CategoryItemRepo):
         self.relations.append(rel)
         return rel
 
+    def link_items_bulk(self, links: Sequence[tuple[str, str]], user_data: dict[str, Any]) -> list[CategoryItem]:
+        """Create many item/category links in one transaction.
+
+        Existing links are found with a single query; missing ones are inserted together.
+
+        Args:
+            links: ``(item_id, category_id)`` pairs.
+            user_data: User scope data.
+
+        Returns:
+            One CategoryItem relation per pair, in input order.
+        """
+        if not links:
+            return []
+        model = self._category_item_model
+        wanted = set(links)
+        with self._sessions.session() as session:
+            filters = [
+                model.item_id.in_(sorted({item_id for item_id, _ in wanted})),
+                model.category_id.in_(sorted({cat_id for _, cat_id in wanted})),
+                *self._build_filters(model, user_data),
+            ]
+            by_pair: dict[tuple[str, str], CategoryItem] = {}
+            for row in session.exec(select(model).where(*filters)).all():
+                if (row.item_id, row.category_id) in wanted:
+                    by_pair[(row.item_id, row.category_id)] = CategoryItem(
+                        id=row.id,
+                        item_id=row.item_id,
+                        category_id=row.category_id,
+                        created_at=row.created_at,
+                        updated_at=row.updated_at,
+                        **self._scope_kwargs_from(row),
+                    )
+
+            now = self._now()
+            new_rows = [
+                model(item_id=item_id, category_id=cat_id, created_at=now, updated_at=now, **user_data)
+                for item_id, cat_id in dict.fromkeys(links)
+                if (item_id, cat_id) not in by_pair
+            ]
+            session.add_all(new_rows)
+            session.commit()
+
+        for row in new_rows:
+            rel = CategoryItem(
+                id=row.id,
+                item_id=row.item_id,
+                category_id=row.category_id,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+                **user_data,
+            )
+            self.relations.append(rel)
+            by_pair[(row.item_id, row.category_id)] = rel
+        return [by_pair[pair] for pair in links]
+
     def unlink_item_category(self, item_id: str, category_id: str) -> None:
         """Remove a link between an item and a category.
 
@@ -10,6 +10,7 @@ from sqlmodel import delete, select
 
 from memu.database.models import MemoryCategory
 from memu.database.repositories.memory_category import MemoryCategoryRepo
+from memu.database.sqlite.models import EmbeddingDType
 from memu.database.sqlite.repositories.base import SQLiteRepoBase
 from memu.database.sqlite.schema import SQLiteSQLAModels
 from memu.database.sqlite.session import SQLiteSessionManager
@@ -29,6 +30,7 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
         sqla_models: SQLiteSQLAModels,
         sessions: SQLiteSessionManager,
         scope_fields: list[str],
+        embedding_dtype: EmbeddingDType = "float32",
     ) -> None:
         """Initialize memory category repository.
 
@@ -38,12 +40,14 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
             sqla_models: SQLAlchemy model container.
             sessions: Session manager for database connections.
             scope_fields: List of user scope field names.
+            embedding_dtype: Element type used when writing embedding blobs.
         """
         super().__init__(
             state=state,
             sqla_models=sqla_models,
             sessions=sessions,
             scope_fields=scope_fields,
+            embedding_dtype=embedding_dtype,
         )
         self._memory_category_model = memory_category_model
         self.categories = self._state.categories
@@ -70,8 +74,10 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
                 id=row.id,
                 name=row.name,
                 description=row.description,
-                embedding=self._normalize_embedding(row.embedding_json),
+                embedding=self._normalize_embedding(row.embedding),
                 summary=row.summary,
+                summary_embedding=self._normalize_embedding(row.summary_embedding),
+                summary_hash=row.summary_hash,
                 created_at=row.created_at,
                 updated_at=row.updated_at,
                 **self._scope_kwargs_from(row),
@@ -104,8 +110,10 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
                     id=row.id,
                     name=row.name,
                     description=row.description,
-                    embedding=self._normalize_embedding(row.embedding_json),
+                    embedding=self._normalize_embedding(row.embedding),
                     summary=row.summary,
+                    summary_embedding=self._normalize_embedding(row.summary_embedding),
+                    summary_hash=row.summary_hash,
                     created_at=row.created_at,
                     updated_at=row.updated_at,
                     **self._scope_kwargs_from(row),
@@ -156,8 +164,10 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
                     id=existing.id,
                     name=existing.name,
                     description=existing.description,
-                    embedding=self._normalize_embedding(existing.embedding_json),
+                    embedding=self._normalize_embedding(existing.embedding),
                     summary=existing.summary,
+                    summary_embedding=self._normalize_embedding(existing.summary_embedding),
+                    summary_hash=existing.summary_hash,
                     created_at=existing.created_at,
                     updated_at=existing.updated_at,
                     **self._scope_kwargs_from(existing),
@@ -170,7 +180,7 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
             row = self._memory_category_model(
                 name=name,
                 description=description,
-                embedding_json=self._prepare_embedding(embedding),
+                embedding=self._prepare_embedding(embedding),
                 summary=None,
                 created_at=now,
                 updated_at=now,
@@ -201,6 +211,8 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
         description: str | None = None,
         embedding: list[float] | None = None,
         summary: str | None = None,
+        summary_embedding: list[float] | None = None,
+        summary_hash: str | None = None,
     ) -> MemoryCategory:
         """Update an existing category.
 
@@ -209,7 +221,9 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
             name: New name (optional).
             description: New description (optional).
             embedding: New embedding vector (optional).
-            summary: New summary text (optional).
+            summary: New summary text (optional); clears a stale summary embedding.
+            summary_embedding: Embedding of the summary (optional).
+            summary_hash: ``compute_summary_hash`` of the embedded summary.
 
         Returns:
             Updated MemoryCategory object.
@@ -230,9 +244,15 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
             if description is not None:
                 row.description = description
             if embedding is not None:
-                row.embedding_json = self._prepare_embedding(embedding)
-            if summary is not None:
+                row.embedding = self._prepare_embedding(embedding)
+            if summary is not None and summary != row.summary:
                 row.summary = summary
+                # A new summary invalidates the stored summary embedding
+                row.summary_embedding = None
+                row.summary_hash = None
+            if summary_embedding is not None:
+                row.summary_embedding = self._prepare_embedding(summary_embedding)
+                row.summary_hash = summary_hash
             row.updated_at = self._now()
 
             session.add(row)
@@ -243,8 +263,10 @@ class SQLiteMemoryCategoryRepo(SQLiteRepoBase, MemoryCategoryRepo):
             id=row.id,
             name=row.name,
             description=row.description,
-            embedding=self._normalize_embedding(row.embedding_json),
+            embedding=self._normalize_embedding(row.embedding),
             summary=row.summary,
+            summary_embedding=self._normalize_embedding(row.summary_embedding),
+            summary_hash=row.summary_hash,
             created_at=row.created_at,
             updated_at=row.updated_at,
             **self._scope_kwargs_from(row),
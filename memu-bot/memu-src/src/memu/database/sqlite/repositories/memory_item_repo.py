@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 import pendulum
 from sqlmodel import delete, select
 
-from memu.database.inmemory.vector import cosine_topk, cosine_topk_salience
+from memu.database.inmemory.embedding_store import EmbeddingStore
 from memu.database.models import MemoryItem, MemoryType, compute_content_hash
 from memu.database.repositories.memory_item import MemoryItemRepo
+from memu.database.sqlite.models import EmbeddingDType
 from memu.database.sqlite.repositories.base import SQLiteRepoBase
 from memu.database.sqlite.schema import SQLiteSQLAModels
 from memu.database.sqlite.session import SQLiteSessionManager
@@ -31,6 +32,8 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
         sqla_models: SQLiteSQLAModels,
         sessions: SQLiteSessionManager,
         scope_fields: list[str],
+        embedding_dtype: EmbeddingDType = "float32",
+        vectors: EmbeddingStore | None = None,
     ) -> None:
         """Initialize memory item repository.
 
@@ -40,15 +43,20 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             sqla_models: SQLAlchemy model container.
             sessions: Session manager for database connections.
             scope_fields: List of user scope field names.
+            embedding_dtype: Element type used when writing embedding blobs.
+            vectors: Embedding matrix (or ANN index) backing similarity search.
         """
         super().__init__(
             state=state,
             sqla_models=sqla_models,
             sessions=sessions,
             scope_fields=scope_fields,
+            embedding_dtype=embedding_dtype,
         )
         self._memory_item_model = memory_item_model
         self.items = self._state.items
+        self._vectors = vectors if vectors is not None else EmbeddingStore(scope_fields=scope_fields)
+        self._vectors_loaded = False
 
     def get_item(self, item_id: str) -> MemoryItem | None:
         """Get a memory item by ID.
@@ -75,9 +83,10 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             resource_id=row.resource_id,
             memory_type=row.memory_type,
             summary=row.summary,
-            embedding=self._normalize_embedding(row.embedding_json),
+            embedding=self._normalize_embedding(row.embedding),
             created_at=row.created_at,
             updated_at=row.updated_at,
+            extra=row.extra,
             **self._scope_kwargs_from(row),
         )
         self.items[row.id] = item
@@ -106,9 +115,10 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                 resource_id=row.resource_id,
                 memory_type=row.memory_type,
                 summary=row.summary,
-                embedding=self._normalize_embedding(row.embedding_json),
+                embedding=self._normalize_embedding(row.embedding),
                 created_at=row.created_at,
                 updated_at=row.updated_at,
+                extra=row.extra,
                 **self._scope_kwargs_from(row),
             )
             result[row.id] = item
@@ -151,9 +161,10 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                 resource_id=row.resource_id,
                 memory_type=row.memory_type,
                 summary=row.summary,
-                embedding=self._normalize_embedding(row.embedding_json),
+                embedding=self._normalize_embedding(row.embedding),
                 created_at=row.created_at,
                 updated_at=row.updated_at,
+                extra=row.extra,
                 **self._scope_kwargs_from(row),
             )
             result[row.id] = item
@@ -185,9 +196,10 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                     resource_id=row.resource_id,
                     memory_type=row.memory_type,
                     summary=row.summary,
-                    embedding=self._normalize_embedding(row.embedding_json),
+                    embedding=self._normalize_embedding(row.embedding),
                     created_at=row.created_at,
                     updated_at=row.updated_at,
+                    extra=row.extra,
                     **self._scope_kwargs_from(row),
                 )
                 deleted[row.id] = item
@@ -205,6 +217,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             # Clean up cache
             for item_id in deleted:
                 self.items.pop(item_id, None)
+                self._vectors.remove(item_id)
 
         return deleted
 
@@ -257,7 +270,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             resource_id=resource_id,
             memory_type=memory_type,
             summary=summary,
-            embedding_json=self._prepare_embedding(embedding),
+            embedding=self._prepare_embedding(embedding),
             extra=extra if extra else {},
             created_at=now,
             updated_at=now,
@@ -280,6 +293,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             **user_data,
         )
         self.items[row.id] = item
+        self._index_item(item, self._scope_kwargs_from(row))
         return item
 
     def create_item_reinforce(
@@ -338,13 +352,14 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                     resource_id=existing.resource_id,
                     memory_type=existing.memory_type,
                     summary=existing.summary,
-                    embedding=self._normalize_embedding(existing.embedding_json),
+                    embedding=self._normalize_embedding(existing.embedding),
                     created_at=existing.created_at,
                     updated_at=existing.updated_at,
                     extra=existing.extra,
                     **self._scope_kwargs_from(existing),
                 )
                 self.items[existing.id] = item
+                self._vectors.set_salience(item.id, *self._salience_inputs(item.extra))
                 return item
 
             # Create new item with salience tracking in extra
@@ -360,7 +375,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                 resource_id=resource_id,
                 memory_type=memory_type,
                 summary=summary,
-                embedding_json=self._prepare_embedding(embedding),
+                embedding=self._prepare_embedding(embedding),
                 extra=item_extra,
                 created_at=now,
                 updated_at=now,
@@ -383,8 +398,119 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             **self._scope_kwargs_from(row),
         )
         self.items[row.id] = item
+        self._index_item(item, self._scope_kwargs_from(row))
         return item
 
+    def create_items_bulk(
+        self,
+        *,
+        resource_id: str,
+        entries: Sequence[tuple[MemoryType, str, list[float]]],
+        user_data: dict[str, Any],
+        reinforce: bool = False,
+    ) -> list[tuple[MemoryItem, bool]]:
+        """Create (or reinforce) memory items in one transaction.
+
+        Content hashes of the whole batch are resolved with a single query, new rows
+        are inserted together (executemany) and reinforced rows updated in the same commit.
+
+        Args:
+            resource_id: Associated resource ID.
+            entries: ``(memory_type, summary, embedding)`` per item.
+            user_data: User scope data.
+            reinforce: If True, reinforce existing items instead of creating duplicates.
+
+        Returns:
+            ``(item, created)`` pairs in entry order.
+        """
+        if not entries:
+            return []
+        from sqlalchemy import func
+
+        user_data = dict(user_data)
+        base_extra = user_data.pop("extra", None) or {}
+        now = self._now()
+        hashes = [
+            compute_content_hash(summary, memory_type) if reinforce and memory_type != "tool" else None
+            for memory_type, summary, _ in entries
+        ]
+        wanted = sorted({h for h in hashes if h})
+        model = self._memory_item_model
+
+        with self._sessions.session() as session:
+            by_hash: dict[str, Any] = {}
+            if wanted:
+                content_hash_col = func.json_extract(model.extra, "$.content_hash")
+                filters = [content_hash_col.in_(wanted)]
+                filters.extend(self._build_filters(model, user_data))
+                for row in session.exec(select(model).where(*filters)).all():
+                    by_hash.setdefault(row.extra["content_hash"], row)
+
+            # (row, created, embedding of a new row)
+            planned: list[tuple[Any, bool, list[float] | None]] = []
+            new_rows: list[Any] = []
+            # Reused below for the planned embeddings, which are None for reinforced rows
+            embedding: list[float] | None
+            for (memory_type, summary, embedding), content_hash in zip(entries, hashes, strict=True):
+                existing = by_hash.get(content_hash) if content_hash else None
+                if existing is not None:
+                    current_extra = existing.extra or {}
+                    existing.extra = {
+                        **current_extra,
+                        "reinforcement_count": current_extra.get("reinforcement_count", 1) + 1,
+                        "last_reinforced_at": now.isoformat(),
+                    }
+                    existing.updated_at = now
+                    session.add(existing)
+                    planned.append((existing, False, None))
+                    continue
+                extra: dict[str, Any] = dict(base_extra)
+                if content_hash:
+                    extra.update({
+                        "content_hash": content_hash,
+                        "reinforcement_count": 1,
+                        "last_reinforced_at": now.isoformat(),
+                    })
+                row = model(
+                    resource_id=resource_id,
+                    memory_type=memory_type,
+                    summary=summary,
+                    embedding=self._prepare_embedding(embedding),
+                    extra=extra,
+                    created_at=now,
+                    updated_at=now,
+                    **user_data,
+                )
+                new_rows.append(row)
+                if content_hash:
+                    by_hash[content_hash] = row
+                planned.append((row, True, embedding))
+            session.add_all(new_rows)
+            session.commit()
+
+        # Ids and values are set client-side, so no refresh round-trips are needed
+        items: dict[str, MemoryItem] = {}
+        results: list[tuple[MemoryItem, bool]] = []
+        for row, created, embedding in planned:
+            item = items.get(row.id)
+            if item is None:
+                item = MemoryItem(
+                    id=row.id,
+                    resource_id=row.resource_id,
+                    memory_type=row.memory_type,
+                    summary=row.summary,
+                    embedding=embedding if embedding is not None else self._normalize_embedding(row.embedding),
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    extra=row.extra,
+                    **self._scope_kwargs_from(row),
+                )
+                items[row.id] = item
+                self.items[row.id] = item
+                self._index_item(item, self._scope_kwargs_from(row))
+            results.append((item, created))
+        return results
+
     def update_item(
         self,
         *,
@@ -424,7 +550,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             if summary is not None:
                 row.summary = summary
             if embedding is not None:
-                row.embedding_json = self._prepare_embedding(embedding)
+                row.embedding = self._prepare_embedding(embedding)
 
             # Merge extra and tool_record into existing extra dict
             current_extra = row.extra or {}
@@ -449,13 +575,14 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
             resource_id=row.resource_id,
             memory_type=row.memory_type,
             summary=row.summary,
-            embedding=self._normalize_embedding(row.embedding_json),
+            embedding=self._normalize_embedding(row.embedding),
             extra=row.extra,
             created_at=row.created_at,
             updated_at=row.updated_at,
             **self._scope_kwargs_from(row),
         )
         self.items[row.id] = item
+        self._index_item(item, self._scope_kwargs_from(row))
         return item
 
     def delete_item(self, item_id: str) -> None:
@@ -473,6 +600,7 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
 
         if item_id in self.items:
             del self.items[item_id]
+        self._vectors.remove(item_id)
 
     def vector_search_items(
         self,
@@ -485,7 +613,8 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
     ) -> list[tuple[str, float]]:
         """Perform vector similarity search on memory items.
 
-        Uses brute-force cosine similarity since SQLite doesn't have native vector support.
+        SQLite has no native vector support, so similarity ranking runs against the
+        repository's in-process embedding matrix (loaded once, then kept in sync by writes).
 
         Args:
             query_vec: Query embedding vector.
@@ -497,26 +626,15 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
         Returns:
             List of (item_id, similarity_score) tuples.
         """
-        # Load items from database with filters
-        pool = self.list_items(where)
-
+        self._ensure_vectors_loaded()
+        mask = self._vectors.where_mask(where)
+        if mask is None:
+            mask = self._vectors.ids_mask(self.list_items(where))
         if ranking == "salience":
             # Salience-aware ranking: similarity x reinforcement x recency
-            # Read values from extra dict
-            corpus = [
-                (
-                    i.id,
-                    i.embedding,
-                    (i.extra or {}).get("reinforcement_count", 1),
-                    self._parse_datetime((i.extra or {}).get("last_reinforced_at")),
-                )
-                for i in pool.values()
-            ]
-            return cosine_topk_salience(query_vec, corpus, k=top_k, recency_decay_days=recency_decay_days)
-
-        # Default: pure cosine similarity (backward compatible)
-        hits = cosine_topk(query_vec, [(i.id, i.embedding) for i in pool.values()], k=top_k)
-        return hits
+            return self._vectors.search_salience(query_vec, top_k, mask=mask, recency_decay_days=recency_decay_days)
+        # Default: pure cosine similarity over the repo-owned embedding matrix
+        return self._vectors.search(query_vec, top_k, mask=mask)
 
     @staticmethod
     def _parse_datetime(dt_str: str | None) -> pendulum.DateTime | None:
@@ -532,9 +650,54 @@ class SQLiteMemoryItemRepo(SQLiteRepoBase, MemoryItemRepo):
                 return parsed
             return None
 
+    def _index_item(self, item: MemoryItem, scope: dict[str, Any]) -> None:
+        """Mirror a new or changed item embedding into the embedding matrix.
+
+        ``scope`` comes from the SQL row: the base ``MemoryItem`` does not carry scope fields.
+        """
+        reinforcement_count, last_reinforced_at = self._salience_inputs(item.extra)
+        self._vectors.upsert(
+            item.id,
+            item.embedding,
+            scope,
+            reinforcement_count=reinforcement_count,
+            last_reinforced_at=last_reinforced_at,
+        )
+
+    def _salience_inputs(self, extra: Mapping[str, Any] | None) -> tuple[int, pendulum.DateTime | None]:
+        """Reinforcement count and last-reinforced time, read from the extra dict."""
+        extra = extra or {}
+        return extra.get("reinforcement_count", 1), self._parse_datetime(extra.get("last_reinforced_at"))
+
+    def _ensure_vectors_loaded(self) -> None:
+        """Populate the embedding matrix from the database on first use."""
+        if self._vectors_loaded:
+            return
+        # Read only ids, blobs, salience data and scope columns: blobs decode as zero-copy array views
+        model = self._memory_item_model
+        columns = [
+            model.id,
+            model.embedding,
+            model.extra,
+            *(getattr(model, field) for field in self._scope_fields),
+        ]
+        with self._sessions.session() as session:
+            rows = session.exec(select(*columns).where(model.embedding.isnot(None))).all()
+        for item_id, embedding, extra, *scope in rows:
+            reinforcement_count, last_reinforced_at = self._salience_inputs(extra)
+            self._vectors.upsert(
+                item_id,
+                embedding,
+                dict(zip(self._scope_fields, scope, strict=True)),
+                reinforcement_count=reinforcement_count,
+                last_reinforced_at=last_reinforced_at,
+            )
+        self._vectors_loaded = True
+
     def load_existing(self) -> None:
         """Load all existing items from database into cache."""
         self.list_items()
+        self._ensure_vectors_loaded()
 
 
 __all__ = ["SQLiteMemoryItemRepo"]
@@ -10,6 +10,7 @@ from sqlmodel import delete, select
 
 from memu.database.models import Resource
 from memu.database.repositories.resource import ResourceRepo
+from memu.database.sqlite.models import EmbeddingDType
 from memu.database.sqlite.repositories.base import SQLiteRepoBase
 from memu.database.sqlite.schema import SQLiteSQLAModels
 from memu.database.sqlite.session import SQLiteSessionManager
@@ -29,6 +30,7 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
         sqla_models: SQLiteSQLAModels,
         sessions: SQLiteSessionManager,
         scope_fields: list[str],
+        embedding_dtype: EmbeddingDType = "float32",
     ) -> None:
         """Initialize resource repository.
 
@@ -38,12 +40,14 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
             sqla_models: SQLAlchemy model container.
             sessions: Session manager for database connections.
             scope_fields: List of user scope field names.
+            embedding_dtype: Element type used when writing embedding blobs.
         """
         super().__init__(
             state=state,
             sqla_models=sqla_models,
             sessions=sessions,
             scope_fields=scope_fields,
+            embedding_dtype=embedding_dtype,
         )
         self._resource_model = resource_model
         self.resources = self._state.resources
@@ -76,7 +80,7 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
                 modality=row.modality,
                 local_path=row.local_path,
                 caption=row.caption,
-                embedding=self._normalize_embedding(row.embedding_json),
+                embedding=self._normalize_embedding(row.embedding),
                 created_at=row.created_at,
                 updated_at=row.updated_at,
                 **self._scope_kwargs_from(row),
@@ -111,7 +115,7 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
                     modality=row.modality,
                     local_path=row.local_path,
                     caption=row.caption,
-                    embedding=self._normalize_embedding(row.embedding_json),
+                    embedding=self._normalize_embedding(row.embedding),
                     created_at=row.created_at,
                     updated_at=row.updated_at,
                     **self._scope_kwargs_from(row),
@@ -163,7 +167,7 @@ class SQLiteResourceRepo(SQLiteRepoBase, ResourceRepo):
             modality=modality,
             local_path=local_path,
             caption=caption,
-            embedding_json=self._prepare_embedding(embedding),
+            embedding=self._prepare_embedding(embedding),
             created_at=now,
             updated_at=now,
             **user_data,
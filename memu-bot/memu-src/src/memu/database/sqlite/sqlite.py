@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 from sqlmodel import SQLModel
 
+from memu.database.inmemory.ivf import build_vector_index
 from memu.database.interfaces import Database
 from memu.database.models import CategoryItem, MemoryCategory, MemoryItem, Resource
 from memu.database.repositories import CategoryItemRepo, MemoryCategoryRepo, MemoryItemRepo, ResourceRepo
+from memu.database.sqlite.migration import add_missing_columns, migrate_embedding_blobs
+from memu.database.sqlite.models import EmbeddingDType
 from memu.database.sqlite.repositories.category_item_repo import SQLiteCategoryItemRepo
 from memu.database.sqlite.repositories.memory_category_repo import SQLiteMemoryCategoryRepo
 from memu.database.sqlite.repositories.memory_item_repo import SQLiteMemoryItemRepo
@@ -19,6 +22,9 @@ from memu.database.sqlite.schema import SQLiteSQLAModels, get_sqlite_sqlalchemy_
 from memu.database.sqlite.session import SQLiteSessionManager
 from memu.database.state import DatabaseState
 
+if TYPE_CHECKING:
+    from memu.app.settings import VectorIndexConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +65,8 @@ class SQLiteStore(Database):
         memory_item_model: type[Any] | None = None,
         category_item_model: type[Any] | None = None,
         sqla_models: SQLiteSQLAModels | None = None,
+        vector_index: VectorIndexConfig | None = None,
+        embedding_dtype: EmbeddingDType = "float32",
     ) -> None:
         """Initialize SQLite database store.
 
@@ -70,10 +78,13 @@ class SQLiteStore(Database):
             memory_item_model: Optional custom memory item model.
             category_item_model: Optional custom category-item model.
             sqla_models: Pre-built SQLAlchemy models container.
+            vector_index: Vector index configuration; provider="ivf" enables the ANN index.
+            embedding_dtype: Element type of stored embedding blobs ("float32" or "float16").
         """
         self.dsn = dsn
         self._scope_model: type[BaseModel] = scope_model or BaseModel
         self._scope_fields = list(getattr(self._scope_model, "model_fields", {}).keys())
+        self._embedding_dtype: EmbeddingDType = embedding_dtype
         self._state = DatabaseState()
         self._sessions = SQLiteSessionManager(dsn=self.dsn)
         self._sqla_models: SQLiteSQLAModels = sqla_models or get_sqlite_sqlalchemy_models(scope_model=self._scope_model)
@@ -94,6 +105,7 @@ class SQLiteStore(Database):
             sqla_models=self._sqla_models,
             sessions=self._sessions,
             scope_fields=self._scope_fields,
+            embedding_dtype=self._embedding_dtype,
         )
         self.memory_category_repo = SQLiteMemoryCategoryRepo(
             state=self._state,
@@ -101,6 +113,7 @@ class SQLiteStore(Database):
             sqla_models=self._sqla_models,
             sessions=self._sessions,
             scope_fields=self._scope_fields,
+            embedding_dtype=self._embedding_dtype,
         )
         self.memory_item_repo = SQLiteMemoryItemRepo(
             state=self._state,
@@ -108,6 +121,8 @@ class SQLiteStore(Database):
             sqla_models=self._sqla_models,
             sessions=self._sessions,
             scope_fields=self._scope_fields,
+            embedding_dtype=self._embedding_dtype,
+            vectors=build_vector_index(vector_index, scope_fields=self._scope_fields),
         )
         self.category_item_repo = SQLiteCategoryItemRepo(
             state=self._state,
@@ -129,6 +144,13 @@ class SQLiteStore(Database):
         # Also create tables from our custom metadata
         self._sqla_models.Base.metadata.create_all(self._sessions.engine)
         logger.debug("SQLite tables created/verified")
+        tables = [
+            self._sqla_models.Resource.__table__,
+            self._sqla_models.MemoryCategory.__table__,
+            self._sqla_models.MemoryItem.__table__,
+        ]
+        add_missing_columns(self._sessions.engine, [*tables, self._sqla_models.CategoryItem.__table__])
+        migrate_embedding_blobs(self._sessions.engine, tables, dtype=self._embedding_dtype)
 
     def close(self) -> None:
         """Close the database connection and release resources."""
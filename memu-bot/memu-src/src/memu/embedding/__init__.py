@@ -1,4 +1,12 @@
+from memu.embedding.cache import CachedEmbeddingClient, EmbeddingCache
+from memu.embedding.dispatcher import EmbeddingDispatcher
 from memu.embedding.http_client import HTTPEmbeddingClient
 from memu.embedding.openai_sdk import OpenAIEmbeddingSDKClient
 
-__all__ = ["HTTPEmbeddingClient", "OpenAIEmbeddingSDKClient"]
+__all__ = [
+    "CachedEmbeddingClient",
+    "EmbeddingCache",
+    "EmbeddingDispatcher",
+    "HTTPEmbeddingClient",
+    "OpenAIEmbeddingSDKClient",
+]
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost (key tuple, OrderedDict node, ndarray header)
+_ENTRY_OVERHEAD_BYTES = 200
+# SQLite limits the number of host parameters per statement
+_DISK_LOOKUP_CHUNK = 500
+
+CacheKey = tuple[str, str, bytes]
+
+
+def embedding_cache_key(provider: str | None, model: str | None, text: str) -> CacheKey:
+    """Content address of an embedding: (provider, model, sha256(text))."""
+    return (provider or "", model or "", hashlib.sha256(text.encode("utf-8")).digest())
+
+
+class _DiskTier:
+    """SQLite-backed embedding store; vectors are float32 blobs, pages are mmap'd."""
+
+    def __init__(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "provider TEXT NOT NULL, model TEXT NOT NULL, text_sha256 BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (provider, model, text_sha256)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[CacheKey]) -> dict[CacheKey, np.ndarray]:
+        found: dict[CacheKey, np.ndarray] = {}
+        by_model: dict[tuple[str, str], list[bytes]] = {}
+        for provider, model, digest in keys:
+            by_model.setdefault((provider, model), []).append(digest)
+        with self._lock:
+            for (provider, model), digests in by_model.items():
+                for start in range(0, len(digests), _DISK_LOOKUP_CHUNK):
+                    chunk = digests[start : start + _DISK_LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        "SELECT text_sha256, vector FROM embedding_cache "  # noqa: S608
+                        f"WHERE provider = ? AND model = ? AND text_sha256 IN ({placeholders})",
+                        (provider, model, *chunk),
+                    ).fetchall()
+                    for digest, blob in rows:
+                        found[(provider, model, digest)] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, entries: Iterable[tuple[CacheKey, np.ndarray]]) -> None:
+        rows = [(provider, model, digest, vec.tobytes()) for (provider, model, digest), vec in entries]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (provider, model, text_sha256, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+
+    Entries are keyed by ``(provider, model, sha256(text))`` and held as float32
+    vectors in an in-process LRU bounded by ``max_bytes``. An optional SQLite file
+    (``disk_path``) backs the LRU so embeddings survive restarts; disk hits are
+    promoted into memory.
+    """
+
+    def __init__(self, *, max_bytes: int = 64 * 1024 * 1024, disk_path: str | Path | None = None) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def has_disk_tier(self) -> bool:
+        return self._disk is not None
+
+    def get_many(self, keys: Sequence[CacheKey]) -> dict[CacheKey, np.ndarray]:
+        """Return the cached vectors for ``keys`` (memory first, then disk); absent keys are omitted."""
+        found: dict[CacheKey, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vec = self._entries.get(key)
+                if vec is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vec
+        memory_hits = len(found)
+        if self._disk is not None:
+            pending = [key for key in keys if key not in found]
+            if pending:
+                from_disk = self._disk.get_many(pending)
+                self._remember(from_disk.items())
+                found.update(from_disk)
+        with self._lock:
+            self.hits += memory_hits
+            self.disk_hits += len(found) - memory_hits
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Sequence[tuple[CacheKey, Sequence[float]]]) -> None:
+        vectors = [(key, np.asarray(vec, dtype=np.float32)) for key, vec in entries]
+        self._remember(vectors)
+        if self._disk is not None:
+            self._disk.put_many(vectors)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _remember(self, entries: Iterable[tuple[CacheKey, np.ndarray]]) -> None:
+        with self._lock:
+            for key, vec in entries:
+                size = vec.nbytes + _ENTRY_OVERHEAD_BYTES
+                if size > self.max_bytes:
+                    continue
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._bytes -= previous.nbytes + _ENTRY_OVERHEAD_BYTES
+                self._entries[key] = vec
+                self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes + _ENTRY_OVERHEAD_BYTES
+
+
+@dataclass
+class CachedEmbeddingResponse:
+    """Raw response of a cached ``embed`` call: the upstream raw response plus per-call cache stats."""
+
+    raw_response: Any
+    cache_stats: dict[str, Any] = field(default_factory=dict)
+
+
+class CachedEmbeddingClient:
+    """
+    Wrap any client exposing ``embed(inputs)`` with an ``EmbeddingCache``.
+
+    Only texts missing from the cache are sent upstream (deduplicated, in input
+    order). ``embed`` returns ``(vectors, CachedEmbeddingResponse)`` like the other
+    ``(pure, raw)`` clients so ``LLMClientWrapper`` can report cache hits through the
+    interceptor after-hooks. Every other attribute is forwarded to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        cache: EmbeddingCache,
+        provider: str | None = None,
+        embed_model: str | None = None,
+    ) -> None:
+        self._client = client
+        self._cache = cache
+        self._provider = provider
+        self._embed_model = embed_model or getattr(client, "embed_model", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        return self._cache
+
+    async def embed(self, inputs: list[str]) -> tuple[list[list[float]], CachedEmbeddingResponse]:
+        keys = [embedding_cache_key(self._provider, self._embed_model, text) for text in inputs]
+        cached = await self._lookup(keys)
+
+        missing: dict[CacheKey, str] = {}
+        for key, text in zip(keys, inputs, strict=True):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        fresh: dict[CacheKey, list[float]] = {}
+        raw_response = None
+        if missing:
+            result = await self._client.embed(list(missing.values()))
+            vectors = result
+            if isinstance(result, tuple) and len(result) == 2:
+                vectors, raw_response = result
+            fresh = dict(zip(missing, vectors, strict=True))
+            await self._store(list(fresh.items()))
+
+        out = [fresh[key] if key in fresh else cached[key].tolist() for key in keys]
+        hits = len(inputs) - sum(1 for key in keys if key in fresh)
+        stats = {
+            "hits": hits,
+            "misses": len(inputs) - hits,
+            "upstream_inputs": len(missing),
+            "hit_rate": hits / len(inputs) if inputs else 0.0,
+            "total_hit_rate": self._cache.stats()["hit_rate"],
+        }
+        return out, CachedEmbeddingResponse(raw_response=raw_response, cache_stats=stats)
+
+    async def _lookup(self, keys: list[CacheKey]) -> dict[CacheKey, np.ndarray]:
+        if not keys:
+            return {}
+        if not self._cache.has_disk_tier:
+            return self._cache.get_many(keys)
+        return await asyncio.to_thread(self._cache.get_many, keys)
+
+    async def _store(self, entries: list[tuple[CacheKey, list[float]]]) -> None:
+        if not self._cache.has_disk_tier:
+            self._cache.put_many(entries)
+        else:
+            await asyncio.to_thread(self._cache.put_many, entries)
+
+    def close(self) -> None:
+        self._cache.close()
+
+
+__all__ = ["CachedEmbeddingClient", "CachedEmbeddingResponse", "EmbeddingCache", "embedding_cache_key"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: request timeout, conflict, rate limit and server errors
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[tuple[list[list[float]], Any]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch budgets."""
+    return len(text) // 4 + 1
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Transient failures: transport errors, timeouts, 408/409/429 and 5xx responses (httpx or OpenAI SDK)."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in _RETRYABLE_STATUS or status >= 500
+    if isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    # openai.APIConnectionError / APITimeoutError carry no status code
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+class EmbeddingDispatcher:
+    """
+    Split large embedding requests into budgeted batches and send them concurrently.
+
+    A batch is closed when adding the next input would exceed ``max_batch_items``,
+    ``max_batch_chars`` or ``max_batch_tokens`` (estimated with ``estimate_tokens``);
+    an input that alone exceeds a budget is sent on its own rather than truncated.
+    At most ``max_concurrency`` batches are in flight; a batch failing with a
+    transient error is retried up to ``max_retries`` times with jittered
+    exponential backoff, other batches are unaffected. Results come back in input
+    order.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch_items: int | None = 2048,
+        max_batch_chars: int | None = None,
+        max_batch_tokens: int | None = 250_000,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        token_estimator: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        if max_concurrency < 1:
+            msg = "max_concurrency must be at least 1"
+            raise ValueError(msg)
+        self.max_batch_items = max_batch_items
+        self.max_batch_chars = max_batch_chars
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.token_estimator = token_estimator
+
+    def plan(self, inputs: Sequence[str]) -> list[tuple[int, int]]:
+        """Return ``(start, end)`` slices of ``inputs``, one per batch."""
+        batches: list[tuple[int, int]] = []
+        start = 0
+        chars = tokens = 0
+        for idx, text in enumerate(inputs):
+            text_chars = len(text)
+            text_tokens = self.token_estimator(text) if self.max_batch_tokens is not None else 0
+            if idx > start and (
+                (self.max_batch_items is not None and idx - start >= self.max_batch_items)
+                or (self.max_batch_chars is not None and chars + text_chars > self.max_batch_chars)
+                or (self.max_batch_tokens is not None and tokens + text_tokens > self.max_batch_tokens)
+            ):
+                batches.append((start, idx))
+                start, chars, tokens = idx, 0, 0
+            chars += text_chars
+            tokens += text_tokens
+        if start < len(inputs):
+            batches.append((start, len(inputs)))
+        return batches
+
+    async def dispatch(self, inputs: Sequence[str], send: EmbedBatchFn) -> tuple[list[list[float]], list[Any]]:
+        """
+        Embed ``inputs`` through ``send`` batch by batch.
+
+        Args:
+            inputs: Texts to embed.
+            send: Coroutine embedding one batch, returning ``(vectors, raw_response)``.
+
+        Returns:
+            Vectors in input order and the raw responses in batch order.
+        """
+        batches = self.plan(inputs)
+        if len(batches) <= 1:
+            batch_vectors, raw = await self._send_with_retry(list(inputs), send)
+            return batch_vectors, [raw]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(start: int, end: int) -> tuple[list[list[float]], Any]:
+            async with semaphore:
+                return await self._send_with_retry(list(inputs[start:end]), send)
+
+        results = await asyncio.gather(*(run(start, end) for start, end in batches))
+        vectors: list[list[float]] = []
+        for (start, end), (batch_vectors, _) in zip(batches, results, strict=True):
+            if len(batch_vectors) != end - start:
+                msg = f"Embedding batch returned {len(batch_vectors)} vectors for {end - start} inputs"
+                raise ValueError(msg)
+            vectors.extend(batch_vectors)
+        return vectors, [raw for _, raw in results]
+
+    async def _send_with_retry(self, batch: list[str], send: EmbedBatchFn) -> tuple[list[list[float]], Any]:
+        attempt = 0
+        while True:
+            try:
+                return await send(batch)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable_error(exc):
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * 2**attempt) * (0.5 + random.random() / 2)  # noqa: S311
+                attempt += 1
+                logger.warning(
+                    "Embedding batch of %d inputs failed (%s), retry %d/%d in %.2fs",
+                    len(batch),
+                    exc,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+
+__all__ = ["EmbeddingDispatcher", "estimate_tokens", "is_retryable_error"]
@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Callable
-from typing import Literal
-
-import httpx
+from typing import Any, Literal
 
 from memu.embedding.backends.base import EmbeddingBackend
 from memu.embedding.backends.doubao import DoubaoEmbeddingBackend, DoubaoMultimodalEmbeddingInput
 from memu.embedding.backends.openai import OpenAIEmbeddingBackend
+from memu.embedding.dispatcher import EmbeddingDispatcher
+from memu.llm.http_pool import HTTPClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,8 @@ class HTTPEmbeddingClient:
         provider: str = "openai",
         endpoint_overrides: dict[str, str] | None = None,
         timeout: int = 60,
+        http_pool: HTTPClientPool | None = None,
+        dispatcher: EmbeddingDispatcher | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key or ""
@@ -44,6 +46,8 @@ class HTTPEmbeddingClient:
             or self.backend.embedding_endpoint
         )
         self.timeout = timeout
+        self.http_pool = http_pool or HTTPClientPool(base_url=self.base_url, timeout=timeout)
+        self.dispatcher = dispatcher or EmbeddingDispatcher()
 
     async def embed(self, inputs: list[str]) -> list[list[float]]:
         """
@@ -55,13 +59,15 @@ class HTTPEmbeddingClient:
         Returns:
             List of embedding vectors
         """
-        payload = self.backend.build_embedding_payload(inputs=inputs, embed_model=self.embed_model)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = await client.post(self.embedding_endpoint, json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        vectors, _ = await self.dispatcher.dispatch(inputs, self._embed_batch)
+        return vectors
+
+    async def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], dict[str, Any]]:
+        payload = self.backend.build_embedding_payload(inputs=batch, embed_model=self.embed_model)
+        resp = await self.http_pool.post(self.embedding_endpoint, json=payload, headers=self._headers())
+        data = resp.json()
         logger.debug("HTTP embedding response: %s", data)
-        return self.backend.parse_embedding_response(data)
+        return self.backend.parse_embedding_response(data), data
 
     async def embed_multimodal(
         self,
@@ -118,14 +124,18 @@ class HTTPEmbeddingClient:
         )
 
         endpoint = self.backend.multimodal_embedding_endpoint
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = await client.post(endpoint, json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self.http_pool.post(endpoint, json=payload, headers=self._headers())
+        data = resp.json()
 
         logger.debug("HTTP multimodal embedding response: %s", data)
         return self.backend.parse_multimodal_embedding_response(data)
 
+    def pool_stats(self) -> dict[str, Any]:
+        return self.http_pool.stats()
+
+    async def aclose(self) -> None:
+        await self.http_pool.aclose()
+
     def _headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.api_key}"}
 
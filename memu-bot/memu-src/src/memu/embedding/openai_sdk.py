@@ -1,7 +1,11 @@
 import logging
 from typing import cast
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types import CreateEmbeddingResponse
+
+from memu.embedding.dispatcher import EmbeddingDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -9,12 +13,24 @@ logger = logging.getLogger(__name__)
 class OpenAIEmbeddingSDKClient:
     """OpenAI embedding client that relies on the official Python SDK."""
 
-    def __init__(self, *, base_url: str, api_key: str, embed_model: str, batch_size: int = 25):
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_key: str,
+        embed_model: str,
+        batch_size: int = 25,
+        http_limits: httpx.Limits | None = None,
+        http2: bool = False,
+        dispatcher: EmbeddingDispatcher | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key or ""
         self.embed_model = embed_model
         self.batch_size = batch_size
-        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.dispatcher = dispatcher or EmbeddingDispatcher(max_batch_items=batch_size)
+        http_client = DefaultAsyncHttpxClient(limits=http_limits, http2=http2) if http_limits or http2 else None
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=http_client)
 
     async def embed(self, inputs: list[str]) -> list[list[float]]:
         """
@@ -26,18 +42,13 @@ class OpenAIEmbeddingSDKClient:
         Returns:
             List of embedding vectors
         """
-        # Process in batches to handle API limits (e.g., some providers limit batch size)
-        if len(inputs) <= self.batch_size:
-            # Single batch - direct call
-            response = await self.client.embeddings.create(model=self.embed_model, input=inputs)
-            return [cast(list[float], d.embedding) for d in response.data]
-
-        # Multiple batches - split and merge
-        all_embeddings = []
-        for i in range(0, len(inputs), self.batch_size):
-            batch = inputs[i : i + self.batch_size]
-            response = await self.client.embeddings.create(model=self.embed_model, input=batch)
-            batch_embeddings = [cast(list[float], d.embedding) for d in response.data]
-            all_embeddings.extend(batch_embeddings)
-
-        return all_embeddings
+        # Batches are sized by the dispatcher's item/token budgets and sent concurrently
+        vectors, _ = await self.dispatcher.dispatch(inputs, self._embed_batch)
+        return vectors
+
+    async def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], CreateEmbeddingResponse]:
+        response = await self.client.embeddings.create(model=self.embed_model, input=batch)
+        return [cast(list[float], d.embedding) for d in response.data], response
+
+    async def aclose(self) -> None:
+        await self.client.close()
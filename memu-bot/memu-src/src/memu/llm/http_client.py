@@ -6,13 +6,13 @@ from collections.abc import Callable
 from pathlib import Path
 from typing import Any, cast
 
-import httpx
-
+from memu.embedding.dispatcher import EmbeddingDispatcher
 from memu.llm.backends.base import LLMBackend
 from memu.llm.backends.doubao import DoubaoLLMBackend
 from memu.llm.backends.grok import GrokBackend
 from memu.llm.backends.openai import OpenAILLMBackend
 from memu.llm.backends.openrouter import OpenRouterLLMBackend
+from memu.llm.http_pool import HTTPClientPool
 
 
 # Minimal embedding backend support (moved from embedding module)
@@ -85,6 +85,8 @@ class HTTPLLMClient:
         endpoint_overrides: dict[str, str] | None = None,
         timeout: int = 60,
         embed_model: str | None = None,
+        http_pool: HTTPClientPool | None = None,
+        embed_dispatcher: EmbeddingDispatcher | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key or ""
@@ -102,6 +104,9 @@ class HTTPLLMClient:
         )
         self.timeout = timeout
         self.embed_model = embed_model or chat_model
+        # Connections are kept alive across calls; pass a pool to share it between clients
+        self.http_pool = http_pool or HTTPClientPool(base_url=self.base_url, timeout=timeout)
+        self.embed_dispatcher = embed_dispatcher or EmbeddingDispatcher()
 
     async def summarize(
         self, text: str, max_tokens: int | None = None, system_prompt: str | None = None
@@ -109,10 +114,8 @@ class HTTPLLMClient:
         payload = self.backend.build_summary_payload(
             text=text, system_prompt=system_prompt, chat_model=self.chat_model, max_tokens=max_tokens
         )
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = await client.post(self.summary_endpoint, json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self.http_pool.post(self.summary_endpoint, json=payload, headers=self._headers())
+        data = resp.json()
         logger.debug("HTTP LLM summarize response: %s", data)
         return self.backend.parse_summary_response(data), data
 
@@ -159,20 +162,21 @@ class HTTPLLMClient:
             max_tokens=max_tokens,
         )
 
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = await client.post(self.summary_endpoint, json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self.http_pool.post(self.summary_endpoint, json=payload, headers=self._headers())
+        data = resp.json()
         logger.debug("HTTP LLM vision response: %s", data)
         return self.backend.parse_summary_response(data), data
 
     async def embed(self, inputs: list[str]) -> tuple[list[list[float]], dict[str, Any]]:
-        """Create text embeddings using the provider-specific embedding API."""
-        payload = self.embedding_backend.build_embedding_payload(inputs=inputs, embed_model=self.embed_model)
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = await client.post(self.embedding_endpoint, json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        """Create text embeddings using the provider-specific embedding API, batched by ``embed_dispatcher``."""
+        vectors, responses = await self.embed_dispatcher.dispatch(inputs, self._embed_batch)
+        # Only the last response is returned for usage reporting
+        return vectors, responses[-1]
+
+    async def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], dict[str, Any]]:
+        payload = self.embedding_backend.build_embedding_payload(inputs=batch, embed_model=self.embed_model)
+        resp = await self.http_pool.post(self.embedding_endpoint, json=payload, headers=self._headers())
+        data = resp.json()
         logger.debug("HTTP embedding response: %s", data)
         return self.embedding_backend.parse_embedding_response(data), data
 
@@ -210,20 +214,19 @@ class HTTPLLMClient:
                 if language:
                     data["language"] = language
 
-                async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout * 3) as client:
-                    resp = await client.post(
-                        "/v1/audio/transcriptions",
-                        files=files,
-                        data=data,
-                        headers=self._headers(),
-                    )
-                    resp.raise_for_status()
-
-                    if response_format == "text":
-                        result = resp.text
-                    else:
-                        raw_response = resp.json()
-                        result = raw_response.get("text", "")
+                resp = await self.http_pool.post(
+                    "/v1/audio/transcriptions",
+                    files=files,
+                    data=data,
+                    headers=self._headers(),
+                    timeout=self.timeout * 3,
+                )
+
+                if response_format == "text":
+                    result = resp.text
+                else:
+                    raw_response = resp.json()
+                    result = raw_response.get("text", "")
 
             logger.debug("HTTP audio transcribe response for %s: %s chars", audio_path, len(result))
         except Exception:
@@ -232,6 +235,12 @@ class HTTPLLMClient:
         else:
             return result or "", raw_response
 
+    def pool_stats(self) -> dict[str, Any]:
+        return self.http_pool.stats()
+
+    async def aclose(self) -> None:
+        await self.http_pool.aclose()
+
     def _headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.api_key}"}
 
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientPool:
+    """
+    Long-lived ``httpx.AsyncClient`` shared by the HTTP LLM and embedding clients.
+
+    Keeps connections (and TLS sessions) alive between calls, within the configured
+    ``httpx.Limits``; ``http2=True`` multiplexes requests over one connection per host
+    and needs the ``h2`` package. The underlying client is created lazily and is
+    bound to the event loop that first used it: if the pool is used from another
+    loop (e.g. successive ``asyncio.run`` calls) a fresh client is opened there and
+    the previous one is closed, on its own loop if that is still running.
+
+    Connection reuse is observable through ``stats()``, which counts requests and
+    the TCP connects / TLS handshakes reported by httpcore's trace extension.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        timeout: float = 60,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 30.0,
+        http2: bool = False,
+    ) -> None:
+        if http2 and importlib.util.find_spec("h2") is None:
+            msg = "http2=True requires the 'h2' package (pip install 'httpx[http2]')"
+            raise ImportError(msg)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Closes of clients replaced after a loop change, kept referenced until done
+        self._closing: set[asyncio.Future[None]] = set()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._connects = 0
+        self._tls_handshakes = 0
+        self._total_latency_ms = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # Connections belong to the loop that opened them; never share them across loops
+            if self._client is not None and not self._client.is_closed:
+                self._retire(self._client, self._loop, loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._loop = loop
+        return self._client
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST through the shared client; raises ``httpx.HTTPStatusError`` on non-2xx responses."""
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = self._trace
+        self._requests += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            resp = await self.client.post(url, extensions=extensions, **kwargs)
+            resp.raise_for_status()
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._total_latency_ms += (time.perf_counter() - started) * 1000
+        return resp
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "requests": self._requests,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+            "connections_opened": self._connects,
+            "tls_handshakes": self._tls_handshakes,
+            "avg_latency_ms": self._total_latency_ms / self._requests if self._requests else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _retire(
+        self,
+        client: httpx.AsyncClient,
+        owner: asyncio.AbstractEventLoop | None,
+        current: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Close a client replaced after a loop change, so its sockets are not leaked."""
+        if owner is not None and owner is not current and owner.is_running():
+            future: asyncio.Future[None] = asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self._close_quietly(client), owner), loop=current
+            )
+        else:
+            future = current.create_task(self._close_quietly(client))
+        self._closing.add(future)
+        future.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_quietly(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as exc:
+            # Its loop may be gone already; nothing else can reuse the client either way
+            logger.debug("Error closing replaced HTTP client: %s", exc)
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._connects += 1
+        elif event_name == "connection.start_tls.complete":
+            self._tls_handshakes += 1
+
+
+__all__ = ["HTTPClientPool"]
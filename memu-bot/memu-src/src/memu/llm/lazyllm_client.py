@@ -5,6 +5,8 @@ from typing import Any, cast
 import lazyllm
 from lazyllm import LOG
 
+from memu.embedding.dispatcher import EmbeddingDispatcher
+
 
 class LazyLLMClient:
     """LAZYLLM client that relies on the LazyLLM framework."""
@@ -22,6 +24,7 @@ class LazyLLMClient:
         vlm_model: str | None = None,
         embed_model: str | None = None,
         stt_model: str | None = None,
+        embed_dispatcher: EmbeddingDispatcher | None = None,
     ):
         self.llm_source = llm_source or self.DEFAULT_SOURCE
         self.vlm_source = vlm_source or self.DEFAULT_SOURCE
@@ -31,6 +34,7 @@ class LazyLLMClient:
         self.vlm_model = vlm_model
         self.embed_model = embed_model
         self.stt_model = stt_model
+        self.embed_dispatcher = embed_dispatcher
 
     async def _call_async(self, client: Any, *args: Any, **kwargs: Any) -> Any:
         """
@@ -109,8 +113,15 @@ class LazyLLMClient:
             source=self.embed_source, model=self.embed_model, type="embed", batch_size=batch_size
         )
         LOG.debug(f"embed {len(texts)} texts with {self.embed_source}/{self.embed_model}")
-        response = await self._call_async(client, texts)
-        return cast(list[list[float]], response)
+        if self.embed_dispatcher is None:
+            response = await self._call_async(client, texts)
+            return cast(list[list[float]], response)
+
+        async def send(batch: list[str]) -> tuple[list[list[float]], None]:
+            return cast(list[list[float]], await self._call_async(client, batch)), None
+
+        vectors, _ = await self.embed_dispatcher.dispatch(texts, send)
+        return vectors
 
     async def transcribe(
         self,
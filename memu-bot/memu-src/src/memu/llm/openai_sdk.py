@@ -3,7 +3,8 @@ import logging
 from pathlib import Path
 from typing import Any, Literal, cast
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types import CreateEmbeddingResponse
 from openai.types.chat import (
     ChatCompletion,
@@ -14,6 +15,8 @@ from openai.types.chat import (
     ChatCompletionUserMessageParam,
 )
 
+from memu.embedding.dispatcher import EmbeddingDispatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,13 +31,18 @@ class OpenAISDKClient:
         chat_model: str,
         embed_model: str,
         embed_batch_size: int = 1,
+        http_limits: httpx.Limits | None = None,
+        http2: bool = False,
+        embed_dispatcher: EmbeddingDispatcher | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key or ""
         self.chat_model = chat_model
         self.embed_model = embed_model
         self.embed_batch_size = embed_batch_size
-        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.embed_dispatcher = embed_dispatcher or EmbeddingDispatcher(max_batch_items=embed_batch_size)
+        http_client = DefaultAsyncHttpxClient(limits=http_limits, http2=http2) if http_limits or http2 else None
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=http_client)
 
     async def summarize(
         self,
@@ -126,21 +134,17 @@ class OpenAISDKClient:
         return content or "", response
 
     async def embed(self, inputs: list[str]) -> tuple[list[list[float]], CreateEmbeddingResponse | None]:
-        """Create text embeddings via the official SDK."""
-        if len(inputs) <= self.embed_batch_size:
-            response = await self.client.embeddings.create(model=self.embed_model, input=inputs)
-            return [cast(list[float], d.embedding) for d in response.data], response
-
-        # For batched requests, we aggregate embeddings but only return the last response for usage
-        all_embeddings: list[list[float]] = []
-        last_response: CreateEmbeddingResponse | None = None
-        for idx in range(0, len(inputs), self.embed_batch_size):
-            batch = inputs[idx : idx + self.embed_batch_size]
-            response = await self.client.embeddings.create(model=self.embed_model, input=batch)
-            all_embeddings.extend([cast(list[float], d.embedding) for d in response.data])
-            last_response = response
-
-        return all_embeddings, last_response
+        """Create text embeddings via the official SDK, batched concurrently by ``embed_dispatcher``."""
+        vectors, responses = await self.embed_dispatcher.dispatch(inputs, self._embed_batch)
+        # Only the last response is returned for usage reporting
+        return vectors, responses[-1]
+
+    async def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], CreateEmbeddingResponse]:
+        response = await self.client.embeddings.create(model=self.embed_model, input=batch)
+        return [cast(list[float], d.embedding) for d in response.data], response
+
+    async def aclose(self) -> None:
+        await self.client.close()
 
     async def transcribe(
         self,
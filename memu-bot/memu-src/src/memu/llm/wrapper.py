@@ -7,7 +7,7 @@ import threading
 import time
 import uuid
 from collections.abc import Callable, Mapping, Sequence
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 
@@ -383,6 +383,12 @@ class LLMClientWrapper:
 
             response_view = response_builder(pure_result)
 
+            # Cached embedding clients wrap the upstream raw response together with hit/miss stats
+            cache_stats = getattr(raw_response, "cache_stats", None)
+            if isinstance(cache_stats, dict):
+                raw_response = getattr(raw_response, "raw_response", None)
+                response_view = replace(response_view, metadata={**response_view.metadata, "cache": cache_stats})
+
             # Extract token usage from raw response (best-effort)
             extracted_usage = _extract_usage_from_raw_response(kind=kind, raw_response=raw_response)
             usage = LLMUsage(
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from memu.database.sqlite import SQLiteStore
+from memu.database.sqlite.repositories.memory_item_repo import SQLiteMemoryItemRepo
+
+
+class UserScope(BaseModel):
+    user_id: str | None = None
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> SQLiteMemoryItemRepo:
+    store = SQLiteStore(dsn=f"sqlite:///{tmp_path / 'memu.db'}", scope_model=UserScope)
+    repo = store.memory_item_repo
+    assert isinstance(repo, SQLiteMemoryItemRepo)
+    # Load the (empty) embedding matrix first, so later hits come from the writes' own indexing
+    assert repo.vector_search_items([1.0, 0.0, 0.0], 5) == []
+    return repo
+
+
+def search_ids(repo: SQLiteMemoryItemRepo, query: list[float], user_id: str) -> set[str]:
+    return {item_id for item_id, _ in repo.vector_search_items(query, 10, where={"user_id": user_id})}
+
+
+def test_create_item_is_searchable_in_its_scope(repo: SQLiteMemoryItemRepo) -> None:
+    item = repo.create_item(
+        resource_id="r1", memory_type="profile", summary="likes tea", embedding=[1.0, 0.0, 0.0],
+        user_data={"user_id": "alice"},
+    )
+    assert search_ids(repo, [1.0, 0.0, 0.0], "alice") == {item.id}
+    assert search_ids(repo, [1.0, 0.0, 0.0], "bob") == set()
+
+
+def test_create_item_reinforce_is_searchable_in_its_scope(repo: SQLiteMemoryItemRepo) -> None:
+    item = repo.create_item(
+        resource_id="r1", memory_type="profile", summary="likes tea", embedding=[1.0, 0.0, 0.0],
+        user_data={"user_id": "alice"}, reinforce=True,
+    )
+    assert search_ids(repo, [1.0, 0.0, 0.0], "alice") == {item.id}
+    assert search_ids(repo, [1.0, 0.0, 0.0], "bob") == set()
+
+
+def test_create_items_bulk_is_searchable_in_its_scope(repo: SQLiteMemoryItemRepo) -> None:
+    results = repo.create_items_bulk(
+        resource_id="r1",
+        entries=[("profile", "likes tea", [1.0, 0.0, 0.0]), ("event", "went hiking", [0.0, 1.0, 0.0])],
+        user_data={"user_id": "alice"},
+    )
+    ids = {item.id for item, _ in results}
+    assert search_ids(repo, [1.0, 1.0, 0.0], "alice") == ids
+    assert search_ids(repo, [1.0, 1.0, 0.0], "bob") == set()
+
+
+def test_update_item_keeps_its_scope(repo: SQLiteMemoryItemRepo) -> None:
+    item = repo.create_item(
+        resource_id="r1", memory_type="profile", summary="likes tea", embedding=[1.0, 0.0, 0.0],
+        user_data={"user_id": "alice"},
+    )
+    repo.update_item(item_id=item.id, summary="likes coffee", embedding=[0.0, 0.0, 1.0])
+    assert search_ids(repo, [0.0, 0.0, 1.0], "alice") == {item.id}
+    assert search_ids(repo, [0.0, 0.0, 1.0], "bob") == set()